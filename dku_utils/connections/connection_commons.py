@@ -19,6 +19,7 @@ from ..datasets.dataset_commons import (
 )
 from ..flow.flow_commons import get_all_flow_dataset_names, get_all_flow_folder_names
 from ..recipes.sync_recipe import sync_dataset_to_connection
+from ..recipes.recipe_commons import rewire_recipes_inputs
 
 
 class FlowConnectionsHandler:
@@ -340,6 +341,7 @@ class FlowConnectionsHandler:
         'fallback_connection_datasets_downstream_recipes' will be used as input of sync recipes synchronizing them 
         toward 'main_connection'. Then, recipes that used these dataset as inputs will be connected to the outputs of the sync recipes.
         """
+        recipes_input_mappings = {}
         for fallback_connection_dataset in self.fallback_connection_datasets:
             use_fast_path = (
                 fallback_connection_dataset in self.fallback_connection_datasets_downstream_recipes.keys()
@@ -350,38 +352,37 @@ class FlowConnectionsHandler:
                 downstream_recipe_names = self.fallback_connection_datasets_downstream_recipes[
                     fallback_connection_dataset
                 ]
+                print(
+                    "Adapting flow structure to fast path ..."
+                    " Datasets '{}' will be synced using path  '{}' ('{}') -->  '{}' ('{}') !".format(
+                        self.fallback_connection_datasets,
+                        self.fallback_connection_name,
+                        self.fallback_connection_type,
+                        self.main_connection_name,
+                        self.main_connection_type,
+                    )
+                )
+                update_dataset_varchar_limit(
+                    self.project, fallback_connection_dataset, self.fallback_connection_varchar_limit
+                )
+                update_dataset_varchar_limit(
+                    self.project, synced_dataset_name, self.main_connection_varchar_limit
+                )
                 for downstream_recipe_name in downstream_recipe_names:
-                    downstream_project_recipe = self.project.get_recipe(downstream_recipe_name)
-                    downstream_project_recipe_settings = downstream_project_recipe.get_settings()
-                    if self.main_connection_type in self.ALLOWED_CLOUD_PROVIDERS_SQL_STORAGES:
-                        print(
-                            "Adapting flow structure to fast path ..."
-                            " Datasets '{}' will be synced using path  '{}' ('{}') -->  '{}' ('{}') !".format(
-                                self.fallback_connection_datasets,
-                                self.fallback_connection_name,
-                                self.fallback_connection_type,
-                                self.main_connection_name,
-                                self.main_connection_type,
-                            )
-                        )
-                        downstream_project_recipe_settings.replace_input(
-                            fallback_connection_dataset, synced_dataset_name
-                        )
-
-                        update_dataset_varchar_limit(
-                            self.project, fallback_connection_dataset, self.fallback_connection_varchar_limit
-                        )
-                        update_dataset_varchar_limit(
-                            self.project, synced_dataset_name, self.main_connection_varchar_limit
-                        )
-                    else:
-                        downstream_project_recipe_settings.replace_input(
-                            synced_dataset_name, fallback_connection_dataset
-                        )
-                    downstream_project_recipe_settings.save()
+                    recipes_input_mappings.setdefault(downstream_recipe_name, {})[
+                        fallback_connection_dataset
+                    ] = synced_dataset_name
                     pass
                 pass
             pass
+        # Each downstream recipe is rewired with a single settings update, whatever the number of its synced inputs:
+        rewiring_report_df = rewire_recipes_inputs(self.project, recipes_input_mappings)
+        failed_rewirings_df = rewiring_report_df[rewiring_report_df["status"] == "FAILED"]
+        if len(failed_rewirings_df) > 0:
+            log_message = "Fast path rewiring failed on recipes '{}': {}".format(
+                list(failed_rewirings_df["recipe_name"]), list(failed_rewirings_df["error_message"])
+            )
+            raise Exception(log_message)
         pass
 
     def connect_flow_input_datasets(self, datasets_to_tables_or_paths_mapping, input_datasets_read_file_format=None):
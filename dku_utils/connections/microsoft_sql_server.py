@@ -1,4 +1,14 @@
 # TODO : document the package
+from .sql.physical_design import quote_sql_identifier
+from .sql.sql_aggregations import (generate_sql_group_query,
+                                   generate_sql_concatenation_expression,
+                                   generate_sql_server_xml_path_concatenation_expression,
+                                   DEFAULT_SQL_CONCATENATION_SEPARATOR,
+                                   SQL_SERVER_STRING_AGG_MIN_MAJOR_VERSION)
+from ..recipes.group_recipe import GROUP_POSSIBLE_AGGREGATIONS, GROUP_AGGREGATIONS_OUTPUT_SUFFIXES
+
+# Queries of this module must keep running on SQL Server versions older than 2017 when the version is unknown:
+MS_SQL_DEFAULT_MAJOR_VERSION = SQL_SERVER_STRING_AGG_MIN_MAJOR_VERSION - 1
 
 def generate_ms_sql_column_group(list_of_columns, int_indent_level):
     sql_column_group = ''
@@ -11,25 +21,26 @@ def generate_ms_sql_column_group(list_of_columns, int_indent_level):
     return sql_column_group
 
 
-def generate_ms_sql_concat_query(table_name, group_key, column_to_concatenate, post_aggregation_name):
+def generate_ms_sql_concat_query(table_name, group_key, column_to_concatenate, post_aggregation_name, sql_server_major_version=None):
+    """
+    Generates the select expression concatenating a column in a SQL Server group query having 't1' as table alias:
+        'STRING_AGG' from SQL Server 2017, a 'FOR XML PATH' subquery correlated to 't1' on older versions
+        (see :function:`connections.sql.sql_aggregations.generate_sql_group_query` for a set-based query).
+        If 'sql_server_major_version' is 'None', the 'FOR XML PATH' subquery is used, as it runs on all versions.
+    """
     if (post_aggregation_name is None) or (post_aggregation_name == ""):
         post_aggregation_name = f"{column_to_concatenate}_concat"
-    last_column_in_group_key = group_key[-1]
-    where_arguments = ""
-    for column_name in group_key:
-        where_arguments += f't1."{column_name}" = t2."{column_name}"'
-        if column_name != last_column_in_group_key:
-            where_arguments += " AND "
-
-    concat_query =\
-    f'''REPLACE (
-    \t STUFF(
-    \t\t (SELECT ',' + convert(varchar(max), t2."{column_to_concatenate}")
-    \t\t FROM "{table_name}" AS t2
-    \t\t WHERE ({where_arguments})
-    \t\t FOR XML PATH ('')
-    \t\t ), 1, 1, ''), '&amp;', '&'
-    ) AS "{post_aggregation_name}"'''
+    if sql_server_major_version is None:
+        sql_server_major_version = MS_SQL_DEFAULT_MAJOR_VERSION
+    if sql_server_major_version < SQL_SERVER_STRING_AGG_MIN_MAJOR_VERSION:
+        concat_expression = generate_sql_server_xml_path_concatenation_expression(quote_sql_identifier("SQLServer", table_name),
+                                                                                  group_key, column_to_concatenate,
+                                                                                  DEFAULT_SQL_CONCATENATION_SEPARATOR, False,
+                                                                                  group_keys_alias="t1")
+    else:
+        concat_expression = generate_sql_concatenation_expression("SQLServer", column_to_concatenate,
+                                                                  DEFAULT_SQL_CONCATENATION_SEPARATOR, False)
+    concat_query = f'{concat_expression} AS {quote_sql_identifier("SQLServer", post_aggregation_name)}'
     return concat_query
 
 
@@ -40,7 +51,8 @@ def generate_ms_sql_count_query(post_aggregation_name):
     return count_query
 
 
-def generate_ms_sql_group_query(table_name, group_key, aggregation_settings, bool_compute_count, count_column_name):
+def generate_ms_sql_group_query(table_name, group_key, aggregation_settings, bool_compute_count, count_column_name,
+                                sql_server_major_version=None):
     """
     aggregation_settings: {
         "concat": [
@@ -52,39 +64,32 @@ def generate_ms_sql_group_query(table_name, group_key, aggregation_settings, boo
             {"column_name": "column_2", "post_aggregation_name": None}
             ]
     }
+    Aggregations can be any of 'recipes.group_recipe.GROUP_POSSIBLE_AGGREGATIONS': the query is generated by
+        :function:`connections.sql.sql_aggregations.generate_sql_group_query`, concatenations depending on
+        'sql_server_major_version': 'STRING_AGG' from SQL Server 2017 (major version 14), 'FOR XML PATH' on older versions
+        and when the version is 'None', as it runs on all versions.
     """
-    
-    POSSIBLE_AGGREGATIONS = ["concat"]
-    query_group = generate_ms_sql_column_group(group_key, 1)
-    aggregations_to_apply = aggregation_settings.keys()
-    
-    for aggregation in aggregations_to_apply:
-        if aggregation not in POSSIBLE_AGGREGATIONS:
+    if sql_server_major_version is None:
+        sql_server_major_version = MS_SQL_DEFAULT_MAJOR_VERSION
+    column_aggregations_mapping = {}
+    output_column_name_overrides = {}
+    for aggregation, all_columns_aggregation_settings in aggregation_settings.items():
+        if aggregation not in GROUP_POSSIBLE_AGGREGATIONS:
             log_message = f"Aggregation '{aggregation}' is not supported by this function !"\
-            f"\nPossible aggregations are '{POSSIBLE_AGGREGATIONS}'."
+            f"\nPossible aggregations are '{GROUP_POSSIBLE_AGGREGATIONS}'."
             raise Exception(log_message)
-    query_aggregations = ""
-    first_aggregation = True
-    
-    for aggregation in POSSIBLE_AGGREGATIONS:
-        all_columns_aggregation_settings = aggregation_settings[aggregation]
         for column_aggregation_settings in all_columns_aggregation_settings:
             column_name = column_aggregation_settings["column_name"]
             post_aggregation_name = column_aggregation_settings["post_aggregation_name"]
-            if aggregation == "concat":
-                query_enrichment = generate_ms_sql_concat_query(table_name, group_key, column_name, post_aggregation_name)
-            if first_aggregation:
-                enrichment_separator = ""
-            else:
-                enrichment_separator = ","
-            query_aggregations = f"{query_aggregations}{enrichment_separator}\n\t{query_enrichment} "
-            first_aggregation = False
-    
-    if bool_compute_count:
-        query_enrichment = generate_ms_sql_count_query(count_column_name)
-        query_aggregations = f"{query_aggregations},\n\t{query_enrichment} "
-    ms_sql_group_query =\
-    f'''SELECT {query_group},{query_aggregations}
-    \nFROM "{table_name}" AS t1
-    \nGROUP BY {query_group};'''
+            column_aggregations_mapping.setdefault(column_name, []).append(aggregation)
+            if (post_aggregation_name is not None) and (post_aggregation_name != ""):
+                default_output_column_name = "{}_{}".format(column_name, GROUP_AGGREGATIONS_OUTPUT_SUFFIXES.get(aggregation, aggregation))
+                output_column_name_overrides[default_output_column_name] = post_aggregation_name
+    if bool_compute_count and (count_column_name is not None) and (count_column_name != ""):
+        output_column_name_overrides["count"] = count_column_name
+    ms_sql_group_query = generate_sql_group_query("SQLServer", quote_sql_identifier("SQLServer", table_name), group_key,
+                                                  column_aggregations_mapping, bool_compute_count,
+                                                  output_column_name_overrides=output_column_name_overrides,
+                                                  sql_server_major_version=sql_server_major_version)
+    ms_sql_group_query = f"{ms_sql_group_query};"
     return ms_sql_group_query
@@ -0,0 +1,325 @@
+from collections import Counter
+import pandas as pd
+from ...datasets.dataset_commons import get_dataset_settings_and_dictionary
+from ...flow.flow_graph import get_flow_graph_nodes, get_flow_dataset_consumer_recipe_names
+from ...recipes.recipe_commons import get_recipe_settings_and_dictionary
+
+
+SQL_CONNECTION_TYPES_WITH_PHYSICAL_DESIGN = ["Redshift", "Snowflake", "BigQuery", "PostgreSQL", "SQLServer"]
+CONNECTIONS_MAX_CLUSTERING_COLUMNS = {"Redshift": 4, "Snowflake": 3, "BigQuery": 4, "PostgreSQL": 3, "SQLServer": 3}
+
+
+def collect_recipe_key_usages(recipe_type, recipe_payload, recipe_input_dataset_names):
+    """
+    Collects the columns a visual recipe uses as keys on each of its input datasets:
+        - 'JOIN': join conditions of 'join' recipes (as written by 'programmaticJoinHandler').
+        - 'GROUP': group keys of 'grouping' recipes and row identifiers of 'pivot' recipes.
+        - 'WINDOW_PARTITION' and 'WINDOW_ORDER': partitioning and ordering columns of 'window' recipes.
+
+    :param recipe_type: str: Type of the recipe.
+    :param recipe_payload: dict: JSON payload of the recipe.
+    :param recipe_input_dataset_names: list: List of the recipe's input dataset names, in the recipe inputs order.
+
+    :returns: recipe_key_usages: list: List of key usages, with format:
+        [{'dataset_name': 'dataset_1', 'usage': 'JOIN', 'columns': ['column_1', 'column_2']}, ...]
+    """
+    recipe_key_usages = []
+    if recipe_type == "join":
+        virtual_inputs = recipe_payload.get("virtualInputs", [])
+        for join_settings in recipe_payload.get("joins", []):
+            join_columns_per_table = {}
+            for join_condition in join_settings.get("on", []):
+                for column_side in ["column1", "column2"]:
+                    column_information = join_condition.get(column_side)
+                    if column_information is None:
+                        continue
+                    join_columns_per_table.setdefault(column_information["table"], []).append(column_information["name"])
+            for table_index, join_columns in join_columns_per_table.items():
+                input_index = virtual_inputs[table_index]["index"]
+                recipe_key_usages.append({"dataset_name": recipe_input_dataset_names[input_index],
+                                          "usage": "JOIN",
+                                          "columns": join_columns})
+    elif recipe_type in ["grouping", "pivot"]:
+        if recipe_type == "grouping":
+            group_columns = [key_settings["column"] for key_settings in recipe_payload.get("keys", [])]
+        else:
+            group_columns = list(recipe_payload.get("explicitIdentifiers", []))
+        if len(group_columns) > 0:
+            recipe_key_usages.append({"dataset_name": recipe_input_dataset_names[0],
+                                      "usage": "GROUP",
+                                      "columns": group_columns})
+    elif recipe_type == "window":
+        for window_settings in recipe_payload.get("windows", []):
+            partitioning_columns = window_settings.get("partitioningColumns", [])
+            if window_settings.get("enablePartitioning", len(partitioning_columns) > 0) and (len(partitioning_columns) > 0):
+                recipe_key_usages.append({"dataset_name": recipe_input_dataset_names[0],
+                                          "usage": "WINDOW_PARTITION",
+                                          "columns": list(partitioning_columns)})
+            order_columns = [order["column"] for order in window_settings.get("orders", [])]
+            if window_settings.get("enableOrdering", len(order_columns) > 0) and (len(order_columns) > 0):
+                recipe_key_usages.append({"dataset_name": recipe_input_dataset_names[0],
+                                          "usage": "WINDOW_ORDER",
+                                          "columns": order_columns})
+    return recipe_key_usages
+
+
+def collect_datasets_downstream_key_usages(project, dataset_names):
+    """
+    Collects the key usages of datasets by all their downstream visual recipes.
+        Each consumer recipe settings is only fetched once, even when it consumes several of the datasets.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_names: list: List of the dataset names.
+
+    :returns: datasets_key_usages: dict: Mapping between the datasets and their key usages, with format:
+        {'dataset_1': [{'recipe_name': 'recipe_1', 'usage': 'JOIN', 'columns': ['column_1']}, ...]}
+    """
+    flow_graph_nodes = get_flow_graph_nodes(project)
+    datasets_key_usages = {dataset_name: [] for dataset_name in dataset_names}
+    consumer_recipe_names = []
+    for dataset_name in dataset_names:
+        for recipe_name in get_flow_dataset_consumer_recipe_names(flow_graph_nodes, dataset_name):
+            if recipe_name not in consumer_recipe_names:
+                consumer_recipe_names.append(recipe_name)
+    for recipe_name in consumer_recipe_names:
+        recipe_settings, __ = get_recipe_settings_and_dictionary(project, recipe_name, False)
+        recipe_input_dataset_names = [item["ref"] for item in recipe_settings.get_recipe_inputs()["main"]["items"]]
+        try:
+            recipe_payload = recipe_settings.get_json_payload()
+        except:
+            # Code recipes have no JSON payload: they do not provide any key information.
+            continue
+        for recipe_key_usage in collect_recipe_key_usages(recipe_settings.type, recipe_payload, recipe_input_dataset_names):
+            dataset_name = recipe_key_usage.pop("dataset_name")
+            if dataset_name in datasets_key_usages.keys():
+                recipe_key_usage["recipe_name"] = recipe_name
+                datasets_key_usages[dataset_name].append(recipe_key_usage)
+    return datasets_key_usages
+
+
+def rank_key_columns(dataset_key_usages, usages):
+    """
+    Ranks the columns used as keys by their number of usages.
+
+    :param dataset_key_usages: list: Key usages of a dataset, as we can get them with
+        :function:`collect_datasets_downstream_key_usages`.
+    :param usages: list: List of the usages to consider, in ['JOIN', 'GROUP', 'WINDOW_PARTITION', 'WINDOW_ORDER'].
+
+    :returns: ranked_key_columns: list: List of the key columns, the most used first.
+    """
+    key_columns_counter = Counter()
+    for key_usage in dataset_key_usages:
+        if key_usage["usage"] in usages:
+            key_columns_counter.update(key_usage["columns"])
+    ranked_key_columns = [column_name for column_name, __ in key_columns_counter.most_common()]
+    return ranked_key_columns
+
+
+def get_most_used_composite_join_key(dataset_key_usages):
+    """
+    Retrieves the composite join key (all the columns of one join) that is the most used on a dataset.
+
+    :param dataset_key_usages: list: Key usages of a dataset.
+
+    :returns: composite_join_key: list: Columns of the most used composite join key (empty if the dataset is never joined).
+    """
+    composite_join_keys_counter = Counter(tuple(key_usage["columns"]) for key_usage in dataset_key_usages
+                                          if key_usage["usage"] == "JOIN")
+    if len(composite_join_keys_counter) == 0:
+        return []
+    composite_join_key = list(composite_join_keys_counter.most_common(1)[0][0])
+    return composite_join_key
+
+
+def concatenate_unique_columns(*column_lists):
+    """
+    Concatenates lists of columns, only keeping the first occurrence of each column.
+
+    :param column_lists: list: Lists of column names.
+
+    :returns: unique_columns: list: Concatenated list of unique column names.
+    """
+    unique_columns = []
+    for column_list in column_lists:
+        for column_name in column_list:
+            if column_name not in unique_columns:
+                unique_columns.append(column_name)
+    return unique_columns
+
+
+def quote_sql_identifier(connection_type, identifier):
+    """
+    Quotes a SQL identifier with the quoting characters of a connection type.
+
+    :param connection_type: str: Type of the SQL connection.
+    :param identifier: str: The identifier to quote.
+
+    :returns: quoted_identifier: str: The quoted identifier.
+    """
+    if connection_type == "SQLServer":
+        quoted_identifier = "[{}]".format(identifier.replace("]", "]]"))
+    elif connection_type == "BigQuery":
+        quoted_identifier = "`{}`".format(identifier.replace("`", "\\`"))
+    else:
+        quoted_identifier = '"{}"'.format(identifier.replace('"', '""'))
+    return quoted_identifier
+
+
+def compute_sql_dataset_table_reference(project, connection_type, dataset_params):
+    """
+    Computes the SQL reference of the table associated with a SQL dataset ('schema.table', quoted).
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param connection_type: str: Type of the SQL connection.
+    :param dataset_params: dict: 'params' section of the dataset settings.
+
+    :returns: table_reference: str: The quoted table reference.
+    """
+    table_name = dataset_params.get("table", "").replace("${projectKey}", project.project_key)
+    table_reference = quote_sql_identifier(connection_type, table_name)
+    schema_name = dataset_params.get("schema", "")
+    if schema_name not in ["", None]:
+        table_reference = "{}.{}".format(quote_sql_identifier(connection_type, schema_name), table_reference)
+    return table_reference
+
+
+def propose_dataset_physical_design(connection_type, dataset_key_usages, table_reference):
+    """
+    Proposes the physical design of a SQL table from the way its dataset is used downstream:
+        - Redshift: 'KEY' distribution on the most joined column and a 'COMPOUND' sort key made of the most used
+          join key followed by the window ordering and group keys. Without join keys, the distribution stays 'AUTO'.
+        - Snowflake: clustering key made of the most used join, group and window partitioning columns.
+        - BigQuery: clustering columns made of the most used join, group and window partitioning columns.
+        - PostgreSQL and SQLServer: one index per distinct composite join key and on the group keys.
+
+    :param connection_type: str: Type of the SQL connection, in 'SQL_CONNECTION_TYPES_WITH_PHYSICAL_DESIGN'.
+    :param dataset_key_usages: list: Key usages of the dataset, as we can get them with
+        :function:`collect_datasets_downstream_key_usages`.
+    :param table_reference: str: Quoted reference of the table associated with the dataset.
+
+    :returns: proposed_params: dict: Dataset 'params' to update (only for connections that expose them in DSS).
+    :returns: proposed_statements: list: SQL statements to run on the table for connections where the physical
+        design is not part of the DSS dataset settings.
+    """
+    max_clustering_columns = CONNECTIONS_MAX_CLUSTERING_COLUMNS[connection_type]
+    join_columns = rank_key_columns(dataset_key_usages, ["JOIN"])
+    group_columns = rank_key_columns(dataset_key_usages, ["GROUP"])
+    window_partition_columns = rank_key_columns(dataset_key_usages, ["WINDOW_PARTITION"])
+    window_order_columns = rank_key_columns(dataset_key_usages, ["WINDOW_ORDER"])
+    clustering_columns = concatenate_unique_columns(join_columns, group_columns,
+                                                    window_partition_columns)[0: max_clustering_columns]
+    proposed_params = {}
+    proposed_statements = []
+
+    if connection_type == "Redshift":
+        sort_key_columns = concatenate_unique_columns(get_most_used_composite_join_key(dataset_key_usages),
+                                                      window_partition_columns, window_order_columns,
+                                                      group_columns)[0: max_clustering_columns]
+        if len(join_columns) > 0:
+            proposed_params["distributionStyle"] = "KEY"
+            proposed_params["distributionKey"] = join_columns[0]
+        else:
+            proposed_params["distributionStyle"] = "AUTO"
+        if len(sort_key_columns) > 0:
+            proposed_params["sortKey"] = "COMPOUND"
+            proposed_params["sortKeyColumns"] = sort_key_columns
+        else:
+            proposed_params["sortKey"] = "NONE"
+            proposed_params["sortKeyColumns"] = []
+
+    elif len(clustering_columns) > 0:
+        quoted_clustering_columns = ", ".join([quote_sql_identifier(connection_type, column_name)
+                                               for column_name in clustering_columns])
+        if connection_type == "Snowflake":
+            proposed_statements.append("ALTER TABLE {} CLUSTER BY ({});".format(table_reference, quoted_clustering_columns))
+        elif connection_type == "BigQuery":
+            # BigQuery clustering can't be altered with DDL: the table has to be re-created with these options.
+            proposed_statements.append("CREATE OR REPLACE TABLE {0} CLUSTER BY {1} AS SELECT * FROM {0};"
+                                       .format(table_reference, quoted_clustering_columns))
+        else:
+            indexed_keys = [key_usage["columns"] for key_usage in dataset_key_usages if key_usage["usage"] == "JOIN"]
+            if len(group_columns) > 0:
+                indexed_keys.append(group_columns[0: max_clustering_columns])
+            unique_indexed_keys = []
+            for indexed_key in indexed_keys:
+                if indexed_key not in unique_indexed_keys:
+                    unique_indexed_keys.append(indexed_key)
+            table_name_for_index = table_reference.split(".")[-1].strip('"[]`')
+            for indexed_key in unique_indexed_keys:
+                index_name = quote_sql_identifier(connection_type,
+                                                  "idx_{}_{}".format(table_name_for_index, "_".join(indexed_key))[0: 63])
+                quoted_indexed_key = ", ".join([quote_sql_identifier(connection_type, column_name)
+                                                for column_name in indexed_key])
+                if connection_type == "PostgreSQL":
+                    proposed_statements.append("CREATE INDEX IF NOT EXISTS {} ON {} ({});"
+                                               .format(index_name, table_reference, quoted_indexed_key))
+                else:
+                    proposed_statements.append("CREATE INDEX {} ON {} ({});"
+                                               .format(index_name, table_reference, quoted_indexed_key))
+    return proposed_params, proposed_statements
+
+
+def get_project_managed_sql_dataset_names(project):
+    """
+    Retrieves the names of all the project managed datasets stored in a SQL connection
+        supported by the physical design advisor.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+
+    :returns: managed_sql_dataset_names: list: List of the managed SQL dataset names.
+    """
+    managed_sql_dataset_names = [dataset_information["name"] for dataset_information in project.list_datasets()
+                                 if dataset_information.get("managed", False)
+                                 and (dataset_information["type"] in SQL_CONNECTION_TYPES_WITH_PHYSICAL_DESIGN)]
+    return managed_sql_dataset_names
+
+
+def advise_managed_sql_datasets_physical_design(project, dataset_names=None, bool_apply_params=False):
+    """
+    Proposes (and optionally applies) the physical design of managed SQL datasets, based on the join keys,
+        group keys and window partitioning/ordering keys of all their downstream visual recipes.
+        Redshift proposals are dataset params (distribution and sort keys) and can be applied directly.
+        Snowflake, BigQuery, PostgreSQL and SQLServer proposals are SQL statements to run once the tables are built
+        (for example in a scenario 'Execute SQL' step), as DSS managed datasets settings do not expose them.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_names: list: List of the datasets to advise on. If 'None', all managed datasets stored in
+        a connection of type in 'SQL_CONNECTION_TYPES_WITH_PHYSICAL_DESIGN' are considered.
+    :param bool_apply_params: bool: Precise if the proposed dataset params should be saved in the dataset settings.
+
+    :returns: physical_design_df: pandas.core.frame.DataFrame: DataFrame containing, for each dataset, its connection
+        type, its downstream key usages, the proposed params and statements and whether the params were applied.
+    """
+    if dataset_names is None:
+        dataset_names = get_project_managed_sql_dataset_names(project)
+    print("Advising physical design of datasets '{}' ...".format(dataset_names))
+    datasets_key_usages = collect_datasets_downstream_key_usages(project, dataset_names)
+    physical_design_proposals = []
+    for dataset_name in dataset_names:
+        dataset_settings, dataset_settings_dict = get_dataset_settings_and_dictionary(project, dataset_name, True)
+        connection_type = dataset_settings_dict["type"]
+        if connection_type not in SQL_CONNECTION_TYPES_WITH_PHYSICAL_DESIGN:
+            log_message = "Dataset '{}' is stored in a connection of type '{}' that is not supported by this function. "\
+                "Supported connection types are '{}'".format(dataset_name, connection_type, SQL_CONNECTION_TYPES_WITH_PHYSICAL_DESIGN)
+            raise Exception(log_message)
+        table_reference = compute_sql_dataset_table_reference(project, connection_type, dataset_settings_dict["params"])
+        dataset_key_usages = datasets_key_usages[dataset_name]
+        proposed_params, proposed_statements = propose_dataset_physical_design(connection_type,
+                                                                               dataset_key_usages,
+                                                                               table_reference)
+        bool_params_applied = False
+        if bool_apply_params and (len(proposed_params) > 0):
+            dataset_settings_dict["params"].update(proposed_params)
+            dataset_settings.save()
+            bool_params_applied = True
+            print("Dataset '{}' physical design params updated with '{}'".format(dataset_name, proposed_params))
+        physical_design_proposals.append({"dataset_name": dataset_name,
+                                          "connection_type": connection_type,
+                                          "key_usages": dataset_key_usages,
+                                          "proposed_params": proposed_params,
+                                          "proposed_statements": proposed_statements,
+                                          "params_applied": bool_params_applied})
+    physical_design_df = pd.DataFrame(physical_design_proposals,
+                                      columns=["dataset_name", "connection_type", "key_usages", "proposed_params",
+                                               "proposed_statements", "params_applied"])
+    return physical_design_df
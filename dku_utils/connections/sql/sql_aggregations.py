@@ -0,0 +1,438 @@
+from .physical_design import quote_sql_identifier, compute_sql_dataset_table_reference
+from ...datasets.dataset_commons import get_dataset_settings_and_dictionary
+from ...recipes.recipe_commons import get_recipe_settings_and_dictionary
+from ...recipes.group_recipe import compute_group_recipe_aggregations, compute_group_recipe_output_columns
+
+
+SQL_AGGREGATIONS_CONNECTION_TYPES = ["SQLServer", "PostgreSQL", "Snowflake", "Redshift", "BigQuery"]
+SQL_SIMPLE_AGGREGATION_FUNCTIONS = {"min": "MIN", "max": "MAX", "sum": "SUM", "count": "COUNT"}
+SQL_FLOAT_DATATYPES = {"SQLServer": "FLOAT",
+                       "PostgreSQL": "DOUBLE PRECISION",
+                       "Snowflake": "DOUBLE",
+                       "Redshift": "DOUBLE PRECISION",
+                       "BigQuery": "FLOAT64"}
+SQL_STRING_DATATYPES = {"SQLServer": "NVARCHAR(MAX)",
+                        "PostgreSQL": "TEXT",
+                        "Snowflake": "VARCHAR",
+                        "Redshift": "VARCHAR(MAX)",
+                        "BigQuery": "STRING"}
+SQL_STANDARD_DEVIATION_FUNCTIONS = {"SQLServer": "STDEV",
+                                    "PostgreSQL": "STDDEV_SAMP",
+                                    "Snowflake": "STDDEV_SAMP",
+                                    "Redshift": "STDDEV_SAMP",
+                                    "BigQuery": "STDDEV_SAMP"}
+DEFAULT_SQL_CONCATENATION_SEPARATOR = ","
+SQL_SOURCE_ROWS_ALIAS = "source_rows"
+SQL_CONCATENATED_ROWS_ALIAS = "concatenated_rows"
+SQL_GROUP_KEYS_ALIAS = "group_keys"
+SQL_AGGREGATED_GROUPS_ALIAS = "aggregated_groups"
+SQL_GROUP_CONCATENATIONS_ALIAS = "group_concatenations"
+SQL_ROW_RANK_COLUMN_PREFIX = "__row_rank_"
+# 'STRING_AGG' is available from SQL Server 2017:
+SQL_SERVER_STRING_AGG_MIN_MAJOR_VERSION = 14
+# Azure SQL Database and Azure SQL Managed Instance:
+SQL_SERVER_AZURE_ENGINE_EDITIONS = [5, 8]
+
+
+def check_sql_aggregations_connection_type(connection_type):
+    """
+    Checks that SQL aggregation queries can be generated for a connection type.
+
+    :param connection_type: str: Type of the SQL connection.
+    """
+    if connection_type not in SQL_AGGREGATIONS_CONNECTION_TYPES:
+        log_message = "SQL aggregation queries can't be generated for connections of type '{}'. "\
+            "Supported connection types are '{}'".format(connection_type, SQL_AGGREGATIONS_CONNECTION_TYPES)
+        raise Exception(log_message)
+    pass
+
+
+def format_sql_string_literal(connection_type, value):
+    """
+    Formats a string as a SQL string literal, escaping it with the rules of a connection type.
+
+    :param connection_type: str: Type of the SQL connection.
+    :param value: str: The string.
+
+    :returns: sql_string_literal: str: The SQL string literal.
+    """
+    if connection_type == "BigQuery":
+        sql_string_literal = "'{}'".format(value.replace("\\", "\\\\").replace("'", "\\'"))
+    else:
+        sql_string_literal = "'{}'".format(value.replace("'", "''"))
+    if connection_type == "SQLServer":
+        sql_string_literal = "N{}".format(sql_string_literal)
+    return sql_string_literal
+
+
+def generate_sql_server_null_safe_equality(left_expressions, right_expressions):
+    """
+    Generates a SQL Server condition comparing two lists of expressions, null values being equal to each other.
+        The 'EXISTS ... INTERSECT' form is planned as an equality, so it doesn't prevent hash or merge joins.
+
+    :param left_expressions: list: List of the left SQL expressions.
+    :param right_expressions: list: List of the right SQL expressions, in the same order.
+
+    :returns: null_safe_equality: str: The SQL condition.
+    """
+    null_safe_equality = "EXISTS (SELECT {} INTERSECT SELECT {})".format(", ".join(left_expressions), ", ".join(right_expressions))
+    return null_safe_equality
+
+
+def generate_sql_server_xml_path_concatenation_expression(table_reference, group_key, column_name, concatenation_separator,
+                                                          bool_distinct_values, order_column=None,
+                                                          group_keys_alias=SQL_GROUP_KEYS_ALIAS):
+    """
+    Generates a SQL Server expression concatenating the non-null values of a column for one group, with a 'FOR XML PATH'
+        subquery correlated to the group key columns of another table alias. The XML is typed and converted back to a
+        string, which decodes all the XML entities ('&amp;', '&lt;', '&gt;', '&#x0D;'...).
+        This is the fallback for SQL Server versions older than 2017, which don't have 'STRING_AGG'.
+
+    :param table_reference: str: The quoted reference of the aggregated table.
+    :param group_key: list: List of the group key columns.
+    :param column_name: str: Name of the concatenated column.
+    :param concatenation_separator: str: Separator of the concatenated values.
+    :param bool_distinct_values: bool: Precise if you want to concatenate only the distinct values, ordered by value.
+    :param order_column: str: Optional column ordering the concatenated values (ignored for distinct values).
+    :param group_keys_alias: str: Alias of the table holding the group key the subquery is correlated to.
+
+    :returns: concatenation_expression: str: The SQL expression.
+    """
+    where_clause = ""
+    if len(group_key) > 0:
+        quoted_key_columns = [quote_sql_identifier("SQLServer", key_column) for key_column in group_key]
+        where_clause = " WHERE {}".format(generate_sql_server_null_safe_equality(
+            ["{}.{}".format(SQL_CONCATENATED_ROWS_ALIAS, quoted_key_column) for quoted_key_column in quoted_key_columns],
+            ["{}.{}".format(group_keys_alias, quoted_key_column) for quoted_key_column in quoted_key_columns]))
+    order_clause = ""
+    if bool_distinct_values:
+        order_clause = " ORDER BY 1"
+    elif order_column not in [None, ""]:
+        order_clause = " ORDER BY {}.{}".format(SQL_CONCATENATED_ROWS_ALIAS, quote_sql_identifier("SQLServer", order_column))
+    concatenated_value = "{} + CONVERT({}, {}.{})".format(format_sql_string_literal("SQLServer", concatenation_separator),
+                                                          SQL_STRING_DATATYPES["SQLServer"], SQL_CONCATENATED_ROWS_ALIAS,
+                                                          quote_sql_identifier("SQLServer", column_name))
+    concatenation_expression = "STUFF((SELECT {}{} FROM {} AS {}{}{} FOR XML PATH(''), TYPE).value('.', '{}'), 1, {}, '')"\
+        .format("DISTINCT " if bool_distinct_values else "", concatenated_value, table_reference, SQL_CONCATENATED_ROWS_ALIAS,
+                where_clause, order_clause, SQL_STRING_DATATYPES["SQLServer"], len(concatenation_separator))
+    return concatenation_expression
+
+
+def generate_sql_concatenation_expression(connection_type, column_name, concatenation_separator, bool_distinct_values,
+                                          order_column=None, distinct_row_rank_column=None):
+    """
+    Generates a SQL aggregate expression concatenating the non-null values of a column in each group, converted to strings.
+        Concatenated values follow the order column when there is one, while distinct values are ordered by value.
+        On SQL Server, 'STRING_AGG' has no 'DISTINCT': only the first row of each value, ranked by
+        :function:`generate_sql_distinct_row_rank_expression`, is concatenated.
+
+    :param connection_type: str: Type of the SQL connection.
+    :param column_name: str: Name of the concatenated column.
+    :param concatenation_separator: str: Separator of the concatenated values.
+    :param bool_distinct_values: bool: Precise if you want to concatenate only the distinct values.
+    :param order_column: str: Optional column ordering the concatenated values.
+    :param distinct_row_rank_column: str: Quoted name of the column ranking the rows of each value (SQL Server distinct
+        concatenations only).
+
+    :returns: concatenation_expression: str: The SQL expression.
+    """
+    string_value = "CAST({} AS {})".format(quote_sql_identifier(connection_type, column_name),
+                                           SQL_STRING_DATATYPES[connection_type])
+    separator_literal = format_sql_string_literal(connection_type, concatenation_separator)
+    order_expression = None
+    if bool_distinct_values:
+        order_expression = string_value
+    elif order_column not in [None, ""]:
+        order_expression = quote_sql_identifier(connection_type, order_column)
+
+    if connection_type == "SQLServer":
+        if bool_distinct_values:
+            string_value = "CASE WHEN {} = 1 THEN {} END".format(distinct_row_rank_column, string_value)
+        concatenation_expression = "STRING_AGG({}, {})".format(string_value, separator_literal)
+    elif bool_distinct_values:
+        string_value = "DISTINCT {}".format(string_value)
+    if connection_type in ["Snowflake", "Redshift"]:
+        concatenation_expression = "LISTAGG({}, {})".format(string_value, separator_literal)
+    elif connection_type in ["PostgreSQL", "BigQuery"]:
+        order_clause = " ORDER BY {}".format(order_expression) if order_expression is not None else ""
+        concatenation_expression = "STRING_AGG({}, {}{})".format(string_value, separator_literal, order_clause)
+    if (connection_type in ["SQLServer", "Snowflake", "Redshift"]) and (order_expression is not None):
+        concatenation_expression = "{} WITHIN GROUP (ORDER BY {})".format(concatenation_expression, order_expression)
+    return concatenation_expression
+
+
+def generate_sql_partition_clause(connection_type, partition_columns):
+    """
+    Generates the 'PARTITION BY' clause of a window expression.
+
+    :param connection_type: str: Type of the SQL connection.
+    :param partition_columns: list: List of the partitioning columns.
+
+    :returns: partition_clause: str: The clause, followed by a space ('' if there is no partitioning column).
+    """
+    partition_clause = ""
+    if len(partition_columns) > 0:
+        partition_clause = "PARTITION BY {} ".format(", ".join([quote_sql_identifier(connection_type, partition_column)
+                                                                for partition_column in partition_columns]))
+    return partition_clause
+
+
+def generate_sql_row_rank_expression(connection_type, group_key, column_name, aggregation, column_settings):
+    """
+    Generates the window expression ranking the rows of each group for a 'first' or 'last' aggregation: the selected
+        row has rank 1. Rows having a null value come last when 'firstLastNotNull' is set.
+
+    :param connection_type: str: Type of the SQL connection.
+    :param group_key: list: List of the group key columns.
+    :param column_name: str: Name of the aggregated column.
+    :param aggregation: str: The aggregation, 'first' or 'last'.
+    :param column_settings: dict: Settings of the aggregated column in the group recipe payload, containing its
+        'orderColumn'.
+
+    :returns: row_rank_expression: str: The SQL window expression.
+    """
+    order_expressions = []
+    if column_settings.get("firstLastNotNull", False):
+        order_expressions.append("CASE WHEN {} IS NULL THEN 1 ELSE 0 END".format(quote_sql_identifier(connection_type, column_name)))
+    order_expressions.append("{}{}".format(quote_sql_identifier(connection_type, column_settings["orderColumn"]),
+                                           " DESC" if aggregation == "last" else ""))
+    row_rank_expression = "ROW_NUMBER() OVER ({}ORDER BY {})".format(generate_sql_partition_clause(connection_type, group_key),
+                                                                     ", ".join(order_expressions))
+    return row_rank_expression
+
+
+def generate_sql_distinct_row_rank_expression(connection_type, group_key, column_name):
+    """
+    Generates the window expression ranking the rows having the same value of a column in each group: the first row of
+        each value has rank 1.
+
+    :param connection_type: str: Type of the SQL connection.
+    :param group_key: list: List of the group key columns.
+    :param column_name: str: Name of the column.
+
+    :returns: row_rank_expression: str: The SQL window expression.
+    """
+    row_rank_expression = "ROW_NUMBER() OVER ({}ORDER BY {})".format(generate_sql_partition_clause(connection_type,
+                                                                                                   group_key + [column_name]),
+                                                                     quote_sql_identifier(connection_type, column_name))
+    return row_rank_expression
+
+
+def get_sql_server_major_version(connection_name):
+    """
+    Retrieves the major version of the SQL Server behind a DSS connection (ex: 14 for SQL Server 2017).
+        Azure SQL Database and Managed Instance always run the latest engine, whatever their reported version.
+
+    :param connection_name: str: Name of the SQL Server connection.
+
+    :returns: sql_server_major_version: int: The SQL Server major version.
+    """
+    # 'dataiku' is only available within DSS: it is imported here so that the query generation can be used outside DSS.
+    import dataiku
+    sql_executor = dataiku.SQLExecutor2(connection=connection_name)
+    version_df = sql_executor.query_to_df("SELECT CAST(SERVERPROPERTY('ProductMajorVersion') AS INT) AS major_version, "
+                                          "CAST(SERVERPROPERTY('EngineEdition') AS INT) AS engine_edition")
+    sql_server_major_version = int(version_df["major_version"].iloc[0])
+    if int(version_df["engine_edition"].iloc[0]) in SQL_SERVER_AZURE_ENGINE_EDITIONS:
+        sql_server_major_version = max(sql_server_major_version, SQL_SERVER_STRING_AGG_MIN_MAJOR_VERSION)
+    return sql_server_major_version
+
+
+def generate_sql_group_query_from_payload(connection_type, table_reference, recipe_json_payload, sql_server_major_version=None):
+    """
+    Generates a SQL query computing the output of a group recipe in-database, for a connection type in
+        'SQL_AGGREGATIONS_CONNECTION_TYPES'. All the group recipe aggregations are supported, and output columns are named
+        as DSS names them (see :function:`recipes.group_recipe.compute_group_recipe_output_columns`).
+        - 'avg' and 'stddev' are computed on floats, 'stddev' being the sample standard deviation.
+        - 'first' and 'last' follow the 'orderColumn' of their column: rows are ranked with a window function in a subquery.
+          Without an order column, rows have no order in SQL, and they return the minimum and maximum values: this differs
+          from the local execution (see :function:`recipes.local_execution.group_execution.compute_grouped_column_aggregation`),
+          which returns the values of the first and last rows in the input order.
+        - 'concat' and 'concatDistinct' ignore null values and use the 'concatSeparator' of their column. Concatenated
+          values follow the 'orderColumn' of their column, while distinct values are ordered by value.
+          On SQL Server versions older than 2017, all the concatenations are computed once per group in a single
+          pre-aggregated CTE, joined once to the other aggregations.
+        Pre-filters, post-filters and computed columns of the recipe are not translated.
+
+    :param connection_type: str: Type of the SQL connection.
+    :param table_reference: str: The quoted reference of the aggregated table, as we can get it with
+        :function:`connections.sql.physical_design.compute_sql_dataset_table_reference`.
+    :param recipe_json_payload: dict: JSON payload of the group recipe (only 'keys', 'values', 'globalCount'
+        and 'outputColumnNameOverrides' are used).
+    :param sql_server_major_version: int: Major version of the SQL Server (ex: 13 for SQL Server 2016), as we can get it
+        with :function:`get_sql_server_major_version`. If 'None', the SQL Server is assumed to be recent.
+
+    :returns: sql_group_query: str: The SQL query.
+    """
+    check_sql_aggregations_connection_type(connection_type)
+    bool_use_xml_path = (connection_type == "SQLServer") and (sql_server_major_version is not None)\
+        and (sql_server_major_version < SQL_SERVER_STRING_AGG_MIN_MAJOR_VERSION)
+    group_key = [key_settings["column"] for key_settings in recipe_json_payload.get("keys", [])]
+    columns_settings = {column_settings["column"]: column_settings for column_settings in recipe_json_payload.get("values", [])}
+    float_datatype = SQL_FLOAT_DATATYPES[connection_type]
+    select_expressions = []
+    row_rank_expressions = []
+    key_output_columns = []
+    concatenation_expressions = []
+    output_expressions = []
+    for output_column_information in compute_group_recipe_output_columns(recipe_json_payload):
+        aggregation = output_column_information["aggregation"]
+        column_name = output_column_information["input_column"]
+        column_settings = columns_settings.get(column_name, {})
+        quoted_column = quote_sql_identifier(connection_type, column_name) if column_name is not None else None
+        output_column = output_column_information["output_column"]
+        quoted_output_column = quote_sql_identifier(connection_type, output_column)
+        if aggregation is None:
+            select_expression = quoted_column
+            key_output_columns.append(output_column)
+        elif column_name is None:
+            select_expression = "COUNT(*)"
+        elif aggregation in SQL_SIMPLE_AGGREGATION_FUNCTIONS:
+            select_expression = "{}({})".format(SQL_SIMPLE_AGGREGATION_FUNCTIONS[aggregation], quoted_column)
+        elif aggregation == "countDistinct":
+            select_expression = "COUNT(DISTINCT {})".format(quoted_column)
+        elif aggregation == "avg":
+            select_expression = "AVG(CAST({} AS {}))".format(quoted_column, float_datatype)
+        elif aggregation == "stddev":
+            select_expression = "{}(CAST({} AS {}))".format(SQL_STANDARD_DEVIATION_FUNCTIONS[connection_type],
+                                                            quoted_column, float_datatype)
+        elif aggregation in ["first", "last"]:
+            if column_settings.get("orderColumn") in [None, ""]:
+                select_expression = "{}({})".format("MIN" if aggregation == "first" else "MAX", quoted_column)
+            else:
+                row_rank_column = quote_sql_identifier(connection_type,
+                                                       "{}{}".format(SQL_ROW_RANK_COLUMN_PREFIX, len(row_rank_expressions)))
+                row_rank_expressions.append("{} AS {}".format(generate_sql_row_rank_expression(connection_type, group_key,
+                                                                                               column_name, aggregation,
+                                                                                               column_settings),
+                                                              row_rank_column))
+                select_expression = "MAX(CASE WHEN {} = 1 THEN {} END)".format(row_rank_column, quoted_column)
+        elif aggregation in ["concat", "concatDistinct"]:
+            concatenation_separator = column_settings.get("concatSeparator") or DEFAULT_SQL_CONCATENATION_SEPARATOR
+            bool_distinct_values = (aggregation == "concatDistinct")
+            if bool_use_xml_path:
+                concatenation_expressions.append("{} AS {}".format(
+                    generate_sql_server_xml_path_concatenation_expression(table_reference, group_key, column_name,
+                                                                          concatenation_separator, bool_distinct_values,
+                                                                          column_settings.get("orderColumn")),
+                    quoted_output_column))
+                output_expressions.append("{}.{}".format(SQL_GROUP_CONCATENATIONS_ALIAS, quoted_output_column))
+                continue
+            distinct_row_rank_column = None
+            if bool_distinct_values and (connection_type == "SQLServer"):
+                distinct_row_rank_column = quote_sql_identifier(connection_type,
+                                                                "{}{}".format(SQL_ROW_RANK_COLUMN_PREFIX, len(row_rank_expressions)))
+                row_rank_expressions.append("{} AS {}".format(generate_sql_distinct_row_rank_expression(connection_type, group_key,
+                                                                                                        column_name),
+                                                              distinct_row_rank_column))
+            select_expression = generate_sql_concatenation_expression(connection_type, column_name, concatenation_separator,
+                                                                      bool_distinct_values, column_settings.get("orderColumn"),
+                                                                      distinct_row_rank_column)
+        else:
+            log_message = "Aggregation '{}' can't be translated in SQL.".format(aggregation)
+            raise Exception(log_message)
+        if (aggregation is not None) or (output_column != column_name):
+            select_expression = "{} AS {}".format(select_expression, quoted_output_column)
+        select_expressions.append(select_expression)
+        output_expressions.append("{}.{}".format(SQL_AGGREGATED_GROUPS_ALIAS, quoted_output_column))
+
+    source_reference = table_reference
+    if len(row_rank_expressions) > 0:
+        source_reference = "(SELECT *, {} FROM {})".format(", ".join(row_rank_expressions), table_reference)
+    quoted_key_columns = [quote_sql_identifier(connection_type, key_column) for key_column in group_key]
+    sql_group_query = "SELECT\n    {}\nFROM {} AS {}".format(",\n    ".join(select_expressions), source_reference,
+                                                              SQL_SOURCE_ROWS_ALIAS)
+    if len(group_key) > 0:
+        sql_group_query = "{}\nGROUP BY\n    {}".format(sql_group_query, ",\n    ".join(quoted_key_columns))
+    if len(concatenation_expressions) == 0:
+        return sql_group_query
+
+    concatenations_query = "SELECT\n        {}".format(",\n        ".join(
+        ["{}.{}".format(SQL_GROUP_KEYS_ALIAS, quoted_key_column) for quoted_key_column in quoted_key_columns]
+        + concatenation_expressions))
+    if len(group_key) > 0:
+        concatenations_query = "{}\n    FROM (SELECT DISTINCT {} FROM {}) AS {}".format(concatenations_query,
+                                                                                       ", ".join(quoted_key_columns),
+                                                                                       table_reference, SQL_GROUP_KEYS_ALIAS)
+    if len(select_expressions) == 0:
+        sql_group_query = "WITH {} AS (\n    {}\n)\nSELECT\n    {}\nFROM {}".format(SQL_GROUP_CONCATENATIONS_ALIAS, concatenations_query,
+                                                                               ",\n    ".join(output_expressions),
+                                                                               SQL_GROUP_CONCATENATIONS_ALIAS)
+        return sql_group_query
+    if len(group_key) > 0:
+        join_clause = "JOIN {} ON {}".format(SQL_GROUP_CONCATENATIONS_ALIAS, generate_sql_server_null_safe_equality(
+            ["{}.{}".format(SQL_AGGREGATED_GROUPS_ALIAS, quote_sql_identifier(connection_type, key_output_column))
+             for key_output_column in key_output_columns],
+            ["{}.{}".format(SQL_GROUP_CONCATENATIONS_ALIAS, quoted_key_column) for quoted_key_column in quoted_key_columns]))
+    else:
+        join_clause = "CROSS JOIN {}".format(SQL_GROUP_CONCATENATIONS_ALIAS)
+    sql_group_query = "WITH {} AS (\n    {}\n), {} AS (\n    {}\n)\nSELECT\n    {}\nFROM {}\n{}".format(
+        SQL_AGGREGATED_GROUPS_ALIAS, sql_group_query.replace("\n", "\n    "), SQL_GROUP_CONCATENATIONS_ALIAS,
+        concatenations_query, ",\n    ".join(output_expressions), SQL_AGGREGATED_GROUPS_ALIAS, join_clause)
+    return sql_group_query
+
+
+def generate_sql_group_query(connection_type, table_reference, group_key, column_aggregations_mapping,
+                             bool_compute_global_count=False, columns_settings=None, output_column_name_overrides=None,
+                             sql_server_major_version=None):
+    """
+    Generates a SQL query grouping a table and aggregating its columns in-database
+        (see :function:`generate_sql_group_query_from_payload`).
+
+    :param connection_type: str: Type of the SQL connection, in 'SQL_AGGREGATIONS_CONNECTION_TYPES'.
+    :param table_reference: str: The quoted reference of the aggregated table.
+    :param group_key: list: List of the group key columns. If empty, the whole table is aggregated.
+    :param column_aggregations_mapping: dict: Mapping between the columns and the list of aggregations to apply to each one,
+        as in :function:`recipes.group_recipe.define_group_recipe_aggregations`.
+        Example: {'column_1': ['min', 'concat'], 'column_2': ['avg', 'sum']}
+    :param bool_compute_global_count: bool: Precise whether you want to compute the count of rows of each group.
+    :param columns_settings: dict: Optional mapping between the aggregated columns and their settings in the group recipe
+        payload format. Example: {'column_1': {'concatSeparator': ';'}, 'column_2': {'orderColumn': 'date', 'firstLastNotNull': True}}
+    :param output_column_name_overrides: dict: Optional mapping between DSS default output column names and their new names.
+    :param sql_server_major_version: int: Major version of the SQL Server, for SQL Server connections. If 'None', the SQL
+        Server is assumed to be recent.
+
+    :returns: sql_group_query: str: The SQL query.
+    """
+    if columns_settings is None:
+        columns_settings = {}
+    recipe_column_aggregations = [dict(column_settings, column=column_name) for column_name, column_settings in columns_settings.items()]
+    recipe_json_payload = {"keys": [{"column": key_column} for key_column in group_key],
+                           "values": compute_group_recipe_aggregations(recipe_column_aggregations, column_aggregations_mapping),
+                           "globalCount": bool_compute_global_count,
+                           "outputColumnNameOverrides": output_column_name_overrides or {}}
+    sql_group_query = generate_sql_group_query_from_payload(connection_type, table_reference, recipe_json_payload,
+                                                            sql_server_major_version)
+    return sql_group_query
+
+
+def generate_group_recipe_sql_query(project, recipe_name):
+    """
+    Generates the SQL query computing a group recipe output in the connection of its input dataset,
+        ready to be used in a SQL query recipe (see :function:`generate_sql_group_query_from_payload`).
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param recipe_name: str: Name of the group recipe.
+
+    :returns: sql_group_query: str: The SQL query.
+    """
+    recipe_settings, recipe_settings_dict = get_recipe_settings_and_dictionary(project, recipe_name, True)
+    if recipe_settings_dict["type"] != "grouping":
+        log_message = "Recipe '{}' is of type '{}' and not a group recipe!".format(recipe_name, recipe_settings_dict["type"])
+        raise Exception(log_message)
+    recipe_json_payload = recipe_settings.get_json_payload()
+    for filter_name in ["preFilter", "postFilter"]:
+        if (recipe_json_payload.get(filter_name) or {}).get("enabled", False):
+            print("WARNING: Recipe '{}' {} is not translated in the generated SQL query.".format(recipe_name, filter_name))
+    if len(recipe_json_payload.get("computedColumns", [])) > 0:
+        print("WARNING: Recipe '{}' computed columns are not translated in the generated SQL query.".format(recipe_name))
+    recipe_input_dataset_name = recipe_settings.get_recipe_inputs()["main"]["items"][0]["ref"]
+    __, dataset_settings_dict = get_dataset_settings_and_dictionary(project, recipe_input_dataset_name, True)
+    connection_type = dataset_settings_dict["type"]
+    table_reference = compute_sql_dataset_table_reference(project, connection_type, dataset_settings_dict["params"])
+    sql_server_major_version = None
+    if connection_type == "SQLServer":
+        sql_server_major_version = get_sql_server_major_version(dataset_settings_dict["params"]["connection"])
+    sql_group_query = generate_sql_group_query_from_payload(connection_type, table_reference, recipe_json_payload,
+                                                            sql_server_major_version)
+    return sql_group_query
@@ -0,0 +1,526 @@
+import itertools
+import dataiku
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from .dataset_commons import (get_dataset_schema,
+                              set_dataset_schema,
+                              extract_dataset_schema_information)
+
+
+DSS_DATATYPES_COMPACT_DTYPES = {
+    "tinyint": "Int8",
+    "smallint": "Int16",
+    "int": "Int32",
+    "bigint": "Int64",
+    "float": "float32",
+    "double": "float64",
+    "boolean": "boolean",
+}
+PANDAS_DTYPES_DSS_DATATYPES = {
+    "int8": "tinyint",
+    "int16": "smallint",
+    "int32": "int",
+    "int64": "bigint",
+    "uint8": "smallint",
+    "uint16": "int",
+    "uint32": "bigint",
+    "float32": "float",
+    "float64": "double",
+    "bool": "boolean",
+    "boolean": "boolean",
+}
+DSS_DATE_DATATYPES = ["date", "dateonly", "datetimenotz"]
+# Only 'date' columns hold a time zone: 'dateonly' and 'datetimenotz' values are kept as naive datetimes.
+DSS_DATE_DATATYPES_COMPACT_DTYPES = {"date": "datetime64[ns, UTC]",
+                                     "dateonly": "datetime64[ns]",
+                                     "datetimenotz": "datetime64[ns]"}
+DSS_STRING_DATATYPES = ["string"]
+DEFAULT_CHUNKSIZE = 100000
+DEFAULT_CATEGORICAL_CARDINALITY_RATIO = 0.5
+DEFAULT_MAX_NUMBER_OF_CATEGORIES = 10000
+
+
+def filter_dataset_schema_columns(dataset_schema, columns, dataset_name):
+    """
+    Filters a dataset schema so that it only contains a subset of its columns, in the order they are requested.
+
+    :param dataset_schema: list: Schema of the dataset, with format:
+            [{'name': 'column_1', 'type': 'column_1_datatype'},
+             {'name': 'column_2', 'type': 'column_2_datatype'}|
+    :param columns: list: List of the columns to keep. If 'None', all the schema is kept.
+    :param dataset_name: str: Name of the dataset (only used for logging purposes).
+
+    :returns: filtered_dataset_schema: list: The schema restricted to 'columns'.
+    """
+    if columns is None:
+        return dataset_schema
+    schema_columns_information = {column_information["name"]: column_information for column_information in dataset_schema}
+    missing_columns = [column_name for column_name in columns if column_name not in schema_columns_information]
+    if len(missing_columns) > 0:
+        log_message = "Columns '{}' do not exist in dataset '{}' !"\
+            "\nExisting columns are '{}'".format(missing_columns, dataset_name, list(schema_columns_information.keys()))
+        raise Exception(log_message)
+    filtered_dataset_schema = [schema_columns_information[column_name] for column_name in columns]
+    return filtered_dataset_schema
+
+
+def compute_dataset_schema_compact_dtypes(dataset_schema, bool_use_float32=False):
+    """
+    Maps a DSS dataset schema to the most compact pandas dtypes its declared datatypes allow.
+        - 'tinyint', 'smallint', 'int', 'bigint' are mapped to the nullable 'Int8', 'Int16', 'Int32', 'Int64'.
+        - 'float' is mapped to 'float32'. 'double' is mapped to 'float64', or to 'float32' if 'bool_use_float32' is True.
+        - 'boolean' is mapped to the nullable 'boolean'.
+        - 'date' is mapped to 'datetime64[ns, UTC]', 'dateonly' and 'datetimenotz' to the naive 'datetime64[ns]'.
+        - String columns are not mapped: see :function:`select_low_cardinality_string_columns`.
+        - Other datatypes (array, map, object, geopoint...) are left untouched.
+
+    :param dataset_schema: list: Schema of the dataset, with format:
+            [{'name': 'column_1', 'type': 'column_1_datatype'},
+             {'name': 'column_2', 'type': 'column_2_datatype'}|
+    :param bool_use_float32: bool: Precise if 'double' columns should be downcasted to 'float32'
+        (this loses precision beyond ~7 significant digits).
+
+    :returns: compact_dtypes: dict: Mapping between the dataset columns and their compact pandas dtype.
+    """
+    compact_dtypes = {}
+    for column_information in dataset_schema:
+        column_name = column_information["name"]
+        column_datatype = column_information["type"]
+        if column_datatype in DSS_DATE_DATATYPES:
+            compact_dtypes[column_name] = DSS_DATE_DATATYPES_COMPACT_DTYPES[column_datatype]
+        elif column_datatype in DSS_DATATYPES_COMPACT_DTYPES.keys():
+            compact_dtype = DSS_DATATYPES_COMPACT_DTYPES[column_datatype]
+            if bool_use_float32 and (column_datatype == "double"):
+                compact_dtype = "float32"
+            compact_dtypes[column_name] = compact_dtype
+    return compact_dtypes
+
+
+def select_low_cardinality_string_columns(dataframe, string_columns, categorical_cardinality_ratio):
+    """
+    Selects the string columns of a DataFrame that have few distinct values compared to their number of rows,
+        and that are therefore worth being stored as pandas categoricals.
+
+    :param dataframe: pandas.core.frame.DataFrame: A DataFrame (usually the first chunk of a dataset).
+    :param string_columns: list: List of the string columns to evaluate.
+    :param categorical_cardinality_ratio: float: Maximum ratio between the number of distinct values of a column
+        and its number of non-null values for the column to be selected.
+
+    :returns: low_cardinality_string_columns: list: List of the selected string columns.
+    """
+    low_cardinality_string_columns = []
+    for column_name in string_columns:
+        column_values = dataframe[column_name]
+        n_non_null_values = column_values.count()
+        if n_non_null_values == 0:
+            continue
+        n_distinct_values = column_values.nunique(dropna=True)
+        if (n_distinct_values / n_non_null_values) <= categorical_cardinality_ratio:
+            low_cardinality_string_columns.append(column_name)
+    return low_cardinality_string_columns
+
+
+def check_if_compact_dtype_is_a_date(compact_dtype):
+    """
+    Checks if a compact dtype is a datetime dtype.
+
+    :param compact_dtype: str: The compact dtype, as we can get it with :function:`compute_dataset_schema_compact_dtypes`.
+
+    :returns: compact_dtype_is_a_date: bool: Boolean precising if the compact dtype is a datetime dtype.
+    """
+    compact_dtype_is_a_date = compact_dtype.startswith("datetime64")
+    return compact_dtype_is_a_date
+
+
+def convert_values_to_compact_dates(column_values, compact_dtype):
+    """
+    Converts column values to datetimes: UTC datetimes for 'date' columns, naive datetimes for 'dateonly'
+        and 'datetimenotz' columns. Values that can't be parsed become null.
+
+    :param column_values: pandas.core.series.Series: The column values.
+    :param compact_dtype: str: The datetime compact dtype, in 'DSS_DATE_DATATYPES_COMPACT_DTYPES'.
+
+    :returns: date_values: pandas.core.series.Series: The converted values.
+    """
+    bool_use_utc = compact_dtype.endswith("UTC]")
+    date_values = pd.to_datetime(column_values, errors="coerce", utc=bool_use_utc)
+    if (not bool_use_utc) and (getattr(date_values.dtype, "tz", None) is not None):
+        date_values = date_values.dt.tz_localize(None)
+    return date_values
+
+
+def cast_dataframe_to_compact_dtypes(dataframe, compact_dtypes, categorical_columns):
+    """
+    Casts the columns of a DataFrame toward their compact dtypes. Columns already having their compact dtype
+        are not copied.
+
+    :param dataframe: pandas.core.frame.DataFrame: The DataFrame to cast.
+    :param compact_dtypes: dict: Mapping between the columns and their compact pandas dtype, as we can get it
+        with :function:`compute_dataset_schema_compact_dtypes`.
+    :param categorical_columns: list: List of the columns to store as pandas categoricals.
+
+    :returns: dataframe: pandas.core.frame.DataFrame: The DataFrame with compact dtypes.
+    """
+    for column_name, compact_dtype in compact_dtypes.items():
+        if column_name not in dataframe.columns:
+            continue
+        column_values = dataframe[column_name]
+        if check_if_compact_dtype_is_a_date(compact_dtype):
+            if not pd.api.types.is_datetime64_any_dtype(column_values):
+                dataframe[column_name] = convert_values_to_compact_dates(column_values, compact_dtype)
+        elif column_values.dtype != compact_dtype:
+            dataframe[column_name] = column_values.astype(compact_dtype)
+    for column_name in categorical_columns:
+        if (column_name in dataframe.columns) and (dataframe[column_name].dtype != "category"):
+            dataframe[column_name] = dataframe[column_name].astype("category")
+    return dataframe
+
+
+def cast_dataframe_chunk_categorical_columns(dataframe_chunk, columns_categories, categorical_cardinality_ratio,
+                                             max_number_of_categories=DEFAULT_MAX_NUMBER_OF_CATEGORIES):
+    """
+    Casts the categorical columns of a DataFrame chunk with the categories seen in the previous chunks, extended
+        with the new values of the chunk. Categories are only appended, so a value keeps the same category code
+        in all the chunks. A column stops being a categorical, for this chunk and all the following ones, as soon as
+        the chunk values exceed 'categorical_cardinality_ratio' or its categories exceed 'max_number_of_categories':
+        memory used by the categories is thus bounded.
+
+    :param dataframe_chunk: pandas.core.frame.DataFrame: A DataFrame chunk.
+    :param columns_categories: dict: Mapping between the categorical columns and the categories seen so far
+        ('None' before the first chunk). It is updated in place.
+    :param categorical_cardinality_ratio: float: Maximum ratio between distinct and non-null values of the chunk
+        for a column to stay a categorical.
+    :param max_number_of_categories: int: Maximum number of categories of a column.
+
+    :returns: dataframe_chunk: pandas.core.frame.DataFrame: The DataFrame chunk with categorical columns.
+    """
+    low_cardinality_columns = select_low_cardinality_string_columns(dataframe_chunk,
+                                                                    [column_name for column_name in columns_categories.keys()
+                                                                     if column_name in dataframe_chunk.columns],
+                                                                    categorical_cardinality_ratio)
+    for column_name in list(columns_categories.keys()):
+        if column_name not in dataframe_chunk.columns:
+            continue
+        column_categories = columns_categories[column_name]
+        if column_name in low_cardinality_columns:
+            chunk_categories = pd.Index(dataframe_chunk[column_name].dropna().unique())
+            if column_categories is None:
+                column_categories = chunk_categories
+            else:
+                column_categories = column_categories.append(chunk_categories[~chunk_categories.isin(column_categories)])
+        if (column_name not in low_cardinality_columns) or (len(column_categories) > max_number_of_categories):
+            if columns_categories[column_name] is not None:
+                print("Column '{}' has too many distinct values: it is no longer stored as a categorical.".format(column_name))
+            del columns_categories[column_name]
+            continue
+        dataframe_chunk[column_name] = pd.Categorical(dataframe_chunk[column_name], categories=column_categories)
+        columns_categories[column_name] = column_categories
+    return dataframe_chunk
+
+
+def iter_compact_dataframe_chunks(dataframe_chunks, dataset_schema, bool_use_float32=False,
+                                  categorical_cardinality_ratio=DEFAULT_CATEGORICAL_CARDINALITY_RATIO,
+                                  max_number_of_categories=DEFAULT_MAX_NUMBER_OF_CATEGORIES):
+    """
+    Casts a stream of DataFrame chunks toward the compact dtypes derived from a DSS dataset schema.
+        The string columns to store as categoricals are selected on the first chunk. Their categories grow with
+        the values met along the stream, up to 'max_number_of_categories', beyond which the column is read as strings
+        (see :function:`cast_dataframe_chunk_categorical_columns`): codes are stable across chunks, but two chunks
+        only have the same categorical dtype if no new value appeared between them. To concatenate chunks while
+        keeping categoricals, use 'pandas.api.types.union_categoricals' (pd.concat falls back to 'object' for
+        different categories).
+
+    :param dataframe_chunks: iterable: Iterable of pandas DataFrames, all following 'dataset_schema'.
+    :param dataset_schema: list: Schema of the dataset, with format:
+            [{'name': 'column_1', 'type': 'column_1_datatype'},
+             {'name': 'column_2', 'type': 'column_2_datatype'}|
+    :param bool_use_float32: bool: Precise if 'double' columns should be downcasted to 'float32'.
+    :param categorical_cardinality_ratio: float: Maximum ratio between distinct and non-null values
+        for a string column to be stored as a categorical. Set it to 'None' to disable categoricals.
+    :param max_number_of_categories: int: Maximum number of categories of a categorical column.
+
+    :returns: compact_dataframe_chunk: generator: Generator of pandas DataFrames with compact dtypes.
+    """
+    compact_dtypes = compute_dataset_schema_compact_dtypes(dataset_schema, bool_use_float32)
+    string_columns = [column_information["name"] for column_information in dataset_schema
+                      if column_information["type"] in DSS_STRING_DATATYPES]
+    columns_categories = None
+    for dataframe_chunk in dataframe_chunks:
+        if columns_categories is None:
+            columns_categories = {}
+            if categorical_cardinality_ratio is not None:
+                columns_categories = {column_name: None for column_name in string_columns}
+        dataframe_chunk = cast_dataframe_to_compact_dtypes(dataframe_chunk, compact_dtypes, [])
+        if len(columns_categories) > 0:
+            dataframe_chunk = cast_dataframe_chunk_categorical_columns(dataframe_chunk, columns_categories,
+                                                                       categorical_cardinality_ratio,
+                                                                       max_number_of_categories)
+        yield dataframe_chunk
+
+
+def iter_dataset_chunks(project, dataset_name, columns=None, chunksize=DEFAULT_CHUNKSIZE, bool_use_float32=False,
+                        categorical_cardinality_ratio=DEFAULT_CATEGORICAL_CARDINALITY_RATIO):
+    """
+    Streams a project dataset as DataFrame chunks having compact dtypes derived from the dataset schema.
+        Only one chunk is held in memory at a time, so peak memory is bounded by 'chunksize'.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the dataset.
+    :param columns: list: List of the columns to read. If 'None', all the dataset columns are read.
+    :param chunksize: int: Number of rows of each chunk.
+    :param bool_use_float32: bool: Precise if 'double' columns should be downcasted to 'float32'.
+    :param categorical_cardinality_ratio: float: Maximum ratio between distinct and non-null values
+        for a string column to be stored as a categorical. Set it to 'None' to disable categoricals.
+
+    :returns: dataset_chunk: generator: Generator of pandas DataFrames.
+    """
+    dataset_schema = get_dataset_schema(project, dataset_name)
+    dataset_schema = filter_dataset_schema_columns(dataset_schema, columns, dataset_name)
+    print("Streaming dataset '{}.{}' by chunks of {} rows ...".format(project.project_key, dataset_name, chunksize))
+    dataset = dataiku.Dataset(dataset_name, project_key=project.project_key)
+    dataframe_chunks = dataset.iter_dataframes(chunksize=chunksize, columns=columns)
+    for dataset_chunk in iter_compact_dataframe_chunks(dataframe_chunks,
+                                                       dataset_schema,
+                                                       bool_use_float32,
+                                                       categorical_cardinality_ratio):
+        yield dataset_chunk
+
+
+def iter_local_file_chunks(file_path, dataset_schema, columns=None, chunksize=DEFAULT_CHUNKSIZE, bool_use_float32=False,
+                           categorical_cardinality_ratio=DEFAULT_CATEGORICAL_CARDINALITY_RATIO):
+    """
+    Streams a local CSV or Parquet file as DataFrame chunks having compact dtypes derived from a DSS dataset schema.
+        This is a local stand-in of :function:`iter_dataset_chunks`, usable without a DSS instance
+        (for example on a dataset export).
+
+    :param file_path: str: Path of a '.csv' (possibly compressed) or '.parquet' file.
+    :param dataset_schema: list: Schema of the dataset, with format:
+            [{'name': 'column_1', 'type': 'column_1_datatype'},
+             {'name': 'column_2', 'type': 'column_2_datatype'}|
+    :param columns: list: List of the columns to read. If 'None', all the schema columns are read.
+    :param chunksize: int: Number of rows of each chunk.
+    :param bool_use_float32: bool: Precise if 'double' columns should be downcasted to 'float32'.
+    :param categorical_cardinality_ratio: float: Maximum ratio between distinct and non-null values
+        for a string column to be stored as a categorical. Set it to 'None' to disable categoricals.
+
+    :returns: file_chunk: generator: Generator of pandas DataFrames.
+    """
+    dataset_schema = filter_dataset_schema_columns(dataset_schema, columns, file_path)
+    schema_columns, __ = extract_dataset_schema_information(dataset_schema)
+    if file_path.endswith(".parquet"):
+        parquet_file = pq.ParquetFile(file_path)
+        dataframe_chunks = (record_batch.to_pandas() for record_batch
+                            in parquet_file.iter_batches(batch_size=chunksize, columns=schema_columns))
+    else:
+        # Numerical dtypes are directly parsed from the file, to avoid materializing 'float64' columns:
+        compact_dtypes = compute_dataset_schema_compact_dtypes(dataset_schema, bool_use_float32)
+        read_dtypes = {column_name: compact_dtype for column_name, compact_dtype in compact_dtypes.items()
+                       if not check_if_compact_dtype_is_a_date(compact_dtype)}
+        dataframe_chunks = pd.read_csv(file_path, usecols=schema_columns, dtype=read_dtypes, chunksize=chunksize)
+    for file_chunk in iter_compact_dataframe_chunks(dataframe_chunks,
+                                                    dataset_schema,
+                                                    bool_use_float32,
+                                                    categorical_cardinality_ratio):
+        if list(file_chunk.columns) != schema_columns:
+            file_chunk = file_chunk[schema_columns]
+        yield file_chunk
+
+
+
+def compute_dataframe_dss_schema(dataframe):
+    """
+    Computes the DSS schema matching the dtypes of a DataFrame.
+        Compact integer and float dtypes are mapped to their DSS counterpart ('Int8' -> 'tinyint', 'float32' -> 'float', ...),
+        datetime dtypes are mapped to 'date' and all other dtypes (object, string, category...) are mapped to 'string'.
+
+    :param dataframe: pandas.core.frame.DataFrame: A DataFrame.
+
+    :returns: dataframe_dss_schema: list: The DSS schema matching the DataFrame, with format:
+            [{'name': 'column_1', 'type': 'column_1_datatype'},
+             {'name': 'column_2', 'type': 'column_2_datatype'}|
+    """
+    dataframe_dss_schema = []
+    for column_name, column_dtype in dataframe.dtypes.items():
+        column_dtype_name = str(column_dtype).lower()
+        if pd.api.types.is_datetime64_any_dtype(column_dtype):
+            column_datatype = "date"
+        elif column_dtype_name in PANDAS_DTYPES_DSS_DATATYPES.keys():
+            column_datatype = PANDAS_DTYPES_DSS_DATATYPES[column_dtype_name]
+        else:
+            column_datatype = "string"
+        dataframe_dss_schema.append({"name": column_name, "type": column_datatype})
+    return dataframe_dss_schema
+
+
+def check_if_dtype_matches_compact_dtype(column_dtype, compact_dtype):
+    """
+    Checks if a column dtype matches a compact dtype. NumPy dtypes and their pandas nullable counterparts
+        ('int64' and 'Int64', 'bool' and 'boolean', 'float32' and 'Float32'...) store the same values,
+        so they are considered as matching.
+
+    :param column_dtype: numpy.dtype or pandas.api.extensions.ExtensionDtype: The column dtype.
+    :param compact_dtype: str: The compact dtype, as we can get it with :function:`compute_dataset_schema_compact_dtypes`.
+
+    :returns: dtype_matches: bool: Boolean precising if the dtypes match.
+    """
+    NULLABLE_DTYPE_NAMES = {"bool": "boolean"}
+    column_dtype_name = str(column_dtype).lower()
+    compact_dtype_name = compact_dtype.lower()
+    dtype_matches = (NULLABLE_DTYPE_NAMES.get(column_dtype_name, column_dtype_name)
+                     == NULLABLE_DTYPE_NAMES.get(compact_dtype_name, compact_dtype_name))
+    return dtype_matches
+
+
+def align_dataframe_chunk_to_schema(dataframe_chunk, schema_columns, compact_dtypes):
+    """
+    Validates that a DataFrame chunk has the columns of a schema, and casts the columns that do not have
+        the expected dtype (see :function:`check_if_dtype_matches_compact_dtype`). The chunk is returned as is when
+        its columns and dtypes already match, and is never modified in place: only the columns that need to be casted
+        are allocated again.
+
+    :param dataframe_chunk: pandas.core.frame.DataFrame: The DataFrame chunk to align.
+    :param schema_columns: list: List of the schema column names, in the schema order.
+    :param compact_dtypes: dict: Mapping between the columns and their expected pandas dtype, as we can get it
+        with :function:`compute_dataset_schema_compact_dtypes`.
+
+    :returns: aligned_dataframe_chunk: pandas.core.frame.DataFrame: The aligned DataFrame chunk.
+    """
+    chunk_columns = list(dataframe_chunk.columns)
+    if chunk_columns != schema_columns:
+        missing_columns = [column_name for column_name in schema_columns if column_name not in chunk_columns]
+        unexpected_columns = [column_name for column_name in chunk_columns if column_name not in schema_columns]
+        if (len(missing_columns) > 0) or (len(unexpected_columns) > 0):
+            log_message = "DataFrame chunk does not match the output schema!"\
+                "\nMissing columns are '{}'.\nUnexpected columns are '{}'.".format(missing_columns, unexpected_columns)
+            raise Exception(log_message)
+        dataframe_chunk = dataframe_chunk[schema_columns]
+
+    aligned_dataframe_chunk = dataframe_chunk
+    for column_name, compact_dtype in compact_dtypes.items():
+        column_values = dataframe_chunk[column_name]
+        if check_if_compact_dtype_is_a_date(compact_dtype):
+            column_is_aligned = pd.api.types.is_datetime64_any_dtype(column_values)
+        else:
+            column_is_aligned = check_if_dtype_matches_compact_dtype(column_values.dtype, compact_dtype)
+        if not column_is_aligned:
+            if aligned_dataframe_chunk is dataframe_chunk:
+                aligned_dataframe_chunk = dataframe_chunk.copy(deep=False)
+            if check_if_compact_dtype_is_a_date(compact_dtype):
+                aligned_dataframe_chunk[column_name] = convert_values_to_compact_dates(column_values, compact_dtype)
+            else:
+                # Nullable integer casts raise instead of silently overflowing:
+                aligned_dataframe_chunk[column_name] = column_values.astype(compact_dtype)
+    return aligned_dataframe_chunk
+
+
+def iter_aligned_dataframe_chunks(dataframe_chunks, output_schema, bool_use_float32=False):
+    """
+    Aligns a stream of DataFrame chunks on an output schema.
+
+    :param dataframe_chunks: iterable: Iterable of pandas DataFrames.
+    :param output_schema: list: Schema the chunks must follow, with format:
+            [{'name': 'column_1', 'type': 'column_1_datatype'},
+             {'name': 'column_2', 'type': 'column_2_datatype'}|
+    :param bool_use_float32: bool: Precise if 'double' columns should be downcasted to 'float32'.
+
+    :returns: aligned_dataframe_chunk: generator: Generator of aligned pandas DataFrames.
+    """
+    schema_columns, __ = extract_dataset_schema_information(output_schema)
+    compact_dtypes = compute_dataset_schema_compact_dtypes(output_schema, bool_use_float32)
+    for dataframe_chunk in dataframe_chunks:
+        yield align_dataframe_chunk_to_schema(dataframe_chunk, schema_columns, compact_dtypes)
+
+
+def peek_first_dataframe_chunk(dataframe_chunks):
+    """
+    Retrieves the first chunk of a stream of DataFrame chunks, without losing it from the stream.
+
+    :param dataframe_chunks: iterable: Iterable of pandas DataFrames.
+
+    :returns: first_dataframe_chunk: pandas.core.frame.DataFrame: The first chunk, or 'None' if the stream is empty.
+    :returns: dataframe_chunks: iterator: Iterator over all the chunks, the first one included.
+    """
+    dataframe_chunks = iter(dataframe_chunks)
+    first_dataframe_chunk = next(dataframe_chunks, None)
+    if first_dataframe_chunk is not None:
+        dataframe_chunks = itertools.chain([first_dataframe_chunk], dataframe_chunks)
+    return first_dataframe_chunk, dataframe_chunks
+
+
+def write_dataframe_chunks(project, dataset_name, dataframe_chunks, bool_use_existing_schema=False, bool_use_float32=False):
+    """
+    Writes a stream of DataFrame chunks in a project dataset, through a single writer session.
+        The output schema is set once, either from the first chunk or from the existing dataset schema.
+        All chunks are then validated and casted toward this schema (without copy when their dtypes already match),
+        so that the whole data never needs to be concatenated in memory.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the dataset.
+    :param dataframe_chunks: iterable: Iterable of pandas DataFrames, as we can get it with :function:`iter_dataset_chunks`.
+    :param bool_use_existing_schema: bool: Precise if the chunks should follow the existing dataset schema.
+        If False, the dataset schema is replaced by the one computed from the first chunk.
+    :param bool_use_float32: bool: Precise if 'double' columns should be downcasted to 'float32' before writing.
+
+    :returns: n_written_rows: int: Number of rows written in the dataset.
+    """
+    first_dataframe_chunk, dataframe_chunks = peek_first_dataframe_chunk(dataframe_chunks)
+    if first_dataframe_chunk is None:
+        print("No DataFrame chunk to write in dataset '{}.{}'.".format(project.project_key, dataset_name))
+        return 0
+    if bool_use_existing_schema:
+        output_schema = get_dataset_schema(project, dataset_name)
+    else:
+        output_schema = compute_dataframe_dss_schema(first_dataframe_chunk)
+        set_dataset_schema(project, dataset_name, output_schema)
+
+    print("Writing DataFrame chunks in dataset '{}.{}' ...".format(project.project_key, dataset_name))
+    n_written_rows = 0
+    dataset = dataiku.Dataset(dataset_name, project_key=project.project_key)
+    with dataset.get_writer() as dataset_writer:
+        for aligned_dataframe_chunk in iter_aligned_dataframe_chunks(dataframe_chunks, output_schema, bool_use_float32):
+            dataset_writer.write_dataframe(aligned_dataframe_chunk)
+            n_written_rows += len(aligned_dataframe_chunk)
+    print("{} rows successfully written in dataset '{}.{}'!".format(n_written_rows, project.project_key, dataset_name))
+    return n_written_rows
+
+
+def write_local_file_chunks(file_path, dataframe_chunks, output_schema=None, bool_use_float32=False):
+    """
+    Writes a stream of DataFrame chunks in a local CSV or Parquet file, through a single writer session.
+        This is a local stand-in of :function:`write_dataframe_chunks`, usable without a DSS instance.
+
+    :param file_path: str: Path of the '.csv' or '.parquet' file to write.
+    :param dataframe_chunks: iterable: Iterable of pandas DataFrames.
+    :param output_schema: list: Schema the chunks must follow. If 'None', it is computed from the first chunk.
+    :param bool_use_float32: bool: Precise if 'double' columns should be downcasted to 'float32' before writing.
+
+    :returns: output_schema: list: The schema followed by the written file.
+    """
+    first_dataframe_chunk, dataframe_chunks = peek_first_dataframe_chunk(dataframe_chunks)
+    if output_schema is None:
+        if first_dataframe_chunk is None:
+            log_message = "Can't compute the schema of file '{}': there is no DataFrame chunk to write!".format(file_path)
+            raise Exception(log_message)
+        output_schema = compute_dataframe_dss_schema(first_dataframe_chunk)
+    aligned_dataframe_chunks = iter_aligned_dataframe_chunks(dataframe_chunks, output_schema, bool_use_float32)
+    if file_path.endswith(".parquet"):
+        parquet_writer = None
+        try:
+            for aligned_dataframe_chunk in aligned_dataframe_chunks:
+                chunk_table = pa.Table.from_pandas(aligned_dataframe_chunk, preserve_index=False)
+                if parquet_writer is None:
+                    parquet_writer = pq.ParquetWriter(file_path, chunk_table.schema)
+                else:
+                    chunk_table = chunk_table.cast(parquet_writer.schema)
+                parquet_writer.write_table(chunk_table)
+        finally:
+            if parquet_writer is not None:
+                parquet_writer.close()
+    else:
+        bool_write_header = True
+        for aligned_dataframe_chunk in aligned_dataframe_chunks:
+            file_mode = "w" if bool_write_header else "a"
+            aligned_dataframe_chunk.to_csv(file_path, mode=file_mode, header=bool_write_header, index=False)
+            bool_write_header = False
+    return output_schema
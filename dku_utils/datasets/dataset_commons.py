@@ -1,5 +1,7 @@
 import dataikuapi
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from ..flow.flow_graph import get_flow_graph_nodes, sort_flow_objects_downstream_first
 
 def get_dataset_settings_and_dictionary(project, dataset_name, bool_get_settings_dictionary):
     """
@@ -172,6 +174,108 @@ def clear_dataset(project, dataset_name):
     pass
 
 
+def get_dataset_last_records_count_and_size(project, dataset_name):
+    """
+    Retrieves the last computed 'records count' and 'size' metrics of a project dataset.
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the dataset.
+    :returns: dataset_records_count: int: Last computed number of records of the dataset ('None' if never computed).
+    :returns: dataset_size: int: Last computed size of the dataset, in bytes ('None' if never computed).
+    """
+    dataset_metrics = project.get_dataset(dataset_name).get_last_metric_values()
+    dataset_last_values = []
+    for metric_id in ["records:COUNT_RECORDS", "basic:SIZE"]:
+        try:
+            dataset_last_values.append(int(dataset_metrics.get_global_value(metric_id)))
+        except:
+            dataset_last_values.append(None)
+    dataset_records_count, dataset_size = dataset_last_values
+    return dataset_records_count, dataset_size
+
+
+def get_dataset_last_build_timestamp(project, dataset_name):
+    """
+    Retrieves the timestamp of the last build of a project dataset: the end time of its last build.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the dataset.
+
+    :returns: dataset_last_build_timestamp: int: Timestamp of the dataset last build, in milliseconds ('None' if the
+        dataset has never been built, like input datasets: their data can change without any build).
+    """
+    dataset = project.get_dataset(dataset_name)
+    try:
+        dataset_last_build_timestamp = int(dataset.get_info().get_raw()["lastBuild"]["buildEndTime"])
+    except:
+        dataset_last_build_timestamp = None
+    return dataset_last_build_timestamp
+
+
+def clear_dataset_and_report(project, dataset_name, bool_skip_empty_dataset):
+    """
+    Clears a project dataset and reports what has been cleared.
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the dataset.
+    :param bool_skip_empty_dataset: bool: Precise if the dataset should not be cleared when its last
+        'records count' metric is 0. This metric may be outdated: the dataset may have been rebuilt since.
+    :returns: clear_report: dict: Information about the clear, with keys 'dataset_name', 'status',
+        'records_count_before_clear', 'reclaimed_size' and 'error_message'.
+    """
+    clear_report = {"dataset_name": dataset_name, "status": None, "records_count_before_clear": None,
+                    "reclaimed_size": None, "error_message": None}
+    try:
+        dataset_records_count, dataset_size = get_dataset_last_records_count_and_size(project, dataset_name)
+        clear_report["records_count_before_clear"] = dataset_records_count
+        if bool_skip_empty_dataset and (dataset_records_count == 0):
+            print("Dataset {}.{} is already empty: it won't be cleared.".format(project.project_key, dataset_name))
+            clear_report["status"] = "SKIPPED_EMPTY"
+        else:
+            clear_dataset(project, dataset_name)
+            clear_report["status"] = "CLEARED"
+            clear_report["reclaimed_size"] = dataset_size
+    except Exception as exception:
+        clear_report["status"] = "FAILED"
+        clear_report["error_message"] = str(exception)
+    return clear_report
+
+
+def clear_datasets(project, dataset_names, max_workers=8, bool_skip_empty_datasets=False):
+    """
+    Clears several project datasets concurrently. Datasets are cleared by flow depth, the most downstream ones first:
+        datasets of the same depth do not depend on each other and are cleared in parallel, and a depth is only
+        processed once all deeper datasets have been cleared.
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_names: list: List of the names of the datasets to clear.
+    :param max_workers: int: Maximum number of datasets cleared at the same time.
+    :param bool_skip_empty_datasets: bool: Precise if datasets having a last 'records count' metric equal to 0
+        should not be cleared. Disabled by default as this metric may be outdated: datasets rebuilt since it was
+        computed would not be cleared.
+    :returns: clear_report_df: pandas.core.frame.DataFrame: DataFrame containing, for each dataset, its flow depth,
+        the clear status ('CLEARED', 'SKIPPED_EMPTY' or 'FAILED'), its last records count and the size reclaimed by
+        the clear, in bytes (based on the last computed metrics: 'None' when they have never been computed).
+    """
+    print("Clearing {} datasets of project '{}' ...".format(len(dataset_names), project.project_key))
+    flow_graph_nodes = get_flow_graph_nodes(project)
+    dataset_names_by_depth = sort_flow_objects_downstream_first(flow_graph_nodes, dataset_names)
+    clear_reports = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for flow_depth, depth_dataset_names in dataset_names_by_depth:
+            depth_clear_reports = list(executor.map(
+                lambda dataset_name: clear_dataset_and_report(project, dataset_name, bool_skip_empty_datasets),
+                depth_dataset_names))
+            for clear_report in depth_clear_reports:
+                clear_report["flow_depth"] = flow_depth
+            clear_reports += depth_clear_reports
+    clear_report_df = pd.DataFrame(clear_reports, columns=["dataset_name", "flow_depth", "status",
+                                                           "records_count_before_clear", "reclaimed_size", "error_message"])
+    failed_dataset_names = list(clear_report_df[clear_report_df["status"] == "FAILED"]["dataset_name"])
+    if len(failed_dataset_names) > 0:
+        print("WARNING: datasets '{}' could not be cleared! Please look at the 'error_message' "
+              "column of the returned report.".format(failed_dataset_names))
+    print("Project '{}' datasets clearing done!".format(project.project_key))
+    return clear_report_df
+
+
 def get_last_dataset_metrics_information(project, dataset_name):
     """
     Retrieves all the last metrics information of a project dataset. 
@@ -338,21 +442,27 @@ def get_dataset_managed_state(project, dataset_name):
     return dataset_managed_state
 
 
-def change_dataset_managed_state(project, dataset_name, bool_should_be_managed_state):
+def change_dataset_managed_state(project, dataset_name, bool_should_be_managed_state, physical_design_params=None):
     """
     Changes the state a project dataset so that it becomes a 'managed' or a 'not managed' one.
     :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
     :param dataset_name: str: Name of the dataset.
     :param bool_should_be_managed_state: bool: Precise if you want the dataset to be managed.
+    :param physical_design_params: dict: Optional Redshift physical design params overriding the defaults
+        ('AUTO' distribution, no sort key), as proposed by
+        :function:`connections.sql.physical_design.advise_managed_sql_datasets_physical_design`.
+        Example: {'distributionStyle': 'KEY', 'distributionKey': 'column_1', 'sortKey': 'COMPOUND', 'sortKeyColumns': ['column_1']}
     """
     dataset_connection_type = get_dataset_connection_type(project, dataset_name)
     dataset_settings, __ = get_dataset_settings_and_dictionary(project, dataset_name, False)
     dataset_settings.settings["managed"] = bool_should_be_managed_state
     if bool_should_be_managed_state:
         if dataset_connection_type == "Redshift":
-            dataset_settings.settings["params"]["distributionStyle"] = "AUTO" #["AUTO", "EVEN", "ALL"]
+            dataset_settings.settings["params"]["distributionStyle"] = "AUTO" #["AUTO", "EVEN", "ALL", "KEY"]
             dataset_settings.settings["params"]["sortKey"] = "NONE" #["NONE", "COMPOUND", "INTERLEAVED"]
             dataset_settings.settings["params"]["sortKeyColumns"] = [] #Should be a list of dataset columns if 'sortKey' != None
+            if physical_design_params is not None:
+                dataset_settings.settings["params"].update(physical_design_params)
             
     dataset_settings.save()
     pass
@@ -0,0 +1,244 @@
+import datetime
+from .dataset_commons import get_dataset_settings_and_dictionary
+
+
+PARTITIONING_TIME_PERIODS = ["YEAR", "MONTH", "DAY", "HOUR"]
+PARTITIONING_TIME_PERIODS_ID_FORMATS = {"YEAR": "%Y", "MONTH": "%Y-%m", "DAY": "%Y-%m-%d", "HOUR": "%Y-%m-%d-%H"}
+PARTITIONING_TIME_PERIODS_PATH_PATTERNS = {"YEAR": "%Y", "MONTH": "%Y/%M", "DAY": "%Y/%M/%D", "HOUR": "%Y/%M/%D/%H"}
+FILESYSTEM_DATASET_TYPES = ["Filesystem", "S3", "GCS", "Azure", "HDFS", "FTP", "SFTP", "SCP"]
+
+
+def compute_partitioning_file_path_pattern(partitioning_dimensions):
+    """
+    Computes the file path pattern of a files-based dataset partitioning:
+        the time dimension comes first (ex: '%Y/%M/%D'), followed by one folder per discrete dimension ('%{dimension}').
+
+    :param partitioning_dimensions: list: List of the partitioning dimensions, with format:
+        [{'name': 'dimension_1', 'type': 'time', 'params': {'period': 'DAY'}},
+        {'name': 'dimension_2', 'type': 'value'}, ...|
+
+    :returns: file_path_pattern: str: The file path pattern.
+    """
+    file_path_pattern_parts = []
+    for partitioning_dimension in partitioning_dimensions:
+        if partitioning_dimension["type"] == "time":
+            file_path_pattern_parts.insert(0, PARTITIONING_TIME_PERIODS_PATH_PATTERNS[partitioning_dimension["params"]["period"]])
+        else:
+            file_path_pattern_parts.append("%{" + partitioning_dimension["name"] + "}")
+    file_path_pattern_parts.append(".*")
+    file_path_pattern = "/".join(file_path_pattern_parts)
+    return file_path_pattern
+
+
+def set_dataset_partitioning(project, dataset_name, time_dimension_name=None, time_dimension_period="DAY",
+                             discrete_dimension_names=None, file_path_pattern=None):
+    """
+    Configures the partitioning of a project dataset, with at most one time dimension and any number of
+        discrete dimensions.
+        - On SQL datasets, dimension names must be the names of the table columns holding the partition values.
+        - On files-based datasets, files are matched with a file path pattern: if not provided, the pattern
+        computed by :function:`compute_partitioning_file_path_pattern` is used.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the dataset.
+    :param time_dimension_name: str: Name of the time dimension ('None' if the dataset has no time dimension).
+    :param time_dimension_period: str: Period of the time dimension, in 'PARTITIONING_TIME_PERIODS'.
+    :param discrete_dimension_names: list: List of the discrete dimension names.
+    :param file_path_pattern: str: File path pattern of a files-based dataset, ex: '%Y/%M/%D/%{country}/.*'.
+    """
+    if discrete_dimension_names is None:
+        discrete_dimension_names = []
+    if time_dimension_period not in PARTITIONING_TIME_PERIODS:
+        log_message = "Time dimension period '{}' is not allowed. Allowed periods are '{}'"\
+            .format(time_dimension_period, PARTITIONING_TIME_PERIODS)
+        raise Exception(log_message)
+    partitioning_dimensions = []
+    if time_dimension_name is not None:
+        partitioning_dimensions.append({"name": time_dimension_name, "type": "time",
+                                        "params": {"period": time_dimension_period}})
+    for dimension_name in discrete_dimension_names:
+        partitioning_dimensions.append({"name": dimension_name, "type": "value", "params": {}})
+    if len(partitioning_dimensions) == 0:
+        log_message = "Dataset '{}' partitioning needs at least one dimension!".format(dataset_name)
+        raise Exception(log_message)
+
+    print("Setting dataset '{}' partitioning with dimensions '{}' ...".format(dataset_name, partitioning_dimensions))
+    dataset_settings, dataset_settings_dict = get_dataset_settings_and_dictionary(project, dataset_name, True)
+    dataset_partitioning = dataset_settings_dict.get("partitioning", {})
+    dataset_partitioning["dimensions"] = partitioning_dimensions
+    if dataset_settings_dict["type"] in FILESYSTEM_DATASET_TYPES:
+        if file_path_pattern is None:
+            file_path_pattern = compute_partitioning_file_path_pattern(partitioning_dimensions)
+        dataset_partitioning["filePathPattern"] = file_path_pattern
+    dataset_settings_dict["partitioning"] = dataset_partitioning
+    dataset_settings.save()
+    print("Dataset '{}' partitioning successfully set!".format(dataset_name))
+    pass
+
+
+def remove_dataset_partitioning(project, dataset_name):
+    """
+    Removes the partitioning of a project dataset.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the dataset.
+    """
+    dataset_settings, dataset_settings_dict = get_dataset_settings_and_dictionary(project, dataset_name, True)
+    dataset_settings_dict.setdefault("partitioning", {})["dimensions"] = []
+    dataset_settings.save()
+    pass
+
+
+def get_dataset_partitioning_dimensions(project, dataset_name):
+    """
+    Retrieves the partitioning dimensions of a project dataset.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the dataset.
+
+    :returns: partitioning_dimensions: list: List of the partitioning dimensions (empty if the dataset is not partitioned),
+        with format: [{'name': 'dimension_1', 'type': 'time', 'params': {'period': 'DAY'}}, ...|
+    """
+    __, dataset_settings_dict = get_dataset_settings_and_dictionary(project, dataset_name, True)
+    partitioning_dimensions = dataset_settings_dict.get("partitioning", {}).get("dimensions", [])
+    return partitioning_dimensions
+
+
+def check_if_dataset_is_partitioned(project, dataset_name):
+    """
+    Checks if a project dataset is partitioned.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the dataset.
+
+    :returns: dataset_is_partitioned: bool: Boolean precising if the dataset is partitioned.
+    """
+    dataset_is_partitioned = len(get_dataset_partitioning_dimensions(project, dataset_name)) > 0
+    return dataset_is_partitioned
+
+
+def list_dataset_partitions(project, dataset_name):
+    """
+    Lists the existing partitions of a project dataset.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the dataset.
+
+    :returns: partition_ids: list: List of the partition IDs, sorted. Multi-dimensional partition IDs
+        join the dimension values with '|', ex: '2024-01-31|FR'.
+    """
+    partition_ids = sorted(project.get_dataset(dataset_name).list_partitions())
+    return partition_ids
+
+
+def compute_time_partition_ids(start_date, end_date, time_dimension_period="DAY"):
+    """
+    Computes the IDs of all the time partitions between two dates (both included).
+
+    :param start_date: datetime.date: First date of the partition range.
+    :param end_date: datetime.date: Last date of the partition range.
+    :param time_dimension_period: str: Period of the time dimension, in 'PARTITIONING_TIME_PERIODS'.
+
+    :returns: partition_ids: list: List of the time partition IDs, ex: ['2024-01-30', '2024-01-31'].
+    """
+    partition_id_format = PARTITIONING_TIME_PERIODS_ID_FORMATS[time_dimension_period]
+    partition_ids = []
+    current_date = datetime.datetime(start_date.year, start_date.month, start_date.day,
+                                     getattr(start_date, "hour", 0))
+    end_datetime = datetime.datetime(end_date.year, end_date.month, end_date.day, getattr(end_date, "hour", 0))
+    while current_date <= end_datetime:
+        partition_id = current_date.strftime(partition_id_format)
+        if partition_id not in partition_ids:
+            partition_ids.append(partition_id)
+        if time_dimension_period == "HOUR":
+            current_date += datetime.timedelta(hours=1)
+        elif time_dimension_period == "DAY":
+            current_date += datetime.timedelta(days=1)
+        elif time_dimension_period == "MONTH":
+            current_date = datetime.datetime(current_date.year + (current_date.month // 12), (current_date.month % 12) + 1, 1)
+        else:
+            current_date = datetime.datetime(current_date.year + 1, 1, 1)
+    return partition_ids
+
+
+def compute_partition_spec(partition_ids):
+    """
+    Computes a DSS partition spec from a list of partition IDs.
+
+    :param partition_ids: list: List of the partition IDs.
+
+    :returns: partition_spec: str: The partition spec, with format 'partition_1,partition_2'.
+    """
+    partition_spec = ",".join(partition_ids)
+    return partition_spec
+
+
+def compute_time_partition_range_spec(start_partition_id, end_partition_id):
+    """
+    Computes a DSS partition spec targeting a range of time partitions (both included).
+
+    :param start_partition_id: str: First partition of the range, ex: '2024-01-01'.
+    :param end_partition_id: str: Last partition of the range, ex: '2024-01-31'.
+
+    :returns: partition_spec: str: The partition spec, with format 'start_partition/end_partition'.
+    """
+    partition_spec = "{}/{}".format(start_partition_id, end_partition_id)
+    return partition_spec
+
+
+def compute_dataset_missing_partition_ids(project, upstream_dataset_name, downstream_dataset_name):
+    """
+    Computes the partitions existing in an upstream dataset and not yet in a downstream dataset
+        having the same partitioning. On append-only data, these are the only partitions to compute.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param upstream_dataset_name: str: Name of the upstream dataset.
+    :param downstream_dataset_name: str: Name of the downstream dataset.
+
+    :returns: missing_partition_ids: list: List of the missing partition IDs, sorted.
+    """
+    downstream_partition_ids = set(list_dataset_partitions(project, downstream_dataset_name))
+    missing_partition_ids = [partition_id for partition_id in list_dataset_partitions(project, upstream_dataset_name)
+                             if partition_id not in downstream_partition_ids]
+    return missing_partition_ids
+
+
+def clear_dataset_partitions(project, dataset_name, partition_ids):
+    """
+    Clears some partitions of a project dataset, leaving the other ones untouched.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the dataset.
+    :param partition_ids: list: List of the partition IDs to clear.
+    """
+    if len(partition_ids) == 0:
+        print("No partition to clear in dataset {}.{}".format(project.project_key, dataset_name))
+    else:
+        print("Clearing partitions '{}' of dataset {}.{}".format(partition_ids, project.project_key, dataset_name))
+        project.get_dataset(dataset_name).clear(partitions=partition_ids)
+    pass
+
+
+def build_dataset_partitions(project, dataset_name, partition_spec, job_type="NON_RECURSIVE_FORCED_BUILD", bool_wait=True):
+    """
+    Builds some partitions of a project dataset.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the dataset.
+    :param partition_spec: str: The partition spec to build, as computed with :function:`compute_partition_spec`
+        or :function:`compute_time_partition_range_spec`.
+    :param job_type: str: Type of the job, in ['NON_RECURSIVE_FORCED_BUILD', 'RECURSIVE_BUILD',
+        'RECURSIVE_FORCED_BUILD', 'RECURSIVE_MISSING_ONLY_BUILD'].
+    :param bool_wait: bool: Precise if the function should wait for the job to end.
+
+    :returns: job: dataikuapi.dss.job.DSSJob: A handle to interact with the build job.
+    """
+    print("Building partitions '{}' of dataset {}.{} ...".format(partition_spec, project.project_key, dataset_name))
+    job_builder = project.new_job(job_type)
+    job_builder.with_output(dataset_name, partition=partition_spec)
+    if bool_wait:
+        job = job_builder.start_and_wait()
+        print("Partitions '{}' of dataset {}.{} successfully built!".format(partition_spec, project.project_key, dataset_name))
+    else:
+        job = job_builder.start()
+    return job
@@ -0,0 +1,592 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+import pandas as pd
+from .dataset_chunks import iter_dataset_chunks, DEFAULT_CHUNKSIZE
+from .dataset_commons import get_dataset_column_datatypes_mapping
+
+
+DEFAULT_PROFILE_QUANTILES = [0.01, 0.25, 0.5, 0.75, 0.99]
+DEFAULT_HYPERLOGLOG_PRECISION = 14
+DEFAULT_KLL_SKETCH_K = 200
+DEFAULT_SPACE_SAVING_CAPACITY = 1000
+
+
+def compute_uint64_bit_lengths(values):
+    """
+    Computes the bit length of each value of an unsigned 64 bits integers array (0 has a bit length of 0).
+
+    :param values: numpy.ndarray: Array of 'uint64' values.
+
+    :returns: bit_lengths: numpy.ndarray: Array of the values bit lengths.
+    """
+    high_values = (values >> np.uint64(32)).astype(np.float64)
+    low_values = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    # 'frexp' exponents are exact bit lengths for integers that fit in a float64 mantissa:
+    __, high_bit_lengths = np.frexp(high_values)
+    __, low_bit_lengths = np.frexp(low_values)
+    bit_lengths = np.where(high_values > 0, high_bit_lengths + 32, low_bit_lengths)
+    return bit_lengths
+
+
+def hash_series_values(series):
+    """
+    Hashes the non-null values of a pandas Series in 64 bits integers.
+
+    :param series: pandas.core.series.Series: A pandas Series.
+
+    :returns: hashes: numpy.ndarray: Array of 'uint64' hashes.
+    """
+    hashes = pd.util.hash_pandas_object(series.dropna(), index=False).to_numpy(dtype=np.uint64)
+    return hashes
+
+
+class HyperLogLogSketch:
+    """
+    Mergeable HyperLogLog sketch approximating the number of distinct values of a stream.
+        Its relative standard error is about 1.04 / sqrt(2 ** precision), ~0.8% with the default precision.
+    """
+
+    def __init__(self, precision=DEFAULT_HYPERLOGLOG_PRECISION):
+        """
+        :param precision: int: Number of hash bits used to select a register (there are 2 ** precision registers).
+        """
+        self.precision = precision
+        self.n_registers = 1 << precision
+        self.registers = np.zeros(self.n_registers, dtype=np.uint8)
+        pass
+
+    def update_with_hashes(self, hashes):
+        """
+        Updates the sketch with hashed values.
+
+        :param hashes: numpy.ndarray: Array of 'uint64' hashes.
+        """
+        if len(hashes) == 0:
+            return
+        n_remaining_bits = 64 - self.precision
+        register_indexes = (hashes >> np.uint64(n_remaining_bits)).astype(np.int64)
+        remaining_bits = hashes & np.uint64((1 << n_remaining_bits) - 1)
+        register_ranks = (n_remaining_bits - compute_uint64_bit_lengths(remaining_bits) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, register_indexes, register_ranks)
+        pass
+
+    def update(self, series):
+        """
+        Updates the sketch with the non-null values of a pandas Series.
+
+        :param series: pandas.core.series.Series: A pandas Series.
+        """
+        self.update_with_hashes(hash_series_values(series))
+        pass
+
+    def merge(self, other_sketch):
+        """
+        Merges another sketch, built with the same precision, in this sketch.
+
+        :param other_sketch: HyperLogLogSketch: The sketch to merge.
+        """
+        if other_sketch.precision != self.precision:
+            log_message = "Can't merge HyperLogLog sketches with different precisions ({} and {})!"\
+                .format(self.precision, other_sketch.precision)
+            raise Exception(log_message)
+        np.maximum(self.registers, other_sketch.registers, out=self.registers)
+        pass
+
+    def estimate(self):
+        """
+        Estimates the number of distinct values seen by the sketch.
+
+        :returns: distinct_count_estimate: int: Approximate number of distinct values.
+        """
+        alpha = 0.7213 / (1 + 1.079 / self.n_registers)
+        raw_estimate = alpha * (self.n_registers ** 2) / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        n_empty_registers = int(np.sum(self.registers == 0))
+        if (raw_estimate <= 2.5 * self.n_registers) and (n_empty_registers > 0):
+            # Small range correction (linear counting):
+            raw_estimate = self.n_registers * np.log(self.n_registers / n_empty_registers)
+        distinct_count_estimate = int(round(raw_estimate))
+        return distinct_count_estimate
+    pass
+
+
+class KllQuantilesSketch:
+    """
+    Mergeable KLL sketch approximating the quantiles of a stream of numerical values.
+        Its rank error is about 1.65 / k, ~1% with the default 'k'.
+    """
+
+    def __init__(self, k=DEFAULT_KLL_SKETCH_K, seed=None):
+        """
+        :param k: int: Capacity of the sketch highest level, driving its accuracy.
+        :param seed: int: Seed of the random generator used while compacting levels.
+        """
+        self.k = k
+        self.compactors = [np.empty(0, dtype=np.float64)]
+        self.random_generator = np.random.default_rng(seed)
+        pass
+
+    def compute_level_capacity(self, level):
+        """
+        Computes the capacity of a sketch level: capacities decrease geometrically from the highest level.
+
+        :param level: int: Index of the level (items of level 'h' have a weight of 2 ** h).
+
+        :returns: level_capacity: int: Maximum number of items the level can hold.
+        """
+        level_depth = len(self.compactors) - level - 1
+        level_capacity = max(int(np.ceil(self.k * ((2 / 3) ** level_depth))), 2)
+        return level_capacity
+
+    def compress(self):
+        """
+        Compacts the sketch levels exceeding their capacity: half of their sorted items are promoted
+            to the next level, with a doubled weight.
+        """
+        level = 0
+        while level < len(self.compactors):
+            if len(self.compactors[level]) > self.compute_level_capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0, dtype=np.float64))
+                level_items = np.sort(self.compactors[level])
+                if len(level_items) % 2 == 1:
+                    kept_items = level_items[-1:]
+                    level_items = level_items[:-1]
+                else:
+                    kept_items = np.empty(0, dtype=np.float64)
+                promotion_offset = self.random_generator.integers(2)
+                self.compactors[level] = kept_items
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], level_items[promotion_offset::2]])
+            level += 1
+        pass
+
+    def update(self, values):
+        """
+        Updates the sketch with numerical values (null values are ignored).
+
+        :param values: numpy.ndarray: Array of numerical values.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self.compress()
+        pass
+
+    def merge(self, other_sketch):
+        """
+        Merges another sketch in this sketch.
+
+        :param other_sketch: KllQuantilesSketch: The sketch to merge.
+        """
+        for level, level_items in enumerate(other_sketch.compactors):
+            if level == len(self.compactors):
+                self.compactors.append(np.empty(0, dtype=np.float64))
+            self.compactors[level] = np.concatenate([self.compactors[level], level_items])
+        self.compress()
+        pass
+
+    def estimate_quantiles(self, quantiles):
+        """
+        Estimates quantiles of the values seen by the sketch.
+
+        :param quantiles: list: List of the quantiles to estimate, with values in [0, 1].
+
+        :returns: quantile_estimates: list: List of the estimated quantiles (None if the sketch is empty).
+        """
+        items = np.concatenate(self.compactors)
+        if len(items) == 0:
+            return [None for __ in quantiles]
+        weights = np.concatenate([np.full(len(level_items), 2.0 ** level)
+                                  for level, level_items in enumerate(self.compactors)])
+        items_order = np.argsort(items, kind="stable")
+        sorted_items = items[items_order]
+        cumulative_weights = np.cumsum(weights[items_order])
+        total_weight = cumulative_weights[-1]
+        quantile_indexes = np.searchsorted(cumulative_weights, np.asarray(quantiles) * total_weight, side="left")
+        quantile_indexes = np.minimum(quantile_indexes, len(sorted_items) - 1)
+        quantile_estimates = [float(sorted_items[index]) for index in quantile_indexes]
+        return quantile_estimates
+    pass
+
+
+class SpaceSavingSketch:
+    """
+    Mergeable SpaceSaving sketch tracking the most frequent values (heavy hitters) of a stream with a bounded
+        number of counters. Counts are over-estimated by at most their 'error': any value more frequent than
+        n_values / capacity is guaranteed to be tracked.
+    """
+
+    def __init__(self, capacity=DEFAULT_SPACE_SAVING_CAPACITY):
+        """
+        :param capacity: int: Maximum number of tracked values.
+        """
+        self.capacity = capacity
+        self.n_values = 0
+        self.counts = pd.Series(dtype=np.int64)
+        self.errors = pd.Series(dtype=np.int64)
+        pass
+
+    def get_min_count(self):
+        """
+        Computes the count any untracked value may have: the smallest tracked count if the sketch is full, 0 otherwise.
+
+        :returns: min_count: int: The smallest possible count of untracked values.
+        """
+        if len(self.counts) < self.capacity:
+            return 0
+        min_count = int(self.counts.min())
+        return min_count
+
+    def merge_counts(self, counts, errors, other_min_count):
+        """
+        Merges counters in the sketch: values missing on one side get that side's minimum count, then only
+            the 'capacity' largest counters are kept.
+
+        :param counts: pandas.core.series.Series: Counts of the values to merge, indexed by value.
+        :param errors: pandas.core.series.Series: Maximum over-estimation of these counts, indexed by value.
+        :param other_min_count: int: The smallest possible count of the values missing from 'counts'.
+        """
+        self_min_count = self.get_min_count()
+        merged_index = self.counts.index.union(counts.index, sort=False)
+        merged_counts = self.counts.reindex(merged_index, fill_value=self_min_count)\
+            + counts.reindex(merged_index, fill_value=other_min_count)
+        merged_errors = self.errors.reindex(merged_index, fill_value=self_min_count)\
+            + errors.reindex(merged_index, fill_value=other_min_count)
+        if len(merged_counts) > self.capacity:
+            merged_counts = merged_counts.nlargest(self.capacity)
+        self.counts = merged_counts.astype(np.int64)
+        self.errors = merged_errors.reindex(merged_counts.index).astype(np.int64)
+        pass
+
+    def update(self, values):
+        """
+        Updates the sketch with a chunk of values. The chunk is counted exactly, then merged in the sketch.
+
+        :param values: pandas.core.series.Series or pandas.core.frame.DataFrame: Chunk of values. The rows of
+            a DataFrame are counted as tuples (ex: composite keys). Rows having a null value are ignored.
+        """
+        if isinstance(values, pd.DataFrame) and (len(values.columns) == 1):
+            values = values.iloc[:, 0]
+        chunk_counts = values.value_counts(dropna=True)
+        if len(chunk_counts) == 0:
+            return
+        self.n_values += int(chunk_counts.sum())
+        self.merge_counts(chunk_counts, pd.Series(0, index=chunk_counts.index, dtype=np.int64), 0)
+        pass
+
+    def merge(self, other_sketch):
+        """
+        Merges another sketch in this sketch.
+
+        :param other_sketch: SpaceSavingSketch: The sketch to merge.
+        """
+        self.n_values += other_sketch.n_values
+        self.merge_counts(other_sketch.counts, other_sketch.errors, other_sketch.get_min_count())
+        pass
+
+    def get_heavy_hitters(self, top_k):
+        """
+        Retrieves the most frequent values seen by the sketch.
+
+        :param top_k: int: Number of values to retrieve.
+
+        :returns: heavy_hitters: list: List of (value, count, error) tuples, the most frequent values first.
+            The exact count of each value is within [count - error, count].
+        """
+        top_counts = self.counts.nlargest(top_k)
+        heavy_hitters = [(value, int(count), int(self.errors[value])) for value, count in top_counts.items()]
+        return heavy_hitters
+    pass
+
+
+class KeyProfileSketch:
+    """
+    Mergeable one-pass profile of a (possibly composite) key: rows count, rows with a null key value,
+        distinct count (HyperLogLog) and heavy hitters (SpaceSaving).
+    """
+
+    def __init__(self, key_columns, hyperloglog_precision=DEFAULT_HYPERLOGLOG_PRECISION,
+                 space_saving_capacity=DEFAULT_SPACE_SAVING_CAPACITY):
+        """
+        :param key_columns: list: List of the key columns.
+        :param hyperloglog_precision: int: Precision of the distinct count sketch.
+        :param space_saving_capacity: int: Maximum number of keys tracked by the heavy hitters sketch.
+        """
+        self.key_columns = key_columns
+        self.n_rows = 0
+        self.n_null_key_rows = 0
+        self.distinct_count_sketch = HyperLogLogSketch(hyperloglog_precision)
+        self.heavy_hitters_sketch = SpaceSavingSketch(space_saving_capacity)
+        pass
+
+    def update(self, dataframe_chunk):
+        """
+        Updates the key profile with a chunk of rows.
+
+        :param dataframe_chunk: pandas.core.frame.DataFrame: Chunk of rows, containing the key columns.
+        """
+        key_dataframe = dataframe_chunk[self.key_columns].dropna()
+        self.n_rows += len(dataframe_chunk)
+        self.n_null_key_rows += len(dataframe_chunk) - len(key_dataframe)
+        if len(key_dataframe) == 0:
+            return
+        key_hashes = pd.util.hash_pandas_object(key_dataframe, index=False).to_numpy(dtype=np.uint64)
+        self.distinct_count_sketch.update_with_hashes(key_hashes)
+        self.heavy_hitters_sketch.update(key_dataframe)
+        pass
+
+    def merge(self, other_profile):
+        """
+        Merges the profile of another chunk of the same key in this profile.
+
+        :param other_profile: KeyProfileSketch: The profile to merge.
+        """
+        self.n_rows += other_profile.n_rows
+        self.n_null_key_rows += other_profile.n_null_key_rows
+        self.distinct_count_sketch.merge(other_profile.distinct_count_sketch)
+        self.heavy_hitters_sketch.merge(other_profile.heavy_hitters_sketch)
+        pass
+    pass
+
+
+def profile_dataframe_chunks_key(dataframe_chunks, key_columns, hyperloglog_precision=DEFAULT_HYPERLOGLOG_PRECISION,
+                                 space_saving_capacity=DEFAULT_SPACE_SAVING_CAPACITY):
+    """
+    Profiles a key over a stream of DataFrame chunks in a single pass, holding one chunk in memory at a time.
+
+    :param dataframe_chunks: iterable: Iterable of pandas DataFrames, as we can get it with :function:`iter_dataset_chunks`.
+    :param key_columns: list: List of the key columns.
+    :param hyperloglog_precision: int: Precision of the distinct count sketch.
+    :param space_saving_capacity: int: Maximum number of keys tracked by the heavy hitters sketch.
+
+    :returns: key_profile: KeyProfileSketch: The key profile.
+    """
+    key_profile = KeyProfileSketch(key_columns, hyperloglog_precision, space_saving_capacity)
+    for dataframe_chunk in dataframe_chunks:
+        key_profile.update(dataframe_chunk)
+    return key_profile
+
+
+class ColumnProfileSketch:
+    """
+    Mergeable one-pass profile of a dataset column: null count, distinct count (HyperLogLog),
+        min/max, maximum string length and quantiles (KLL, for numerical columns only).
+    """
+
+    def __init__(self, column_name, hyperloglog_precision=DEFAULT_HYPERLOGLOG_PRECISION, kll_sketch_k=DEFAULT_KLL_SKETCH_K):
+        """
+        :param column_name: str: Name of the profiled column.
+        :param hyperloglog_precision: int: Precision of the distinct count sketch.
+        :param kll_sketch_k: int: Accuracy parameter of the quantiles sketch.
+        """
+        self.column_name = column_name
+        self.column_dtype = None
+        self.n_rows = 0
+        self.n_nulls = 0
+        self.min_value = None
+        self.max_value = None
+        self.max_string_length = None
+        self.distinct_count_sketch = HyperLogLogSketch(hyperloglog_precision)
+        self.quantiles_sketch = KllQuantilesSketch(kll_sketch_k)
+        pass
+
+    def update(self, series):
+        """
+        Updates the column profile with a chunk of the column values.
+
+        :param series: pandas.core.series.Series: Chunk of the column values.
+        """
+        self.column_dtype = str(series.dtype)
+        self.n_rows += len(series)
+        non_null_values = series.dropna()
+        self.n_nulls += len(series) - len(non_null_values)
+        if len(non_null_values) == 0:
+            return
+        self.distinct_count_sketch.update_with_hashes(hash_series_values(non_null_values))
+
+        column_is_numerical = pd.api.types.is_numeric_dtype(non_null_values) and\
+            not pd.api.types.is_bool_dtype(non_null_values)
+        if column_is_numerical:
+            self.quantiles_sketch.update(non_null_values.to_numpy(dtype=np.float64))
+        elif not pd.api.types.is_datetime64_any_dtype(non_null_values):
+            if isinstance(non_null_values.dtype, pd.CategoricalDtype):
+                # Lengths are only computed once per category present in the chunk:
+                present_categories = non_null_values.cat.categories[np.unique(non_null_values.cat.codes)]
+                string_values = pd.Series(present_categories).astype(str)
+                non_null_values = pd.Series(present_categories)
+            else:
+                string_values = non_null_values.astype(str)
+            chunk_max_string_length = int(string_values.str.len().max())
+            self.max_string_length = max(self.max_string_length or 0, chunk_max_string_length)
+
+        try:
+            chunk_min_value = non_null_values.min()
+            chunk_max_value = non_null_values.max()
+            self.min_value = chunk_min_value if self.min_value is None else min(self.min_value, chunk_min_value)
+            self.max_value = chunk_max_value if self.max_value is None else max(self.max_value, chunk_max_value)
+        except TypeError:
+            # Columns mixing non comparable types (e.g. 'object' columns) have no min/max:
+            pass
+        pass
+
+    def merge(self, other_profile):
+        """
+        Merges the profile of another chunk of the same column in this profile.
+
+        :param other_profile: ColumnProfileSketch: The profile to merge.
+        """
+        if other_profile.n_rows == 0:
+            return
+        self.column_dtype = other_profile.column_dtype
+        self.n_rows += other_profile.n_rows
+        self.n_nulls += other_profile.n_nulls
+        for attribute_name, merging_function in [("min_value", min), ("max_value", max), ("max_string_length", max)]:
+            self_value = getattr(self, attribute_name)
+            other_value = getattr(other_profile, attribute_name)
+            if self_value is None:
+                setattr(self, attribute_name, other_value)
+            elif other_value is not None:
+                setattr(self, attribute_name, merging_function(self_value, other_value))
+        self.distinct_count_sketch.merge(other_profile.distinct_count_sketch)
+        self.quantiles_sketch.merge(other_profile.quantiles_sketch)
+        pass
+
+    def compute_statistics(self, quantiles):
+        """
+        Computes the column statistics.
+
+        :param quantiles: list: List of the quantiles to estimate, with values in [0, 1].
+
+        :returns: column_statistics: dict: Column statistics. 'min_value' and 'max_value' are stored as strings
+            so that statistics of columns with different datatypes fit in the same DataFrame column.
+        """
+        column_statistics = {
+            "column_name": self.column_name,
+            "pandas_dtype": self.column_dtype,
+            "n_rows": self.n_rows,
+            "n_nulls": self.n_nulls,
+            "null_ratio": (self.n_nulls / self.n_rows) if self.n_rows > 0 else None,
+            "approx_n_distinct": self.distinct_count_sketch.estimate(),
+            "min_value": None if self.min_value is None else str(self.min_value),
+            "max_value": None if self.max_value is None else str(self.max_value),
+            "max_string_length": self.max_string_length,
+        }
+        quantile_estimates = self.quantiles_sketch.estimate_quantiles(quantiles)
+        for quantile, quantile_estimate in zip(quantiles, quantile_estimates):
+            column_statistics["quantile_{}".format(quantile)] = quantile_estimate
+        return column_statistics
+    pass
+
+
+def compute_dataframe_chunk_column_profiles(dataframe_chunk, hyperloglog_precision=DEFAULT_HYPERLOGLOG_PRECISION,
+                                            kll_sketch_k=DEFAULT_KLL_SKETCH_K):
+    """
+    Profiles all the columns of a DataFrame chunk.
+
+    :param dataframe_chunk: pandas.core.frame.DataFrame: The DataFrame chunk to profile.
+    :param hyperloglog_precision: int: Precision of the distinct count sketches.
+    :param kll_sketch_k: int: Accuracy parameter of the quantiles sketches.
+
+    :returns: column_profiles: dict: Mapping between the chunk columns and their 'ColumnProfileSketch'.
+    """
+    column_profiles = {}
+    for column_name in dataframe_chunk.columns:
+        column_profile = ColumnProfileSketch(column_name, hyperloglog_precision, kll_sketch_k)
+        column_profile.update(dataframe_chunk[column_name])
+        column_profiles[column_name] = column_profile
+    return column_profiles
+
+
+def merge_column_profiles(column_profiles, chunk_column_profiles):
+    """
+    Merges the column profiles of a chunk in the column profiles of all previous chunks.
+
+    :param column_profiles: dict: Mapping between the columns and their 'ColumnProfileSketch'. Updated in place.
+    :param chunk_column_profiles: dict: Mapping between the chunk columns and their 'ColumnProfileSketch'.
+    """
+    for column_name, chunk_column_profile in chunk_column_profiles.items():
+        if column_name in column_profiles.keys():
+            column_profiles[column_name].merge(chunk_column_profile)
+        else:
+            column_profiles[column_name] = chunk_column_profile
+    pass
+
+
+def profile_dataframe_chunks(dataframe_chunks, max_workers=None, quantiles=None,
+                             hyperloglog_precision=DEFAULT_HYPERLOGLOG_PRECISION, kll_sketch_k=DEFAULT_KLL_SKETCH_K):
+    """
+    Profiles the columns of a stream of DataFrame chunks in a single pass. Chunks are profiled in a process pool
+        and their mergeable sketches are combined as they complete. At most 2 chunks per worker are in flight,
+        so memory stays bounded whatever the stream length.
+
+    :param dataframe_chunks: iterable: Iterable of pandas DataFrames, as we can get it with :function:`iter_dataset_chunks`.
+    :param max_workers: int: Number of processes profiling the chunks. Defaults to the number of CPUs.
+        Set it to 1 to profile chunks in the current process.
+    :param quantiles: list: List of the quantiles to estimate on numerical columns, with values in [0, 1].
+    :param hyperloglog_precision: int: Precision of the distinct count sketches.
+    :param kll_sketch_k: int: Accuracy parameter of the quantiles sketches.
+
+    :returns: columns_profile_df: pandas.core.frame.DataFrame: DataFrame containing one row of statistics per column.
+    """
+    if quantiles is None:
+        quantiles = DEFAULT_PROFILE_QUANTILES
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    column_profiles = {}
+    column_names = None
+    if max_workers == 1:
+        for dataframe_chunk in dataframe_chunks:
+            if column_names is None:
+                column_names = list(dataframe_chunk.columns)
+            chunk_column_profiles = compute_dataframe_chunk_column_profiles(dataframe_chunk, hyperloglog_precision, kll_sketch_k)
+            merge_column_profiles(column_profiles, chunk_column_profiles)
+    else:
+        max_futures_in_flight = 2 * max_workers
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures_in_flight = set()
+            for dataframe_chunk in dataframe_chunks:
+                if column_names is None:
+                    column_names = list(dataframe_chunk.columns)
+                if len(futures_in_flight) >= max_futures_in_flight:
+                    done_futures, futures_in_flight = wait(futures_in_flight, return_when=FIRST_COMPLETED)
+                    for done_future in done_futures:
+                        merge_column_profiles(column_profiles, done_future.result())
+                futures_in_flight.add(executor.submit(compute_dataframe_chunk_column_profiles,
+                                                      dataframe_chunk, hyperloglog_precision, kll_sketch_k))
+            for done_future in wait(futures_in_flight).done:
+                merge_column_profiles(column_profiles, done_future.result())
+
+    columns_statistics = []
+    for column_name in (column_names or []):
+        columns_statistics.append(column_profiles[column_name].compute_statistics(quantiles))
+    columns_profile_df = pd.DataFrame(columns_statistics)
+    return columns_profile_df
+
+
+def profile_dataset_columns(project, dataset_name, columns=None, chunksize=DEFAULT_CHUNKSIZE, max_workers=None,
+                            quantiles=None):
+    """
+    Profiles the columns of a project dataset in a single streaming pass: number of rows, null ratio,
+        approximate number of distinct values, min/max, maximum string length and approximate quantiles.
+        The returned DataFrame only contains plain types, so it can be written in a dataset
+        (for example with :function:`write_dataframe_chunks`).
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the dataset.
+    :param columns: list: List of the columns to profile. If 'None', all the dataset columns are profiled.
+    :param chunksize: int: Number of rows of each streamed chunk.
+    :param max_workers: int: Number of processes profiling the chunks. Defaults to the number of CPUs.
+    :param quantiles: list: List of the quantiles to estimate on numerical columns, with values in [0, 1].
+
+    :returns: columns_profile_df: pandas.core.frame.DataFrame: DataFrame containing one row of statistics per column.
+    """
+    print("Profiling dataset '{}.{}' columns ...".format(project.project_key, dataset_name))
+    dataset_chunks = iter_dataset_chunks(project, dataset_name, columns, chunksize)
+    columns_profile_df = profile_dataframe_chunks(dataset_chunks, max_workers, quantiles)
+    column_datatypes_mapping = get_dataset_column_datatypes_mapping(project, dataset_name)
+    columns_profile_df.insert(0, "dataset_name", dataset_name)
+    columns_profile_df.insert(2, "column_datatype", columns_profile_df["column_name"].map(column_datatypes_mapping))
+    print("Dataset '{}.{}' columns successfully profiled!".format(project.project_key, dataset_name))
+    return columns_profile_df
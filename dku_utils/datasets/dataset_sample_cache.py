@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import dataiku
+import pandas as pd
+from .dataset_commons import get_dataset_last_build_timestamp
+
+
+DEFAULT_SAMPLE_CACHE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".dku_utils_sample_cache")
+DEFAULT_SAMPLE_CACHE_MAX_SIZE = 2 * 1024 ** 3
+SAMPLE_CACHE_FILE_EXTENSION = ".parquet"
+
+
+class DatasetSampleCache:
+    """
+    Caches dataset samples in local Parquet files, so that reading the same sample several times only
+        hits DSS once. Cached samples are keyed by project, dataset, sampling spec and dataset last build timestamp:
+        a sample is automatically invalidated when its dataset is rebuilt. When the cache exceeds its maximum size,
+        the least recently read samples are evicted first.
+    """
+
+    def __init__(self, cache_directory=DEFAULT_SAMPLE_CACHE_DIRECTORY, max_cache_size=DEFAULT_SAMPLE_CACHE_MAX_SIZE):
+        """
+        :param cache_directory: str: Path of the local directory where samples are stored.
+        :param max_cache_size: int: Maximum total size of the cached samples, in bytes.
+        """
+        self.cache_directory = cache_directory
+        self.max_cache_size = max_cache_size
+        os.makedirs(self.cache_directory, exist_ok=True)
+        pass
+
+    def compute_dataset_cache_prefix(self, project_key, dataset_name):
+        """
+        Computes the file name prefix shared by all the cached samples of a dataset.
+
+        :param project_key: str: Key of the dataset project.
+        :param dataset_name: str: Name of the dataset.
+
+        :returns: dataset_cache_prefix: str: The dataset cache prefix.
+        """
+        dataset_cache_prefix = hashlib.sha256("{}.{}".format(project_key, dataset_name).encode("utf-8")).hexdigest()[0: 16]
+        return dataset_cache_prefix
+
+    def compute_sample_cache_file_path(self, project_key, dataset_name, sampling_spec, dataset_last_build_timestamp):
+        """
+        Computes the path of the file caching a dataset sample.
+
+        :param project_key: str: Key of the dataset project.
+        :param dataset_name: str: Name of the dataset.
+        :param sampling_spec: dict: Sampling parameters, as passed to 'dataiku.Dataset.get_dataframe'.
+        :param dataset_last_build_timestamp: int: Timestamp of the dataset last build, in milliseconds.
+
+        :returns: sample_cache_file_path: str: Path of the sample cache file.
+        """
+        sampling_spec_hash = hashlib.sha256(json.dumps(sampling_spec, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        sample_cache_file_name = "{}_{}_{}{}".format(self.compute_dataset_cache_prefix(project_key, dataset_name),
+                                                     dataset_last_build_timestamp, sampling_spec_hash[0: 32],
+                                                     SAMPLE_CACHE_FILE_EXTENSION)
+        sample_cache_file_path = os.path.join(self.cache_directory, sample_cache_file_name)
+        return sample_cache_file_path
+
+    def list_cache_files(self):
+        """
+        Lists the sample cache files, with their size and last read time.
+
+        :returns: cache_files: list: List of (file_path, file_size, last_read_time) tuples, the least recently
+            read files first.
+        """
+        cache_files = []
+        for file_name in os.listdir(self.cache_directory):
+            if not file_name.endswith(SAMPLE_CACHE_FILE_EXTENSION):
+                continue
+            file_path = os.path.join(self.cache_directory, file_name)
+            try:
+                file_stats = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+            cache_files.append((file_path, file_stats.st_size, file_stats.st_mtime))
+        cache_files = sorted(cache_files, key=lambda cache_file: cache_file[2])
+        return cache_files
+
+    def get_cache_size(self):
+        """
+        Computes the total size of the cached samples.
+
+        :returns: cache_size: int: Total size of the cached samples, in bytes.
+        """
+        cache_size = sum([file_size for __, file_size, __ in self.list_cache_files()])
+        return cache_size
+
+    def remove_cache_file(self, file_path):
+        """
+        Removes a sample cache file, ignoring files already removed by another process.
+
+        :param file_path: str: Path of the sample cache file.
+        """
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        pass
+
+    def evict_least_recently_read_samples(self):
+        """
+        Removes the least recently read samples until the cache size is below its maximum size.
+        """
+        cache_files = self.list_cache_files()
+        cache_size = sum([file_size for __, file_size, __ in cache_files])
+        for file_path, file_size, __ in cache_files:
+            if cache_size <= self.max_cache_size:
+                break
+            print("Evicting sample cache file '{}' ...".format(file_path))
+            self.remove_cache_file(file_path)
+            cache_size -= file_size
+        pass
+
+    def invalidate_dataset_samples(self, project_key, dataset_name, dataset_last_build_timestamp=None):
+        """
+        Removes the cached samples of a dataset. If a build timestamp is provided, only the samples
+            computed before this build are removed.
+
+        :param project_key: str: Key of the dataset project.
+        :param dataset_name: str: Name of the dataset.
+        :param dataset_last_build_timestamp: int: Timestamp of the dataset last build, in milliseconds.
+        """
+        dataset_cache_prefix = "{}_".format(self.compute_dataset_cache_prefix(project_key, dataset_name))
+        up_to_date_prefix = "{}{}_".format(dataset_cache_prefix, dataset_last_build_timestamp)
+        for file_name in os.listdir(self.cache_directory):
+            if file_name.startswith(dataset_cache_prefix) and not file_name.startswith(up_to_date_prefix):
+                self.remove_cache_file(os.path.join(self.cache_directory, file_name))
+        pass
+
+    def clear(self):
+        """
+        Removes all the cached samples.
+        """
+        for file_path, __, __ in self.list_cache_files():
+            self.remove_cache_file(file_path)
+        pass
+
+    def get_dataframe(self, project, dataset_name, columns=None, sampling="head", sampling_column=None,
+                      limit=None, ratio=None):
+        """
+        Reads a dataset sample as a pandas DataFrame, from the cache if it is up to date with the dataset last build.
+            Samples of datasets that have never been built (ex: input datasets) are always read from DSS.
+            Parameters mirror the ones of 'dataiku.Dataset.get_dataframe'.
+
+        :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+        :param dataset_name: str: Name of the dataset.
+        :param columns: list: List of the columns to read. If 'None', all columns are read.
+        :param sampling: str: Sampling method, in ['head', 'random', 'random-column', 'full'].
+        :param sampling_column: str: Column used by the 'random-column' sampling.
+        :param limit: int: Maximum number of rows of the sample.
+        :param ratio: float: Ratio of rows to sample, for the 'random' sampling.
+
+        :returns: dataframe: pandas.core.frame.DataFrame: The dataset sample.
+        """
+        sampling_spec = {"columns": columns, "sampling": sampling, "sampling_column": sampling_column,
+                         "limit": limit, "ratio": ratio}
+        dataset_last_build_timestamp = get_dataset_last_build_timestamp(project, dataset_name)
+        if dataset_last_build_timestamp is None:
+            print("Dataset {}.{} has never been built: its sample is read from DSS without being cached."
+                  .format(project.project_key, dataset_name))
+            self.invalidate_dataset_samples(project.project_key, dataset_name)
+            dataset = dataiku.Dataset(dataset_name, project_key=project.project_key)
+            dataframe = dataset.get_dataframe(columns=columns, sampling=sampling, sampling_column=sampling_column,
+                                              limit=limit, ratio=ratio)
+            return dataframe
+        sample_cache_file_path = self.compute_sample_cache_file_path(project.project_key, dataset_name,
+                                                                     sampling_spec, dataset_last_build_timestamp)
+        if os.path.exists(sample_cache_file_path):
+            try:
+                dataframe = pd.read_parquet(sample_cache_file_path)
+                os.utime(sample_cache_file_path, None)
+                return dataframe
+            except (FileNotFoundError, OSError):
+                # The file was evicted by another process while being read: the sample is read from DSS again.
+                pass
+
+        print("Reading dataset {}.{} sample '{}' from DSS ...".format(project.project_key, dataset_name, sampling_spec))
+        self.invalidate_dataset_samples(project.project_key, dataset_name, dataset_last_build_timestamp)
+        dataset = dataiku.Dataset(dataset_name, project_key=project.project_key)
+        dataframe = dataset.get_dataframe(columns=columns, sampling=sampling, sampling_column=sampling_column,
+                                          limit=limit, ratio=ratio)
+        temporary_file_path = "{}.{}.tmp".format(sample_cache_file_path, os.getpid())
+        try:
+            dataframe.to_parquet(temporary_file_path, index=False)
+            os.replace(temporary_file_path, sample_cache_file_path)
+        except Exception as exception:
+            self.remove_cache_file(temporary_file_path)
+            print("WARNING: dataset {}.{} sample could not be cached: {}".format(project.project_key, dataset_name, exception))
+        self.evict_least_recently_read_samples()
+        return dataframe
@@ -0,0 +1,496 @@
+import re
+import pandas as pd
+from .flow_graph import (get_flow_graph_nodes,
+                         check_if_flow_node_is_a_dataset,
+                         check_if_flow_node_is_a_recipe,
+                         compute_flow_nodes_topological_order)
+from ..datasets.dataset_commons import get_dataset_schema
+from ..recipes.recipe_commons import get_recipe_settings_and_dictionary, update_recipe_ouput_schema
+from ..recipes.group_recipe import compute_group_recipe_output_columns
+from ..recipes.window_recipe import compute_window_recipe_output_columns
+from ..recipes.prepare_recipe import compute_prepare_keep_or_delete_step
+from ..recipes.join_recipe import compute_join_recipe_output_column_name
+
+
+PASS_THROUGH_RECIPE_TYPES = ["sync", "sampling"]
+PRUNABLE_RECIPE_TYPES = ["join", "shaker"]
+# Lineage edges of these transformations are needed by the recipe whatever the output columns used downstream:
+CONTROL_TRANSFORMATIONS = ["JOIN_KEY", "GROUP_KEY", "WINDOW_PARTITION", "WINDOW_ORDER", "FILTER"]
+FORMULA_IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+FORMULA_QUOTED_COLUMN_PATTERN = re.compile(r"""(?:val|strval|numval|cells\[)\s*\(?\s*["']([^"']+)["']""")
+
+
+def extract_formula_column_references(formula_expression, candidate_columns=None):
+    """
+    Extracts the columns referenced by a DSS formula: bare identifiers and columns accessed with
+        'val("column")', 'strval("column")', 'numval("column")' or 'cells["column"]'.
+
+    :param formula_expression: str: Expression of the formula, following the DSS formula language.
+    :param candidate_columns: iterable: Columns that the formula can reference. If 'None', all identifiers are returned.
+
+    :returns: referenced_columns: set: Set of the referenced columns.
+    """
+    if formula_expression in [None, ""]:
+        return set()
+    referenced_columns = set(FORMULA_IDENTIFIER_PATTERN.findall(formula_expression))
+    referenced_columns.update(FORMULA_QUOTED_COLUMN_PATTERN.findall(formula_expression))
+    if candidate_columns is not None:
+        referenced_columns.intersection_update(candidate_columns)
+    return referenced_columns
+
+
+def compute_lineage_edge(output_column, input_dataset_name, input_column, transformation):
+    """
+    Computes a column lineage edge.
+
+    :param output_column: str: Name of the output column ('None' for columns only used to compute the recipe,
+        like join keys or filters).
+    :param input_dataset_name: str: Name of the input dataset.
+    :param input_column: str: Name of the input column ('None' when the edge covers all the input columns).
+    :param transformation: str: Transformation leading from the input column to the output column.
+
+    :returns: lineage_edge: dict: The lineage edge.
+    """
+    lineage_edge = {"output_column": output_column, "input_dataset_name": input_dataset_name,
+                    "input_column": input_column, "transformation": transformation}
+    return lineage_edge
+
+
+def compute_opaque_recipe_lineage(recipe_input_dataset_names):
+    """
+    Computes the lineage of a recipe that can't be analyzed (code recipes, unsupported visual recipes):
+        each output column may depend on all the input columns.
+
+    :param recipe_input_dataset_names: list: List of the recipe input dataset names.
+
+    :returns: recipe_lineage: list: List of the lineage edges.
+    """
+    recipe_lineage = [compute_lineage_edge(None, dataset_name, None, "OPAQUE") for dataset_name in recipe_input_dataset_names]
+    return recipe_lineage
+
+
+def compute_join_recipe_lineage(recipe_payload, recipe_input_dataset_names, dataset_schemas):
+    """
+    Computes the column lineage of a join recipe from its selected columns, join conditions,
+        pre-join and post-join computed columns and filters.
+
+    :param recipe_payload: dict: JSON payload of the join recipe.
+    :param recipe_input_dataset_names: list: List of the recipe input dataset names.
+    :param dataset_schemas: dict: Mapping between the dataset names and their schemas.
+
+    :returns: recipe_lineage: list: List of the lineage edges.
+    """
+    virtual_inputs = recipe_payload.get("virtualInputs", [])
+    recipe_lineage = []
+    virtual_inputs_column_sources = []
+    for virtual_input in virtual_inputs:
+        dataset_name = recipe_input_dataset_names[virtual_input["index"]]
+        if virtual_input.get("autoSelectColumns", False):
+            recipe_lineage.append(compute_lineage_edge(None, dataset_name, None, "OPAQUE"))
+        dataset_columns = [column["name"] for column in dataset_schemas.get(dataset_name, [])]
+        column_sources = {column_name: [(column_name, "SELECT")] for column_name in dataset_columns}
+        for computed_column in virtual_input.get("computedColumns", []):
+            column_sources[computed_column["name"]] = [(referenced_column, "FORMULA") for referenced_column
+                                                       in extract_formula_column_references(computed_column.get("expr"), dataset_columns)]
+        pre_filter = virtual_input.get("preFilter", {})
+        if pre_filter.get("enabled", False):
+            for referenced_column in extract_formula_column_references(pre_filter.get("expression"), dataset_columns):
+                recipe_lineage.append(compute_lineage_edge(None, dataset_name, referenced_column, "FILTER"))
+        virtual_inputs_column_sources.append((dataset_name, column_sources))
+
+    for join in recipe_payload.get("joins", []):
+        for join_condition in join.get("on", []):
+            for column_side in ["column1", "column2"]:
+                column_information = join_condition.get(column_side)
+                if column_information is None:
+                    continue
+                dataset_name, column_sources = virtual_inputs_column_sources[column_information["table"]]
+                for input_column, __ in column_sources.get(column_information["name"], [(column_information["name"], None)]):
+                    recipe_lineage.append(compute_lineage_edge(None, dataset_name, input_column, "JOIN_KEY"))
+
+    output_column_sources = {}
+    for selected_column in recipe_payload.get("selectedColumns", []):
+        dataset_name, column_sources = virtual_inputs_column_sources[selected_column["table"]]
+        output_column = compute_join_recipe_output_column_name(selected_column, virtual_inputs)
+        output_column_sources[output_column] = [(dataset_name, input_column, transformation) for input_column, transformation
+                                                in column_sources.get(selected_column["name"], [(selected_column["name"], "SELECT")])]
+    for computed_column in recipe_payload.get("computedColumns", []):
+        output_column_sources[computed_column["name"]] = [
+            (dataset_name, input_column, "FORMULA")
+            for referenced_column in extract_formula_column_references(computed_column.get("expr"), output_column_sources.keys())
+            for dataset_name, input_column, __ in output_column_sources[referenced_column]]
+    post_filter = recipe_payload.get("postFilter", {})
+    if post_filter.get("enabled", False):
+        for referenced_column in extract_formula_column_references(post_filter.get("expression"), output_column_sources.keys()):
+            for dataset_name, input_column, __ in output_column_sources[referenced_column]:
+                recipe_lineage.append(compute_lineage_edge(None, dataset_name, input_column, "FILTER"))
+    for output_column, column_sources in output_column_sources.items():
+        for dataset_name, input_column, transformation in column_sources:
+            recipe_lineage.append(compute_lineage_edge(output_column, dataset_name, input_column, transformation))
+    return recipe_lineage
+
+
+def compute_prepare_steps_column_sources(steps, column_sources):
+    """
+    Propagates column sources through prepare recipe steps. Renaming, formula and keep/delete steps are
+        analyzed: any other processor makes the remaining steps opaque.
+
+    :param steps: list: List of the prepare recipe steps, each being in JSON format.
+    :param column_sources: dict: Mapping between the current columns and the set of the input columns they come from.
+        It is updated in place.
+
+    :returns: bool_steps_are_analyzed: bool: Boolean precising if all the steps could be analyzed.
+    """
+    for step in steps:
+        if step.get("disabled", False):
+            continue
+        if step.get("metaType") == "GROUP":
+            if not compute_prepare_steps_column_sources(step.get("steps", []), column_sources):
+                return False
+            continue
+        step_type = step.get("type")
+        step_params = step.get("params", {})
+        if step_type == "ColumnRenamer":
+            for renaming in step_params.get("renamings", []):
+                column_sources[renaming["to"]] = column_sources.pop(renaming["from"], set())
+        elif step_type == "CreateColumnWithGREL":
+            referenced_columns = extract_formula_column_references(step_params.get("expression"), column_sources.keys())
+            column_sources[step_params["column"]] = set().union(*[column_sources[column_name] for column_name in referenced_columns])
+        elif (step_type == "ColumnsSelector") and (step_params.get("appliesTo") == "COLUMNS"):
+            selected_columns = set(step_params.get("columns", []))
+            for column_name in list(column_sources.keys()):
+                if (column_name in selected_columns) != step_params.get("keep", False):
+                    column_sources.pop(column_name)
+        else:
+            return False
+    return True
+
+
+def compute_prepare_recipe_lineage(recipe_payload, recipe_input_dataset_name, recipe_output_dataset_name, dataset_schemas):
+    """
+    Computes the column lineage of a prepare recipe from its renaming, formula and keep/delete steps.
+        Recipes with other processors are considered as opaque.
+
+    :param recipe_payload: dict: JSON payload of the prepare recipe.
+    :param recipe_input_dataset_name: str: Name of the recipe input dataset.
+    :param recipe_output_dataset_name: str: Name of the recipe output dataset.
+    :param dataset_schemas: dict: Mapping between the dataset names and their schemas.
+
+    :returns: recipe_lineage: list: List of the lineage edges.
+    """
+    column_sources = {column["name"]: set([column["name"]]) for column in dataset_schemas.get(recipe_input_dataset_name, [])}
+    if not compute_prepare_steps_column_sources(recipe_payload.get("steps", []), column_sources):
+        return compute_opaque_recipe_lineage([recipe_input_dataset_name])
+    recipe_lineage = []
+    output_columns = [column["name"] for column in dataset_schemas.get(recipe_output_dataset_name, [])]
+    if len(output_columns) == 0:
+        output_columns = list(column_sources.keys())
+    for output_column in output_columns:
+        if output_column not in column_sources:
+            recipe_lineage.append(compute_lineage_edge(output_column, recipe_input_dataset_name, None, "OPAQUE"))
+            continue
+        for input_column in column_sources[output_column]:
+            transformation = "SELECT" if (input_column == output_column) else "PREPARE"
+            recipe_lineage.append(compute_lineage_edge(output_column, recipe_input_dataset_name, input_column, transformation))
+    return recipe_lineage
+
+
+def compute_recipe_column_lineage(recipe_type, recipe_payload, recipe_input_dataset_names, recipe_output_dataset_names,
+                                  dataset_schemas):
+    """
+    Computes the column lineage of a recipe from its JSON payload. Join, group, window, prepare, sync and sampling
+        recipes are analyzed: code recipes and other recipe types are considered as opaque.
+
+    :param recipe_type: str: Type of the recipe.
+    :param recipe_payload: dict: JSON payload of the recipe ('None' for code recipes).
+    :param recipe_input_dataset_names: list: List of the recipe input dataset names.
+    :param recipe_output_dataset_names: list: List of the recipe output dataset names.
+    :param dataset_schemas: dict: Mapping between the dataset names and their schemas.
+
+    :returns: recipe_lineage: list: List of the lineage edges, with format:
+        [{'output_column': 'column_1', 'input_dataset_name': 'dataset_1', 'input_column': 'column_1',
+          'transformation': 'SELECT'}, ...]
+        Edges with an 'output_column' equal to 'None' are columns only used to compute the recipe (transformations
+        in 'CONTROL_TRANSFORMATIONS') or, for 'OPAQUE' edges, all input columns possibly used by the recipe.
+    """
+    if (recipe_payload is None) or (len(recipe_input_dataset_names) == 0) or (len(recipe_output_dataset_names) != 1):
+        return compute_opaque_recipe_lineage(recipe_input_dataset_names)
+    recipe_input_dataset_name = recipe_input_dataset_names[0]
+    if recipe_type == "join":
+        return compute_join_recipe_lineage(recipe_payload, recipe_input_dataset_names, dataset_schemas)
+    if recipe_type == "shaker":
+        return compute_prepare_recipe_lineage(recipe_payload, recipe_input_dataset_name,
+                                              recipe_output_dataset_names[0], dataset_schemas)
+    if recipe_type in PASS_THROUGH_RECIPE_TYPES:
+        return [compute_lineage_edge(column["name"], recipe_input_dataset_name, column["name"], "SELECT")
+                for column in dataset_schemas.get(recipe_input_dataset_name, [])]
+    if recipe_type in ["grouping", "window"]:
+        if len(recipe_payload.get("computedColumns", [])) > 0:
+            return compute_opaque_recipe_lineage(recipe_input_dataset_names)
+        recipe_lineage = []
+        pre_filter = recipe_payload.get("preFilter", {})
+        if pre_filter.get("enabled", False):
+            for referenced_column in extract_formula_column_references(pre_filter.get("expression")):
+                recipe_lineage.append(compute_lineage_edge(None, recipe_input_dataset_name, referenced_column, "FILTER"))
+        if recipe_type == "grouping":
+            recipe_output_columns = compute_group_recipe_output_columns(recipe_payload)
+        else:
+            recipe_output_columns = compute_window_recipe_output_columns(recipe_payload)
+            for window_settings in recipe_payload.get("windows", []):
+                for column_name in window_settings.get("partitioningColumns", []):
+                    recipe_lineage.append(compute_lineage_edge(None, recipe_input_dataset_name, column_name, "WINDOW_PARTITION"))
+                for order in window_settings.get("orders", []):
+                    recipe_lineage.append(compute_lineage_edge(None, recipe_input_dataset_name, order["column"], "WINDOW_ORDER"))
+        for output_column_information in recipe_output_columns:
+            if output_column_information["input_column"] is None:
+                continue
+            if output_column_information["aggregation"] is not None:
+                transformation = "AGGREGATION"
+            elif recipe_type == "grouping":
+                transformation = "GROUP_KEY"
+            else:
+                transformation = "SELECT"
+            recipe_lineage.append(compute_lineage_edge(output_column_information["output_column"], recipe_input_dataset_name,
+                                                       output_column_information["input_column"], transformation))
+        return recipe_lineage
+    return compute_opaque_recipe_lineage(recipe_input_dataset_names)
+
+
+def compute_recipe_used_input_columns(recipe_lineage, recipe_input_dataset_names, needed_output_columns):
+    """
+    Computes the input columns a recipe needs to produce some of its output columns.
+
+    :param recipe_lineage: list: List of the recipe lineage edges, as computed with :function:`compute_recipe_column_lineage`.
+    :param recipe_input_dataset_names: list: List of the recipe input dataset names.
+    :param needed_output_columns: set: Set of the output columns used downstream ('None' if all of them are used).
+
+    :returns: used_input_columns: dict: Mapping between the input datasets and the set of their used columns
+        ('None' if all columns are possibly used).
+    """
+    used_input_columns = {dataset_name: set() for dataset_name in recipe_input_dataset_names}
+    for lineage_edge in recipe_lineage:
+        dataset_name = lineage_edge["input_dataset_name"]
+        edge_is_needed = (lineage_edge["output_column"] is None) or (needed_output_columns is None)\
+            or (lineage_edge["output_column"] in needed_output_columns)\
+            or (lineage_edge["transformation"] in CONTROL_TRANSFORMATIONS)
+        if (not edge_is_needed) or (used_input_columns.get(dataset_name, set()) is None):
+            continue
+        if lineage_edge["input_column"] is None:
+            used_input_columns[dataset_name] = None
+        else:
+            used_input_columns.setdefault(dataset_name, set()).add(lineage_edge["input_column"])
+    return used_input_columns
+
+
+def load_flow_recipes_information(project, flow_graph_nodes):
+    """
+    Loads the type, JSON payload, inputs and outputs of all the flow recipes, fetching each recipe settings once.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param flow_graph_nodes: dict: Nodes of the flow graph, as we can get them with :function:`get_flow_graph_nodes`.
+
+    :returns: flow_recipes_information: dict: Mapping between the recipe names and their information, with keys
+        'recipe_settings', 'recipe_type', 'recipe_payload', 'input_dataset_names' and 'output_dataset_names'.
+    """
+    flow_recipes_information = {}
+    for flow_graph_node in flow_graph_nodes.values():
+        if not check_if_flow_node_is_a_recipe(flow_graph_node):
+            continue
+        recipe_name = flow_graph_node["ref"]
+        recipe_settings, recipe_settings_dict = get_recipe_settings_and_dictionary(project, recipe_name, True)
+        try:
+            recipe_payload = recipe_settings.get_json_payload()
+        except:
+            recipe_payload = None
+        flow_recipes_information[recipe_name] = {
+            "recipe_settings": recipe_settings,
+            "recipe_type": recipe_settings_dict["type"],
+            "recipe_payload": recipe_payload,
+            "input_dataset_names": [item["ref"] for item in recipe_settings.get_recipe_inputs().get("main", {}).get("items", [])],
+            "output_dataset_names": [item["ref"] for item in recipe_settings.get_recipe_outputs().get("main", {}).get("items", [])]}
+    return flow_recipes_information
+
+
+def get_cached_dataset_schemas(project, dataset_names, dataset_schemas_cache):
+    """
+    Retrieves dataset schemas, fetching only the ones missing from a schemas cache.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_names: list: List of the dataset names.
+    :param dataset_schemas_cache: dict: Mapping between dataset names and their schemas. It is updated in place.
+
+    :returns: dataset_schemas_cache: dict: The updated schemas cache.
+    """
+    for dataset_name in dataset_names:
+        if dataset_name not in dataset_schemas_cache:
+            try:
+                dataset_schemas_cache[dataset_name] = get_dataset_schema(project, dataset_name)
+            except:
+                # Flow inputs can be objects from other projects or managed folders:
+                dataset_schemas_cache[dataset_name] = []
+    return dataset_schemas_cache
+
+
+def compute_flow_column_lineage(project, dataset_schemas_cache=None):
+    """
+    Computes the column-level lineage of all the flow recipes.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_schemas_cache: dict: Optional mapping between dataset names and their schemas.
+
+    :returns: flow_column_lineage_df: pandas.core.frame.DataFrame: DataFrame containing one row per lineage edge,
+        with columns 'recipe_name', 'recipe_type', 'output_dataset_name', 'output_column', 'input_dataset_name',
+        'input_column' and 'transformation'.
+    """
+    if dataset_schemas_cache is None:
+        dataset_schemas_cache = {}
+    flow_graph_nodes = get_flow_graph_nodes(project)
+    flow_recipes_information = load_flow_recipes_information(project, flow_graph_nodes)
+    flow_lineage_edges = []
+    for recipe_name, recipe_information in flow_recipes_information.items():
+        get_cached_dataset_schemas(project, recipe_information["input_dataset_names"] + recipe_information["output_dataset_names"],
+                                   dataset_schemas_cache)
+        recipe_lineage = compute_recipe_column_lineage(recipe_information["recipe_type"], recipe_information["recipe_payload"],
+                                                       recipe_information["input_dataset_names"],
+                                                       recipe_information["output_dataset_names"], dataset_schemas_cache)
+        output_dataset_name = recipe_information["output_dataset_names"][0] if len(recipe_information["output_dataset_names"]) == 1 else None
+        for lineage_edge in recipe_lineage:
+            lineage_edge.update({"recipe_name": recipe_name, "recipe_type": recipe_information["recipe_type"],
+                                 "output_dataset_name": output_dataset_name})
+            flow_lineage_edges.append(lineage_edge)
+    flow_column_lineage_df = pd.DataFrame(flow_lineage_edges, columns=["recipe_name", "recipe_type", "output_dataset_name",
+                                                                       "output_column", "input_dataset_name", "input_column",
+                                                                       "transformation"])
+    return flow_column_lineage_df
+
+
+def compute_join_recipe_pruned_selected_columns(recipe_payload, needed_output_columns):
+    """
+    Computes the selected columns of a join recipe that are still needed downstream, or by its post-join
+        computed columns and filter.
+
+    :param recipe_payload: dict: JSON payload of the join recipe.
+    :param needed_output_columns: set: Set of the recipe output columns used downstream.
+
+    :returns: pruned_selected_columns: list: Selected columns to keep.
+    :returns: columns_to_prune: list: Output names of the selected columns to remove.
+    """
+    virtual_inputs = recipe_payload.get("virtualInputs", [])
+    post_join_expressions = [computed_column.get("expr") for computed_column in recipe_payload.get("computedColumns", [])]
+    if recipe_payload.get("postFilter", {}).get("enabled", False):
+        post_join_expressions.append(recipe_payload["postFilter"].get("expression"))
+    post_join_referenced_columns = set()
+    for post_join_expression in post_join_expressions:
+        post_join_referenced_columns.update(extract_formula_column_references(post_join_expression))
+    pruned_selected_columns = []
+    columns_to_prune = []
+    for selected_column in recipe_payload.get("selectedColumns", []):
+        output_column = compute_join_recipe_output_column_name(selected_column, virtual_inputs)
+        if (output_column in needed_output_columns) or (output_column in post_join_referenced_columns):
+            pruned_selected_columns.append(selected_column)
+        else:
+            columns_to_prune.append(output_column)
+    return pruned_selected_columns, columns_to_prune
+
+
+def prune_flow_unused_columns(project, bool_apply_pruning=False, dataset_schemas_cache=None):
+    """
+    Detects the columns produced by join and prepare recipes that no downstream recipe uses, walking the flow from
+        its outputs to its inputs: pruning a recipe reduces the columns its own inputs need, so upstream recipes can
+        be pruned in the same pass.
+        - Join recipes: unused columns are removed from the selected columns.
+        - Prepare recipes: a final step keeping only the used columns is added.
+        Flow output datasets, datasets used by code recipes and datasets produced by recipes with auto-selected
+        columns are never pruned.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param bool_apply_pruning: bool: Precise if the proposed pruning should be saved in the recipes settings. The
+        output schemas of the pruned recipes are then updated.
+    :param dataset_schemas_cache: dict: Optional mapping between dataset names and their schemas.
+
+    :returns: pruning_report_df: pandas.core.frame.DataFrame: DataFrame containing, for each prunable recipe,
+        its output dataset, its number of output columns, the columns to prune and whether the pruning was applied.
+    """
+    if dataset_schemas_cache is None:
+        dataset_schemas_cache = {}
+    print("Looking for unused columns in project '{}' flow ...".format(project.project_key))
+    flow_graph_nodes = get_flow_graph_nodes(project)
+    flow_recipes_information = load_flow_recipes_information(project, flow_graph_nodes)
+    datasets_needed_columns = {}
+    recipes_used_input_columns = {}
+    pruning_reports = []
+    for node_id in reversed(compute_flow_nodes_topological_order(flow_graph_nodes)):
+        flow_graph_node = flow_graph_nodes[node_id]
+        if check_if_flow_node_is_a_dataset(flow_graph_node):
+            dataset_name = flow_graph_node["ref"]
+            consumer_recipe_names = [flow_graph_nodes[successor_id]["ref"] for successor_id in flow_graph_node["successors"]
+                                     if check_if_flow_node_is_a_recipe(flow_graph_nodes[successor_id])]
+            dataset_needed_columns = set() if len(consumer_recipe_names) > 0 else None
+            for recipe_name in consumer_recipe_names:
+                recipe_used_columns = recipes_used_input_columns[recipe_name].get(dataset_name)
+                if recipe_used_columns is None:
+                    dataset_needed_columns = None
+                    break
+                dataset_needed_columns.update(recipe_used_columns)
+            datasets_needed_columns[dataset_name] = dataset_needed_columns
+            continue
+        if not check_if_flow_node_is_a_recipe(flow_graph_node):
+            continue
+
+        recipe_name = flow_graph_node["ref"]
+        recipe_information = flow_recipes_information[recipe_name]
+        recipe_type = recipe_information["recipe_type"]
+        recipe_payload = recipe_information["recipe_payload"]
+        input_dataset_names = recipe_information["input_dataset_names"]
+        output_dataset_names = recipe_information["output_dataset_names"]
+        get_cached_dataset_schemas(project, input_dataset_names + output_dataset_names, dataset_schemas_cache)
+        recipe_lineage = compute_recipe_column_lineage(recipe_type, recipe_payload, input_dataset_names,
+                                                       output_dataset_names, dataset_schemas_cache)
+        needed_output_columns = None
+        if len(output_dataset_names) == 1:
+            needed_output_columns = datasets_needed_columns.get(output_dataset_names[0])
+
+        recipe_is_prunable = (recipe_type in PRUNABLE_RECIPE_TYPES) and (needed_output_columns is not None)\
+            and (len(output_dataset_names) == 1)\
+            and all([lineage_edge["transformation"] != "OPAQUE" for lineage_edge in recipe_lineage])
+        if recipe_is_prunable:
+            output_dataset_name = output_dataset_names[0]
+            columns_to_prune = []
+            if recipe_type == "join":
+                pruned_selected_columns, columns_to_prune = compute_join_recipe_pruned_selected_columns(recipe_payload,
+                                                                                                       needed_output_columns)
+                if len(columns_to_prune) > 0:
+                    recipe_payload["selectedColumns"] = pruned_selected_columns
+            else:
+                output_columns = [column["name"] for column in dataset_schemas_cache.get(output_dataset_name, [])]
+                columns_to_keep = [column_name for column_name in output_columns if column_name in needed_output_columns]
+                columns_to_prune = [column_name for column_name in output_columns if column_name not in needed_output_columns]
+                if (len(columns_to_prune) > 0) and (len(columns_to_keep) > 0):
+                    recipe_payload.setdefault("steps", []).append(compute_prepare_keep_or_delete_step(columns_to_keep, True))
+                else:
+                    columns_to_prune = []
+            bool_pruning_applied = False
+            if len(columns_to_prune) > 0:
+                recipe_lineage = compute_recipe_column_lineage(recipe_type, recipe_payload, input_dataset_names,
+                                                               output_dataset_names, dataset_schemas_cache)
+                if bool_apply_pruning:
+                    recipe_settings = recipe_information["recipe_settings"]
+                    recipe_settings.set_json_payload(recipe_payload)
+                    recipe_settings.save()
+                    update_recipe_ouput_schema(project, recipe_name)
+                    bool_pruning_applied = True
+                    print("Recipe '{}' pruned from columns '{}'".format(recipe_name, columns_to_prune))
+            pruning_reports.append({"recipe_name": recipe_name, "recipe_type": recipe_type,
+                                    "output_dataset_name": output_dataset_name,
+                                    "n_output_columns": len(dataset_schemas_cache.get(output_dataset_name, [])),
+                                    "columns_to_prune": columns_to_prune,
+                                    "pruning_applied": bool_pruning_applied})
+            if bool_pruning_applied:
+                # The cached output schema is stale once the recipe output schema is updated:
+                dataset_schemas_cache.pop(output_dataset_name, None)
+        recipes_used_input_columns[recipe_name] = compute_recipe_used_input_columns(recipe_lineage, input_dataset_names,
+                                                                                    needed_output_columns)
+    pruning_report_df = pd.DataFrame(pruning_reports, columns=["recipe_name", "recipe_type", "output_dataset_name",
+                                                               "n_output_columns", "columns_to_prune", "pruning_applied"])
+    print("Project '{}' unused columns analysis done!".format(project.project_key))
+    return pruning_report_df
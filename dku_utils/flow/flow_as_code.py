@@ -0,0 +1,306 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import yaml
+from .flow_commons import get_all_flow_recipe_names, get_all_flow_dataset_names
+from ..recipes.recipe_commons import (get_recipe_settings_and_dictionary,
+                                      update_recipe_ouput_schema,
+                                      VisualRecipeBuilder)
+from ..recipes.group_recipe import GroupRecipeBuilder
+from ..recipes.pivot_recipe import PivotRecipeBuilder
+from ..recipes.window_recipe import WindowRecipeBuilder
+from ..recipes.prepare_recipe import PrepareRecipeBuilder
+
+
+FLOW_AS_CODE_RECIPE_BUILDERS = {"grouping": GroupRecipeBuilder,
+                                "pivot": PivotRecipeBuilder,
+                                "window": WindowRecipeBuilder,
+                                "shaker": PrepareRecipeBuilder}
+FLOW_AS_CODE_SPEC_HASH_KEY = "dku_utils_flow_as_code_spec_hash"
+
+
+def load_flow_spec(flow_spec, flow_spec_variables=None):
+    """
+    Loads a flow specification, and replaces its variables. A flow specification describes recipes with format:
+        {'recipes': [
+            {'name': 'compute_dataset_2', 'type': 'grouping', 'inputs': ['dataset_1'],
+             'output': 'dataset_2', 'connection': 'connection_1',
+             'settings': [{'set_group_key': [['column_1']]}, {'set_aggregations': [{'column_2': ['sum']}]}],
+             'payload': {'engineType': 'SQL'}},
+            ...]}
+        - 'settings' are calls to the recipe builder methods (ex: :class:`recipes.group_recipe.GroupRecipeBuilder`),
+        with either a list of positional arguments or a dict of keyword arguments.
+        - 'payload' entries are written as is in the recipe JSON payload.
+
+    :param flow_spec: dict|str: The flow specification, either as a dictionary, a YAML string or a YAML file path.
+    :param flow_spec_variables: dict: Variables to replace in all the specification strings,
+        ex: {'market': 'FR'} turns 'sales_{market}' into 'sales_FR'.
+
+    :returns: flow_spec: dict: The loaded flow specification.
+    """
+    if isinstance(flow_spec, str):
+        if flow_spec.endswith((".yml", ".yaml")):
+            with open(flow_spec, "r") as file:
+                flow_spec = yaml.safe_load(file)
+        else:
+            flow_spec = yaml.safe_load(flow_spec)
+    if flow_spec_variables is not None:
+        flow_spec = replace_flow_spec_variables(flow_spec, flow_spec_variables)
+    recipe_names = []
+    recipe_outputs = []
+    for recipe_spec in flow_spec.get("recipes", []):
+        for spec_key in ["name", "type", "inputs", "output"]:
+            if spec_key not in recipe_spec:
+                log_message = "Recipe specification '{}' has no '{}' key!".format(recipe_spec, spec_key)
+                raise Exception(log_message)
+        if recipe_spec["name"] in recipe_names:
+            log_message = "Recipe '{}' is specified several times!".format(recipe_spec["name"])
+            raise Exception(log_message)
+        if recipe_spec["output"] in recipe_outputs:
+            log_message = "Dataset '{}' is the output of several recipes!".format(recipe_spec["output"])
+            raise Exception(log_message)
+        recipe_names.append(recipe_spec["name"])
+        recipe_outputs.append(recipe_spec["output"])
+    return flow_spec
+
+
+def replace_flow_spec_variables(flow_spec_part, flow_spec_variables):
+    """
+    Recursively replaces variables in all the strings of a flow specification part.
+
+    :param flow_spec_part: dict|list|str: A part of the flow specification.
+    :param flow_spec_variables: dict: Variables to replace, ex: {'market': 'FR'}.
+
+    :returns: flow_spec_part: dict|list|str: The flow specification part with its variables replaced.
+    """
+    if isinstance(flow_spec_part, dict):
+        return {replace_flow_spec_variables(key, flow_spec_variables): replace_flow_spec_variables(value, flow_spec_variables)
+                for key, value in flow_spec_part.items()}
+    if isinstance(flow_spec_part, list):
+        return [replace_flow_spec_variables(value, flow_spec_variables) for value in flow_spec_part]
+    if isinstance(flow_spec_part, str):
+        for variable_name, variable_value in flow_spec_variables.items():
+            flow_spec_part = flow_spec_part.replace("{" + variable_name + "}", str(variable_value))
+    return flow_spec_part
+
+
+def compute_recipe_spec_hash(recipe_spec):
+    """
+    Computes the hash of a recipe specification.
+
+    :param recipe_spec: dict: Specification of the recipe.
+
+    :returns: recipe_spec_hash: str: SHA-256 hash of the recipe specification.
+    """
+    recipe_spec_hash = hashlib.sha256(json.dumps(recipe_spec, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return recipe_spec_hash
+
+
+def compute_flow_spec_recipe_levels(flow_spec):
+    """
+    Groups the recipes of a flow specification by topological level: a recipe comes in a level after the levels of
+        all the recipes producing its inputs, so that recipes of the same level can be created concurrently.
+
+    :param flow_spec: dict: The flow specification, as loaded with :function:`load_flow_spec`.
+
+    :returns: recipe_levels: list: List of the recipe specification lists, one per level.
+    """
+    recipe_specs = {recipe_spec["name"]: recipe_spec for recipe_spec in flow_spec.get("recipes", [])}
+    output_producers = {recipe_spec["output"]: recipe_name for recipe_name, recipe_spec in recipe_specs.items()}
+    recipe_dependencies = {recipe_name: set([output_producers[input_name] for input_name in recipe_spec["inputs"]
+                                             if input_name in output_producers])
+                           for recipe_name, recipe_spec in recipe_specs.items()}
+    recipe_levels = []
+    placed_recipe_names = set()
+    while len(placed_recipe_names) < len(recipe_specs):
+        level_recipe_names = [recipe_name for recipe_name in recipe_specs if (recipe_name not in placed_recipe_names)
+                              and recipe_dependencies[recipe_name].issubset(placed_recipe_names)]
+        if len(level_recipe_names) == 0:
+            log_message = "The flow specification contains a cycle between recipes '{}'!"\
+                .format([recipe_name for recipe_name in recipe_specs if recipe_name not in placed_recipe_names])
+            raise Exception(log_message)
+        recipe_levels.append([recipe_specs[recipe_name] for recipe_name in level_recipe_names])
+        placed_recipe_names.update(level_recipe_names)
+    return recipe_levels
+
+
+def get_recipe_spec_hash(project, recipe_name):
+    """
+    Retrieves the specification hash stored in a recipe metadata by the flow-as-code compiler.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param recipe_name: str: Name of the recipe.
+
+    :returns: recipe_spec_hash: str: The recipe specification hash ('None' if the recipe was not compiled from a spec).
+    """
+    __, recipe_settings_dict = get_recipe_settings_and_dictionary(project, recipe_name, True)
+    recipe_spec_hash = recipe_settings_dict.get("customMeta", {}).get("kv", {}).get(FLOW_AS_CODE_SPEC_HASH_KEY)
+    return recipe_spec_hash
+
+
+def plan_flow_spec_recipe_action(project, recipe_spec, project_recipe_names):
+    """
+    Computes the action to take on a specified recipe, comparing its specification with the project flow.
+        - 'CREATE': the recipe does not exist.
+        - 'SKIP': the recipe exists with the same specification hash.
+        - 'UPDATE': the recipe exists with the same inputs and output, but another specification hash.
+        - 'CONFLICT': the recipe exists with other inputs or output: it is left untouched.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param recipe_spec: dict: Specification of the recipe.
+    :param project_recipe_names: list: List of the project recipe names.
+
+    :returns: recipe_plan: dict: The recipe action, with keys 'recipe_name', 'recipe_type', 'action',
+        'spec_hash', 'previous_spec_hash' and 'message'.
+    """
+    recipe_name = recipe_spec["name"]
+    recipe_plan = {"recipe_name": recipe_name, "recipe_type": recipe_spec["type"], "action": "CREATE",
+                   "spec_hash": compute_recipe_spec_hash(recipe_spec), "previous_spec_hash": None, "message": None}
+    if recipe_name in project_recipe_names:
+        recipe_settings, recipe_settings_dict = get_recipe_settings_and_dictionary(project, recipe_name, True)
+        recipe_plan["previous_spec_hash"] = recipe_settings_dict.get("customMeta", {}).get("kv", {}).get(FLOW_AS_CODE_SPEC_HASH_KEY)
+        recipe_inputs = [item["ref"] for item in recipe_settings.get_recipe_inputs()["main"]["items"]]
+        recipe_outputs = [item["ref"] for item in recipe_settings.get_recipe_outputs()["main"]["items"]]
+        if recipe_plan["previous_spec_hash"] == recipe_plan["spec_hash"]:
+            recipe_plan["action"] = "SKIP"
+        elif (recipe_inputs != recipe_spec["inputs"]) or (recipe_outputs != [recipe_spec["output"]]):
+            recipe_plan["action"] = "CONFLICT"
+            recipe_plan["message"] = "Recipe has inputs '{}' and outputs '{}' while its specification has inputs '{}' "\
+                "and output '{}'".format(recipe_inputs, recipe_outputs, recipe_spec["inputs"], recipe_spec["output"])
+        else:
+            recipe_plan["action"] = "UPDATE"
+    return recipe_plan
+
+
+def apply_recipe_spec_settings(project, recipe_spec, recipe_spec_hash, dataset_schemas_cache):
+    """
+    Applies the settings and payload of a recipe specification with the recipe builder, and stores the specification
+        hash in the recipe metadata, in a single settings update. Then updates the recipe output schema.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param recipe_spec: dict: Specification of the recipe.
+    :param recipe_spec_hash: str: Hash of the recipe specification.
+    :param dataset_schemas_cache: dict: Mapping between dataset names and their schemas, shared between builders.
+    """
+    recipe_builder_class = FLOW_AS_CODE_RECIPE_BUILDERS.get(recipe_spec["type"], VisualRecipeBuilder)
+    recipe_builder = recipe_builder_class(project, recipe_spec["name"], dataset_schemas_cache)
+    for builder_call in recipe_spec.get("settings", []):
+        for method_name, method_arguments in builder_call.items():
+            builder_method = getattr(recipe_builder, method_name)
+            if isinstance(method_arguments, dict):
+                builder_method(**method_arguments)
+            else:
+                builder_method(*method_arguments)
+    recipe_builder.recipe_payload.update(recipe_spec.get("payload", {}))
+    recipe_builder.recipe_settings_dict.setdefault("customMeta", {}).setdefault("kv", {})[FLOW_AS_CODE_SPEC_HASH_KEY] = recipe_spec_hash
+    recipe_builder.save()
+    update_recipe_ouput_schema(project, recipe_spec["name"])
+    pass
+
+
+def create_recipe_from_spec(project, recipe_spec, project_dataset_names):
+    """
+    Creates a recipe and its output dataset from a recipe specification, in a single creation call.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param recipe_spec: dict: Specification of the recipe.
+    :param project_dataset_names: list: List of the project dataset names: outputs not in this list are created
+        in the recipe specification 'connection'.
+    """
+    print("Creating {} recipe '{}' ...".format(recipe_spec["type"], recipe_spec["name"]))
+    builder = project.new_recipe(recipe_spec["type"], recipe_spec["name"])
+    for dataset_name in recipe_spec["inputs"]:
+        builder.with_input(dataset_name)
+    if recipe_spec["output"] in project_dataset_names:
+        builder.with_output(recipe_spec["output"])
+    else:
+        builder.with_new_output(recipe_spec["output"], recipe_spec["connection"])
+    builder.build()
+    print("Recipe '{}' sucessfully created!".format(recipe_spec["name"]))
+    pass
+
+
+def execute_flow_spec_recipe_plan(project, recipe_spec, recipe_plan, project_dataset_names, dataset_schemas_cache):
+    """
+    Executes the planned action on a specified recipe.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param recipe_spec: dict: Specification of the recipe.
+    :param recipe_plan: dict: The recipe action, as computed with :function:`plan_flow_spec_recipe_action`.
+        It is updated in place with the 'status' and 'message' of the execution.
+    :param project_dataset_names: list: List of the project dataset names.
+    :param dataset_schemas_cache: dict: Mapping between dataset names and their schemas, shared between builders.
+
+    :returns: recipe_plan: dict: The updated recipe action.
+    """
+    if recipe_plan["action"] in ["SKIP", "CONFLICT"]:
+        recipe_plan["status"] = "SKIPPED"
+        return recipe_plan
+    try:
+        if recipe_plan["action"] == "CREATE":
+            create_recipe_from_spec(project, recipe_spec, project_dataset_names)
+        apply_recipe_spec_settings(project, recipe_spec, recipe_plan["spec_hash"], dataset_schemas_cache)
+        recipe_plan["status"] = "DONE"
+    except Exception as exception:
+        recipe_plan["status"] = "FAILED"
+        recipe_plan["message"] = str(exception)
+    return recipe_plan
+
+
+def compile_flow_spec(project, flow_spec, flow_spec_variables=None, max_workers=8, bool_dry_run=False):
+    """
+    Compiles a flow specification into the project flow: recipes are created or updated level by level in topological
+        order, the recipes of the same level being processed concurrently. Recipes whose specification did not change
+        since their last compilation are skipped, and recipes depending on a failed recipe are not processed.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param flow_spec: dict|str: The flow specification, as described in :function:`load_flow_spec`.
+    :param flow_spec_variables: dict: Variables to replace in the flow specification, ex: {'market': 'FR'}.
+    :param max_workers: int: Maximum number of recipes processed at the same time.
+    :param bool_dry_run: bool: Precise if the function should only report the planned actions, without changing the flow.
+
+    :returns: flow_spec_diff_df: pandas.core.frame.DataFrame: DataFrame containing, for each specified recipe, its
+        level in the plan, the planned action ('CREATE', 'UPDATE', 'SKIP' or 'CONFLICT'), the specification hashes,
+        the execution status ('PLANNED', 'DONE', 'SKIPPED', 'FAILED' or 'UPSTREAM_FAILED') and a message.
+    """
+    flow_spec = load_flow_spec(flow_spec, flow_spec_variables)
+    recipe_levels = compute_flow_spec_recipe_levels(flow_spec)
+    project_recipe_names = get_all_flow_recipe_names(project)
+    project_dataset_names = get_all_flow_dataset_names(project)
+    print("Compiling flow specification of {} recipes in {} levels ...".format(len(flow_spec.get("recipes", [])),
+                                                                                len(recipe_levels)))
+    dataset_schemas_cache = {}
+    failed_outputs = set()
+    recipe_plans = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for plan_level, level_recipe_specs in enumerate(recipe_levels):
+            level_recipe_plans = list(executor.map(
+                lambda recipe_spec: plan_flow_spec_recipe_action(project, recipe_spec, project_recipe_names),
+                level_recipe_specs))
+            recipe_plans_to_execute = []
+            for recipe_spec, recipe_plan in zip(level_recipe_specs, level_recipe_plans):
+                recipe_plan["plan_level"] = plan_level
+                if bool_dry_run:
+                    recipe_plan["status"] = "PLANNED"
+                elif len(failed_outputs.intersection(recipe_spec["inputs"])) > 0:
+                    recipe_plan["status"] = "UPSTREAM_FAILED"
+                    failed_outputs.add(recipe_spec["output"])
+                else:
+                    recipe_plans_to_execute.append((recipe_spec, recipe_plan))
+            executed_recipe_plans = list(executor.map(
+                lambda spec_and_plan: execute_flow_spec_recipe_plan(project, spec_and_plan[0], spec_and_plan[1],
+                                                                    project_dataset_names, dataset_schemas_cache),
+                recipe_plans_to_execute))
+            for (recipe_spec, __), recipe_plan in zip(recipe_plans_to_execute, executed_recipe_plans):
+                if recipe_plan["status"] == "FAILED":
+                    failed_outputs.add(recipe_spec["output"])
+            recipe_plans += level_recipe_plans
+    flow_spec_diff_df = pd.DataFrame(recipe_plans, columns=["recipe_name", "recipe_type", "plan_level", "action",
+                                                            "status", "spec_hash", "previous_spec_hash", "message"])
+    failed_recipe_names = list(flow_spec_diff_df[flow_spec_diff_df["status"].isin(["FAILED", "UPSTREAM_FAILED"])]["recipe_name"])
+    if len(failed_recipe_names) > 0:
+        print("WARNING: recipes '{}' could not be compiled! Please look at the 'message' "
+              "column of the returned report.".format(failed_recipe_names))
+    print("Flow specification compilation done!")
+    return flow_spec_diff_df
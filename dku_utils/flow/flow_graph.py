@@ -0,0 +1,149 @@
+def get_flow_graph_nodes(project):
+    """
+    Retrieves the nodes of a project flow graph.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+
+    :returns: flow_graph_nodes: dict: Mapping between the flow node IDs and their information, with format:
+        {'node_id': {'ref': 'object_name', 'type': 'COMPUTABLE_DATASET', 'predecessors': [...], 'successors': [...]}}
+        Recipe nodes have a type starting with 'RUNNABLE' and their recipe type in 'subType'.
+    """
+    flow_graph = project.get_flow().get_graph()
+    flow_graph_nodes = flow_graph.data["nodes"]
+    return flow_graph_nodes
+
+
+def check_if_flow_node_is_a_dataset(flow_graph_node):
+    """
+    Checks if a flow graph node is a dataset.
+
+    :param flow_graph_node: dict: Information of a flow graph node.
+
+    :returns: node_is_a_dataset: bool: Boolean precising if the node is a dataset.
+    """
+    node_is_a_dataset = (flow_graph_node["type"] == "COMPUTABLE_DATASET")
+    return node_is_a_dataset
+
+
+def check_if_flow_node_is_a_recipe(flow_graph_node):
+    """
+    Checks if a flow graph node is a recipe.
+
+    :param flow_graph_node: dict: Information of a flow graph node.
+
+    :returns: node_is_a_recipe: bool: Boolean precising if the node is a recipe.
+    """
+    node_is_a_recipe = flow_graph_node["type"].startswith("RUNNABLE")
+    return node_is_a_recipe
+
+
+def get_flow_node_id(flow_graph_nodes, object_name):
+    """
+    Retrieves the ID of the flow graph node referring to a project object (dataset, recipe, folder...).
+
+    :param flow_graph_nodes: dict: Nodes of the flow graph, as we can get them with :function:`get_flow_graph_nodes`.
+    :param object_name: str: Name of the project object.
+
+    :returns: node_id: str: ID of the flow graph node.
+    """
+    if object_name in flow_graph_nodes.keys():
+        return object_name
+    for node_id, flow_graph_node in flow_graph_nodes.items():
+        if flow_graph_node.get("ref") == object_name:
+            return node_id
+    log_message = "Object '{}' is not part of the flow graph!".format(object_name)
+    raise Exception(log_message)
+
+
+def get_flow_dataset_consumer_recipe_names(flow_graph_nodes, dataset_name):
+    """
+    Retrieves the names of all the recipes using a dataset as an input.
+
+    :param flow_graph_nodes: dict: Nodes of the flow graph, as we can get them with :function:`get_flow_graph_nodes`.
+    :param dataset_name: str: Name of the dataset.
+
+    :returns: consumer_recipe_names: list: List of the recipes having the dataset as an input.
+    """
+    dataset_node_id = get_flow_node_id(flow_graph_nodes, dataset_name)
+    consumer_recipe_names = [flow_graph_nodes[node_id]["ref"] for node_id in flow_graph_nodes[dataset_node_id]["successors"]
+                             if check_if_flow_node_is_a_recipe(flow_graph_nodes[node_id])]
+    return consumer_recipe_names
+
+
+def get_flow_dataset_producer_recipe_names(flow_graph_nodes, dataset_name):
+    """
+    Retrieves the names of all the recipes having a dataset as an output.
+
+    :param flow_graph_nodes: dict: Nodes of the flow graph, as we can get them with :function:`get_flow_graph_nodes`.
+    :param dataset_name: str: Name of the dataset.
+
+    :returns: producer_recipe_names: list: List of the recipes having the dataset as an output.
+    """
+    dataset_node_id = get_flow_node_id(flow_graph_nodes, dataset_name)
+    producer_recipe_names = [flow_graph_nodes[node_id]["ref"] for node_id in flow_graph_nodes[dataset_node_id]["predecessors"]
+                             if check_if_flow_node_is_a_recipe(flow_graph_nodes[node_id])]
+    return producer_recipe_names
+
+
+def compute_flow_nodes_topological_order(flow_graph_nodes):
+    """
+    Computes a topological order of the flow graph nodes: each node comes after all its predecessors.
+
+    :param flow_graph_nodes: dict: Nodes of the flow graph, as we can get them with :function:`get_flow_graph_nodes`.
+
+    :returns: sorted_node_ids: list: List of the flow node IDs, in topological order.
+    """
+    n_unvisited_predecessors = {node_id: len([predecessor_id for predecessor_id in flow_graph_node["predecessors"]
+                                              if predecessor_id in flow_graph_nodes])
+                                for node_id, flow_graph_node in flow_graph_nodes.items()}
+    nodes_to_visit = [node_id for node_id, n_predecessors in n_unvisited_predecessors.items() if n_predecessors == 0]
+    sorted_node_ids = []
+    while len(nodes_to_visit) > 0:
+        node_id = nodes_to_visit.pop()
+        sorted_node_ids.append(node_id)
+        for successor_id in flow_graph_nodes[node_id]["successors"]:
+            if successor_id not in n_unvisited_predecessors:
+                continue
+            n_unvisited_predecessors[successor_id] -= 1
+            if n_unvisited_predecessors[successor_id] == 0:
+                nodes_to_visit.append(successor_id)
+    if len(sorted_node_ids) != len(flow_graph_nodes):
+        log_message = "The flow graph contains a cycle: can't sort its nodes in topological order!"
+        raise Exception(log_message)
+    return sorted_node_ids
+
+
+def compute_flow_nodes_depths(flow_graph_nodes):
+    """
+    Computes the depth of each flow graph node, being the length of the longest path leading to it
+        from a flow source.
+
+    :param flow_graph_nodes: dict: Nodes of the flow graph, as we can get them with :function:`get_flow_graph_nodes`.
+
+    :returns: flow_nodes_depths: dict: Mapping between the flow node IDs and their depth.
+    """
+    flow_nodes_depths = {}
+    for node_id in compute_flow_nodes_topological_order(flow_graph_nodes):
+        predecessor_depths = [flow_nodes_depths[predecessor_id] for predecessor_id in flow_graph_nodes[node_id]["predecessors"]
+                              if predecessor_id in flow_nodes_depths]
+        flow_nodes_depths[node_id] = (max(predecessor_depths) + 1) if len(predecessor_depths) > 0 else 0
+    return flow_nodes_depths
+
+
+def sort_flow_objects_downstream_first(flow_graph_nodes, object_names):
+    """
+    Groups project objects (datasets, recipes...) by flow depth, the most downstream objects coming first.
+        Objects sharing the same depth have no dependency between each other.
+
+    :param flow_graph_nodes: dict: Nodes of the flow graph, as we can get them with :function:`get_flow_graph_nodes`.
+    :param object_names: list: List of the object names to sort.
+
+    :returns: object_names_by_depth: list: List of (depth, object names) tuples, ordered by decreasing depth.
+    """
+    flow_nodes_depths = compute_flow_nodes_depths(flow_graph_nodes)
+    object_names_per_depth = {}
+    for object_name in object_names:
+        object_depth = flow_nodes_depths[get_flow_node_id(flow_graph_nodes, object_name)]
+        object_names_per_depth.setdefault(object_depth, []).append(object_name)
+    object_names_by_depth = sorted(object_names_per_depth.items(), key=lambda depth_and_names: -depth_and_names[0])
+    return object_names_by_depth
@@ -0,0 +1,205 @@
+import pandas as pd
+from .flow_graph import (get_flow_graph_nodes,
+                         check_if_flow_node_is_a_dataset,
+                         check_if_flow_node_is_a_recipe,
+                         compute_flow_nodes_topological_order)
+from .column_lineage import load_flow_recipes_information
+from ..datasets.dataset_commons import get_dataset_settings_and_dictionary, get_dataset_last_records_count_and_size
+
+
+PIPELINE_ENGINES = ["SQL", "SPARK"]
+PIPELINE_CODE_RECIPE_ENGINES = {"sql_query": "SQL",
+                                "spark_sql_query": "SPARK",
+                                "pyspark": "SPARK",
+                                "spark_scala": "SPARK",
+                                "sparkr": "SPARK"}
+# Recipes storing their engine settings in their params rather than in their JSON payload:
+PARAMS_ENGINE_RECIPE_TYPES = ["prepare", "shaker", "sampling"]
+PIPELINE_ENGINE_PARAMS_KEYS = {"SQL": "sqlPipelineParams", "SPARK": "sparkSQL"}
+
+
+def get_recipe_engine_settings(recipe_settings, recipe_type, recipe_payload):
+    """
+    Retrieves the part of a recipe settings holding its 'engineType' and 'engineParams', depending on the recipe type
+        (see :function:`recipes.recipe_commons.switch_recipe_engine`).
+
+    :param recipe_settings: dataikuapi.dss.recipe.[RecipeType]Settings: Settings of the recipe.
+    :param recipe_type: str: Type of the recipe.
+    :param recipe_payload: dict: JSON payload of the recipe ('None' if the recipe has no JSON payload).
+
+    :returns: recipe_engine_settings: dict: The recipe engine settings ('None' if the recipe has no engine settings).
+    """
+    if (recipe_type in PARAMS_ENGINE_RECIPE_TYPES) or (recipe_type in PIPELINE_CODE_RECIPE_ENGINES):
+        recipe_engine_settings = recipe_settings.get_recipe_params()
+    elif recipe_type == "split":
+        recipe_engine_settings = recipe_settings.obj_payload
+    else:
+        recipe_engine_settings = recipe_payload if isinstance(recipe_payload, dict) else None
+    return recipe_engine_settings
+
+
+def get_recipe_pipeline_engine(recipe_type, recipe_engine_settings):
+    """
+    Retrieves the engine a recipe could be pipelined with: code recipes depend on their type, while
+        visual recipes depend on their selected engine.
+
+    :param recipe_type: str: Type of the recipe.
+    :param recipe_engine_settings: dict: The recipe engine settings, as we can get them with
+        :function:`get_recipe_engine_settings`.
+
+    :returns: pipeline_engine: str: The pipeline engine, in 'PIPELINE_ENGINES' ('None' if the recipe can't be pipelined).
+    """
+    if recipe_type in PIPELINE_CODE_RECIPE_ENGINES:
+        return PIPELINE_CODE_RECIPE_ENGINES[recipe_type]
+    if recipe_engine_settings is None:
+        return None
+    pipeline_engine = recipe_engine_settings.get("engineType")
+    if pipeline_engine not in PIPELINE_ENGINES:
+        pipeline_engine = None
+    return pipeline_engine
+
+
+def enable_recipe_pipelining(recipe_engine_settings, pipeline_engine):
+    """
+    Allows a recipe to start a pipeline and to be merged in an existing pipeline of its engine.
+        The recipe settings still need to be saved.
+
+    :param recipe_engine_settings: dict: The recipe engine settings, as we can get them with
+        :function:`get_recipe_engine_settings`.
+    :param pipeline_engine: str: The pipeline engine, in 'PIPELINE_ENGINES'.
+
+    :returns: bool_settings_changed: bool: Boolean precising if the recipe settings changed.
+    """
+    pipeline_params = recipe_engine_settings.setdefault("engineParams", {})\
+        .setdefault(PIPELINE_ENGINE_PARAMS_KEYS[pipeline_engine], {})
+    bool_settings_changed = False
+    for pipeline_param in ["pipelineAllowStart", "pipelineAllowMerge"]:
+        if pipeline_params.get(pipeline_param) != True:
+            pipeline_params[pipeline_param] = True
+            bool_settings_changed = True
+    return bool_settings_changed
+
+
+def compute_flow_pipelines(flow_graph_nodes, flow_recipes_pipeline_engines):
+    """
+    Computes the pipelines that can be built in a flow: chains of consecutive recipes sharing the same pipeline engine,
+        linked by intermediate datasets that have no other consumer. These intermediate datasets can be virtualized,
+        which means they are never written when the pipeline is built.
+        Datasets without any consumer are flow outputs and are always written.
+
+    :param flow_graph_nodes: dict: Nodes of the flow graph, as we can get them with :function:`get_flow_graph_nodes`.
+    :param flow_recipes_pipeline_engines: dict: Mapping between the recipe names and their pipeline engine
+        (see :function:`get_recipe_pipeline_engine`).
+
+    :returns: flow_pipelines: list: List of the pipelines, in flow order, each being a dictionary with keys 'pipeline_engine',
+        'recipe_names' (in flow order) and 'virtualizable_datasets' (list of (dataset_name, producer_recipe_name,
+        consumer_recipe_name) tuples).
+    """
+    sorted_node_ids = compute_flow_nodes_topological_order(flow_graph_nodes)
+    recipe_pipeline_roots = {}
+
+    def find_pipeline_root(recipe_name):
+        while recipe_pipeline_roots[recipe_name] != recipe_name:
+            recipe_pipeline_roots[recipe_name] = recipe_pipeline_roots[recipe_pipeline_roots[recipe_name]]
+            recipe_name = recipe_pipeline_roots[recipe_name]
+        return recipe_name
+
+    virtualizable_datasets = []
+    for node_id in sorted_node_ids:
+        flow_graph_node = flow_graph_nodes[node_id]
+        if not check_if_flow_node_is_a_dataset(flow_graph_node):
+            continue
+        predecessor_ids = [predecessor_id for predecessor_id in flow_graph_node["predecessors"] if predecessor_id in flow_graph_nodes]
+        successor_ids = [successor_id for successor_id in flow_graph_node["successors"] if successor_id in flow_graph_nodes]
+        if (len(predecessor_ids) != 1) or (len(successor_ids) != 1):
+            continue
+        producer_recipe_name = flow_graph_nodes[predecessor_ids[0]].get("ref")
+        consumer_recipe_name = flow_graph_nodes[successor_ids[0]].get("ref")
+        pipeline_engine = flow_recipes_pipeline_engines.get(producer_recipe_name)
+        if (pipeline_engine is None) or (flow_recipes_pipeline_engines.get(consumer_recipe_name) != pipeline_engine):
+            continue
+        for recipe_name in [producer_recipe_name, consumer_recipe_name]:
+            recipe_pipeline_roots.setdefault(recipe_name, recipe_name)
+        recipe_pipeline_roots[find_pipeline_root(consumer_recipe_name)] = find_pipeline_root(producer_recipe_name)
+        virtualizable_datasets.append((flow_graph_node["ref"], producer_recipe_name, consumer_recipe_name))
+
+    pipelines_per_root = {}
+    for node_id in sorted_node_ids:
+        recipe_name = flow_graph_nodes[node_id].get("ref")
+        if check_if_flow_node_is_a_recipe(flow_graph_nodes[node_id]) and (recipe_name in recipe_pipeline_roots):
+            pipeline_root = find_pipeline_root(recipe_name)
+            flow_pipeline = pipelines_per_root.setdefault(pipeline_root, {"pipeline_engine": flow_recipes_pipeline_engines[recipe_name],
+                                                                          "recipe_names": [],
+                                                                          "virtualizable_datasets": []})
+            flow_pipeline["recipe_names"].append(recipe_name)
+    for dataset_name, producer_recipe_name, consumer_recipe_name in virtualizable_datasets:
+        pipelines_per_root[find_pipeline_root(producer_recipe_name)]["virtualizable_datasets"]\
+            .append((dataset_name, producer_recipe_name, consumer_recipe_name))
+    flow_pipelines = list(pipelines_per_root.values())
+    return flow_pipelines
+
+
+def plan_flow_pipelines(project, bool_apply_plan=False):
+    """
+    Plans the SQL and Spark pipelines of a project flow (see :function:`compute_flow_pipelines`), and reports the
+        dataset writes they avoid, based on the last computed 'records count' and 'size' metrics of the datasets.
+        By default, this is a dry run: nothing is changed in the flow. When the plan is applied, intermediate datasets are
+        marked as virtualizable and pipelining is enabled on the pipeline recipes.
+        SQL and Spark pipelines must also be enabled in the project settings to be used by the builds.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param bool_apply_plan: bool: Precise if you want to apply the plan to the flow.
+
+    :returns: flow_pipelines_df: pandas.core.frame.DataFrame: DataFrame containing one row per virtualizable dataset,
+        with columns 'pipeline_index', 'pipeline_engine', 'pipeline_recipe_names', 'dataset_name', 'producer_recipe_name',
+        'consumer_recipe_name', 'bool_already_virtualizable', 'records_count' and 'size'.
+    """
+    print("Planning project '{}' SQL and Spark pipelines ...".format(project.project_key))
+    flow_graph_nodes = get_flow_graph_nodes(project)
+    flow_recipes_information = load_flow_recipes_information(project, flow_graph_nodes)
+    flow_recipes_engine_settings = {}
+    flow_recipes_pipeline_engines = {}
+    for recipe_name, recipe_information in flow_recipes_information.items():
+        recipe_engine_settings = get_recipe_engine_settings(recipe_information["recipe_settings"],
+                                                            recipe_information["recipe_type"],
+                                                            recipe_information["recipe_payload"])
+        flow_recipes_engine_settings[recipe_name] = recipe_engine_settings
+        flow_recipes_pipeline_engines[recipe_name] = get_recipe_pipeline_engine(recipe_information["recipe_type"],
+                                                                                recipe_engine_settings)
+    flow_pipelines = compute_flow_pipelines(flow_graph_nodes, flow_recipes_pipeline_engines)
+
+    flow_pipelines_rows = []
+    for pipeline_index, flow_pipeline in enumerate(flow_pipelines):
+        for dataset_name, producer_recipe_name, consumer_recipe_name in flow_pipeline["virtualizable_datasets"]:
+            dataset_settings, dataset_settings_dict = get_dataset_settings_and_dictionary(project, dataset_name, True)
+            bool_already_virtualizable = dataset_settings_dict.get("flowOptions", {}).get("virtualizable", False)
+            dataset_records_count, dataset_size = get_dataset_last_records_count_and_size(project, dataset_name)
+            flow_pipelines_rows.append({"pipeline_index": pipeline_index,
+                                        "pipeline_engine": flow_pipeline["pipeline_engine"],
+                                        "pipeline_recipe_names": flow_pipeline["recipe_names"],
+                                        "dataset_name": dataset_name,
+                                        "producer_recipe_name": producer_recipe_name,
+                                        "consumer_recipe_name": consumer_recipe_name,
+                                        "bool_already_virtualizable": bool_already_virtualizable,
+                                        "records_count": dataset_records_count,
+                                        "size": dataset_size})
+            if bool_apply_plan and (not bool_already_virtualizable):
+                dataset_settings_dict.setdefault("flowOptions", {})["virtualizable"] = True
+                dataset_settings.save()
+                print("Dataset '{}' marked as virtualizable.".format(dataset_name))
+        if bool_apply_plan:
+            for recipe_name in flow_pipeline["recipe_names"]:
+                if enable_recipe_pipelining(flow_recipes_engine_settings[recipe_name], flow_pipeline["pipeline_engine"]):
+                    flow_recipes_information[recipe_name]["recipe_settings"].save()
+                    print("Recipe '{}' pipelining enabled ({}).".format(recipe_name, flow_pipeline["pipeline_engine"]))
+
+    flow_pipelines_df = pd.DataFrame(flow_pipelines_rows, columns=["pipeline_index", "pipeline_engine", "pipeline_recipe_names",
+                                                                   "dataset_name", "producer_recipe_name", "consumer_recipe_name",
+                                                                   "bool_already_virtualizable", "records_count", "size"])
+    avoided_writes_df = flow_pipelines_df[~flow_pipelines_df["bool_already_virtualizable"].astype(bool)]
+    print("Project '{}' pipelines planned: {} pipelines, {} dataset writes avoided ({} records, {} bytes, "
+          "datasets without metrics excluded){}".format(project.project_key, len(flow_pipelines), len(avoided_writes_df),
+                                                        int(avoided_writes_df["records_count"].fillna(0).sum()),
+                                                        int(avoided_writes_df["size"].fillna(0).sum()),
+                                                        "." if bool_apply_plan else " (dry run)."))
+    return flow_pipelines_df
@@ -0,0 +1,289 @@
+import copy
+import json
+import pandas as pd
+from .flow_graph import (get_flow_graph_nodes,
+                         check_if_flow_node_is_a_recipe,
+                         compute_flow_nodes_topological_order,
+                         get_flow_dataset_consumer_recipe_names)
+from .column_lineage import load_flow_recipes_information
+from ..recipes.recipe_commons import update_recipe_ouput_schema, rewire_inputs
+from ..recipes.window_recipe import compute_window_recipe_output_columns
+
+
+WINDOW_RANKING_FLAGS = ["rowNumber", "rank", "denseRank", "cumeDist", "percentRank", "ntile"]
+WINDOW_FRAME_SETTINGS_KEYS = ["enableLimits", "limitPreceding", "limitFollowing",
+                              "enableValueLimits", "valueLimitPreceding", "valueLimitFollowing"]
+# Parts of a window recipe payload that must be identical for recipes to be merged:
+WINDOW_MERGE_PAYLOAD_KEYS = ["computedColumns", "preFilter", "postFilter"]
+
+
+def compute_window_sort_key(window_settings):
+    """
+    Computes the sort a window requires: its partitioning columns and its orders. Windows sharing the same
+        sort key on the same input can be computed from a single sort of the data.
+
+    :param window_settings: dict: Settings of the window, from the 'windows' section of the recipe payload.
+
+    :returns: window_sort_key: tuple: Tuple (partitioning_columns, orders), partitioning columns being sorted by name
+        and orders being a tuple of (column, bool_descending) tuples.
+    """
+    partitioning_columns = []
+    if window_settings.get("enablePartitioning", False):
+        partitioning_columns = sorted(window_settings.get("partitioningColumns", []))
+    orders = []
+    if window_settings.get("enableOrdering", False):
+        orders = [(order["column"], order.get("desc", False)) for order in window_settings.get("orders", [])]
+    window_sort_key = (tuple(partitioning_columns), tuple(orders))
+    return window_sort_key
+
+
+def compute_window_recipe_merge_key(recipe_payload):
+    """
+    Computes the key identifying the window recipes that can be merged: recipes on the same input that have the same
+        computed columns, filters, and windows (sorts and frames). Ranking flags are not part of the key as they
+        can be merged.
+
+    :param recipe_payload: dict: JSON payload of the window recipe.
+
+    :returns: window_recipe_merge_key: str: The merge key.
+    """
+    merge_key_parts = {payload_key: recipe_payload.get(payload_key) for payload_key in WINDOW_MERGE_PAYLOAD_KEYS}
+    merge_key_parts["windows"] = [[compute_window_sort_key(window_settings),
+                                   [window_settings.get(frame_key) for frame_key in WINDOW_FRAME_SETTINGS_KEYS]]
+                                  for window_settings in recipe_payload.get("windows", [])]
+    window_recipe_merge_key = json.dumps(merge_key_parts, sort_keys=True, default=str)
+    return window_recipe_merge_key
+
+
+def merge_window_recipe_payloads(recipe_payloads):
+    """
+    Merges the payloads of window recipes having the same merge key (see :function:`compute_window_recipe_merge_key`)
+        into a single payload computing all their aggregations and ranking columns.
+
+    :param recipe_payloads: list: List of the window recipe JSON payloads. The first one is the merge target.
+
+    :returns: merged_recipe_payload: dict: The merged JSON payload.
+    """
+    merged_recipe_payload = copy.deepcopy(recipe_payloads[0])
+    merged_columns_settings = {column_settings["column"]: column_settings
+                               for column_settings in merged_recipe_payload.get("values", [])}
+    merged_output_column_name_overrides = merged_recipe_payload.setdefault("outputColumnNameOverrides", {})
+    for recipe_payload in recipe_payloads[1:]:
+        for column_settings in recipe_payload.get("values", []):
+            column_name = column_settings["column"]
+            if not any([value == True for value in column_settings.values()]):
+                continue
+            merged_column_settings = merged_columns_settings.get(column_name)
+            if merged_column_settings is None:
+                merged_recipe_payload.setdefault("values", []).append(copy.deepcopy(column_settings))
+                merged_columns_settings[column_name] = merged_recipe_payload["values"][-1]
+                continue
+            bool_merged_column_is_aggregated = any([value == True for value in merged_column_settings.values()])
+            for setting_key, setting_value in column_settings.items():
+                if isinstance(setting_value, bool):
+                    merged_column_settings[setting_key] = merged_column_settings.get(setting_key, False) or setting_value
+                elif not bool_merged_column_is_aggregated:
+                    merged_column_settings[setting_key] = setting_value
+                elif merged_column_settings.get(setting_key) != setting_value:
+                    log_message = "Column '{}' has different '{}' settings in the merged window recipes ('{}' and '{}')!"\
+                        .format(column_name, setting_key, merged_column_settings.get(setting_key), setting_value)
+                    raise Exception(log_message)
+        for output_column, output_column_override in recipe_payload.get("outputColumnNameOverrides", {}).items():
+            if merged_output_column_name_overrides.get(output_column, output_column_override) != output_column_override:
+                log_message = "Output column '{}' is renamed differently in the merged window recipes ('{}' and '{}')!"\
+                    .format(output_column, merged_output_column_name_overrides[output_column], output_column_override)
+                raise Exception(log_message)
+            merged_output_column_name_overrides[output_column] = output_column_override
+        for merged_window_settings, window_settings in zip(merged_recipe_payload.get("windows", []),
+                                                          recipe_payload.get("windows", [])):
+            if window_settings.get("ntile", False) == True:
+                if (merged_window_settings.get("ntile", False) == True)\
+                        and (merged_window_settings.get("nTile") != window_settings.get("nTile")):
+                    log_message = "Window recipes compute 'ntile' with different numbers of tiles ('{}' and '{}')!"\
+                        .format(merged_window_settings.get("nTile"), window_settings.get("nTile"))
+                    raise Exception(log_message)
+                merged_window_settings["nTile"] = window_settings.get("nTile")
+            for ranking_flag in WINDOW_RANKING_FLAGS:
+                merged_window_settings[ranking_flag] = (merged_window_settings.get(ranking_flag, False) == True)\
+                    or (window_settings.get(ranking_flag, False) == True)
+
+    merged_output_columns = [output_column_information["output_column"]
+                             for output_column_information in compute_window_recipe_output_columns(merged_recipe_payload)]
+    duplicated_output_columns = sorted(set([output_column for output_column in merged_output_columns
+                                            if merged_output_columns.count(output_column) > 1]))
+    if len(duplicated_output_columns) > 0:
+        log_message = "Merged window recipe would have duplicated output columns '{}'!".format(duplicated_output_columns)
+        raise Exception(log_message)
+    return merged_recipe_payload
+
+
+def compute_flow_window_sorts(flow_graph_nodes, flow_recipes_information):
+    """
+    Lists the sorts required by all the windows of the flow window recipes, grouped by input dataset and sort key
+        (see :function:`compute_window_sort_key`). Each group is sorted once per window it contains.
+
+    :param flow_graph_nodes: dict: Nodes of the flow graph, as we can get them with :function:`get_flow_graph_nodes`.
+    :param flow_recipes_information: dict: Information of the flow recipes, as we can get them with
+        :function:`column_lineage.load_flow_recipes_information`.
+
+    :returns: flow_window_sorts: dict: Mapping between the (input_dataset_name, window_sort_key) tuples and the list
+        of the (recipe_name, window_id) tuples requiring that sort, recipes being in flow order.
+    """
+    flow_window_sorts = {}
+    for node_id in compute_flow_nodes_topological_order(flow_graph_nodes):
+        flow_graph_node = flow_graph_nodes[node_id]
+        if not check_if_flow_node_is_a_recipe(flow_graph_node):
+            continue
+        recipe_name = flow_graph_node["ref"]
+        recipe_information = flow_recipes_information.get(recipe_name)
+        if (recipe_information is None) or (recipe_information["recipe_type"] != "window")\
+                or (len(recipe_information["input_dataset_names"]) != 1):
+            continue
+        input_dataset_name = recipe_information["input_dataset_names"][0]
+        for window_id, window_settings in enumerate(recipe_information["recipe_payload"].get("windows", [])):
+            window_sort_key = compute_window_sort_key(window_settings)
+            flow_window_sorts.setdefault((input_dataset_name, window_sort_key), []).append((recipe_name, window_id))
+    return flow_window_sorts
+
+
+def merge_window_recipes(project, target_recipe_name, merged_recipe_names, flow_recipes_information,
+                         bool_drop_merged_recipes=False):
+    """
+    Merges sibling window recipes into a target recipe: the target computes all their aggregations, then the consumers
+        of the merged recipes outputs are rewired on the target recipe output.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param target_recipe_name: str: Name of the recipe receiving the merged aggregations.
+    :param merged_recipe_names: list: List of the recipes merged into the target recipe.
+    :param flow_recipes_information: dict: Information of the flow recipes, as we can get them with
+        :function:`column_lineage.load_flow_recipes_information`.
+    :param bool_drop_merged_recipes: bool: Precise if the merged recipes and their output datasets should be deleted
+        once all their consumers are rewired. Outputs without any consumer are flow outputs: they are never deleted.
+
+    :returns: rewiring_report_df: pandas.core.frame.DataFrame: The report of the consumers rewiring
+        (see :function:`recipes.recipe_commons.rewire_inputs`).
+    """
+    target_recipe_information = flow_recipes_information[target_recipe_name]
+    recipe_payloads = [target_recipe_information["recipe_payload"]] + \
+        [flow_recipes_information[recipe_name]["recipe_payload"] for recipe_name in merged_recipe_names]
+    merged_recipe_payload = merge_window_recipe_payloads(recipe_payloads)
+    target_recipe_settings = target_recipe_information["recipe_settings"]
+    target_recipe_settings.set_json_payload(merged_recipe_payload)
+    target_recipe_settings.save()
+    update_recipe_ouput_schema(project, target_recipe_name)
+    target_output_dataset_name = target_recipe_information["output_dataset_names"][0]
+    input_mapping = {flow_recipes_information[recipe_name]["output_dataset_names"][0]: target_output_dataset_name
+                     for recipe_name in merged_recipe_names}
+    flow_graph_nodes = get_flow_graph_nodes(project)
+    merged_outputs_consumer_recipe_names = {merged_output_dataset_name: get_flow_dataset_consumer_recipe_names(flow_graph_nodes,
+                                                                                                             merged_output_dataset_name)
+                                            for merged_output_dataset_name in input_mapping.keys()}
+    rewiring_report_df = rewire_inputs(project, input_mapping)
+    print("Window recipes '{}' merged into recipe '{}'.".format(merged_recipe_names, target_recipe_name))
+    if bool_drop_merged_recipes:
+        rewired_recipe_names = list(rewiring_report_df[rewiring_report_df["status"] == "REWIRED"]["recipe_name"])
+        for recipe_name in merged_recipe_names:
+            merged_output_dataset_name = flow_recipes_information[recipe_name]["output_dataset_names"][0]
+            consumer_recipe_names = merged_outputs_consumer_recipe_names[merged_output_dataset_name]
+            if len(consumer_recipe_names) == 0:
+                print("WARNING: dataset '{}' is a flow output: recipe '{}' and its output dataset are not deleted."
+                      .format(merged_output_dataset_name, recipe_name))
+            elif any([consumer_recipe_name not in rewired_recipe_names for consumer_recipe_name in consumer_recipe_names]):
+                print("WARNING: some consumers of dataset '{}' could not be rewired: recipe '{}' and its output dataset "
+                      "are not deleted.".format(merged_output_dataset_name, recipe_name))
+            else:
+                project.get_recipe(recipe_name).delete()
+                project.get_dataset(merged_output_dataset_name).delete(drop_data=True)
+                print("Merged window recipe '{}' and its output dataset deleted.".format(recipe_name))
+    return rewiring_report_df
+
+
+def advise_flow_window_consolidation(project, bool_apply_merges=False, bool_drop_merged_recipes=False):
+    """
+    Looks for windows sorting the same data the same way, in one window recipe or across sibling window recipes:
+        each of these windows forces another full sort of its input. Sibling recipes having the same computed
+        columns, filters and windows (see :function:`compute_window_recipe_merge_key`) can be merged into a single
+        recipe computing all their aggregations. The merge target is the recipe whose output has the most consumers,
+        so that the fewest recipes are rewired.
+        By default, this is a dry run: nothing is changed in the flow.
+        Merged recipes outputs get the columns of all the merged recipes.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param bool_apply_merges: bool: Precise if the mergeable recipes should be merged.
+    :param bool_drop_merged_recipes: bool: Precise if the merged recipes and their output datasets should be deleted,
+        when merges are applied. Merged recipes are only deleted once all their consumers are rewired: recipes whose
+        output has no consumer (flow outputs) are kept.
+
+    :returns: window_consolidation_df: pandas.core.frame.DataFrame: DataFrame containing one row per window sharing
+        its sort with other windows, with columns 'sort_index', 'input_dataset_name', 'partitioning_columns',
+        'orders', 'recipe_name', 'window_id', 'merge_target_recipe_name' and 'merge_status'. Merge statuses are
+        'MERGE_TARGET', 'MERGEABLE', 'MERGED', 'CONFLICT: [reason]', 'SAME_RECIPE' (other windows of the same recipe)
+        and 'NOT_MERGEABLE' (different filters, computed columns or frames).
+    """
+    print("Looking for window recipes sharing their sorts in project '{}' ...".format(project.project_key))
+    flow_graph_nodes = get_flow_graph_nodes(project)
+    flow_recipes_information = load_flow_recipes_information(project, flow_graph_nodes)
+    flow_window_sorts = compute_flow_window_sorts(flow_graph_nodes, flow_recipes_information)
+
+    recipes_merge_targets = {}
+    recipes_merge_statuses = {}
+    merge_groups = {}
+    for (input_dataset_name, __), window_recipes in flow_window_sorts.items():
+        for recipe_name, __ in window_recipes:
+            recipe_information = flow_recipes_information[recipe_name]
+            if (recipe_name in recipes_merge_statuses) or (len(recipe_information["output_dataset_names"]) != 1):
+                continue
+            merge_key = (input_dataset_name, compute_window_recipe_merge_key(recipe_information["recipe_payload"]))
+            merge_groups.setdefault(merge_key, []).append(recipe_name)
+            recipes_merge_statuses[recipe_name] = "NOT_MERGEABLE"
+    for merge_group_recipe_names in merge_groups.values():
+        if len(merge_group_recipe_names) < 2:
+            continue
+        merge_group_recipe_names = sorted(merge_group_recipe_names, key=lambda recipe_name: -len(
+            get_flow_dataset_consumer_recipe_names(flow_graph_nodes,
+                                                   flow_recipes_information[recipe_name]["output_dataset_names"][0])))
+        target_recipe_name = merge_group_recipe_names[0]
+        merged_recipe_names = merge_group_recipe_names[1:]
+        try:
+            merge_window_recipe_payloads([flow_recipes_information[recipe_name]["recipe_payload"]
+                                          for recipe_name in merge_group_recipe_names])
+            merge_status = "MERGEABLE"
+        except Exception as exception:
+            merge_status = "CONFLICT: {}".format(exception)
+        if bool_apply_merges and (merge_status == "MERGEABLE"):
+            merge_window_recipes(project, target_recipe_name, merged_recipe_names, flow_recipes_information,
+                                 bool_drop_merged_recipes)
+            merge_status = "MERGED"
+        for recipe_name in merge_group_recipe_names:
+            recipes_merge_targets[recipe_name] = target_recipe_name
+            recipes_merge_statuses[recipe_name] = merge_status
+        if not merge_status.startswith("CONFLICT"):
+            recipes_merge_statuses[target_recipe_name] = "MERGE_TARGET"
+
+    window_consolidation_rows = []
+    sort_index = 0
+    for (input_dataset_name, window_sort_key), window_recipes in flow_window_sorts.items():
+        if len(window_recipes) < 2:
+            continue
+        for recipe_name, window_id in window_recipes:
+            merge_status = recipes_merge_statuses.get(recipe_name, "NOT_MERGEABLE")
+            if len(set([window_recipe_name for window_recipe_name, __ in window_recipes])) == 1:
+                merge_status = "SAME_RECIPE"
+            window_consolidation_rows.append({"sort_index": sort_index,
+                                              "input_dataset_name": input_dataset_name,
+                                              "partitioning_columns": list(window_sort_key[0]),
+                                              "orders": list(window_sort_key[1]),
+                                              "recipe_name": recipe_name,
+                                              "window_id": window_id,
+                                              "merge_target_recipe_name": recipes_merge_targets.get(recipe_name),
+                                              "merge_status": merge_status})
+        sort_index += 1
+    window_consolidation_df = pd.DataFrame(window_consolidation_rows,
+                                           columns=["sort_index", "input_dataset_name", "partitioning_columns", "orders",
+                                                    "recipe_name", "window_id", "merge_target_recipe_name",
+                                                    "merge_status"])
+    n_merged_recipes = len([recipe_name for recipe_name, merge_status in recipes_merge_statuses.items()
+                            if merge_status in ["MERGEABLE", "MERGED"]])
+    print("Project '{}' window sorts analyzed: {} sorts shared by several windows, {} window recipes {}."
+          .format(project.project_key, sort_index, n_merged_recipes, "merged" if bool_apply_merges else "mergeable"))
+    return window_consolidation_df
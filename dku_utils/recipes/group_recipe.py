@@ -1,8 +1,13 @@
 import dataikuapi
-from .recipe_commons import get_recipe_settings_and_dictionary
+from .recipe_commons import get_recipe_settings_and_dictionary, VisualRecipeBuilder
 from ..datasets.dataset_commons import create_dataset_in_connection
 
 
+GROUP_POSSIBLE_AGGREGATIONS = ["countDistinct", "min", "max", "avg", "sum", "stddev",
+                               "count", "first", "last", "concat", "concatDistinct"]
+GROUP_AGGREGATIONS_OUTPUT_SUFFIXES = {"countDistinct": "distinct", "concatDistinct": "concat_distinct"}
+
+
 def instantiate_group_recipe(project, recipe_name, recipe_input_dataset_name,
                              recipe_output_dataset_name, connection_name):
     """
@@ -44,6 +49,67 @@ def define_group_recipe_aggregation_key(project, recipe_name, group_key, replace
     pass
 
 
+def compute_group_recipe_aggregations(recipe_column_aggregations, column_aggregations_mapping):
+    """
+    Computes the 'values' section of a group recipe payload, from its current column aggregations.
+        The settings of the columns already aggregated (ex: 'concatSeparator') are preserved.
+
+    :param recipe_column_aggregations: list: Current 'values' section of the group recipe payload.
+    :param column_aggregations_mapping: dict: Mapping between the columns and the list of aggregations to apply to each one.
+        Example: {'column_1': ['min', 'concat'], 'column_2': ['avg', 'sum']}
+
+    :returns: recipe_aggregations: list: New 'values' section of the group recipe payload.
+    """
+    recipe_column_aggregations_mapping = {column_aggregation["column"]: column_aggregation
+                                          for column_aggregation in recipe_column_aggregations}
+    recipe_aggregations = []
+    for column in column_aggregations_mapping.keys():
+        column_asked_aggregations = column_aggregations_mapping[column]
+        recipe_column_settings = recipe_column_aggregations_mapping.get(column, {"column": column})
+        for aggregation in GROUP_POSSIBLE_AGGREGATIONS:
+            if aggregation in column_asked_aggregations:
+                recipe_column_settings[aggregation] = True
+            else:
+                recipe_column_settings[aggregation] = False
+        recipe_aggregations.append(recipe_column_settings)
+    return recipe_aggregations
+
+
+def compute_group_recipe_output_columns(recipe_json_payload):
+    """
+    Computes the output columns of a group recipe from its JSON payload, following DSS default naming
+        ('column_1_min', 'column_2_distinct', 'count' for the global count...) and the output column name overrides.
+
+    :param recipe_json_payload: dict: JSON payload of the group recipe.
+
+    :returns: group_recipe_output_columns: list: List of the output columns, in output order, with format:
+        [{'output_column': 'column_1', 'input_column': 'column_1', 'aggregation': None},
+         {'output_column': 'column_2_sum', 'input_column': 'column_2', 'aggregation': 'sum'},
+         {'output_column': 'count', 'input_column': None, 'aggregation': 'count'}, ...]
+        Group key columns have no aggregation.
+    """
+    output_column_name_overrides = recipe_json_payload.get("outputColumnNameOverrides", {})
+    group_recipe_output_columns = []
+    for key_settings in recipe_json_payload.get("keys", []):
+        group_recipe_output_columns.append({"output_column": key_settings["column"],
+                                            "input_column": key_settings["column"],
+                                            "aggregation": None})
+    for column_aggregation in recipe_json_payload.get("values", []):
+        for aggregation in GROUP_POSSIBLE_AGGREGATIONS:
+            if column_aggregation.get(aggregation, False) == True:
+                output_column = "{}_{}".format(column_aggregation["column"],
+                                               GROUP_AGGREGATIONS_OUTPUT_SUFFIXES.get(aggregation, aggregation))
+                group_recipe_output_columns.append({"output_column": output_column,
+                                                    "input_column": column_aggregation["column"],
+                                                    "aggregation": aggregation})
+    if recipe_json_payload.get("globalCount", False):
+        group_recipe_output_columns.append({"output_column": "count", "input_column": None, "aggregation": "count"})
+    for output_column_information in group_recipe_output_columns:
+        output_column = output_column_information["output_column"]
+        output_column_information["output_column"] = output_column_name_overrides.get(output_column, output_column)
+    return group_recipe_output_columns
+
+
 def define_group_recipe_aggregations(project, recipe_name, column_aggregations_mapping, bool_compute_global_count):
     """
     Set aggregations done by a group recipe.
@@ -55,22 +121,10 @@ def define_group_recipe_aggregations(project, recipe_name, column_aggregations_m
     :param bool_compute_global_count: bool: Precise whether you want to compute the global count of the recipe or not.
     """
     print("Updating recipe '{}' aggregations ...".format(recipe_name))
-    POSSIBLE_AGGREGATIONS = ["countDistinct", "min", "max", "avg", "sum", "stddev",
-                             "count", "first", "last", "concat", "concatDistinct"]
-    
     recipe_settings, __ = get_recipe_settings_and_dictionary(project, recipe_name, False)
     recipe_json_payload = recipe_settings.get_json_payload()
-    recipe_aggregations = []
-    for column in column_aggregations_mapping.keys():
-        column_asked_aggregations = column_aggregations_mapping[column]
-        recipe_column_settings = recipe_settings.get_or_create_column_settings(column)
-        for aggregation in POSSIBLE_AGGREGATIONS:
-            if aggregation in column_asked_aggregations:
-                recipe_column_settings[aggregation] = True
-            else:
-                recipe_column_settings[aggregation] = False
-        recipe_aggregations.append(recipe_column_settings)
-    recipe_json_payload["values"] = recipe_aggregations
+    recipe_json_payload["values"] = compute_group_recipe_aggregations(recipe_json_payload.get("values", []),
+                                                                      column_aggregations_mapping)
     recipe_settings.set_json_payload(recipe_json_payload)
     recipe_settings.set_global_count_enabled(bool_compute_global_count)
     recipe_settings.save()
@@ -121,3 +175,95 @@ def change_group_recipe_concatenation(project, recipe_name, column_name, bool_ac
     recipe_settings.set_json_payload(recipe_payload)
     recipe_settings.save()
     pass
+
+
+class GroupRecipeBuilder(VisualRecipeBuilder):
+    """
+    Accumulates the group key, aggregations, concatenation settings and output column name overrides
+        of a group recipe, then validates and saves them in a single settings update.
+    """
+
+    ALLOWED_RECIPE_TYPES = ["grouping"]
+
+    def set_group_key(self, group_key, replace_existing_key=True):
+        """
+        Changes the aggregation key of the group recipe.
+
+        :param group_key: list: List of the column names part of the group key update.
+        :param replace_existing_key: bool: Precise if you want to replace the existing group key or instead add columns
+            mentioned in 'group_key' to the current recipe aggregation key.
+
+        :returns: self
+        """
+        if replace_existing_key:
+            self.recipe_payload["keys"] = []
+        current_group_key = [key_settings["column"] for key_settings in self.recipe_payload.get("keys", [])]
+        for column in group_key:
+            if column not in current_group_key:
+                self.recipe_payload.setdefault("keys", []).append({"column": column})
+        return self
+
+    def set_aggregations(self, column_aggregations_mapping):
+        """
+        Sets the aggregations done by the group recipe.
+
+        :param column_aggregations_mapping: dict: Mapping between the columns and the list of aggregations to apply
+            to each one. Example: {'column_1': ['min', 'concat'], 'column_2': ['avg', 'sum']}
+
+        :returns: self
+        """
+        for column, column_asked_aggregations in column_aggregations_mapping.items():
+            for aggregation in column_asked_aggregations:
+                if aggregation not in GROUP_POSSIBLE_AGGREGATIONS:
+                    self.validation_errors.append("Aggregation '{}' asked on column '{}' is not allowed. Allowed "
+                                                  "aggregations are '{}'".format(aggregation, column, GROUP_POSSIBLE_AGGREGATIONS))
+        self.recipe_payload["values"] = compute_group_recipe_aggregations(self.recipe_payload.get("values", []),
+                                                                          column_aggregations_mapping)
+        return self
+
+    def set_global_count(self, bool_compute_global_count):
+        """
+        Sets whether the group recipe computes the global count of records.
+
+        :param bool_compute_global_count: bool: Precise whether you want to compute the global count of the recipe or not.
+
+        :returns: self
+        """
+        self.recipe_payload["globalCount"] = bool_compute_global_count
+        return self
+
+    def set_concatenation(self, column_name, bool_activate_concatenation, separator):
+        """
+        Updates, for one aggregated column, the settings related to the 'concat' aggregation.
+
+        :param column_name: str: Name of the column where we want to change the 'concat' settings.
+        :param bool_activate_concatenation: bool: Precise whether 'concat' should be activated or not in the recipe.
+        :param separator: str: Precise the values separator that should be used in the concatenation process.
+
+        :returns: self
+        """
+        column_aggregations = [column_aggregation for column_aggregation in self.recipe_payload.get("values", [])
+                               if column_aggregation["column"] == column_name]
+        if len(column_aggregations) == 0:
+            self.validation_errors.append("Column '{}' concatenation can't be set as the column is not aggregated"
+                                          .format(column_name))
+        for column_aggregation in column_aggregations:
+            column_aggregation["concat"] = bool_activate_concatenation
+            column_aggregation["concatSeparator"] = separator
+        return self
+
+    def validate(self):
+        """
+        Checks that the group key and aggregated columns exist in the recipe input dataset.
+        """
+        self.check_columns_are_in_recipe_input([key_settings["column"] for key_settings in self.recipe_payload.get("keys", [])],
+                                               "group key")
+        self.check_columns_are_in_recipe_input([column_aggregation["column"]
+                                                for column_aggregation in self.recipe_payload.get("values", [])],
+                                               "aggregated column")
+        recipe_input_column_datatypes = self.get_recipe_input_column_datatypes()
+        for column_aggregation in self.recipe_payload.get("values", []):
+            if column_aggregation["column"] in recipe_input_column_datatypes:
+                column_aggregation["type"] = recipe_input_column_datatypes[column_aggregation["column"]]
+        VisualRecipeBuilder.validate(self)
+        pass
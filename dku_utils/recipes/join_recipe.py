@@ -1,6 +1,17 @@
 import dataikuapi
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from ..datasets.dataset_commons import create_dataset_in_connection
-from ..datasets.dataset_commons import get_dataset_column_datatype
+from ..datasets.dataset_commons import get_dataset_schema, extract_dataset_schema_information
+from ..datasets.dataset_chunks import iter_dataset_chunks, DEFAULT_CHUNKSIZE
+from ..datasets.dataset_profiling import profile_dataframe_chunks_key
+
+
+JOIN_PLANNER_COLUMN_METRICS = ["COUNT_DISTINCT", "COUNT_NULL", "MIN", "MAX"]
+JOIN_SPECIFICATION_PARAMETERS = ["dataset_to_join_name", "dataset_to_join_columns_to_select", "columns_to_select_alias",
+                                 "dataset_computed_columns", "join_type", "columns_prefix", "left_join_key", "right_join_key"]
+JOIN_FAN_OUT_RATIO_THRESHOLD = 1.1
+JOIN_SKEW_KEY_SHARE_THRESHOLD = 0.1
 
 
 def instantiate_join_recipe(project, recipe_name, recipe_input_datasets,
@@ -52,12 +63,435 @@ def compute_join_recipe_computed_column_settings(computed_column_name, computed_
     return join_recipe_computed_column_settings
 
 
+def compute_join_recipe_output_column_name(selected_column, virtual_inputs):
+    """
+    Computes the output name of a join recipe selected column: its alias if any, else its name
+        prefixed with its virtual input prefix.
+
+    :param selected_column: dict: Settings of the selected column, with keys 'name', 'table' and optionally 'alias'.
+    :param virtual_inputs: list: Virtual inputs of the join recipe.
+
+    :returns: output_column_name: str: Output name of the column.
+    """
+    if selected_column.get("alias") not in [None, ""]:
+        return selected_column["alias"]
+    virtual_input_prefix = virtual_inputs[selected_column["table"]].get("prefix", "")
+    if virtual_input_prefix not in [None, ""]:
+        return "{}_{}".format(virtual_input_prefix, selected_column["name"])
+    return selected_column["name"]
+
+def get_dataset_join_statistics(project, dataset_name, key_columns):
+    """
+    Retrieves the statistics a join planner needs from the last computed metrics of a project dataset:
+        its records count and, for each key column, its distinct count, null count, min and max.
+        Statistics whose metric has never been computed are 'None'.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the dataset.
+    :param key_columns: list: List of the dataset key columns.
+
+    :returns: dataset_join_statistics: dict: Dataset statistics, with format:
+        {'n_records': 1000, 'columns': {'column_1': {'COUNT_DISTINCT': 10, 'COUNT_NULL': 0, 'MIN': '1', 'MAX': '10'}}}
+    """
+    dataset_metrics = project.get_dataset(dataset_name).get_last_metric_values()
+
+    def get_metric_value(metric_id):
+        try:
+            return dataset_metrics.get_global_value(metric_id)
+        except:
+            return None
+
+    dataset_join_statistics = {"n_records": get_metric_value("records:COUNT_RECORDS"), "columns": {}}
+    if dataset_join_statistics["n_records"] is not None:
+        dataset_join_statistics["n_records"] = int(dataset_join_statistics["n_records"])
+    for column_name in key_columns:
+        column_statistics = {}
+        for metric_name in JOIN_PLANNER_COLUMN_METRICS:
+            column_statistics[metric_name] = get_metric_value("col_stats:{}:{}".format(metric_name, column_name))
+        for metric_name in ["COUNT_DISTINCT", "COUNT_NULL"]:
+            if column_statistics[metric_name] is not None:
+                column_statistics[metric_name] = int(column_statistics[metric_name])
+        dataset_join_statistics["columns"][column_name] = column_statistics
+    return dataset_join_statistics
+
+
+def estimate_join_key_distinct_count(dataset_join_statistics, key_columns):
+    """
+    Estimates the number of distinct values of a (possibly composite) join key from its columns distinct counts:
+        the product of the columns distinct counts, capped by the dataset records count.
+
+    :param dataset_join_statistics: dict: Dataset statistics, as computed with :function:`get_dataset_join_statistics`.
+    :param key_columns: list: List of the key columns.
+
+    :returns: key_n_distinct: int: Estimated number of distinct key values ('None' if a metric is missing).
+    """
+    key_n_distinct = 1
+    for column_name in key_columns:
+        column_n_distinct = dataset_join_statistics["columns"][column_name]["COUNT_DISTINCT"]
+        if column_n_distinct is None:
+            return None
+        key_n_distinct *= column_n_distinct
+    if dataset_join_statistics["n_records"] is not None:
+        key_n_distinct = min(key_n_distinct, dataset_join_statistics["n_records"])
+    return key_n_distinct
+
+
+def compute_join_key_coverage(project, left_dataset_name, left_join_key, right_dataset_name, right_join_key):
+    """
+    Computes the exact share of the left dataset rows whose join key exists in the right dataset, reading only
+        the key columns of both datasets. Rows with a null key value are never covered.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param left_dataset_name: str: Name of the left dataset.
+    :param left_join_key: list: List of the left dataset key columns.
+    :param right_dataset_name: str: Name of the right dataset.
+    :param right_join_key: list: List of the right dataset key columns.
+
+    :returns: key_coverage: float: Share of the left rows matching at least one right row, in [0, 1].
+    """
+    right_key_dataframes = []
+    for dataframe_chunk in iter_dataset_chunks(project, right_dataset_name, right_join_key, categorical_cardinality_ratio=None):
+        right_key_dataframes.append(dataframe_chunk[right_join_key].dropna().drop_duplicates())
+    right_key_index = pd.MultiIndex.from_frame(pd.concat(right_key_dataframes, ignore_index=True).drop_duplicates())\
+        if len(right_key_dataframes) > 0 else None
+    n_left_rows = 0
+    n_covered_left_rows = 0
+    for dataframe_chunk in iter_dataset_chunks(project, left_dataset_name, left_join_key, categorical_cardinality_ratio=None):
+        n_left_rows += len(dataframe_chunk)
+        dataframe_chunk = dataframe_chunk[left_join_key].dropna()
+        if (right_key_index is None) or (len(dataframe_chunk) == 0):
+            continue
+        n_covered_left_rows += int(pd.MultiIndex.from_frame(dataframe_chunk).isin(right_key_index).sum())
+    key_coverage = (n_covered_left_rows / n_left_rows) if n_left_rows > 0 else 1.0
+    return key_coverage
+
+
+def compute_join_key_range_filter_expression(left_join_key, right_dataset_join_statistics, right_join_key):
+    """
+    Computes a DSS formula keeping the left rows whose single numerical join key is within the right key range.
+
+    :param left_join_key: list: List of the left dataset key columns.
+    :param right_dataset_join_statistics: dict: Right dataset statistics, as computed with :function:`get_dataset_join_statistics`.
+    :param right_join_key: list: List of the right dataset key columns.
+
+    :returns: filter_expression: str: The filter formula ('None' if the key is composite, not numerical or without range metrics).
+    """
+    if len(left_join_key) != 1:
+        return None
+    right_key_statistics = right_dataset_join_statistics["columns"][right_join_key[0]]
+    try:
+        right_key_min = float(right_key_statistics["MIN"])
+        right_key_max = float(right_key_statistics["MAX"])
+    except (TypeError, ValueError):
+        return None
+    right_key_bounds = [str(int(bound)) if bound.is_integer() else repr(bound) for bound in [right_key_min, right_key_max]]
+    filter_expression = "{0} >= {1} && {0} <= {2}".format(left_join_key[0], *right_key_bounds)
+    return filter_expression
+
+
+def plan_join_order(project, main_dataset_name, join_specifications, bool_check_key_coverage=False):
+    """
+    Plans the order of joins on a main dataset, using the datasets records counts and key distinct counts
+        (from the last computed DSS metrics: 'records:COUNT_RECORDS' and 'col_stats' metrics on the key columns):
+        - INNER joins come first, the most selective ones (fewest left keys found on the right side) first, as
+        they reduce the rows carried by all following joins.
+        - LEFT joins come next, the smallest datasets first, joins duplicating rows (right keys not unique) last.
+        Joins only reference the main dataset columns, so the order doesn't change the output rows. If a RIGHT join
+        is present, the original order is kept.
+        The plan also warns when a LEFT join could be an INNER join (all the main dataset keys exist on the right side)
+        and suggests pre-join filters. By default, this check only uses the metrics: the right key having at least as many
+        distinct values as the left key makes it a possible INNER join. If 'bool_check_key_coverage' is True,
+        the key coverage is checked on the data.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param main_dataset_name: str: Name of the recipe's main dataset.
+    :param join_specifications: list: List of the joins to plan, each being a dict whose keys are the parameters of
+        'programmaticJoinHandler.add_one_join_on_main_dataset' (see 'JOIN_SPECIFICATION_PARAMETERS').
+    :param bool_check_key_coverage: bool: Precise if the key coverage of the LEFT joins should be computed
+        on the data, reading the key columns of both datasets.
+
+    :returns: planned_join_specifications: list: The join specifications, in the planned order.
+    :returns: join_plan_df: pandas.core.frame.DataFrame: DataFrame describing each join of the plan: statistics,
+        estimated key coverage, warnings and suggested pre-join filters.
+    """
+    main_dataset_key_columns = []
+    for join_specification in join_specifications:
+        for column_name in join_specification["left_join_key"]:
+            if column_name not in main_dataset_key_columns:
+                main_dataset_key_columns.append(column_name)
+    main_dataset_join_statistics = get_dataset_join_statistics(project, main_dataset_name, main_dataset_key_columns)
+
+    join_plans = []
+    for join_index, join_specification in enumerate(join_specifications):
+        dataset_name = join_specification["dataset_to_join_name"]
+        join_type = join_specification["join_type"]
+        left_join_key = join_specification["left_join_key"]
+        right_join_key = join_specification["right_join_key"]
+        dataset_join_statistics = get_dataset_join_statistics(project, dataset_name, right_join_key)
+        left_key_n_distinct = estimate_join_key_distinct_count(main_dataset_join_statistics, left_join_key)
+        right_key_n_distinct = estimate_join_key_distinct_count(dataset_join_statistics, right_join_key)
+        n_records = dataset_join_statistics["n_records"]
+
+        right_key_fan_out = None
+        if (n_records is not None) and (right_key_n_distinct not in [None, 0]):
+            right_key_fan_out = n_records / right_key_n_distinct
+        max_key_coverage = None
+        if (left_key_n_distinct not in [None, 0]) and (right_key_n_distinct is not None):
+            max_key_coverage = min(1.0, right_key_n_distinct / left_key_n_distinct)
+        left_key_has_nulls = any([(main_dataset_join_statistics["columns"][column_name]["COUNT_NULL"] or 0) > 0
+                                  for column_name in left_join_key])
+        right_key_has_nulls = any([(dataset_join_statistics["columns"][column_name]["COUNT_NULL"] or 0) > 0
+                                   for column_name in right_join_key])
+        if left_key_has_nulls and (max_key_coverage is not None):
+            max_key_coverage = min(max_key_coverage, 0.999)
+
+        key_coverage = None
+        warnings = []
+        pre_join_filters = []
+        if (join_type == "LEFT") and bool_check_key_coverage and ((max_key_coverage is None) or (max_key_coverage >= 1.0)):
+            try:
+                key_coverage = compute_join_key_coverage(project, main_dataset_name, left_join_key, dataset_name, right_join_key)
+            except Exception as exception:
+                print("WARNING: key coverage of the join with '{}' could not be computed: {}".format(dataset_name, exception))
+        if (join_type == "LEFT") and (key_coverage == 1.0):
+            warnings.append("All '{}' keys exist in '{}': the LEFT join could be an INNER join.".format(main_dataset_name, dataset_name))
+        elif (join_type == "LEFT") and (key_coverage is None) and (max_key_coverage is not None) and (max_key_coverage >= 1.0):
+            warnings.append("'{}' has as many distinct keys as '{}': the LEFT join may be an INNER join "
+                            "(set 'bool_check_key_coverage' to True to check it on the data).".format(dataset_name, main_dataset_name))
+        if right_key_fan_out is not None and right_key_fan_out > 1:
+            warnings.append("'{}' keys are not unique (~{:.1f} rows per key): the join duplicates rows."
+                            .format(dataset_name, right_key_fan_out))
+        if right_key_has_nulls:
+            pre_join_filters.append({"dataset_name": dataset_name,
+                                     "expression": " && ".join(["isNonBlank({})".format(column_name) for column_name in right_join_key]),
+                                     "reason": "Null keys never match."})
+        if join_type == "INNER":
+            range_filter_expression = compute_join_key_range_filter_expression(left_join_key, dataset_join_statistics, right_join_key)
+            if range_filter_expression is not None:
+                pre_join_filters.append({"dataset_name": main_dataset_name, "expression": range_filter_expression,
+                                         "reason": "Keys out of the '{}' key range never match.".format(dataset_name)})
+
+        if join_type == "INNER":
+            join_order_key = (0, 1.0 if max_key_coverage is None else max_key_coverage, n_records or 0, join_index)
+        else:
+            join_order_key = (1, int((right_key_fan_out or 1) > 1), n_records or 0, join_index)
+        join_plans.append({"join_specification": join_specification, "join_order_key": join_order_key,
+                           "original_join_index": join_index, "dataset_to_join_name": dataset_name, "join_type": join_type,
+                           "n_records": n_records, "right_key_n_distinct": right_key_n_distinct,
+                           "right_key_fan_out": right_key_fan_out, "max_key_coverage": max_key_coverage,
+                           "key_coverage": key_coverage, "warnings": warnings, "pre_join_filters": pre_join_filters})
+
+    if any([join_plan["join_type"] == "RIGHT" for join_plan in join_plans]):
+        print("WARNING: RIGHT joins change the rows kept by the following joins: the original join order is kept.")
+    else:
+        join_plans = sorted(join_plans, key=lambda join_plan: join_plan["join_order_key"])
+    for join_plan in join_plans:
+        for warning in join_plan["warnings"]:
+            print("WARNING: {}".format(warning))
+    planned_join_specifications = [join_plan["join_specification"] for join_plan in join_plans]
+    join_plan_df = pd.DataFrame(join_plans, columns=["original_join_index", "dataset_to_join_name", "join_type", "n_records",
+                                                     "right_key_n_distinct", "right_key_fan_out", "max_key_coverage",
+                                                     "key_coverage", "warnings", "pre_join_filters"])
+    join_plan_df.insert(0, "planned_join_index", range(len(join_plan_df)))
+    return planned_join_specifications, join_plan_df
+
+
+def select_key_profile_heavy_keys(key_profile, top_k):
+    """
+    Selects the keys of a key profile whose count is tracked: all the keys if the heavy hitters sketch
+        never evicted any key (counts are then exact), its 'top_k' most frequent keys otherwise.
+
+    :param key_profile: KeyProfileSketch: The key profile.
+    :param top_k: int: Number of keys to select when the sketch is full.
+
+    :returns: heavy_keys: list: List of the selected keys.
+    """
+    heavy_hitters_sketch = key_profile.heavy_hitters_sketch
+    if heavy_hitters_sketch.get_min_count() == 0:
+        heavy_keys = list(heavy_hitters_sketch.counts.index)
+    else:
+        heavy_keys = list(heavy_hitters_sketch.counts.nlargest(top_k).index)
+    return heavy_keys
+
+
+def compute_key_profile_light_keys_statistics(key_profile, heavy_keys_counts):
+    """
+    Computes the rows and distinct count of the keys of a key profile that are not heavy keys.
+
+    :param key_profile: KeyProfileSketch: The key profile.
+    :param heavy_keys_counts: dict: Mapping between the heavy keys and their count in the profile.
+
+    :returns: n_light_key_rows: float: Number of non-null key rows having a light key.
+    :returns: n_light_keys: float: Approximate number of distinct light keys.
+    """
+    n_light_key_rows = max(key_profile.n_rows - key_profile.n_null_key_rows - sum(heavy_keys_counts.values()), 0)
+    n_heavy_keys = sum([count > 0 for count in heavy_keys_counts.values()])
+    n_light_keys = max(key_profile.distinct_count_sketch.estimate() - n_heavy_keys, 0)
+    if n_light_key_rows > 0:
+        n_light_keys = max(n_light_keys, 1)
+    return n_light_key_rows, n_light_keys
+
+
+def get_key_profile_key_count(key_profile, key, light_key_average_count):
+    """
+    Retrieves the count of a key in a key profile: its tracked count, 0 if the profile tracks all its keys
+        and not this one, the average count of light keys otherwise.
+
+    :param key_profile: KeyProfileSketch: The key profile.
+    :param key: object: The key.
+    :param light_key_average_count: float: Average count of the keys not tracked by the profile.
+
+    :returns: key_count: float: The key count.
+    """
+    heavy_hitters_sketch = key_profile.heavy_hitters_sketch
+    if key in heavy_hitters_sketch.counts.index:
+        return heavy_hitters_sketch.counts[key]
+    if heavy_hitters_sketch.get_min_count() == 0:
+        return 0
+    return light_key_average_count
+
+
+def estimate_join_output_cardinality(left_key_profile, right_key_profile, top_k=100):
+    """
+    Estimates the number of rows of the join of two datasets from their key profiles. Heavy keys contribute
+        the product of their counts on both sides. Other keys are assumed to be found on the right side in the
+        proportion of the distinct counts and to have the average right light key count.
+        Counts are exact when the heavy hitters sketches tracked all the keys (ex: dimension tables).
+
+    :param left_key_profile: KeyProfileSketch: Key profile of the left dataset.
+    :param right_key_profile: KeyProfileSketch: Key profile of the right dataset.
+    :param top_k: int: Number of heavy keys considered on each side when their sketch is full.
+
+    :returns: join_cardinality_estimates: dict: Estimated number of rows of the 'INNER' join and of the
+        left rows ('n_matched_left_rows') and right rows ('n_matched_right_rows') having a match.
+    """
+    heavy_keys = select_key_profile_heavy_keys(left_key_profile, top_k)
+    for key in select_key_profile_heavy_keys(right_key_profile, top_k):
+        if key not in heavy_keys:
+            heavy_keys.append(key)
+    key_profiles_statistics = []
+    for key_profile in [left_key_profile, right_key_profile]:
+        heavy_keys_counts = {key: get_key_profile_key_count(key_profile, key, 0) for key in heavy_keys}
+        n_light_key_rows, n_light_keys = compute_key_profile_light_keys_statistics(key_profile, heavy_keys_counts)
+        light_key_average_count = (n_light_key_rows / n_light_keys) if n_light_keys > 0 else 0
+        heavy_keys_counts = {key: get_key_profile_key_count(key_profile, key, light_key_average_count) for key in heavy_keys}
+        key_profiles_statistics.append((heavy_keys_counts, n_light_key_rows, n_light_keys, light_key_average_count))
+    (left_heavy_keys_counts, n_left_light_key_rows, n_left_light_keys, left_light_key_average_count),\
+        (right_heavy_keys_counts, n_right_light_key_rows, n_right_light_keys, right_light_key_average_count) = key_profiles_statistics
+
+    n_inner_join_rows = 0
+    n_matched_left_rows = 0
+    n_matched_right_rows = 0
+    for key in heavy_keys:
+        left_key_count = left_heavy_keys_counts[key]
+        right_key_count = right_heavy_keys_counts[key]
+        n_inner_join_rows += left_key_count * right_key_count
+        if (left_key_count > 0) and (right_key_count > 0):
+            n_matched_left_rows += left_key_count
+            n_matched_right_rows += right_key_count
+    if (n_left_light_keys > 0) and (n_right_light_keys > 0):
+        left_light_keys_coverage = min(1.0, n_right_light_keys / n_left_light_keys)
+        right_light_keys_coverage = min(1.0, n_left_light_keys / n_right_light_keys)
+        n_inner_join_rows += n_left_light_key_rows * left_light_keys_coverage * right_light_key_average_count
+        n_matched_left_rows += n_left_light_key_rows * left_light_keys_coverage
+        n_matched_right_rows += n_right_light_key_rows * right_light_keys_coverage
+    join_cardinality_estimates = {"n_inner_join_rows": int(round(n_inner_join_rows)),
+                                  "n_matched_left_rows": int(round(n_matched_left_rows)),
+                                  "n_matched_right_rows": int(round(n_matched_right_rows))}
+    return join_cardinality_estimates
+
+
+def analyze_join_keys(project, left_dataset_name, left_join_key, right_dataset_name, right_join_key, join_type="LEFT",
+                      top_k=10, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Analyzes the keys of a join before building it, streaming only the key columns of both datasets:
+        rows and distinct key counts, duplicate rates, heavy hitters and expected output cardinality.
+        The analysis flags:
+        - 'RIGHT_KEY_NOT_UNIQUE': some right keys have several rows, so the join duplicates left rows.
+        - 'MANY_TO_MANY': keys are duplicated on both sides.
+        - 'FAN_OUT': the join is expected to output more than 'JOIN_FAN_OUT_RATIO_THRESHOLD' times its driving rows.
+        - 'SKEW': a single key holds more than 'JOIN_SKEW_KEY_SHARE_THRESHOLD' of the rows of a side.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param left_dataset_name: str: Name of the left dataset.
+    :param left_join_key: list: List of the left dataset key columns.
+    :param right_dataset_name: str: Name of the right dataset.
+    :param right_join_key: list: List of the right dataset key columns.
+    :param join_type: str: Type of the join, in ['LEFT', 'RIGHT', 'INNER'].
+    :param top_k: int: Number of heavy hitters to report on each side.
+    :param chunksize: int: Number of rows of each streamed chunk.
+
+    :returns: join_key_analysis: dict: Join statistics, estimated output rows and flags.
+    :returns: heavy_hitters_df: pandas.core.frame.DataFrame: DataFrame containing the 'top_k' most frequent keys of each side,
+        with their approximate count, maximum count error, share of the side rows and count on the other side.
+    """
+    print("Analyzing join keys of '{}' {} and '{}' {} ...".format(left_dataset_name, left_join_key,
+                                                                   right_dataset_name, right_join_key))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        left_key_profile_future = executor.submit(
+            lambda: profile_dataframe_chunks_key(iter_dataset_chunks(project, left_dataset_name, left_join_key, chunksize,
+                                                                     categorical_cardinality_ratio=None), left_join_key))
+        right_key_profile_future = executor.submit(
+            lambda: profile_dataframe_chunks_key(iter_dataset_chunks(project, right_dataset_name, right_join_key, chunksize,
+                                                                     categorical_cardinality_ratio=None), right_join_key))
+        left_key_profile = left_key_profile_future.result()
+        right_key_profile = right_key_profile_future.result()
+
+    join_cardinality_estimates = estimate_join_output_cardinality(left_key_profile, right_key_profile,
+                                                                  max(100, top_k))
+    n_inner_join_rows = join_cardinality_estimates["n_inner_join_rows"]
+    n_left_join_rows = n_inner_join_rows + left_key_profile.n_rows - join_cardinality_estimates["n_matched_left_rows"]
+    n_right_join_rows = n_inner_join_rows + right_key_profile.n_rows - join_cardinality_estimates["n_matched_right_rows"]
+    n_expected_output_rows = {"INNER": n_inner_join_rows, "LEFT": n_left_join_rows, "RIGHT": n_right_join_rows}[join_type]
+    n_driving_rows = right_key_profile.n_rows if join_type == "RIGHT" else left_key_profile.n_rows
+
+    join_key_analysis = {"left_dataset_name": left_dataset_name, "right_dataset_name": right_dataset_name,
+                         "join_type": join_type, "n_expected_output_rows": n_expected_output_rows,
+                         "fan_out_ratio": (n_expected_output_rows / n_driving_rows) if n_driving_rows > 0 else None,
+                         "flags": []}
+    heavy_hitters = []
+    side_max_key_counts = {}
+    for side, key_profile, other_key_profile in [("left", left_key_profile, right_key_profile),
+                                                 ("right", right_key_profile, left_key_profile)]:
+        n_non_null_key_rows = key_profile.n_rows - key_profile.n_null_key_rows
+        key_n_distinct = key_profile.distinct_count_sketch.estimate()
+        join_key_analysis["{}_n_rows".format(side)] = key_profile.n_rows
+        join_key_analysis["{}_n_null_key_rows".format(side)] = key_profile.n_null_key_rows
+        join_key_analysis["{}_approx_key_n_distinct".format(side)] = key_n_distinct
+        join_key_analysis["{}_key_duplicate_rate".format(side)] =\
+            (1 - min(key_n_distinct, n_non_null_key_rows) / n_non_null_key_rows) if n_non_null_key_rows > 0 else 0.0
+        side_heavy_hitters = key_profile.heavy_hitters_sketch.get_heavy_hitters(top_k)
+        side_max_key_counts[side] = side_heavy_hitters[0][1] if len(side_heavy_hitters) > 0 else 0
+        for key, key_count, key_count_error in side_heavy_hitters:
+            key_share = key_count / n_non_null_key_rows
+            if (key_share > JOIN_SKEW_KEY_SHARE_THRESHOLD) and ("SKEW" not in join_key_analysis["flags"]):
+                join_key_analysis["flags"].append("SKEW")
+            heavy_hitters.append({"side": side, "key": key, "approx_count": key_count, "max_count_error": key_count_error,
+                                  "share_of_rows": key_share,
+                                  "approx_count_on_other_side": get_key_profile_key_count(other_key_profile, key, None)})
+
+    if side_max_key_counts["right"] > 1:
+        join_key_analysis["flags"].append("RIGHT_KEY_NOT_UNIQUE")
+        if side_max_key_counts["left"] > 1:
+            join_key_analysis["flags"].append("MANY_TO_MANY")
+    if (join_key_analysis["fan_out_ratio"] or 0) > JOIN_FAN_OUT_RATIO_THRESHOLD:
+        join_key_analysis["flags"].append("FAN_OUT")
+    for flag in join_key_analysis["flags"]:
+        print("WARNING: join of '{}' and '{}' flagged '{}' (expected output rows: {}, fan-out ratio: {})"
+              .format(left_dataset_name, right_dataset_name, flag, n_expected_output_rows, join_key_analysis["fan_out_ratio"]))
+    heavy_hitters_df = pd.DataFrame(heavy_hitters, columns=["side", "key", "approx_count", "max_count_error",
+                                                            "share_of_rows", "approx_count_on_other_side"])
+    print("Join keys of '{}' and '{}' successfully analyzed!".format(left_dataset_name, right_dataset_name))
+    return join_key_analysis, heavy_hitters_df
+
+
 class programmaticJoinHandler:
     """
     This class allows to programatically update DSS 'join' recipes.
     """
 
-    def __init__(self, project, recipe_name, main_dataset_name, main_dataset_columns_to_select, main_dataset_columns_to_select_alias, main_dataset_computed_columns):
+    def __init__(self, project, recipe_name, main_dataset_name, main_dataset_columns_to_select, main_dataset_columns_to_select_alias, main_dataset_computed_columns,
+                 dataset_schemas_cache=None, bool_defer_commit=False):
         """        
         :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
         :param recipe_name: str: Name of the recipe.
@@ -66,11 +500,23 @@ class programmaticJoinHandler:
         :param main_dataset_columns_to_select_alias: dict: Can be an empty dict. Mapping between columns present in 'main_dataset_columns_to_select'
             and the alias they should have post join.
         :param main_dataset_computed_columns: list: Settings associated with the dataset's computed columns.
+        :param dataset_schemas_cache: dict: Optional mapping between dataset names and their schemas, that can be shared
+            between handlers and recipe builders. Each dataset schema is fetched once and added to it.
+        :param bool_defer_commit: bool: Precise if the recipe updates should only be saved when calling 'commit()'.
+            If 'False', the recipe is saved after each join, computed column or filter update.
         """
         self.project = project
+        self.recipe_name = recipe_name
         self.recipe_settings = project.get_recipe(recipe_name).get_settings()
         self.recipe_payload = self.recipe_settings.get_json_payload()
+        if dataset_schemas_cache is None:
+            dataset_schemas_cache = {}
+        self.dataset_schemas_cache = dataset_schemas_cache
+        self.dataset_column_datatypes = {} # Mapping between the datasets and their {column: datatype} mapping.
+        self.bool_defer_commit = bool_defer_commit
         self.recipe_input_dataset_names = []
+        self.recipe_input_dataset_names_set = set()
+        self.recipe_computed_columns_virtual_input_information = {} # Mapping between the pre-join computed columns and their (virtual input, datatype).
         self.recipe_input_datasets_virtual_input_ids = {}
         self.recipe_last_virtual_input_id = 0 # Refers to the table associated with the recipe's inputs (<-> Input dataset unique identifier). 
         self.recipe_last_join_input_id = 0 # Refers to the inputs as we see them in the "Join" and "Selected columns" (<-> The same dataset can be added several time in a join).
@@ -102,7 +548,54 @@ class programmaticJoinHandler:
                                                                self.main_dataset_computed_columns)
         self.recipe_input_datasets_virtual_input_ids = {self.main_dataset_name: self.recipe_last_virtual_input_id}
         self.recipe_payload["virtualInputs"] = [join_recipe_virtual_input]
+        self.recipe_computed_columns_virtual_input_information = {}
+        self.index_virtual_input_computed_columns(join_recipe_virtual_input)
         pass
+
+    def index_virtual_input_computed_columns(self, virtual_input_settings):
+        """
+        Indexes the pre-join computed columns of a virtual input, so that their information can be retrieved
+            without scanning all the recipe virtual inputs.
+
+        :param virtual_input_settings: dict: Settings of the virtual input.
+        """
+        for computed_column_settings in virtual_input_settings["computedColumns"]:
+            column_name = computed_column_settings.get("name")
+            self.recipe_computed_columns_virtual_input_information[column_name] = (virtual_input_settings,
+                                                                                  computed_column_settings["type"])
+        pass
+
+    def preload_dataset_schemas(self, dataset_names, max_workers=8):
+        """
+        Fetches concurrently the schemas of datasets to join that are not yet in the schemas cache.
+
+        :param dataset_names: list: List of the dataset names.
+        :param max_workers: int: Maximum number of schemas fetched at the same time.
+        """
+        dataset_names_to_fetch = [dataset_name for dataset_name in set(dataset_names)
+                                  if dataset_name not in self.dataset_schemas_cache]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            dataset_schemas = list(executor.map(lambda dataset_name: get_dataset_schema(self.project, dataset_name),
+                                                dataset_names_to_fetch))
+        for dataset_name, dataset_schema in zip(dataset_names_to_fetch, dataset_schemas):
+            self.dataset_schemas_cache[dataset_name] = dataset_schema
+        pass
+
+    def get_dataset_column_datatypes(self, dataset_name):
+        """
+        Retrieves the mapping between a dataset columns and their datatypes, from the schemas cache when available.
+
+        :param dataset_name: str: Name of the dataset.
+
+        :returns: dataset_column_datatypes: dict: Mapping between the dataset columns and their datatypes.
+        """
+        if dataset_name not in self.dataset_column_datatypes:
+            if dataset_name not in self.dataset_schemas_cache:
+                self.dataset_schemas_cache[dataset_name] = get_dataset_schema(self.project, dataset_name)
+            dataset_columns, dataset_column_datatypes = extract_dataset_schema_information(self.dataset_schemas_cache[dataset_name])
+            self.dataset_column_datatypes[dataset_name] = dict(zip(dataset_columns, dataset_column_datatypes))
+        dataset_column_datatypes = self.dataset_column_datatypes[dataset_name]
+        return dataset_column_datatypes
     
     def initialize_joins(self):
         """
@@ -184,7 +677,7 @@ class programmaticJoinHandler:
         :returns: recipe_input_dataset_exists: bool: Boolean precising if the dataset
             is already among the recipe inputs.
         """
-        recipe_input_dataset_exists = (dataset_name in self.recipe_input_dataset_names)
+        recipe_input_dataset_exists = (dataset_name in self.recipe_input_dataset_names_set)
         return recipe_input_dataset_exists
 
     def add_input_in_recipe(self, dataset_name):
@@ -194,6 +687,7 @@ class programmaticJoinHandler:
         :param dataset_name: str: Name of the dataset.
         """
         self.recipe_input_dataset_names.append(dataset_name)
+        self.recipe_input_dataset_names_set.add(dataset_name)
         self.recipe_settings.data["recipe"]["inputs"]["main"]["items"].append(
             {'deps': [], 'ref': dataset_name}
         )
@@ -237,6 +731,7 @@ class programmaticJoinHandler:
                                                                dataset_virtual_input_id,
                                                                dataset_computed_columns)
         self.recipe_payload["virtualInputs"].append(join_recipe_virtual_input)
+        self.index_virtual_input_computed_columns(join_recipe_virtual_input)
         pass
 
     def update_join_input_ids(self):
@@ -262,14 +757,14 @@ class programmaticJoinHandler:
             to select from the dataset to join.
         """
         alias_are_defined =  not ((columns_to_select_alias == {}) or (columns_to_select_alias == None))
+        dataset_column_datatypes = self.get_dataset_column_datatypes(dataset_name)
         selected_columns_settings = []
         for column_name in columns_to_select_in_dataset:
-            try:
-                column_datatype = get_dataset_column_datatype(self.project,
-                                                            dataset_name,
-                                                            column_name)
-            except:
-                print("Exception encountered! Column '{}' will be considered as a pre-join computed column...")
+            if column_name in dataset_column_datatypes:
+                column_datatype = dataset_column_datatypes[column_name]
+            else:
+                print("Column '{}' is not in dataset '{}' schema: it will be considered as a pre-join computed column..."\
+                      .format(column_name, dataset_name))
                 computed_column_virtual_input_settings, computed_column_datatype =\
                     self.get_computed_column_virtual_input_information(column_name)
                 column_datatype = computed_column_datatype
@@ -294,15 +789,8 @@ class programmaticJoinHandler:
             with the computed column virtual inputs.
         :returns: computed_column_datatype: str: Datatype of the computed column. 
         """
-        computed_column_virtual_input_settings = {}
-        computed_column_datatype = None
-        for virtual_input_settings in self.recipe_payload["virtualInputs"]:
-            all_virtual_input_computed_column_settings = virtual_input_settings["computedColumns"]
-            for computed_column_settings in all_virtual_input_computed_column_settings:
-                column_name = computed_column_settings.get("name")
-                if column_name == computed_column_name:
-                    computed_column_virtual_input_settings = virtual_input_settings
-                    computed_column_datatype = computed_column_settings["type"]
+        computed_column_virtual_input_settings, computed_column_datatype =\
+            self.recipe_computed_columns_virtual_input_information.get(computed_column_name, ({}, None))
         return computed_column_virtual_input_settings, computed_column_datatype
 
     def update_recipe_selected_columns_settings(self, selected_columns_settings):
@@ -321,7 +809,7 @@ class programmaticJoinHandler:
         Computes a basic join parameters.
             We talk about 'basic' parameters as we only look for a strict equality between left and right join keys.
 
-        :param: join_type: str: Type of the join. It should be in ['LEFT', 'RIGHT'].
+        :param: join_type: str: Type of the join. It should be in ['LEFT', 'RIGHT', 'INNER'].
         :param: left_table_index_in_join: int: Index of the left table, among all the recipe joins (This is not a virtual index).
         :param: right_table_index_in_join: int: Index of the right table, among all the recipe joins (This is not a virtual index).
         :param: left_join_key: list: List containing all the columns of the left table join key.
@@ -329,7 +817,7 @@ class programmaticJoinHandler:
 
         :returns: join_parameters: dict: Settings defining the join to apply. 
         """
-        ALLOWED_JOINS = ['LEFT', 'RIGHT']
+        ALLOWED_JOINS = ['LEFT', 'RIGHT', 'INNER']
         if not join_type in ALLOWED_JOINS:
             log_message = "You selected a 'join_type' equals to '{}'. Please choose a join type in '{}'.".format(join_type, ALLOWED_JOINS)
             raise Exception(log_message)
@@ -368,7 +856,7 @@ class programmaticJoinHandler:
         """
         Adds one join in the recipe settings.
         
-        :param: join_type: str: Type of the join. It should be in ['LEFT', 'RIGHT'].
+        :param: join_type: str: Type of the join. It should be in ['LEFT', 'RIGHT', 'INNER'].
         :param: left_join_key: list: List containing all the columns of the 'main/left dataset' join key.
         :param: right_join_key: list: List containing all the columns of the 'right dataset' join key.
         """
@@ -388,6 +876,23 @@ class programmaticJoinHandler:
         self.recipe_settings.set_json_payload(self.recipe_payload)
         self.recipe_settings.save()
         pass
+
+    def update_recipe_definition_if_not_deferred(self):
+        """
+        Saves the join recipe's definition, unless the handler was created with 'bool_defer_commit=True'.
+        """
+        if not self.bool_defer_commit:
+            self.update_recipe_definition()
+        pass
+
+    def commit(self):
+        """
+        Saves all the recipe updates done since the last save, in a single settings update.
+        """
+        print("Saving join recipe '{}' definition ...".format(self.recipe_name))
+        self.update_recipe_definition()
+        print("Join recipe '{}' definition successfully saved!".format(self.recipe_name))
+        pass
     
     def add_one_join_on_main_dataset(self,
                                      dataset_to_join_name,
@@ -405,7 +910,7 @@ class programmaticJoinHandler:
         :param: dataset_to_join_columns_to_select: list: List of the columns to select from the dataset to join.
         :param: dataset_computed_columns: list: List of the computed columns for the join, as we can get using the
             function ''. 
-        :param: join_type: str: Type of the join. It should be in ['LEFT', 'RIGHT'].
+        :param: join_type: str: Type of the join. It should be in ['LEFT', 'RIGHT', 'INNER'].
         :param columns_prefix: str: Prefix to add to the columns of the dataset to join.
         :param: left_join_key: list: List containing all the columns of the 'main/left dataset' join key.
         :param: right_join_key: list: List containing all the columns of the 'right dataset' join key.
@@ -425,8 +930,58 @@ class programmaticJoinHandler:
                                                       columns_to_select_alias)
         self.update_recipe_selected_columns_settings(selected_columns_settings)
         self.add_one_join(join_type, left_join_key, right_join_key)
-        self.update_recipe_definition()
+        self.update_recipe_definition_if_not_deferred()
         pass
+
+    def add_planned_joins_on_main_dataset(self, join_specifications, bool_check_key_coverage=False):
+        """
+        Adds several joins on the recipe's main dataset, in the order planned by :function:`plan_join_order`,
+            and saves the recipe once. The selected columns keep the order of 'join_specifications', so that the
+            output schema doesn't depend on the planned join order.
+
+        :param join_specifications: list: List of the joins to add, each being a dict whose keys are the parameters of
+            'add_one_join_on_main_dataset' (see 'JOIN_SPECIFICATION_PARAMETERS').
+        :param bool_check_key_coverage: bool: Precise if the key coverage of the LEFT joins should be computed
+            on the data, reading the key columns of both datasets.
+
+        :returns: join_plan_df: pandas.core.frame.DataFrame: DataFrame describing each join of the plan.
+        """
+        planned_join_specifications, join_plan_df = plan_join_order(self.project, self.main_dataset_name,
+                                                                    join_specifications, bool_check_key_coverage)
+        self.preload_dataset_schemas([join_specification["dataset_to_join_name"]
+                                      for join_specification in planned_join_specifications])
+        bool_defer_commit = self.bool_defer_commit
+        self.bool_defer_commit = True
+        n_previously_selected_columns = len(self.recipe_payload["selectedColumns"])
+        joins_selected_columns = {}
+        for original_join_index, join_specification in zip(join_plan_df["original_join_index"], planned_join_specifications):
+            n_selected_columns = len(self.recipe_payload["selectedColumns"])
+            self.add_one_join_on_main_dataset(*[join_specification[parameter] for parameter in JOIN_SPECIFICATION_PARAMETERS])
+            joins_selected_columns[original_join_index] = self.recipe_payload["selectedColumns"][n_selected_columns:]
+        self.recipe_payload["selectedColumns"] = self.recipe_payload["selectedColumns"][:n_previously_selected_columns]
+        for original_join_index in sorted(joins_selected_columns.keys()):
+            self.recipe_payload["selectedColumns"] += joins_selected_columns[original_join_index]
+        self.bool_defer_commit = bool_defer_commit
+        self.update_recipe_definition_if_not_deferred()
+        return join_plan_df
+
+    def analyze_join_on_main_dataset(self, dataset_to_join_name, join_type, left_join_key, right_join_key, top_k=10):
+        """
+        Analyzes the keys of a join on the recipe's main dataset before adding it (see :function:`analyze_join_keys`).
+            Left join keys must be columns of the main dataset schema (not pre-join computed columns).
+
+        :param: dataset_to_join_name: str: Name of a dataset to join on the recipe's 'main dataset'.
+        :param: join_type: str: Type of the join. It should be in ['LEFT', 'RIGHT', 'INNER'].
+        :param: left_join_key: list: List containing all the columns of the 'main/left dataset' join key.
+        :param: right_join_key: list: List containing all the columns of the 'right dataset' join key.
+        :param top_k: int: Number of heavy hitters to report on each side.
+
+        :returns: join_key_analysis: dict: Join statistics, estimated output rows and flags.
+        :returns: heavy_hitters_df: pandas.core.frame.DataFrame: DataFrame containing the most frequent keys of each side.
+        """
+        join_key_analysis, heavy_hitters_df = analyze_join_keys(self.project, self.main_dataset_name, left_join_key,
+                                                                dataset_to_join_name, right_join_key, join_type, top_k)
+        return join_key_analysis, heavy_hitters_df
     
     def add_post_join_computed_column(self, join_recipe_computed_column_settings):
         """
@@ -436,7 +991,7 @@ class programmaticJoinHandler:
             as we can get when using the function 'compute_join_recipe_computed_column_settings'.
         """
         self.recipe_payload["computedColumns"].append(join_recipe_computed_column_settings)
-        self.update_recipe_definition()
+        self.update_recipe_definition_if_not_deferred()
         pass
     
     def set_post_join_filter_expression(self, post_join_filter_formula_expression):
@@ -451,6 +1006,6 @@ class programmaticJoinHandler:
         if post_join_filter_is_disabled:
             self.recipe_payload["postFilter"]["enabled"] = True
         self.recipe_payload["postFilter"]["expression"] = post_join_filter_formula_expression
-        self.update_recipe_definition()
+        self.update_recipe_definition_if_not_deferred()
         pass
     pass
@@ -0,0 +1,767 @@
+import re
+from functools import lru_cache, reduce
+import numpy as np
+import pandas as pd
+
+
+GREL_TOKEN_PATTERN = re.compile(r"""
+    (?P<number>\d+\.\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?|\d+(?:[eE][+-]?\d+)?)
+    |(?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+    |(?P<identifier>[A-Za-z_][A-Za-z0-9_]*)
+    |(?P<operator>==|!=|<=|>=|&&|\|\||[-+*/%<>!(),.\[\]])
+    |(?P<space>\s+)
+    """, re.VERBOSE)
+GREL_BINARY_OPERATORS_PRECEDENCE = [["||"], ["&&"], ["==", "!=", "<", ">", "<=", ">="], ["+", "-"], ["*", "/", "%"]]
+GREL_LITERAL_KEYWORDS = {"true": True, "false": False, "null": None}
+GREL_COLUMN_ACCESS_FUNCTIONS = ["val", "strval", "numval"]
+
+
+def tokenize_grel_expression(expression):
+    """
+    Splits a DSS formula into tokens.
+
+    :param expression: str: Expression of the formula, following the DSS formula language.
+
+    :returns: tokens: list: List of (token_type, token_value) tuples, token types being in
+        ['number', 'string', 'identifier', 'operator'].
+    """
+    tokens = []
+    position = 0
+    while position < len(expression):
+        token_match = GREL_TOKEN_PATTERN.match(expression, position)
+        if token_match is None:
+            log_message = "Unexpected character '{}' at position {} of formula '{}'".format(expression[position], position, expression)
+            raise Exception(log_message)
+        position = token_match.end()
+        token_type = token_match.lastgroup
+        if token_type == "space":
+            continue
+        token_value = token_match.group(token_type)
+        if token_type == "number":
+            token_value = float(token_value) if any([character in token_value for character in ".eE"]) else int(token_value)
+        elif token_type == "string":
+            token_value = re.sub(r"\\(.)", lambda escape_match: {"n": "\n", "t": "\t"}.get(escape_match.group(1), escape_match.group(1)),
+                                 token_value[1: -1])
+        tokens.append((token_type, token_value))
+    return tokens
+
+
+class GrelExpressionParser:
+    """
+    Recursive descent parser of DSS formulas. Formulas are parsed into nested tuples:
+        ('literal', value), ('column', column_name), ('unary', operator, operand),
+        ('binary', operator, left_operand, right_operand) and ('call', function_name, [arguments]).
+        Method calls like 'column.trim()' are parsed as function calls whose first argument is the object.
+    """
+
+    def __init__(self, expression):
+        """
+        :param expression: str: Expression of the formula, following the DSS formula language.
+        """
+        self.expression = expression
+        self.tokens = tokenize_grel_expression(expression)
+        self.position = 0
+        pass
+
+    def peek(self):
+        """
+        Retrieves the current token without consuming it.
+
+        :returns: token: tuple: The current (token_type, token_value) tuple ('(None, None)' at the end of the formula).
+        """
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return (None, None)
+
+    def consume(self, expected_operator=None):
+        """
+        Consumes the current token.
+
+        :param expected_operator: str: Operator the current token must be (ex: ')'). If 'None', any token is accepted.
+
+        :returns: token: tuple: The consumed (token_type, token_value) tuple.
+        """
+        token = self.peek()
+        if (token[0] is None) or ((expected_operator is not None) and (token != ("operator", expected_operator))):
+            log_message = "Expected '{}' instead of '{}' in formula '{}'".format(expected_operator, token[1], self.expression)
+            raise Exception(log_message)
+        self.position += 1
+        return token
+
+    def parse(self):
+        """
+        Parses the whole formula.
+
+        :returns: expression_tree: tuple: The formula expression tree.
+        """
+        expression_tree = self.parse_binary_expression(0)
+        if self.peek()[0] is not None:
+            log_message = "Unexpected token '{}' in formula '{}'".format(self.peek()[1], self.expression)
+            raise Exception(log_message)
+        return expression_tree
+
+    def parse_binary_expression(self, precedence_level):
+        """
+        Parses a sequence of binary operations having at least a given precedence level.
+
+        :param precedence_level: int: Index of the precedence level in 'GREL_BINARY_OPERATORS_PRECEDENCE'.
+
+        :returns: expression_tree: tuple: The expression tree.
+        """
+        if precedence_level == len(GREL_BINARY_OPERATORS_PRECEDENCE):
+            return self.parse_unary_expression()
+        expression_tree = self.parse_binary_expression(precedence_level + 1)
+        while (self.peek()[0] == "operator") and (self.peek()[1] in GREL_BINARY_OPERATORS_PRECEDENCE[precedence_level]):
+            operator = self.consume()[1]
+            right_operand = self.parse_binary_expression(precedence_level + 1)
+            expression_tree = ("binary", operator, expression_tree, right_operand)
+        return expression_tree
+
+    def parse_unary_expression(self):
+        """
+        Parses a unary operation ('!' or '-') or a postfix expression.
+
+        :returns: expression_tree: tuple: The expression tree.
+        """
+        if self.peek() in [("operator", "!"), ("operator", "-")]:
+            operator = self.consume()[1]
+            return ("unary", operator, self.parse_unary_expression())
+        return self.parse_postfix_expression()
+
+    def parse_arguments(self):
+        """
+        Parses the parenthesized arguments of a function call.
+
+        :returns: arguments: list: List of the arguments expression trees.
+        """
+        self.consume("(")
+        arguments = []
+        if self.peek() != ("operator", ")"):
+            arguments.append(self.parse_binary_expression(0))
+            while self.peek() == ("operator", ","):
+                self.consume(",")
+                arguments.append(self.parse_binary_expression(0))
+        self.consume(")")
+        return arguments
+
+    def parse_postfix_expression(self):
+        """
+        Parses a primary expression followed by method calls ('.function(...)') or '.value' accesses.
+
+        :returns: expression_tree: tuple: The expression tree.
+        """
+        expression_tree = self.parse_primary_expression()
+        while self.peek() == ("operator", "."):
+            self.consume(".")
+            token_type, function_name = self.consume()
+            if token_type != "identifier":
+                log_message = "Expected a function name after '.' in formula '{}'".format(self.expression)
+                raise Exception(log_message)
+            if (function_name == "value") and (self.peek() != ("operator", "(")):
+                continue
+            expression_tree = ("call", function_name, [expression_tree] + self.parse_arguments())
+        return expression_tree
+
+    def parse_primary_expression(self):
+        """
+        Parses a literal, a column reference, a function call or a parenthesized expression.
+
+        :returns: expression_tree: tuple: The expression tree.
+        """
+        token_type, token_value = self.consume()
+        if token_type in ["number", "string"]:
+            return ("literal", token_value)
+        if (token_type, token_value) == ("operator", "("):
+            expression_tree = self.parse_binary_expression(0)
+            self.consume(")")
+            return expression_tree
+        if token_type == "identifier":
+            if token_value in GREL_LITERAL_KEYWORDS:
+                return ("literal", GREL_LITERAL_KEYWORDS[token_value])
+            if (token_value == "cells") and (self.peek() == ("operator", "[")):
+                self.consume("[")
+                column_token_type, column_name = self.consume()
+                self.consume("]")
+                if column_token_type != "string":
+                    log_message = "Expected a column name in 'cells[...]' in formula '{}'".format(self.expression)
+                    raise Exception(log_message)
+                return ("column", column_name)
+            if self.peek() == ("operator", "("):
+                arguments = self.parse_arguments()
+                if (token_value in GREL_COLUMN_ACCESS_FUNCTIONS) and (len(arguments) == 1) and (arguments[0][0] == "literal"):
+                    return ("call", token_value, [("column", arguments[0][1])])
+                return ("call", token_value, arguments)
+            return ("column", token_value)
+        log_message = "Unexpected token '{}' in formula '{}'".format(token_value, self.expression)
+        raise Exception(log_message)
+    pass
+
+
+@lru_cache(maxsize=1024)
+def parse_grel_expression(expression):
+    """
+    Parses a DSS formula into an expression tree. Parsed formulas are cached, so that a formula used on
+        many DataFrames or chunks is only parsed once.
+
+    :param expression: str: Expression of the formula, following the DSS formula language.
+
+    :returns: expression_tree: tuple: The formula expression tree (see 'GrelExpressionParser').
+    """
+    expression_tree = GrelExpressionParser(expression).parse()
+    return expression_tree
+
+
+def format_grel_literal(value):
+    """
+    Writes a formula literal value.
+
+    :param value: object: The literal value (str, number, bool or None).
+
+    :returns: literal: str: The literal, following the DSS formula language.
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, (bool, np.bool_)):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return '"{}"'.format(value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\t", "\\t"))
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return "{}.0".format(int(value))
+    return str(value)
+
+
+def format_grel_expression_tree(expression_tree):
+    """
+    Writes a formula expression tree back as a DSS formula. Nested operations are parenthesized.
+
+    :param expression_tree: tuple: The formula expression tree, as computed with :function:`parse_grel_expression`.
+
+    :returns: expression: str: Expression of the formula, following the DSS formula language.
+    """
+    node_type = expression_tree[0]
+    if node_type == "literal":
+        return format_grel_literal(expression_tree[1])
+    if node_type == "column":
+        column_name = expression_tree[1]
+        if re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", column_name) and (column_name not in GREL_LITERAL_KEYWORDS)\
+                and (column_name != "cells"):
+            return column_name
+        return "val({})".format(format_grel_literal(column_name))
+    if node_type in ["unary", "binary"]:
+        operands = []
+        for operand_tree in expression_tree[2:]:
+            operand = format_grel_expression_tree(operand_tree)
+            if operand_tree[0] in ["unary", "binary"]:
+                operand = "({})".format(operand)
+            operands.append(operand)
+        if node_type == "unary":
+            return "{}{}".format(expression_tree[1], operands[0])
+        return "{} {} {}".format(operands[0], expression_tree[1], operands[1])
+    function_name, arguments = expression_tree[1], expression_tree[2]
+    if (function_name in GREL_COLUMN_ACCESS_FUNCTIONS) and (len(arguments) == 1) and (arguments[0][0] == "column"):
+        return "{}({})".format(function_name, format_grel_literal(arguments[0][1]))
+    return "{}({})".format(function_name, ", ".join([format_grel_expression_tree(argument) for argument in arguments]))
+
+
+def extract_grel_expression_tree_columns(expression_tree):
+    """
+    Lists the columns referenced by a formula expression tree.
+
+    :param expression_tree: tuple: The formula expression tree, as computed with :function:`parse_grel_expression`.
+
+    :returns: column_names: set: Set of the referenced column names.
+    """
+    node_type = expression_tree[0]
+    if node_type == "literal":
+        return set()
+    if node_type == "column":
+        return set([expression_tree[1]])
+    if node_type == "call":
+        child_trees = expression_tree[2]
+    else:
+        child_trees = expression_tree[2:]
+    column_names = set()
+    for child_tree in child_trees:
+        column_names |= extract_grel_expression_tree_columns(child_tree)
+    return column_names
+
+
+def extract_grel_expression_columns(expression):
+    """
+    Lists the columns referenced by a DSS formula.
+
+    :param expression: str: Expression of the formula, following the DSS formula language.
+
+    :returns: column_names: set: Set of the referenced column names.
+    """
+    column_names = extract_grel_expression_tree_columns(parse_grel_expression(expression))
+    return column_names
+
+
+def broadcast_grel_value(value, index):
+    """
+    Converts a formula value into a pandas Series aligned on a DataFrame index.
+
+    :param value: object: A scalar or a pandas Series.
+    :param index: pandas.core.indexes.base.Index: The DataFrame index.
+
+    :returns: series: pandas.core.series.Series: The value as a Series.
+    """
+    if isinstance(value, pd.Series):
+        return value
+    series = pd.Series(value, index=index, dtype=object if value is None else None)
+    return series
+
+
+def check_if_grel_value_is_string(value):
+    """
+    Checks if a formula value holds strings.
+
+    :param value: object: A scalar or a pandas Series.
+
+    :returns: value_is_string: bool: Boolean precising if the value holds strings.
+    """
+    if isinstance(value, pd.Series):
+        if pd.api.types.is_string_dtype(value.dtype) or isinstance(value.dtype, pd.CategoricalDtype):
+            non_null_values = value.dropna()
+            return (len(non_null_values) == 0) or isinstance(non_null_values.iloc[0], str)
+        return False
+    return isinstance(value, str)
+
+
+def convert_grel_value_to_boolean(value):
+    """
+    Converts a formula value into booleans: null values are false, strings are true when equal to 'true'.
+
+    :param value: object: A scalar or a pandas Series.
+
+    :returns: boolean_value: object: A boolean or a boolean pandas Series.
+    """
+    if isinstance(value, pd.Series):
+        if pd.api.types.is_bool_dtype(value.dtype):
+            return value.fillna(False).astype(bool)
+        if check_if_grel_value_is_string(value):
+            return value.astype(object).map(lambda element: isinstance(element, str) and (element.lower() == "true"))
+        return value.astype(object).map(lambda element: (not pd.isnull(element)) and bool(element))
+    if isinstance(value, str):
+        return value.lower() == "true"
+    return (not pd.isnull(value)) and bool(value)
+
+
+def convert_grel_value_to_string(value):
+    """
+    Converts a formula value into strings, keeping null values. Integral floats are written without decimals.
+        Series having a pandas string dtype are kept as is, so that string functions stay vectorized.
+
+    :param value: object: A scalar or a pandas Series.
+
+    :returns: string_value: object: A string or a pandas Series of strings.
+    """
+    def convert_element(element):
+        if pd.isnull(element):
+            return None
+        if isinstance(element, (bool, np.bool_)):
+            return "true" if element else "false"
+        if isinstance(element, (float, np.floating)) and float(element).is_integer():
+            return str(int(element))
+        return str(element)
+
+    if isinstance(value, pd.Series):
+        values_are_not_null = value.notnull()
+        if pd.api.types.is_string_dtype(value.dtype) and (value.dtype != object):
+            return value
+        if pd.api.types.infer_dtype(value, skipna=True) in ["string", "empty"]:
+            return value.where(values_are_not_null, None)
+        if pd.api.types.is_bool_dtype(value.dtype):
+            return value.astype(object).map({True: "true", False: "false"}).where(values_are_not_null, None)
+        if pd.api.types.is_integer_dtype(value.dtype):
+            return value.astype(str).where(values_are_not_null, None)
+        if pd.api.types.is_float_dtype(value.dtype):
+            values_are_integral = values_are_not_null & (np.abs(value) < 1e15) & (np.floor(value) == value)
+            values_are_not_integral = values_are_not_null & ~values_are_integral
+            string_value = value[values_are_integral].astype("int64").astype(str)
+            if values_are_not_integral.any():
+                string_value = pd.concat([string_value, value[values_are_not_integral].astype(str)])
+            return string_value.reindex(value.index)
+        return value.astype(object).map(convert_element)
+    return convert_element(value)
+
+
+def convert_grel_value_to_number(value):
+    """
+    Converts a formula value into numbers: values that can't be converted become null.
+
+    :param value: object: A scalar or a pandas Series.
+
+    :returns: number_value: object: A number or a float pandas Series.
+    """
+    if isinstance(value, pd.Series):
+        if pd.api.types.is_bool_dtype(value.dtype):
+            return value.astype(float)
+        return pd.to_numeric(value, errors="coerce")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def check_if_grel_value_is_blank(value):
+    """
+    Checks which formula values are null or empty strings.
+
+    :param value: object: A scalar or a pandas Series.
+
+    :returns: value_is_blank: object: A boolean or a boolean pandas Series.
+    """
+    if isinstance(value, pd.Series):
+        return value.isnull() | (value.astype(object) == "")
+    return pd.isnull(value) or (value == "")
+
+
+def apply_grel_binary_operator(operator, left_value, right_value):
+    """
+    Applies a binary operator on formula values. '+' concatenates values when one of them holds strings
+        (null values are then considered as empty strings). Null values are only equal to null values, and other
+        comparisons involving null values are false. Divisions by zero are null.
+
+    :param operator: str: The operator.
+    :param left_value: object: A scalar or a pandas Series.
+    :param right_value: object: A scalar or a pandas Series.
+
+    :returns: result: object: A scalar or a pandas Series.
+    """
+    if operator == "&&":
+        return convert_grel_value_to_boolean(left_value) & convert_grel_value_to_boolean(right_value)
+    if operator == "||":
+        return convert_grel_value_to_boolean(left_value) | convert_grel_value_to_boolean(right_value)
+    if (operator == "+") and (check_if_grel_value_is_string(left_value) or check_if_grel_value_is_string(right_value)):
+        left_string = convert_grel_value_to_string(left_value)
+        right_string = convert_grel_value_to_string(right_value)
+        if not any([isinstance(value, pd.Series) for value in [left_string, right_string]]):
+            return (left_string or "") + (right_string or "")
+        left_string = left_string.fillna("") if isinstance(left_string, pd.Series) else (left_string or "")
+        right_string = right_string.fillna("") if isinstance(right_string, pd.Series) else (right_string or "")
+        return left_string + right_string
+    if operator in ["==", "!="]:
+        if not any([isinstance(value, pd.Series) for value in [left_value, right_value]]):
+            if pd.isnull(left_value) or pd.isnull(right_value):
+                values_are_equal = pd.isnull(left_value) and pd.isnull(right_value)
+            else:
+                values_are_equal = (left_value == right_value)
+            return values_are_equal if operator == "==" else (not values_are_equal)
+        series_index = (left_value if isinstance(left_value, pd.Series) else right_value).index
+        values_are_null = []
+        compared_values = []
+        for value in [left_value, right_value]:
+            if isinstance(value, pd.Series):
+                values_are_null.append(value.isna())
+                value = value.astype(object)
+            else:
+                values_are_null.append(pd.Series(pd.isnull(value), index=series_index))
+            compared_values.append(value)
+        values_are_equal = ((compared_values[0] == compared_values[1]) & ~values_are_null[0] & ~values_are_null[1])\
+            | (values_are_null[0] & values_are_null[1])
+        if operator == "==":
+            return values_are_equal
+        return ~values_are_equal
+    if operator in ["<", ">", "<=", ">="]:
+        if not (check_if_grel_value_is_string(left_value) and check_if_grel_value_is_string(right_value)):
+            left_value = convert_grel_value_to_number(left_value)
+            right_value = convert_grel_value_to_number(right_value)
+        if not any([isinstance(value, pd.Series) for value in [left_value, right_value]]):
+            if pd.isnull(left_value) or pd.isnull(right_value):
+                return False
+        comparison_functions = {"<": lambda x, y: x < y, ">": lambda x, y: x > y,
+                                "<=": lambda x, y: x <= y, ">=": lambda x, y: x >= y}
+        comparison = comparison_functions[operator](left_value, right_value)
+        if isinstance(comparison, pd.Series):
+            comparison = comparison.fillna(False).astype(bool)
+        return comparison
+    left_number = convert_grel_value_to_number(left_value)
+    right_number = convert_grel_value_to_number(right_value)
+    if not any([isinstance(value, pd.Series) for value in [left_number, right_number]]):
+        if (left_number is None) or (right_number is None):
+            return None
+        if (operator in ["/", "%"]) and (right_number == 0):
+            return None
+    arithmetic_functions = {"+": lambda x, y: x + y, "-": lambda x, y: x - y, "*": lambda x, y: x * y,
+                            "/": lambda x, y: x / y, "%": lambda x, y: np.fmod(x, y)}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = arithmetic_functions[operator](left_number, right_number)
+    if isinstance(result, pd.Series) and (operator in ["/", "%"]):
+        # Divisions by zero are null:
+        result = pd.Series(np.where(right_number == 0, np.nan, result), index=result.index)
+    return result
+
+
+def apply_grel_if_function(condition_value, true_value, false_value=None):
+    """
+    Evaluates the formula function 'if(condition, true_value, false_value)'.
+
+    :param condition_value: object: A scalar or a pandas Series.
+    :param true_value: object: A scalar or a pandas Series.
+    :param false_value: object: A scalar or a pandas Series.
+
+    :returns: result: object: A scalar or a pandas Series.
+    """
+    condition_value = convert_grel_value_to_boolean(condition_value)
+    if not isinstance(condition_value, pd.Series):
+        return true_value if condition_value else false_value
+    true_series = broadcast_grel_value(true_value, condition_value.index)
+    false_series = broadcast_grel_value(false_value, condition_value.index)
+    if true_series.dtype != false_series.dtype:
+        true_series = true_series.astype(object)
+        false_series = false_series.astype(object)
+    result = true_series.where(condition_value, false_series)
+    return result
+
+
+def apply_grel_coalesce_function(*values):
+    """
+    Evaluates the formula function 'coalesce(value_1, value_2, ...)': the first non-null value.
+
+    :param values: tuple: Scalars or pandas Series.
+
+    :returns: result: object: A scalar or a pandas Series.
+    """
+    result = values[0]
+    for value in values[1:]:
+        if isinstance(result, pd.Series):
+            if isinstance(value, pd.Series) and (value.dtype != result.dtype):
+                result = result.astype(object)
+            result = result.where(result.notnull(), value)
+        elif pd.isnull(result):
+            result = value
+    return result
+
+
+def apply_grel_string_function(string_function, value, *arguments):
+    """
+    Applies a string function on the non-null values of a formula value, in a vectorized way.
+
+    :param string_function: function: Function taking the pandas '.str' accessor of a Series of strings
+        (and optional scalar arguments) as input (ex: 'lambda strings: strings.lower()').
+    :param value: object: A scalar or a pandas Series.
+    :param arguments: tuple: Scalar arguments of the function.
+
+    :returns: result: object: A scalar or a pandas Series.
+    """
+    string_value = convert_grel_value_to_string(value)
+    if isinstance(string_value, pd.Series):
+        return string_function(string_value.str, *arguments)
+    if string_value is None:
+        return None
+    return string_function(pd.Series([string_value], dtype=object).str, *arguments).iloc[0]
+
+
+def apply_grel_number_function(number_function, *values):
+    """
+    Applies a numerical function on formula values.
+
+    :param number_function: function: Vectorized numerical function (ex: 'np.floor').
+    :param values: tuple: Scalars or pandas Series.
+
+    :returns: result: object: A scalar or a pandas Series.
+    """
+    number_values = [convert_grel_value_to_number(value) for value in values]
+    if any([number_value is None for number_value in number_values]):
+        return None
+    result = number_function(*number_values)
+    return result
+
+
+GREL_FUNCTIONS = {
+    "if": apply_grel_if_function,
+    "coalesce": apply_grel_coalesce_function,
+    "and": lambda *values: reduce(lambda x, y: apply_grel_binary_operator("&&", x, y), values),
+    "or": lambda *values: reduce(lambda x, y: apply_grel_binary_operator("||", x, y), values),
+    "not": lambda value: ~convert_grel_value_to_boolean(value) if isinstance(value, pd.Series) else not convert_grel_value_to_boolean(value),
+    "isNull": lambda value: value.isnull() if isinstance(value, pd.Series) else pd.isnull(value),
+    "isNotNull": lambda value: value.notnull() if isinstance(value, pd.Series) else not pd.isnull(value),
+    "isBlank": check_if_grel_value_is_blank,
+    "isNonBlank": lambda value: ~check_if_grel_value_is_blank(value) if isinstance(value, pd.Series) else not check_if_grel_value_is_blank(value),
+    "val": lambda value: value,
+    "strval": convert_grel_value_to_string,
+    "numval": convert_grel_value_to_number,
+    "toString": convert_grel_value_to_string,
+    "toNumber": convert_grel_value_to_number,
+    "length": lambda value: apply_grel_string_function(lambda strings: strings.len(), value),
+    "toLowercase": lambda value: apply_grel_string_function(lambda strings: strings.lower(), value),
+    "toUppercase": lambda value: apply_grel_string_function(lambda strings: strings.upper(), value),
+    "toTitlecase": lambda value: apply_grel_string_function(lambda strings: strings.title(), value),
+    "trim": lambda value: apply_grel_string_function(lambda strings: strings.strip(), value),
+    "strip": lambda value: apply_grel_string_function(lambda strings: strings.strip(), value),
+    "contains": lambda value, substring: apply_grel_string_function(lambda strings: strings.contains(substring, regex=False), value),
+    "startsWith": lambda value, prefix: apply_grel_string_function(lambda strings: strings.startswith(prefix), value),
+    "endsWith": lambda value, suffix: apply_grel_string_function(lambda strings: strings.endswith(suffix), value),
+    "indexOf": lambda value, substring: apply_grel_string_function(lambda strings: strings.find(substring), value),
+    "lastIndexOf": lambda value, substring: apply_grel_string_function(lambda strings: strings.rfind(substring), value),
+    "replace": lambda value, old, new: apply_grel_string_function(lambda strings: strings.replace(old, new, regex=False), value),
+    "substring": lambda value, start, end=None: apply_grel_string_function(
+        lambda strings: strings.slice(int(start), None if end is None else int(end)), value),
+    "concat": lambda *values: reduce(lambda x, y: apply_grel_binary_operator("+", x, y),
+                                     [convert_grel_value_to_string(value) for value in values]),
+    "abs": lambda value: apply_grel_number_function(np.abs, value),
+    "round": lambda value: apply_grel_number_function(lambda numbers: np.floor(numbers + 0.5), value),
+    "floor": lambda value: apply_grel_number_function(np.floor, value),
+    "ceil": lambda value: apply_grel_number_function(np.ceil, value),
+    "sqrt": lambda value: apply_grel_number_function(np.sqrt, value),
+    "min": lambda *values: apply_grel_number_function(lambda *numbers: reduce(np.fmin, numbers), *values),
+    "max": lambda *values: apply_grel_number_function(lambda *numbers: reduce(np.fmax, numbers), *values),
+}
+
+
+def evaluate_grel_expression_tree(expression_tree, dataframe):
+    """
+    Evaluates a formula expression tree on a DataFrame, in a vectorized way.
+
+    :param expression_tree: tuple: The formula expression tree, as computed with :function:`parse_grel_expression`.
+    :param dataframe: pandas.core.frame.DataFrame: The DataFrame whose columns the formula references.
+
+    :returns: result: object: A scalar or a pandas Series aligned on the DataFrame index.
+    """
+    node_type = expression_tree[0]
+    if node_type == "literal":
+        return expression_tree[1]
+    if node_type == "column":
+        column_name = expression_tree[1]
+        if column_name not in dataframe.columns:
+            log_message = "Formula references column '{}' which does not exist. Existing columns are '{}'"\
+                .format(column_name, list(dataframe.columns))
+            raise Exception(log_message)
+        return dataframe[column_name]
+    if node_type == "unary":
+        operand_value = evaluate_grel_expression_tree(expression_tree[2], dataframe)
+        if expression_tree[1] == "!":
+            return GREL_FUNCTIONS["not"](operand_value)
+        return apply_grel_binary_operator("*", operand_value, -1)
+    if node_type == "binary":
+        left_value = evaluate_grel_expression_tree(expression_tree[2], dataframe)
+        right_value = evaluate_grel_expression_tree(expression_tree[3], dataframe)
+        return apply_grel_binary_operator(expression_tree[1], left_value, right_value)
+    function_name = expression_tree[1]
+    if function_name not in GREL_FUNCTIONS:
+        log_message = "Formula function '{}' is not supported locally. Supported functions are '{}'"\
+            .format(function_name, sorted(GREL_FUNCTIONS.keys()))
+        raise Exception(log_message)
+    argument_values = [evaluate_grel_expression_tree(argument, dataframe) for argument in expression_tree[2]]
+    return GREL_FUNCTIONS[function_name](*argument_values)
+
+
+def fold_grel_expression_tree(expression_tree):
+    """
+    Simplifies a formula expression tree by evaluating once the sub-expressions that don't reference any column
+        (ex: 'x * (60 * 60)' becomes 'x * 3600').
+
+    :param expression_tree: tuple: The formula expression tree, as computed with :function:`parse_grel_expression`.
+
+    :returns: folded_expression_tree: tuple: The simplified formula expression tree.
+    """
+    node_type = expression_tree[0]
+    if node_type in ["literal", "column"]:
+        return expression_tree
+    if node_type == "unary":
+        folded_expression_tree = ("unary", expression_tree[1], fold_grel_expression_tree(expression_tree[2]))
+        child_trees = [folded_expression_tree[2]]
+    elif node_type == "binary":
+        folded_expression_tree = ("binary", expression_tree[1], fold_grel_expression_tree(expression_tree[2]),
+                                  fold_grel_expression_tree(expression_tree[3]))
+        child_trees = list(folded_expression_tree[2:])
+    else:
+        folded_expression_tree = ("call", expression_tree[1],
+                                  tuple([fold_grel_expression_tree(argument) for argument in expression_tree[2]]))
+        child_trees = list(folded_expression_tree[2])
+        if expression_tree[1] not in GREL_FUNCTIONS:
+            return folded_expression_tree
+    if all([child_tree[0] == "literal" for child_tree in child_trees]):
+        return ("literal", evaluate_grel_expression_tree(folded_expression_tree, pd.DataFrame()))
+    return folded_expression_tree
+
+
+def compile_grel_expression_tree(expression_tree):
+    """
+    Compiles a formula expression tree into a function evaluating it on a DataFrame: operators and functions are
+        resolved once, so that evaluating the formula on many DataFrames or chunks only runs vectorized operations.
+
+    :param expression_tree: tuple: The formula expression tree, as computed with :function:`parse_grel_expression`.
+
+    :returns: compiled_expression: function: Function taking a DataFrame as input and returning a scalar
+        or a pandas Series aligned on the DataFrame index.
+    """
+    node_type = expression_tree[0]
+    if node_type == "literal":
+        literal_value = expression_tree[1]
+        return lambda dataframe: literal_value
+    if node_type == "column":
+        column_name = expression_tree[1]
+
+        def compiled_expression(dataframe):
+            if column_name not in dataframe.columns:
+                log_message = "Formula references column '{}' which does not exist. Existing columns are '{}'"\
+                    .format(column_name, list(dataframe.columns))
+                raise Exception(log_message)
+            return dataframe[column_name]
+        return compiled_expression
+    if node_type == "unary":
+        compiled_operand = compile_grel_expression_tree(expression_tree[2])
+        if expression_tree[1] == "!":
+            not_function = GREL_FUNCTIONS["not"]
+            return lambda dataframe: not_function(compiled_operand(dataframe))
+        return lambda dataframe: apply_grel_binary_operator("*", compiled_operand(dataframe), -1)
+    if node_type == "binary":
+        operator = expression_tree[1]
+        compiled_left_operand = compile_grel_expression_tree(expression_tree[2])
+        compiled_right_operand = compile_grel_expression_tree(expression_tree[3])
+        return lambda dataframe: apply_grel_binary_operator(operator, compiled_left_operand(dataframe),
+                                                            compiled_right_operand(dataframe))
+    function_name = expression_tree[1]
+    if function_name not in GREL_FUNCTIONS:
+        log_message = "Formula function '{}' is not supported locally. Supported functions are '{}'"\
+            .format(function_name, sorted(GREL_FUNCTIONS.keys()))
+        raise Exception(log_message)
+    grel_function = GREL_FUNCTIONS[function_name]
+    compiled_arguments = [compile_grel_expression_tree(argument) for argument in expression_tree[2]]
+    return lambda dataframe: grel_function(*[compiled_argument(dataframe) for compiled_argument in compiled_arguments])
+
+
+@lru_cache(maxsize=1024)
+def compile_grel_expression(expression):
+    """
+    Parses, simplifies and compiles a DSS formula. Compiled formulas are cached.
+
+    :param expression: str: Expression of the formula, following the DSS formula language.
+
+    :returns: compiled_expression: function: Function taking a DataFrame as input and returning a scalar
+        or a pandas Series aligned on the DataFrame index (see :function:`compile_grel_expression_tree`).
+    """
+    compiled_expression = compile_grel_expression_tree(fold_grel_expression_tree(parse_grel_expression(expression)))
+    return compiled_expression
+
+
+def evaluate_grel_expression(expression, dataframe):
+    """
+    Evaluates a DSS formula on a DataFrame, in a vectorized way.
+
+    :param expression: str: Expression of the formula, following the DSS formula language
+        (https://doc.dataiku.com/dss/latest/formula/index.html).
+    :param dataframe: pandas.core.frame.DataFrame: The DataFrame whose columns the formula references.
+
+    :returns: result_series: pandas.core.series.Series: The formula result, aligned on the DataFrame index.
+    """
+    result = compile_grel_expression(expression)(dataframe)
+    result_series = broadcast_grel_value(result, dataframe.index)
+    return result_series
+
+
+def evaluate_grel_filter(expression, dataframe):
+    """
+    Evaluates a DSS formula used as a rows filter on a DataFrame.
+
+    :param expression: str: Expression of the filter formula, following the DSS formula language.
+    :param dataframe: pandas.core.frame.DataFrame: The DataFrame to filter.
+
+    :returns: filter_mask: pandas.core.series.Series: Boolean Series, true for the rows to keep.
+    """
+    filter_mask = broadcast_grel_value(convert_grel_value_to_boolean(evaluate_grel_expression(expression, dataframe)),
+                                       dataframe.index).astype(bool)
+    return filter_mask
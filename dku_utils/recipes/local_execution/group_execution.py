@@ -0,0 +1,110 @@
+import pandas as pd
+from .grel_expressions import convert_grel_value_to_string
+from .local_execution_commons import apply_computed_columns, apply_recipe_filter
+from ..group_recipe import compute_group_recipe_output_columns
+
+
+GROUP_AGGREGATIONS_PANDAS_FUNCTIONS = {"min": "min", "max": "max", "avg": "mean", "stddev": "std",
+                                       "count": "count", "countDistinct": "nunique"}
+DEFAULT_CONCATENATION_SEPARATOR = ","
+GLOBAL_GROUP_KEY_COLUMN = "__global_group_key"
+
+
+def compute_grouped_column_aggregation(dataframe, key_columns, column_name, aggregation, column_settings):
+    """
+    Computes one aggregation of a column for each group of a DataFrame, in a vectorized way.
+        Null values are ignored by all the aggregations (except 'first' and 'last' when 'firstLastNotNull' is False),
+        and the sum of a group having only null values is null, as in SQL.
+
+    :param dataframe: pandas.core.frame.DataFrame: The DataFrame.
+    :param key_columns: list: List of the group key columns (must not be empty).
+    :param column_name: str: Name of the aggregated column.
+    :param aggregation: str: The aggregation, in 'GROUP_POSSIBLE_AGGREGATIONS'.
+    :param column_settings: dict: Settings of the aggregated column in the recipe payload
+        (ex: 'concatSeparator', 'orderColumn', 'firstLastNotNull'). The order column also orders 'concat' values.
+        Without an order column, 'first' and 'last' return the values of the first and last rows in the DataFrame order
+        (the in-database queries of :function:`connections.sql.sql_aggregations.generate_sql_group_query` return
+        the minimum and maximum values instead).
+
+    :returns: aggregated_series: pandas.core.series.Series: The aggregated values, indexed by the group keys.
+    """
+    if aggregation in GROUP_AGGREGATIONS_PANDAS_FUNCTIONS:
+        return dataframe.groupby(key_columns, dropna=False, sort=False)[column_name].agg(GROUP_AGGREGATIONS_PANDAS_FUNCTIONS[aggregation])
+    if aggregation == "sum":
+        return dataframe.groupby(key_columns, dropna=False, sort=False)[column_name].sum(min_count=1)
+    if aggregation in ["first", "last"]:
+        order_column = column_settings.get("orderColumn")
+        if order_column not in [None, ""]:
+            dataframe = dataframe.sort_values(order_column, kind="stable")
+        grouped_column = dataframe.groupby(key_columns, dropna=False, sort=False)[column_name]
+        if column_settings.get("firstLastNotNull", False):
+            return grouped_column.first() if aggregation == "first" else grouped_column.last()
+        rows_are_selected = (grouped_column.cumcount(ascending=(aggregation == "first")) == 0)
+        return dataframe[rows_are_selected].groupby(key_columns, dropna=False, sort=False)[column_name].first()
+    if aggregation in ["concat", "concatDistinct"]:
+        concatenation_separator = column_settings.get("concatSeparator") or DEFAULT_CONCATENATION_SEPARATOR
+        if (aggregation == "concat") and (column_settings.get("orderColumn") not in [None, ""]):
+            dataframe = dataframe.sort_values(column_settings["orderColumn"], kind="stable")
+        non_null_dataframe = dataframe[key_columns].assign(**{column_name: convert_grel_value_to_string(dataframe[column_name])})
+        non_null_dataframe = non_null_dataframe[non_null_dataframe[column_name].notnull()]
+        if aggregation == "concatDistinct":
+            non_null_dataframe = non_null_dataframe.drop_duplicates(subset=key_columns + [column_name])
+        return non_null_dataframe.groupby(key_columns, dropna=False, sort=False)[column_name].agg(concatenation_separator.join)
+    log_message = "Aggregation '{}' can't be executed locally.".format(aggregation)
+    raise Exception(log_message)
+
+
+def execute_group_recipe_payload(recipe_json_payload, input_dataframes, input_dataset_names=None):
+    """
+    Executes a group recipe payload on a local DataFrame: pre-filter and computed columns, group keys,
+        column aggregations (including 'concat', 'concatDistinct' and 'countDistinct'), global count,
+        output column name overrides and post-filter. Output columns are named as DSS names them
+        (see :function:`compute_group_recipe_output_columns`).
+
+    :param recipe_json_payload: dict: JSON payload of the group recipe.
+    :param input_dataframes: list: List containing the recipe input DataFrame.
+    :param input_dataset_names: list: List of the recipe input dataset names (unused by group recipes).
+
+    :returns: output_dataframe: pandas.core.frame.DataFrame: The group recipe output.
+    """
+    dataframe = apply_computed_columns(input_dataframes[0], recipe_json_payload.get("computedColumns", []))
+    dataframe = apply_recipe_filter(dataframe, recipe_json_payload.get("preFilter"))
+    key_columns = [key_settings["column"] for key_settings in recipe_json_payload.get("keys", [])]
+    bool_is_global_aggregation = (len(key_columns) == 0)
+    if bool_is_global_aggregation:
+        key_columns = [GLOBAL_GROUP_KEY_COLUMN]
+        dataframe = dataframe.assign(**{GLOBAL_GROUP_KEY_COLUMN: 0})
+    columns_settings = {column_settings["column"]: column_settings for column_settings in recipe_json_payload.get("values", [])}
+
+    groups_index = dataframe.groupby(key_columns, dropna=False, sort=False).size().index
+    if bool_is_global_aggregation and (len(groups_index) == 0):
+        groups_index = pd.Index([0], name=GLOBAL_GROUP_KEY_COLUMN)
+    output_series = []
+    for output_column_information in compute_group_recipe_output_columns(recipe_json_payload):
+        if output_column_information["aggregation"] is None:
+            continue
+        if output_column_information["input_column"] is None:
+            aggregated_series = dataframe.groupby(key_columns, dropna=False, sort=False).size()
+        else:
+            column_name = output_column_information["input_column"]
+            aggregated_series = compute_grouped_column_aggregation(dataframe, key_columns, column_name,
+                                                                   output_column_information["aggregation"],
+                                                                   columns_settings.get(column_name, {}))
+        aggregated_series = aggregated_series.reindex(groups_index)
+        if output_column_information["aggregation"] in ["count", "countDistinct"]:
+            aggregated_series = aggregated_series.fillna(0).astype("int64")
+        output_series.append(aggregated_series.rename(output_column_information["output_column"]))
+
+    output_dataframe = pd.DataFrame(index=groups_index)
+    if len(output_series) > 0:
+        output_dataframe = pd.concat(output_series, axis=1)
+        output_dataframe.index = groups_index
+    output_dataframe = output_dataframe.reset_index()
+    if bool_is_global_aggregation:
+        output_dataframe = output_dataframe.drop(columns=[GLOBAL_GROUP_KEY_COLUMN])
+    output_column_name_overrides = recipe_json_payload.get("outputColumnNameOverrides", {})
+    output_dataframe = output_dataframe.rename(columns={key_column: output_column_name_overrides.get(key_column, key_column)
+                                                        for key_column in key_columns})
+    output_dataframe = apply_recipe_filter(output_dataframe, recipe_json_payload.get("postFilter"))
+    output_dataframe = output_dataframe.reset_index(drop=True)
+    return output_dataframe
@@ -0,0 +1,183 @@
+import unicodedata
+import pandas as pd
+from .local_execution_commons import apply_computed_columns, apply_recipe_filter
+from ..join_recipe import compute_join_recipe_output_column_name
+
+
+JOIN_TYPES_PANDAS_MERGE_HOWS = {"LEFT": "left", "INNER": "inner", "RIGHT": "right", "FULL": "outer", "CROSS": "cross"}
+
+
+def compute_join_table_column_name(table_index, column_name):
+    """
+    Computes the name of a virtual input column in the intermediate joined DataFrame, so that columns having the
+        same name in several virtual inputs don't collide.
+
+    :param table_index: int: Index of the virtual input.
+    :param column_name: str: Name of the column in the virtual input.
+
+    :returns: join_table_column_name: str: Name of the column in the intermediate DataFrame.
+    """
+    join_table_column_name = "__table_{}__{}".format(table_index, column_name)
+    return join_table_column_name
+
+
+def normalize_join_key_series(series, bool_case_insensitive, bool_normalize_text):
+    """
+    Normalizes the values of a join key column, following a join condition options.
+
+    :param series: pandas.core.series.Series: The join key column.
+    :param bool_case_insensitive: bool: Precise if the key comparison ignores case.
+    :param bool_normalize_text: bool: Precise if the key comparison ignores case, accents and surrounding spaces.
+
+    :returns: normalized_series: pandas.core.series.Series: The normalized join key column.
+    """
+    if not (bool_case_insensitive or bool_normalize_text):
+        return series
+    normalized_series = series.astype(object).map(lambda value: value.lower() if isinstance(value, str) else value)
+    if bool_normalize_text:
+        normalized_series = normalized_series.map(
+            lambda value: unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii").strip()
+            if isinstance(value, str) else value)
+    return normalized_series
+
+
+def merge_dataframes_on_keys(left_dataframe, right_dataframe, left_key_columns, right_key_columns, join_type):
+    """
+    Joins two DataFrames on equality of their keys. Unlike 'pandas.merge', rows having a null key value never match,
+        as in DSS: they are only kept by the outer side of the join.
+
+    :param left_dataframe: pandas.core.frame.DataFrame: The left DataFrame.
+    :param right_dataframe: pandas.core.frame.DataFrame: The right DataFrame.
+    :param left_key_columns: list: List of the left key columns.
+    :param right_key_columns: list: List of the right key columns.
+    :param join_type: str: Type of the join, in 'JOIN_TYPES_PANDAS_MERGE_HOWS'.
+
+    :returns: joined_dataframe: pandas.core.frame.DataFrame: The joined DataFrame.
+    """
+    merge_how = JOIN_TYPES_PANDAS_MERGE_HOWS[join_type]
+    if merge_how == "cross":
+        return left_dataframe.merge(right_dataframe, how="cross")
+    left_rows_have_keys = left_dataframe[left_key_columns].notnull().all(axis=1)
+    right_rows_have_keys = right_dataframe[right_key_columns].notnull().all(axis=1)
+    joined_dataframe = left_dataframe[left_rows_have_keys].merge(right_dataframe[right_rows_have_keys], how=merge_how,
+                                                                 left_on=left_key_columns, right_on=right_key_columns)
+    unmatched_dataframes = [joined_dataframe]
+    if merge_how in ["left", "outer"]:
+        unmatched_dataframes.append(left_dataframe[~left_rows_have_keys])
+    if merge_how in ["right", "outer"]:
+        unmatched_dataframes.append(right_dataframe[~right_rows_have_keys])
+    unmatched_dataframes = [dataframe for dataframe in unmatched_dataframes[1:] if len(dataframe) > 0]
+    if len(unmatched_dataframes) > 0:
+        joined_dataframe = pd.concat([joined_dataframe] + unmatched_dataframes, ignore_index=True)
+    joined_dataframe = joined_dataframe.reset_index(drop=True)
+    return joined_dataframe
+
+
+def execute_join(joined_dataframe, joined_table_indexes, table_dataframes, join_settings):
+    """
+    Executes one join of a join recipe payload, between the already joined tables and a new table.
+
+    :param joined_dataframe: pandas.core.frame.DataFrame: The intermediate joined DataFrame.
+    :param joined_table_indexes: list: Indexes of the virtual inputs already joined. Updated in place.
+    :param table_dataframes: list: Pre-processed DataFrames of all the virtual inputs, with intermediate column names.
+    :param join_settings: dict: Settings of the join, from the 'joins' section of the recipe payload.
+
+    :returns: joined_dataframe: pandas.core.frame.DataFrame: The intermediate joined DataFrame, including the new table.
+    """
+    new_table_index = join_settings["table2"]
+    if new_table_index in joined_table_indexes:
+        new_table_index = join_settings["table1"]
+    if new_table_index in joined_table_indexes:
+        log_message = "Join '{}' only involves tables that are already joined: it can't be executed locally.".format(join_settings)
+        raise Exception(log_message)
+    if join_settings.get("rightLimit", {}).get("enabled", False):
+        log_message = "Join '{}' limits the number of matches: it can't be executed locally.".format(join_settings)
+        raise Exception(log_message)
+    join_type = join_settings["type"]
+    if join_type not in JOIN_TYPES_PANDAS_MERGE_HOWS:
+        log_message = "Join type '{}' can't be executed locally. Supported join types are '{}'"\
+            .format(join_type, list(JOIN_TYPES_PANDAS_MERGE_HOWS.keys()))
+        raise Exception(log_message)
+    if (join_settings.get("conditionsMode", "AND") != "AND") and (len(join_settings.get("on", [])) > 1):
+        log_message = "Join conditions mode '{}' can't be executed locally: only 'AND' is supported."\
+            .format(join_settings["conditionsMode"])
+        raise Exception(log_message)
+
+    new_table_dataframe = table_dataframes[new_table_index]
+    left_key_columns = []
+    right_key_columns = []
+    for condition_index, join_condition in enumerate(join_settings.get("on", [])):
+        if join_condition.get("type", "EQ") != "EQ":
+            log_message = "Join condition type '{}' can't be executed locally: only 'EQ' is supported.".format(join_condition["type"])
+            raise Exception(log_message)
+        joined_column, new_table_column = join_condition["column1"], join_condition["column2"]
+        if joined_column["table"] == new_table_index:
+            joined_column, new_table_column = new_table_column, joined_column
+        bool_case_insensitive = join_condition.get("caseInsensitive", False)
+        bool_normalize_text = join_condition.get("normalizeText", False)
+        left_key_column = "__left_key_{}".format(condition_index)
+        right_key_column = "__right_key_{}".format(condition_index)
+        joined_dataframe = joined_dataframe.assign(**{left_key_column: normalize_join_key_series(
+            joined_dataframe[compute_join_table_column_name(joined_column["table"], joined_column["name"])],
+            bool_case_insensitive, bool_normalize_text)})
+        new_table_dataframe = new_table_dataframe.assign(**{right_key_column: normalize_join_key_series(
+            new_table_dataframe[compute_join_table_column_name(new_table_index, new_table_column["name"])],
+            bool_case_insensitive, bool_normalize_text)})
+        left_key_columns.append(left_key_column)
+        right_key_columns.append(right_key_column)
+    if (len(left_key_columns) == 0) and (join_type != "CROSS"):
+        log_message = "Join '{}' has no condition: it can't be executed locally.".format(join_settings)
+        raise Exception(log_message)
+
+    joined_dataframe = merge_dataframes_on_keys(joined_dataframe, new_table_dataframe, left_key_columns,
+                                                right_key_columns, join_type)
+    joined_dataframe = joined_dataframe.drop(columns=left_key_columns + right_key_columns)
+    joined_table_indexes.append(new_table_index)
+    return joined_dataframe
+
+
+def execute_join_recipe_payload(recipe_json_payload, input_dataframes, input_dataset_names=None):
+    """
+    Executes a join recipe payload on local DataFrames: virtual inputs pre-join computed columns and pre-filters,
+        joins (types 'LEFT', 'INNER', 'RIGHT', 'FULL' and 'CROSS' with equality conditions), selected columns with
+        their aliases and prefixes, post-join computed columns and post-filter.
+
+    :param recipe_json_payload: dict: JSON payload of the join recipe.
+    :param input_dataframes: list: List of the recipe input DataFrames, in the recipe inputs order.
+    :param input_dataset_names: list: List of the recipe input dataset names (unused by join recipes).
+
+    :returns: output_dataframe: pandas.core.frame.DataFrame: The join recipe output.
+    """
+    virtual_inputs = recipe_json_payload["virtualInputs"]
+    table_dataframes = []
+    for table_index, virtual_input in enumerate(virtual_inputs):
+        table_dataframe = apply_computed_columns(input_dataframes[virtual_input["index"]], virtual_input.get("computedColumns", []))
+        table_dataframe = apply_recipe_filter(table_dataframe, virtual_input.get("preFilter"))
+        table_dataframe = table_dataframe.rename(columns={column_name: compute_join_table_column_name(table_index, column_name)
+                                                          for column_name in table_dataframe.columns})
+        table_dataframes.append(table_dataframe.reset_index(drop=True))
+
+    joins = recipe_json_payload.get("joins", [])
+    first_table_index = joins[0]["table1"] if len(joins) > 0 else 0
+    joined_dataframe = table_dataframes[first_table_index]
+    joined_table_indexes = [first_table_index]
+    for join_settings in joins:
+        joined_dataframe = execute_join(joined_dataframe, joined_table_indexes, table_dataframes, join_settings)
+
+    selected_columns = list(recipe_json_payload.get("selectedColumns", []))
+    selected_column_keys = set([(selected_column["table"], selected_column["name"]) for selected_column in selected_columns])
+    for table_index, virtual_input in enumerate(virtual_inputs):
+        if virtual_input.get("autoSelectColumns", False) and (table_index in joined_table_indexes):
+            for join_table_column_name in table_dataframes[table_index].columns:
+                column_name = join_table_column_name[len(compute_join_table_column_name(table_index, "")):]
+                if (table_index, column_name) not in selected_column_keys:
+                    selected_columns.append({"table": table_index, "name": column_name})
+    output_dataframe = pd.DataFrame(index=joined_dataframe.index)
+    for selected_column in selected_columns:
+        output_column_name = compute_join_recipe_output_column_name(selected_column, virtual_inputs)
+        output_dataframe[output_column_name] = joined_dataframe[compute_join_table_column_name(selected_column["table"],
+                                                                                               selected_column["name"])]
+    output_dataframe = apply_computed_columns(output_dataframe, recipe_json_payload.get("computedColumns", []))
+    output_dataframe = apply_recipe_filter(output_dataframe, recipe_json_payload.get("postFilter"))
+    output_dataframe = output_dataframe.reset_index(drop=True)
+    return output_dataframe
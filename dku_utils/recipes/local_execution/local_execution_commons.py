@@ -0,0 +1,77 @@
+import pandas as pd
+from .grel_expressions import evaluate_grel_expression, evaluate_grel_filter
+
+
+DSS_DATATYPES_PANDAS_DTYPES = {"tinyint": "Int64", "smallint": "Int64", "int": "Int64", "bigint": "Int64",
+                               "float": "float64", "double": "float64", "boolean": "boolean", "string": "object"}
+
+
+def cast_series_to_dss_datatype(series, dss_datatype):
+    """
+    Casts a pandas Series to the dtype matching a DSS datatype. Values that can't be cast become null,
+        as they would in a DSS output dataset.
+
+    :param series: pandas.core.series.Series: The Series to cast.
+    :param dss_datatype: str: The DSS datatype (ex: 'bigint', 'double', 'string').
+
+    :returns: cast_series: pandas.core.series.Series: The cast Series.
+    """
+    if dss_datatype in ["tinyint", "smallint", "int", "bigint", "float", "double"]:
+        cast_series = pd.to_numeric(series, errors="coerce")
+        if DSS_DATATYPES_PANDAS_DTYPES[dss_datatype] == "Int64":
+            cast_series = cast_series.round().astype("Int64")
+        return cast_series
+    if dss_datatype == "boolean":
+        return series.astype("boolean")
+    if dss_datatype == "string":
+        return series.astype(object).where(series.notnull(), None).map(lambda value: value if value is None else str(value))
+    if dss_datatype in ["date", "dateonly", "datetimenotz"]:
+        return pd.to_datetime(series, errors="coerce")
+    return series
+
+
+def apply_computed_columns(dataframe, computed_columns):
+    """
+    Adds computed columns to a DataFrame, as defined in a visual recipe payload.
+
+    :param dataframe: pandas.core.frame.DataFrame: The DataFrame.
+    :param computed_columns: list: List of the computed columns settings, with format:
+        [{'name': 'column_1', 'type': 'double', 'mode': 'GREL', 'expr': 'column_2 * 2'}, ...]
+
+    :returns: dataframe: pandas.core.frame.DataFrame: The DataFrame with its computed columns.
+    """
+    if len(computed_columns) == 0:
+        return dataframe
+    dataframe = dataframe.copy()
+    for computed_column in computed_columns:
+        if computed_column.get("mode", "GREL") != "GREL":
+            log_message = "Computed column '{}' uses mode '{}': only 'GREL' computed columns can be executed locally."\
+                .format(computed_column["name"], computed_column.get("mode"))
+            raise Exception(log_message)
+        computed_column_values = evaluate_grel_expression(computed_column["expr"], dataframe)
+        dataframe[computed_column["name"]] = cast_series_to_dss_datatype(computed_column_values, computed_column.get("type"))
+    return dataframe
+
+
+def apply_recipe_filter(dataframe, recipe_filter):
+    """
+    Applies a visual recipe filter (pre-filter or post-filter) on a DataFrame. Only filters defined with a formula
+        can be executed locally.
+
+    :param dataframe: pandas.core.frame.DataFrame: The DataFrame to filter.
+    :param recipe_filter: dict: The filter settings, with format:
+        {'enabled': True, 'distinct': False, 'expression': 'column_1 > 0', 'uiData': {'mode': 'CUSTOM'}}
+
+    :returns: dataframe: pandas.core.frame.DataFrame: The filtered DataFrame.
+    """
+    if recipe_filter is None:
+        return dataframe
+    if recipe_filter.get("enabled", False):
+        filter_expression = recipe_filter.get("expression")
+        if filter_expression in [None, ""]:
+            log_message = "Filter '{}' is not defined with a formula and can't be executed locally.".format(recipe_filter)
+            raise Exception(log_message)
+        dataframe = dataframe[evaluate_grel_filter(filter_expression, dataframe)]
+    if recipe_filter.get("distinct", False):
+        dataframe = dataframe.drop_duplicates()
+    return dataframe
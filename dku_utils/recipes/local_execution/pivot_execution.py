@@ -0,0 +1,114 @@
+import pandas as pd
+from .grel_expressions import convert_grel_value_to_string
+from .group_execution import compute_grouped_column_aggregation, GLOBAL_GROUP_KEY_COLUMN
+from .local_execution_commons import apply_computed_columns, apply_recipe_filter
+from ..pivot_recipe import compute_pivot_recipe_output_column_name
+
+
+PIVOT_AGGREGATIONS = ["avg", "concat", "count", "countDistinct", "first", "last", "max", "min", "stddev", "sum"]
+PIVOT_VALUE_LABEL_COLUMN = "__pivot_value_label"
+
+
+def select_pivoted_values(pivot_key_dataframe, pivot_settings):
+    """
+    Selects the values to pivot, following the pivot values selection settings:
+        - Explicit values, when 'explicitValues' is not empty.
+        - 'TOP_N': the 'topnLimit' most frequent values.
+        - 'AT_LEAST_N_OCC': the values occurring at least 'minOccLimit' times.
+        - 'NO_LIMIT': all the values.
+        Values are returned from the most to the least frequent. Rows having a null pivoted value are never pivoted.
+
+    :param pivot_key_dataframe: pandas.core.frame.DataFrame: The pivoted columns, converted to strings.
+    :param pivot_settings: dict: Settings of the pivot, from the 'pivots' section of the recipe payload.
+
+    :returns: pivoted_values: list: List of the pivoted values, as tuples of strings in the 'keyColumns' order.
+    """
+    explicit_values = pivot_settings.get("explicitValues", [])
+    if len(explicit_values) > 0:
+        pivoted_values = [tuple(value) if isinstance(value, list) else (value,) for value in explicit_values]
+        return pivoted_values
+    value_counts = pivot_key_dataframe.dropna().value_counts(sort=False).sort_values(ascending=False, kind="stable")
+    value_limit = pivot_settings.get("valueLimit", "TOP_N")
+    if value_limit == "TOP_N":
+        value_counts = value_counts.iloc[:int(pivot_settings.get("topnLimit", 20))]
+    elif value_limit == "AT_LEAST_N_OCC":
+        value_counts = value_counts[value_counts >= int(pivot_settings.get("minOccLimit", 2))]
+    elif value_limit != "NO_LIMIT":
+        log_message = "Pivot values selection '{}' can't be executed locally.".format(value_limit)
+        raise Exception(log_message)
+    pivoted_values = [value if isinstance(value, tuple) else (value,) for value in value_counts.index]
+    return pivoted_values
+
+
+def execute_pivot_recipe_payload(recipe_json_payload, input_dataframes, input_dataset_names=None):
+    """
+    Executes a pivot recipe payload on a local DataFrame: pre-filter and computed columns, row identifiers, pivoted
+        values selection (see :function:`select_pivoted_values`), aggregations of each pivoted value, global counts
+        and post-filter. Output columns are named as DSS names them (see :function:`compute_pivot_recipe_output_column_name`).
+        Only the first pivot of the payload is executed.
+
+    :param recipe_json_payload: dict: JSON payload of the pivot recipe.
+    :param input_dataframes: list: List containing the recipe input DataFrame.
+    :param input_dataset_names: list: List of the recipe input dataset names (unused by pivot recipes).
+
+    :returns: output_dataframe: pandas.core.frame.DataFrame: The pivot recipe output.
+    """
+    dataframe = apply_computed_columns(input_dataframes[0], recipe_json_payload.get("computedColumns", []))
+    dataframe = apply_recipe_filter(dataframe, recipe_json_payload.get("preFilter"))
+    pivot_settings = recipe_json_payload["pivots"][0]
+    identifier_columns = list(recipe_json_payload.get("explicitIdentifiers", []))
+    bool_has_identifiers = (len(identifier_columns) > 0)
+    if not bool_has_identifiers:
+        identifier_columns = [GLOBAL_GROUP_KEY_COLUMN]
+        dataframe = dataframe.assign(**{GLOBAL_GROUP_KEY_COLUMN: 0})
+    identifiers_index = dataframe.groupby(identifier_columns, dropna=False, sort=False).size().index
+    if (not bool_has_identifiers) and (len(identifiers_index) == 0):
+        identifiers_index = pd.Index([0], name=GLOBAL_GROUP_KEY_COLUMN)
+
+    pivot_key_dataframe = pd.DataFrame({column_name: convert_grel_value_to_string(dataframe[column_name])
+                                        for column_name in pivot_settings["keyColumns"]}, index=dataframe.index)
+    pivoted_values = select_pivoted_values(pivot_key_dataframe, pivot_settings)
+    pivoted_value_labels = ["_".join([str(value) for value in pivoted_value]) for pivoted_value in pivoted_values]
+    value_labels = pivot_key_dataframe.iloc[:, 0]
+    if len(pivot_settings["keyColumns"]) > 1:
+        value_labels = value_labels.str.cat([pivot_key_dataframe.iloc[:, column_index]
+                                             for column_index in range(1, len(pivot_settings["keyColumns"]))], sep="_")
+    pivoted_dataframe = dataframe.assign(**{PIVOT_VALUE_LABEL_COLUMN: value_labels})
+    pivoted_dataframe = pivoted_dataframe[pivoted_dataframe[PIVOT_VALUE_LABEL_COLUMN].isin(pivoted_value_labels)]
+    group_columns = identifier_columns + [PIVOT_VALUE_LABEL_COLUMN]
+
+    pivoted_aggregations = []
+    if pivot_settings.get("globalCount", False):
+        pivoted_aggregations.append((None, "count", {}))
+    for column_settings in pivot_settings.get("valueColumns", []):
+        for aggregation in PIVOT_AGGREGATIONS:
+            if column_settings.get(aggregation, False) == True:
+                pivoted_aggregations.append((column_settings["column"], aggregation, column_settings))
+    aggregated_dataframes = []
+    for column_name, aggregation, column_settings in pivoted_aggregations:
+        if column_name is None:
+            aggregated_series = pivoted_dataframe.groupby(group_columns, dropna=False, sort=False).size()
+        else:
+            aggregated_series = compute_grouped_column_aggregation(pivoted_dataframe, group_columns, column_name,
+                                                                   aggregation, column_settings)
+        aggregated_dataframe = aggregated_series.unstack(PIVOT_VALUE_LABEL_COLUMN)
+        aggregated_dataframe = aggregated_dataframe.reindex(index=identifiers_index, columns=pivoted_value_labels)
+        if aggregation in ["count", "countDistinct"]:
+            aggregated_dataframe = aggregated_dataframe.fillna(0).astype("int64")
+        aggregated_dataframes.append(aggregated_dataframe)
+
+    output_series = []
+    for pivoted_value, pivoted_value_label in zip(pivoted_values, pivoted_value_labels):
+        for (column_name, aggregation, __), aggregated_dataframe in zip(pivoted_aggregations, aggregated_dataframes):
+            output_column_name = compute_pivot_recipe_output_column_name(pivoted_value, column_name, aggregation)
+            output_series.append(aggregated_dataframe[pivoted_value_label].rename(output_column_name))
+    output_dataframe = pd.DataFrame(index=identifiers_index)
+    if len(output_series) > 0:
+        output_dataframe = pd.concat(output_series, axis=1)
+        output_dataframe.index = identifiers_index
+    output_dataframe = output_dataframe.reset_index()
+    if not bool_has_identifiers:
+        output_dataframe = output_dataframe.drop(columns=[GLOBAL_GROUP_KEY_COLUMN])
+    output_dataframe = apply_recipe_filter(output_dataframe, recipe_json_payload.get("postFilter"))
+    output_dataframe = output_dataframe.reset_index(drop=True)
+    return output_dataframe
@@ -0,0 +1,195 @@
+import time
+import pandas as pd
+from .grel_expressions import compile_grel_expression, broadcast_grel_value, convert_grel_value_to_boolean
+
+
+PREPARE_LOCAL_EXECUTION_PROCESSORS = ["ColumnRenamer", "CreateColumnWithGREL", "ColumnsSelector", "FilterOnCustomFormula"]
+DEFAULT_PREPARE_BENCHMARK_NUMBER_OF_RUNS = 3
+
+
+def compile_prepare_step(step):
+    """
+    Compiles a prepare recipe processor step into a function applying it on a DataFrame.
+        Supported processors are listed in 'PREPARE_LOCAL_EXECUTION_PROCESSORS'. Formulas are parsed and compiled
+        once, at compilation time.
+
+    :param step: dict: Definition of the prepare recipe step in JSON format.
+
+    :returns: compiled_step: function: Function taking a DataFrame as input and returning the transformed DataFrame.
+    """
+    step_type = step.get("type")
+    step_params = step.get("params", {})
+    if step_type == "ColumnRenamer":
+        renamings = {renaming["from"]: renaming["to"] for renaming in step_params.get("renamings", [])}
+
+        def compiled_step(dataframe):
+            missing_columns = [column_name for column_name in renamings.keys() if column_name not in dataframe.columns]
+            if len(missing_columns) > 0:
+                log_message = "Columns '{}' renamed in a prepare step do not exist.".format(missing_columns)
+                raise Exception(log_message)
+            return dataframe.rename(columns=renamings)
+        return compiled_step
+
+    if step_type == "CreateColumnWithGREL":
+        column_name = step_params["column"]
+        compiled_expression = compile_grel_expression(step_params["expression"])
+
+        def compiled_step(dataframe):
+            column_values = broadcast_grel_value(compiled_expression(dataframe), dataframe.index)
+            return dataframe.assign(**{column_name: column_values})
+        return compiled_step
+
+    if step_type == "ColumnsSelector":
+        if step_params.get("appliesTo", "COLUMNS") not in ["COLUMNS", "SINGLE_COLUMN"]:
+            log_message = "Prepare 'ColumnsSelector' steps applying to '{}' can't be executed locally."\
+                .format(step_params.get("appliesTo"))
+            raise Exception(log_message)
+        selected_columns = list(step_params.get("columns", []))
+        bool_keep_columns = step_params.get("keep", False)
+
+        def compiled_step(dataframe):
+            missing_columns = [column_name for column_name in selected_columns if column_name not in dataframe.columns]
+            if len(missing_columns) > 0:
+                log_message = "Columns '{}' kept or deleted in a prepare step do not exist.".format(missing_columns)
+                raise Exception(log_message)
+            if bool_keep_columns:
+                return dataframe[[column_name for column_name in dataframe.columns if column_name in selected_columns]]
+            return dataframe.drop(columns=selected_columns)
+        return compiled_step
+
+    if step_type == "FilterOnCustomFormula":
+        compiled_expression = compile_grel_expression(step_params["expression"])
+        bool_keep_rows = (step_params.get("action", "KEEP_ROW") == "KEEP_ROW")
+
+        def compiled_step(dataframe):
+            filter_mask = broadcast_grel_value(convert_grel_value_to_boolean(compiled_expression(dataframe)),
+                                               dataframe.index).astype(bool)
+            return dataframe[filter_mask if bool_keep_rows else ~filter_mask]
+        return compiled_step
+
+    log_message = "Prepare processor '{}' can't be executed locally. Supported processors are '{}'"\
+        .format(step_type, PREPARE_LOCAL_EXECUTION_PROCESSORS)
+    raise Exception(log_message)
+
+
+def list_prepare_steps(steps, step_path_prefix=""):
+    """
+    Lists the enabled processor steps of a prepare recipe, in execution order. GROUP steps are flattened, at any depth.
+
+    :param steps: list: List of the prepare recipe steps, each being in JSON format.
+    :param step_path_prefix: str: Path of the GROUP step containing the steps, if any.
+
+    :returns: processor_steps: list: List of (step_path, step) tuples, step paths being the step positions joined
+        with '.' (ex: '2.0' for the first sub-step of the third step).
+    """
+    processor_steps = []
+    for step_index, step in enumerate(steps):
+        step_path = "{}{}".format(step_path_prefix, step_index)
+        if step.get("disabled", False):
+            continue
+        if step.get("metaType") == "GROUP":
+            processor_steps += list_prepare_steps(step.get("steps", []), "{}.".format(step_path))
+        else:
+            processor_steps.append((step_path, step))
+    return processor_steps
+
+
+def execute_prepare_steps(steps, dataframe):
+    """
+    Executes prepare recipe steps on a local DataFrame (see :function:`compile_prepare_step`).
+
+    :param steps: list: List of the prepare recipe steps, each being in JSON format.
+    :param dataframe: pandas.core.frame.DataFrame: The prepare recipe input DataFrame.
+
+    :returns: dataframe: pandas.core.frame.DataFrame: The prepare recipe output.
+    """
+    compiled_steps = [compile_prepare_step(step) for __, step in list_prepare_steps(steps)]
+    for compiled_step in compiled_steps:
+        dataframe = compiled_step(dataframe)
+    return dataframe
+
+
+def validate_prepare_steps_locally(steps, dataframe):
+    """
+    Validates prepare recipe steps before saving them, by compiling and executing them on a sample DataFrame.
+        Execution stops at the first step failing at runtime, as the columns of the next steps are then unknown.
+
+    :param steps: list: List of the prepare recipe steps, each being in JSON format.
+    :param dataframe: pandas.core.frame.DataFrame: A sample of the prepare recipe input.
+
+    :returns: validation_errors: list: List of the validation errors messages. Empty if the steps are valid.
+    """
+    validation_errors = []
+    compiled_steps = []
+    for step_path, step in list_prepare_steps(steps):
+        try:
+            compiled_steps.append((step_path, step, compile_prepare_step(step)))
+        except Exception as compilation_error:
+            validation_errors.append("Prepare step '{}' ({}) can't be compiled: {}"
+                                     .format(step_path, step.get("type"), compilation_error))
+    if len(validation_errors) > 0:
+        return validation_errors
+    for step_path, step, compiled_step in compiled_steps:
+        try:
+            dataframe = compiled_step(dataframe)
+        except Exception as execution_error:
+            validation_errors.append("Prepare step '{}' ({}) fails: {}".format(step_path, step.get("type"), execution_error))
+            break
+    return validation_errors
+
+
+def benchmark_prepare_steps(steps, dataframe, number_of_runs=DEFAULT_PREPARE_BENCHMARK_NUMBER_OF_RUNS):
+    """
+    Measures the local execution cost of each prepare recipe step on a DataFrame, to spot the expensive formulas.
+        Each step duration is the best of 'number_of_runs' runs of the whole steps list.
+
+    :param steps: list: List of the prepare recipe steps, each being in JSON format.
+    :param dataframe: pandas.core.frame.DataFrame: A sample of the prepare recipe input.
+    :param number_of_runs: int: Number of runs of the steps list.
+
+    :returns: benchmark_df: pandas.core.frame.DataFrame: The cost of each step, with columns
+        ['step_path', 'step_type', 'column', 'expression', 'compilation_seconds', 'execution_seconds',
+         'rows_per_second'].
+    """
+    compile_grel_expression.cache_clear()
+    benchmark_rows = []
+    compiled_steps = []
+    for step_path, step in list_prepare_steps(steps):
+        compilation_start_time = time.perf_counter()
+        compiled_steps.append(compile_prepare_step(step))
+        step_params = step.get("params", {})
+        benchmark_rows.append({"step_path": step_path,
+                               "step_type": step.get("type"),
+                               "column": step_params.get("column"),
+                               "expression": step_params.get("expression"),
+                               "compilation_seconds": time.perf_counter() - compilation_start_time,
+                               "execution_seconds": None,
+                               "rows_per_second": None})
+    for __ in range(number_of_runs):
+        run_dataframe = dataframe
+        for benchmark_row, compiled_step in zip(benchmark_rows, compiled_steps):
+            number_of_rows = len(run_dataframe)
+            execution_start_time = time.perf_counter()
+            run_dataframe = compiled_step(run_dataframe)
+            execution_seconds = time.perf_counter() - execution_start_time
+            if (benchmark_row["execution_seconds"] is None) or (execution_seconds < benchmark_row["execution_seconds"]):
+                benchmark_row["execution_seconds"] = execution_seconds
+                benchmark_row["rows_per_second"] = number_of_rows / execution_seconds if execution_seconds > 0 else None
+    benchmark_df = pd.DataFrame(benchmark_rows, columns=["step_path", "step_type", "column", "expression",
+                                                         "compilation_seconds", "execution_seconds", "rows_per_second"])
+    return benchmark_df
+
+
+def execute_prepare_recipe_payload(recipe_json_payload, input_dataframes, input_dataset_names=None):
+    """
+    Executes a prepare recipe payload on a local DataFrame (see :function:`execute_prepare_steps`).
+
+    :param recipe_json_payload: dict: JSON payload of the prepare recipe.
+    :param input_dataframes: list: List containing the recipe input DataFrame.
+    :param input_dataset_names: list: List of the recipe input dataset names (unused by prepare recipes).
+
+    :returns: output_dataframe: pandas.core.frame.DataFrame: The prepare recipe output.
+    """
+    output_dataframe = execute_prepare_steps(recipe_json_payload.get("steps", []), input_dataframes[0])
+    output_dataframe = output_dataframe.reset_index(drop=True)
+    return output_dataframe
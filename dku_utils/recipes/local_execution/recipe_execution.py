@@ -0,0 +1,71 @@
+import dataiku
+from ..recipe_commons import get_recipe_settings_and_dictionary
+from .group_execution import execute_group_recipe_payload
+from .join_execution import execute_join_recipe_payload
+from .pivot_execution import execute_pivot_recipe_payload
+from .prepare_execution import execute_prepare_recipe_payload
+from .stack_execution import execute_stack_recipe_payload
+from .window_execution import execute_window_recipe_payload
+
+
+LOCAL_EXECUTION_RECIPE_FUNCTIONS = {"join": execute_join_recipe_payload,
+                                    "vstack": execute_stack_recipe_payload,
+                                    "grouping": execute_group_recipe_payload,
+                                    "pivot": execute_pivot_recipe_payload,
+                                    "window": execute_window_recipe_payload,
+                                    "shaker": execute_prepare_recipe_payload}
+DEFAULT_LOCAL_EXECUTION_SAMPLE_LIMIT = 10000
+
+
+def execute_recipe_payload_locally(recipe_type, recipe_json_payload, input_dataframes, input_dataset_names=None):
+    """
+    Executes a visual recipe payload on local DataFrames, without running any DSS job.
+
+    :param recipe_type: str: Type of the recipe, in 'LOCAL_EXECUTION_RECIPE_FUNCTIONS'.
+    :param recipe_json_payload: dict: JSON payload of the recipe.
+    :param input_dataframes: list: List of the recipe input DataFrames, in the recipe inputs order.
+    :param input_dataset_names: list: List of the recipe input dataset names.
+
+    :returns: output_dataframe: pandas.core.frame.DataFrame: The recipe output.
+    """
+    if recipe_type not in LOCAL_EXECUTION_RECIPE_FUNCTIONS:
+        log_message = "Recipes of type '{}' can't be executed locally. Supported recipe types are '{}'"\
+            .format(recipe_type, list(LOCAL_EXECUTION_RECIPE_FUNCTIONS.keys()))
+        raise Exception(log_message)
+    output_dataframe = LOCAL_EXECUTION_RECIPE_FUNCTIONS[recipe_type](recipe_json_payload, input_dataframes, input_dataset_names)
+    return output_dataframe
+
+
+def execute_recipe_locally(project, recipe_name, input_dataframes=None, sample_limit=DEFAULT_LOCAL_EXECUTION_SAMPLE_LIMIT,
+                           dataset_sample_cache=None):
+    """
+    Executes a project visual recipe on local DataFrames, to preview its output or test its settings in seconds.
+        If no input DataFrame is provided, the recipe is executed on a head sample of each of its inputs.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param recipe_name: str: Name of the recipe.
+    :param input_dataframes: dict: Optional mapping between the recipe input dataset names and the DataFrames to use.
+        Inputs missing from it are sampled.
+    :param sample_limit: int: Maximum number of rows sampled from each input dataset.
+    :param dataset_sample_cache: DatasetSampleCache: Optional local cache of the dataset samples.
+
+    :returns: output_dataframe: pandas.core.frame.DataFrame: The recipe output.
+    """
+    if input_dataframes is None:
+        input_dataframes = {}
+    recipe_settings, recipe_settings_dict = get_recipe_settings_and_dictionary(project, recipe_name, True)
+    recipe_input_dataset_names = [item["ref"] for item in recipe_settings.get_recipe_inputs()["main"]["items"]]
+    recipe_input_dataframes = []
+    for dataset_name in recipe_input_dataset_names:
+        if dataset_name in input_dataframes:
+            recipe_input_dataframes.append(input_dataframes[dataset_name])
+        elif dataset_sample_cache is not None:
+            recipe_input_dataframes.append(dataset_sample_cache.get_dataframe(project, dataset_name, limit=sample_limit))
+        else:
+            dataset = dataiku.Dataset(dataset_name, project_key=project.project_key)
+            recipe_input_dataframes.append(dataset.get_dataframe(limit=sample_limit))
+    print("Executing recipe '{}' locally ...".format(recipe_name))
+    output_dataframe = execute_recipe_payload_locally(recipe_settings_dict["type"], recipe_settings.get_json_payload(),
+                                                      recipe_input_dataframes, recipe_input_dataset_names)
+    print("Recipe '{}' locally executed: {} output rows.".format(recipe_name, len(output_dataframe)))
+    return output_dataframe
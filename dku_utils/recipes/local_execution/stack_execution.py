@@ -0,0 +1,72 @@
+import pandas as pd
+from .local_execution_commons import apply_recipe_filter
+
+
+STACK_LOCAL_EXECUTION_MODES = ["UNION", "INTERSECT", "CUSTOM", "REMAP"]
+
+
+def compute_stack_output_columns(recipe_json_payload, virtual_input_dataframes):
+    """
+    Computes the output columns of a stack recipe, following its columns selection mode:
+        - 'UNION': all the columns of all the inputs, in their order of appearance.
+        - 'INTERSECT': the columns present in all the inputs.
+        - 'CUSTOM' and 'REMAP': the columns of the payload 'selectedColumns'.
+
+    :param recipe_json_payload: dict: JSON payload of the stack recipe.
+    :param virtual_input_dataframes: list: List of the virtual inputs DataFrames.
+
+    :returns: output_columns: list: List of the output column names.
+    """
+    stack_mode = recipe_json_payload.get("mode", "UNION")
+    if stack_mode not in STACK_LOCAL_EXECUTION_MODES:
+        log_message = "Stack mode '{}' can't be executed locally. Supported modes are '{}'".format(stack_mode, STACK_LOCAL_EXECUTION_MODES)
+        raise Exception(log_message)
+    if stack_mode in ["CUSTOM", "REMAP"]:
+        output_columns = [selected_column["name"] for selected_column in recipe_json_payload.get("selectedColumns", [])]
+        return output_columns
+    output_columns = []
+    for dataframe in virtual_input_dataframes:
+        for column_name in dataframe.columns:
+            if column_name not in output_columns:
+                output_columns.append(column_name)
+    if stack_mode == "INTERSECT":
+        output_columns = [column_name for column_name in output_columns
+                          if all([column_name in dataframe.columns for dataframe in virtual_input_dataframes])]
+    return output_columns
+
+
+def execute_stack_recipe_payload(recipe_json_payload, input_dataframes, input_dataset_names=None):
+    """
+    Executes a stack recipe payload on local DataFrames: virtual inputs pre-filters, columns selection
+        (see :function:`compute_stack_output_columns`), origin column and post-filter.
+
+    :param recipe_json_payload: dict: JSON payload of the stack recipe.
+    :param input_dataframes: list: List of the recipe input DataFrames, in the recipe inputs order.
+    :param input_dataset_names: list: List of the recipe input dataset names, used as default origin labels.
+
+    :returns: output_dataframe: pandas.core.frame.DataFrame: The stack recipe output.
+    """
+    virtual_inputs = recipe_json_payload["virtualInputs"]
+    virtual_input_dataframes = [apply_recipe_filter(input_dataframes[virtual_input["index"]], virtual_input.get("preFilter"))
+                                for virtual_input in virtual_inputs]
+    output_columns = compute_stack_output_columns(recipe_json_payload, virtual_input_dataframes)
+    stacked_dataframes = []
+    for virtual_input, dataframe in zip(virtual_inputs, virtual_input_dataframes):
+        if recipe_json_payload.get("mode", "UNION") == "REMAP":
+            columns_match = virtual_input.get("columnsMatch", [])
+            stacked_dataframe = pd.DataFrame(index=dataframe.index)
+            for output_column_index, output_column_name in enumerate(output_columns):
+                input_column_name = columns_match[output_column_index] if output_column_index < len(columns_match) else None
+                stacked_dataframe[output_column_name] = dataframe[input_column_name] if input_column_name is not None else None
+        else:
+            stacked_dataframe = dataframe.reindex(columns=output_columns)
+        if recipe_json_payload.get("addOriginColumn", False):
+            origin_label = virtual_input.get("originLabel")
+            if (origin_label in [None, ""]) and (input_dataset_names is not None):
+                origin_label = input_dataset_names[virtual_input["index"]]
+            stacked_dataframe[recipe_json_payload.get("originColumnName", "original_dataset")] = origin_label
+        stacked_dataframes.append(stacked_dataframe)
+    output_dataframe = pd.concat(stacked_dataframes, ignore_index=True)
+    output_dataframe = apply_recipe_filter(output_dataframe, recipe_json_payload.get("postFilter"))
+    output_dataframe = output_dataframe.reset_index(drop=True)
+    return output_dataframe
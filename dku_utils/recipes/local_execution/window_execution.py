@@ -0,0 +1,311 @@
+import numpy as np
+import pandas as pd
+from .group_execution import DEFAULT_CONCATENATION_SEPARATOR
+from .grel_expressions import convert_grel_value_to_string
+from .local_execution_commons import apply_computed_columns, apply_recipe_filter
+from ..window_recipe import compute_window_recipe_output_columns
+
+
+WINDOW_RANKING_OUTPUT_COLUMNS = {"rowNumber": "rownumber", "rank": "rank", "denseRank": "dense_rank",
+                                 "cumeDist": "cume_dist", "percentRank": "percent_rank", "ntile": "ntile"}
+WINDOW_PARTITION_ID_COLUMN = "__window_partition_id"
+
+
+def compute_group_start_positions(group_ids):
+    """
+    Computes, for each row of contiguous groups, the position of its group first row.
+
+    :param group_ids: numpy.ndarray: Group identifier of each row. Rows of a same group must be contiguous.
+
+    :returns: group_start_positions: numpy.ndarray: Position of the first row of each row group.
+    """
+    row_positions = np.arange(len(group_ids))
+    rows_start_groups = np.r_[True, group_ids[1:] != group_ids[:-1]]
+    group_start_positions = np.maximum.accumulate(np.where(rows_start_groups, row_positions, 0))
+    return group_start_positions
+
+
+def compute_group_end_positions(group_ids):
+    """
+    Computes, for each row of contiguous groups, the position of its group last row.
+
+    :param group_ids: numpy.ndarray: Group identifier of each row. Rows of a same group must be contiguous.
+
+    :returns: group_end_positions: numpy.ndarray: Position of the last row of each row group.
+    """
+    reversed_group_start_positions = compute_group_start_positions(group_ids[::-1])
+    group_end_positions = (len(group_ids) - 1 - reversed_group_start_positions)[::-1]
+    return group_end_positions
+
+
+def compute_window_frame_bounds(partition_ids, tie_group_ids, window_settings):
+    """
+    Computes the bounds of each row window frame, on rows sorted by partition then by the window orders:
+        - Without ordering, the frame is the whole partition.
+        - With ordering and without limits, the frame goes from the partition start to the last row having the same
+          order values as the current row (SQL default 'RANGE BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW').
+        - With limits, the frame goes from 'limitPreceding' rows before to 'limitFollowing' rows after the current row.
+
+    :param partition_ids: numpy.ndarray: Partition identifier of each sorted row.
+    :param tie_group_ids: numpy.ndarray: Identifier of each group of sorted rows having the same partition and order values.
+    :param window_settings: dict: Settings of the window, from the 'windows' section of the recipe payload.
+
+    :returns: frame_starts: numpy.ndarray: Position of the first row of each row frame.
+    :returns: frame_ends: numpy.ndarray: Position of the last row of each row frame.
+    """
+    row_positions = np.arange(len(partition_ids))
+    partition_starts = compute_group_start_positions(partition_ids)
+    partition_ends = compute_group_end_positions(partition_ids)
+    if window_settings.get("enableLimits", False):
+        frame_starts = np.maximum(partition_starts, row_positions - int(window_settings.get("limitPreceding", 0)))
+        frame_ends = np.minimum(partition_ends, row_positions + int(window_settings.get("limitFollowing", 0)))
+    elif window_settings.get("enableOrdering", False):
+        frame_starts = partition_starts
+        frame_ends = compute_group_end_positions(tie_group_ids)
+    else:
+        frame_starts = partition_starts
+        frame_ends = partition_ends
+    return frame_starts, frame_ends
+
+
+def convert_window_values_to_numbers(series):
+    """
+    Converts window values into a float array on which frame aggregations are computed. Dates are converted
+        into nanosecond timestamps.
+
+    :param series: pandas.core.series.Series: The window values.
+
+    :returns: numbers: numpy.ndarray: The values as floats, with NaN for null values.
+    :returns: bool_values_are_dates: bool: Precise if the values are dates.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        numbers = series.to_numpy(dtype="datetime64[ns]").astype("int64").astype(float)
+        numbers[series.isnull().to_numpy()] = np.nan
+        return numbers, True
+    numbers = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    return numbers, False
+
+
+def compute_sliding_frame_extremum(numbers, frame_starts, frame_ends, numpy_function):
+    """
+    Computes the minimum or maximum of bounded row frames with a sparse table: each frame is covered by two
+        overlapping blocks of power-of-two sizes, so the cost stays O(n log(frame size)) whatever the frames.
+
+    :param numbers: numpy.ndarray: The values, as floats. NaN values are ignored.
+    :param frame_starts: numpy.ndarray: Position of the first row of each row frame.
+    :param frame_ends: numpy.ndarray: Position of the last row of each row frame.
+    :param numpy_function: numpy.ufunc: 'numpy.fmin' or 'numpy.fmax'.
+
+    :returns: frame_extremums: numpy.ndarray: The extremum of each row frame.
+    """
+    frame_sizes = frame_ends - frame_starts + 1
+    block_levels = np.floor(np.log2(np.maximum(frame_sizes, 1))).astype(int)
+    sparse_table = [numbers]
+    for block_level in range(1, int(block_levels.max()) + 1 if len(numbers) > 0 else 1):
+        half_block_size = 2 ** (block_level - 1)
+        previous_level = sparse_table[-1]
+        shifted_previous_level = np.r_[previous_level[half_block_size:], np.full(half_block_size, np.nan)]
+        sparse_table.append(numpy_function(previous_level, shifted_previous_level))
+    sparse_table = np.vstack(sparse_table)
+    frame_extremums = numpy_function(sparse_table[block_levels, frame_starts],
+                                     sparse_table[block_levels, frame_ends - 2 ** block_levels + 1])
+    return frame_extremums
+
+
+def compute_window_frame_aggregation(sorted_series, aggregation, partition_ids, frame_starts, frame_ends,
+                                     bool_frames_are_partitions, bool_frames_start_at_partitions, column_settings):
+    """
+    Computes one aggregation of a column over each row window frame, in a vectorized way. Sums, counts, averages and
+        standard deviations use prefix sums, 'first' and 'last' take the frame bounds values, and minimums and maximums
+        use cumulative extremums or a sparse table. Null values are ignored, as in SQL.
+
+    :param sorted_series: pandas.core.series.Series: The column values, sorted by partition then by the window orders.
+    :param aggregation: str: The aggregation.
+    :param partition_ids: numpy.ndarray: Partition identifier of each sorted row.
+    :param frame_starts: numpy.ndarray: Position of the first row of each row frame.
+    :param frame_ends: numpy.ndarray: Position of the last row of each row frame.
+    :param bool_frames_are_partitions: bool: Precise if each row frame is its whole partition.
+    :param bool_frames_start_at_partitions: bool: Precise if each row frame starts at its partition first row.
+    :param column_settings: dict: Settings of the aggregated column in the recipe payload.
+
+    :returns: aggregated_values: numpy.ndarray: The aggregated value of each sorted row.
+    """
+    if aggregation == "first":
+        return sorted_series.to_numpy()[frame_starts]
+    if aggregation == "last":
+        return sorted_series.to_numpy()[frame_ends]
+    frame_counts = np.r_[0, np.cumsum(sorted_series.notnull().to_numpy())]
+    frame_counts = frame_counts[frame_ends + 1] - frame_counts[frame_starts]
+    if aggregation == "count":
+        return frame_counts
+    if aggregation in ["concat", "concatDistinct"]:
+        if not bool_frames_are_partitions:
+            log_message = "Aggregation '{}' can only be executed locally on windows without ordering nor limits."\
+                .format(aggregation)
+            raise Exception(log_message)
+        concatenation_separator = column_settings.get("concatSeparator") or DEFAULT_CONCATENATION_SEPARATOR
+        strings = pd.DataFrame({"partition_id": partition_ids, "value": convert_grel_value_to_string(sorted_series).to_numpy()})
+        strings = strings[strings["value"].notnull()]
+        if aggregation == "concatDistinct":
+            strings = strings.drop_duplicates()
+        partition_concatenations = strings.groupby("partition_id", sort=False)["value"].agg(concatenation_separator.join)
+        return pd.Series(partition_ids).map(partition_concatenations).to_numpy()
+
+    numbers, bool_values_are_dates = convert_window_values_to_numbers(sorted_series)
+    if aggregation in ["min", "max"]:
+        numpy_function = np.fmin if aggregation == "min" else np.fmax
+        if bool_frames_start_at_partitions:
+            grouped_numbers = pd.Series(numbers).groupby(partition_ids, sort=False)
+            cumulative_extremums = grouped_numbers.cummin() if aggregation == "min" else grouped_numbers.cummax()
+            cumulative_extremums = cumulative_extremums.groupby(partition_ids, sort=False).ffill().to_numpy()
+            aggregated_values = cumulative_extremums[frame_ends]
+        else:
+            aggregated_values = compute_sliding_frame_extremum(numbers, frame_starts, frame_ends, numpy_function)
+        if bool_values_are_dates:
+            return pd.to_datetime(pd.Series(aggregated_values), unit="ns").to_numpy()
+        return aggregated_values
+    if aggregation not in ["sum", "avg", "stddev"]:
+        log_message = "Aggregation '{}' can't be executed locally.".format(aggregation)
+        raise Exception(log_message)
+    numbers_are_valid = ~np.isnan(numbers)
+    numbers_offset = np.nanmean(numbers) if numbers_are_valid.any() else 0.
+    centered_numbers = np.where(numbers_are_valid, numbers - numbers_offset, 0.)
+    frame_sums = np.r_[0., np.cumsum(centered_numbers)]
+    frame_sums = frame_sums[frame_ends + 1] - frame_sums[frame_starts]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if aggregation == "sum":
+            return np.where(frame_counts > 0, frame_sums + frame_counts * numbers_offset, np.nan)
+        if aggregation == "avg":
+            return np.where(frame_counts > 0, frame_sums / frame_counts + numbers_offset, np.nan)
+        frame_squares_sums = np.r_[0., np.cumsum(centered_numbers ** 2)]
+        frame_squares_sums = frame_squares_sums[frame_ends + 1] - frame_squares_sums[frame_starts]
+        frame_variances = (frame_squares_sums - frame_sums ** 2 / frame_counts) / (frame_counts - 1)
+        return np.where(frame_counts > 1, np.sqrt(np.maximum(frame_variances, 0.)), np.nan)
+
+
+def compute_window_offset_values(sorted_series, partition_ids, offset):
+    """
+    Computes the value of the row located 'offset' rows after each sorted row, in the same partition.
+
+    :param sorted_series: pandas.core.series.Series: The column values, sorted by partition then by the window orders.
+    :param partition_ids: numpy.ndarray: Partition identifier of each sorted row.
+    :param offset: int: The row offset: negative for a lag, positive for a lead.
+
+    :returns: offset_values: pandas.core.series.Series: The offset values, null when out of the partition.
+    """
+    offset_positions = np.arange(len(sorted_series)) + offset
+    offset_positions_are_valid = (offset_positions >= 0) & (offset_positions < len(sorted_series))
+    offset_positions = np.clip(offset_positions, 0, max(len(sorted_series) - 1, 0))
+    offset_positions_are_valid &= (partition_ids[offset_positions] == partition_ids)
+    offset_values = sorted_series.iloc[offset_positions].reset_index(drop=True)
+    offset_values = offset_values.where(offset_positions_are_valid)
+    offset_values.index = sorted_series.index
+    return offset_values
+
+
+def compute_window_ranking_values(ranking, partition_ids, tie_group_ids, window_settings):
+    """
+    Computes a ranking column of a window, from the groups of rows having the same order values.
+
+    :param ranking: str: The ranking, in 'WINDOW_RANKING_OUTPUT_COLUMNS'.
+    :param partition_ids: numpy.ndarray: Partition identifier of each sorted row.
+    :param tie_group_ids: numpy.ndarray: Identifier of each group of sorted rows having the same partition and order values.
+    :param window_settings: dict: Settings of the window, from the 'windows' section of the recipe payload.
+
+    :returns: ranking_values: numpy.ndarray: The ranking value of each sorted row.
+    """
+    row_positions = np.arange(len(partition_ids))
+    partition_starts = compute_group_start_positions(partition_ids)
+    partition_sizes = compute_group_end_positions(partition_ids) - partition_starts + 1
+    row_numbers = row_positions - partition_starts + 1
+    if ranking == "rowNumber":
+        return row_numbers
+    ranks = compute_group_start_positions(tie_group_ids) - partition_starts + 1
+    if ranking == "rank":
+        return ranks
+    if ranking == "denseRank":
+        rows_start_tie_groups = np.r_[True, tie_group_ids[1:] != tie_group_ids[:-1]].astype(int)
+        cumulative_tie_groups = np.cumsum(rows_start_tie_groups)
+        return cumulative_tie_groups - cumulative_tie_groups[partition_starts] + 1
+    if ranking == "cumeDist":
+        return (compute_group_end_positions(tie_group_ids) - partition_starts + 1) / partition_sizes
+    if ranking == "percentRank":
+        return np.where(partition_sizes > 1, (ranks - 1) / np.maximum(partition_sizes - 1, 1), 0.)
+    number_of_tiles = int(window_settings.get("nTile", 1))
+    tile_sizes, number_of_larger_tiles = np.divmod(partition_sizes, number_of_tiles)
+    larger_tiles_rows = number_of_larger_tiles * (tile_sizes + 1)
+    row_indexes = row_numbers - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tiles = np.where(row_indexes < larger_tiles_rows, row_indexes // (tile_sizes + 1) + 1,
+                         (row_indexes - larger_tiles_rows) // np.maximum(tile_sizes, 1) + number_of_larger_tiles + 1)
+    return tiles
+
+
+def execute_window_recipe_payload(recipe_json_payload, input_dataframes, input_dataset_names=None):
+    """
+    Executes a window recipe payload on a local DataFrame: pre-filter and computed columns, window partitioning,
+        ordering and limits (see :function:`compute_window_frame_bounds`), frame aggregations, lags and leads,
+        ranking columns and post-filter. Input rows order is preserved.
+        Output columns are named as DSS names them (see :function:`compute_window_recipe_output_columns`),
+        followed by the ranking columns ('WINDOW_RANKING_OUTPUT_COLUMNS'). Only payloads with a single window can be
+        executed locally.
+
+    :param recipe_json_payload: dict: JSON payload of the window recipe.
+    :param input_dataframes: list: List containing the recipe input DataFrame.
+    :param input_dataset_names: list: List of the recipe input dataset names (unused by window recipes).
+
+    :returns: output_dataframe: pandas.core.frame.DataFrame: The window recipe output.
+    """
+    windows = recipe_json_payload.get("windows", [{}])
+    if len(windows) != 1:
+        log_message = "Window recipe payload has {} windows: only payloads with a single window can be executed locally."\
+            .format(len(windows))
+        raise Exception(log_message)
+    window_settings = windows[0]
+    dataframe = apply_computed_columns(input_dataframes[0], recipe_json_payload.get("computedColumns", []))
+    dataframe = apply_recipe_filter(dataframe, recipe_json_payload.get("preFilter")).reset_index(drop=True)
+
+    partitioning_columns = window_settings.get("partitioningColumns", []) if window_settings.get("enablePartitioning", False) else []
+    orders = window_settings.get("orders", []) if window_settings.get("enableOrdering", False) else []
+    if len(partitioning_columns) > 0:
+        partition_ids = dataframe.groupby(partitioning_columns, dropna=False, sort=False).ngroup()
+    else:
+        partition_ids = pd.Series(0, index=dataframe.index)
+    sorted_dataframe = dataframe.assign(**{WINDOW_PARTITION_ID_COLUMN: partition_ids})
+    sorted_dataframe = sorted_dataframe.sort_values([WINDOW_PARTITION_ID_COLUMN] + [order["column"] for order in orders],
+                                                    ascending=[True] + [not order.get("desc", False) for order in orders],
+                                                    kind="stable")
+    partition_ids = sorted_dataframe[WINDOW_PARTITION_ID_COLUMN].to_numpy()
+    tie_group_ids = sorted_dataframe.groupby([WINDOW_PARTITION_ID_COLUMN] + [order["column"] for order in orders],
+                                             dropna=False, sort=False).ngroup().to_numpy()
+    frame_starts, frame_ends = compute_window_frame_bounds(partition_ids, tie_group_ids, window_settings)
+    bool_frames_start_at_partitions = not window_settings.get("enableLimits", False)
+    bool_frames_are_partitions = bool_frames_start_at_partitions and (len(orders) == 0)
+
+    columns_settings = {column_settings["column"]: column_settings for column_settings in recipe_json_payload.get("values", [])}
+    output_dataframe = pd.DataFrame(index=sorted_dataframe.index)
+    for output_column_information in compute_window_recipe_output_columns(recipe_json_payload):
+        column_name = output_column_information["input_column"]
+        aggregation = output_column_information["aggregation"]
+        sorted_series = sorted_dataframe[column_name]
+        if aggregation is None:
+            output_values = sorted_series
+        elif aggregation in ["lag", "lead", "lagDiff", "leadDiff"]:
+            offset_settings = columns_settings[column_name].get("{}Values".format(aggregation.replace("Diff", "")))
+            offset = int(str(offset_settings).split(",")[0]) if offset_settings not in [None, ""] else 1
+            offset_values = compute_window_offset_values(sorted_series, partition_ids,
+                                                         -offset if aggregation.startswith("lag") else offset)
+            output_values = offset_values if aggregation in ["lag", "lead"] else sorted_series - offset_values
+        else:
+            output_values = compute_window_frame_aggregation(sorted_series, aggregation, partition_ids, frame_starts,
+                                                             frame_ends, bool_frames_are_partitions,
+                                                             bool_frames_start_at_partitions, columns_settings[column_name])
+        output_dataframe[output_column_information["output_column"]] = output_values
+    for ranking, ranking_output_column in WINDOW_RANKING_OUTPUT_COLUMNS.items():
+        if window_settings.get(ranking, False) == True:
+            output_dataframe[ranking_output_column] = compute_window_ranking_values(ranking, partition_ids,
+                                                                                    tie_group_ids, window_settings)
+    output_dataframe = output_dataframe.sort_index()
+    output_dataframe = apply_recipe_filter(output_dataframe, recipe_json_payload.get("postFilter"))
+    output_dataframe = output_dataframe.reset_index(drop=True)
+    return output_dataframe
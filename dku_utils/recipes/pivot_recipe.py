@@ -1,42 +1,38 @@
-from .recipe_commons import get_recipe_settings_and_dictionary, get_recipe_input_datasets
+import dataiku
+import pandas as pd
+from .recipe_commons import get_recipe_settings_and_dictionary, get_recipe_input_datasets, VisualRecipeBuilder
+from .group_recipe import GROUP_AGGREGATIONS_OUTPUT_SUFFIXES
 from ..datasets.dataset_commons import get_dataset_column_datatypes_mapping
+from ..datasets.dataset_chunks import iter_dataset_chunks, DEFAULT_CHUNKSIZE
+from ..datasets.dataset_profiling import profile_dataframe_chunks_key, DEFAULT_SPACE_SAVING_CAPACITY
 
 
-def define_pivot_recipe_aggregations(project,
-                                     recipe_name,
-                                     row_identifiers,
-                                     columns_to_pivot,
-                                     column_aggregations_mapping,
-                                     pivoted_values_selection_strategy="TOP_N",
-                                     max_number_of_pivoted_column_values=20,
-                                     minimum_number_of_occurences=2,
-                                     bool_compute_global_count=False,
-                                     bool_recompute_schema_at_each_run=True):
-    """
-    Set aggregations done by a pivot recipe.
-    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
-    :param recipe_name: str: Name of the recipe.
-    :param row_identifiers: list: List of the colunms that should be used as row identifiers.
-    :param columns_to_pivot: list: List of the columns from which values should be pivoted.
-    :param column_aggregations_mapping: dict: Mapping between the columns and the list of aggregations to apply to each one.
-        Example: {'column_1': ['min', 'concat'], 'column_2': ['avg', 'sum']} 
-    :param: pivoted_values_selection_strategy: str: Parameter setting the way pivoted values should be selected.
-        It corresponds to the 'Pivoted values' section in the visual recipe.
-        It must have a value in  '["TOP_N", "NO_LIMIT", "AT_LEAST_N_OCC"]'
-        - 'TOP_N' corresponds to the choice 'most frequent' in the visual recipe.
-        - 'NO_LIMIT' corresponds to the choice 'all' in the visual recipe.
-        - 'AT_LEAST_N_OCC' corresponds to the choice 'occuring more than' in the visual recipe.
-    :param max_number_of_pivoted_column_values: int: Sets the maximum number of values to pivot, in cases
-       when (pivoted_values_selection_strategy == 'TOP_N')
-    :param minimum_number_of_occurences: int: Sets the minimum number of values a column category must have
-        to be pivoted, in cases when (pivoted_values_selection_strategy == 'AT_LEAST_N_OCC')
-    :param bool_compute_global_count: bool: Precises whether the count of recors should be computed or not
-         for each pivoted value.
-    :param bool_recompute_schema_at_each_run: bool: Precises whether the recipe's schema should be recomputed at the runtime
-        or not.        
+DEFAULT_PIVOT_MAX_NUMBER_OF_OUTPUT_COLUMNS = 500
+DEFAULT_PIVOT_CARDINALITY_SAMPLE_LIMIT = 100000
+# Share of the output columns 'NO_LIMIT' may use, leaving room for the pivoted values appearing in future data:
+PIVOT_NO_LIMIT_OUTPUT_COLUMNS_RATIO = 0.5
+PIVOT_SELECTION_SETTINGS_KEYS = ["pivoted_values_selection_strategy", "max_number_of_pivoted_column_values",
+                                 "minimum_number_of_occurences"]
+
+
+def update_pivot_recipe_payload(recipe_json_payload,
+                                recipe_input_dataset_column_datatypes,
+                                row_identifiers,
+                                columns_to_pivot,
+                                column_aggregations_mapping,
+                                pivoted_values_selection_strategy="TOP_N",
+                                max_number_of_pivoted_column_values=20,
+                                minimum_number_of_occurences=2,
+                                bool_compute_global_count=False,
+                                bool_recompute_schema_at_each_run=True):
     """
-    print("Updating recipe '{}' aggregations ...".format(recipe_name))
+    Updates a pivot recipe JSON payload with its aggregations settings, without saving it.
+    :param recipe_json_payload: dict: JSON payload of the pivot recipe.
+    :param recipe_input_dataset_column_datatypes: dict: Mapping between the recipe input dataset columns and their datatypes.
+    Other parameters are documented in :function:`define_pivot_recipe_aggregations`.
 
+    :returns: recipe_json_payload: dict: The updated JSON payload.
+    """
     PIVOT_DEFAULT_AGGREGATIONS = {'avg': False,
                                   'column': '',
                                   'concat': False,
@@ -52,8 +48,6 @@ def define_pivot_recipe_aggregations(project,
     PIVOT_ALLOWED_AGGREGATIONS = ["avg", "concat", "count", "countDistinct", "first",
                                   "last", "max", "min", "stddev", "sum"]
     PIVOT_ALLOWED_VALUES_SELECTION_STRATEGY = ["TOP_N", "NO_LIMIT", "AT_LEAST_N_OCC"]
-    recipe_settings, __ = get_recipe_settings_and_dictionary(project, recipe_name, False)
-    recipe_json_payload = recipe_settings.get_json_payload()
     
     # Checking columns to pivot settings:
     for column_name in columns_to_pivot:
@@ -83,8 +77,6 @@ def define_pivot_recipe_aggregations(project,
     recipe_json_payload["pivots"][0]["keyColumns"] = columns_to_pivot
     
     recipe_new_aggregations = []
-    recipe_input_dataset = get_recipe_input_datasets(project, recipe_name)[0]
-    recipe_input_dataset_column_datatypes = get_dataset_column_datatypes_mapping(project, recipe_input_dataset)
     for column_name in columns_to_aggregate:
         column_aggregations = column_aggregations_mapping[column_name]
         
@@ -111,8 +103,297 @@ def define_pivot_recipe_aggregations(project,
     else:
         recipe_json_payload["schemaComputation"] = "ONLY_IF_NO_METADATA"
         
+    return recipe_json_payload
+
+
+def compute_pivot_recipe_output_column_name(pivoted_values, column_name, aggregation):
+    """
+    Computes the name of a pivot recipe output column, following DSS default naming: pivoted values joined with '_',
+        then the aggregated column and the aggregation suffix (ex: 'FR_amount_sum', 'FR_web_amount_distinct'),
+        or 'count' for the global count of each pivoted value (ex: 'FR_count').
+
+    :param pivoted_values: list: Values of the pivoted columns, in the 'keyColumns' order.
+    :param column_name: str: Name of the aggregated column. None for the global count.
+    :param aggregation: str: The aggregation (ex: 'sum', 'countDistinct', 'count').
+
+    :returns: output_column_name: str: Name of the output column.
+    """
+    pivoted_values_label = "_".join([str(value) for value in pivoted_values])
+    if column_name is None:
+        output_column_name = "{}_count".format(pivoted_values_label)
+    else:
+        output_column_name = "{}_{}_{}".format(pivoted_values_label, column_name,
+                                               GROUP_AGGREGATIONS_OUTPUT_SUFFIXES.get(aggregation, aggregation))
+    return output_column_name
+
+
+def compute_pivoted_values_frequencies(dataframe, columns_to_pivot):
+    """
+    Computes exactly the frequency of each value of the columns to pivot in a DataFrame.
+        Rows having a null value in a column to pivot are ignored, as they are never pivoted.
+
+    :param dataframe: pandas.core.frame.DataFrame: The DataFrame, containing the columns to pivot.
+    :param columns_to_pivot: list: List of the columns from which values should be pivoted.
+
+    :returns: pivoted_values_counts: pandas.core.series.Series: Number of rows of each value (tuples of values when
+        there are several columns to pivot), the most frequent values first.
+    """
+    pivot_key_dataframe = dataframe[columns_to_pivot].dropna()
+    if len(columns_to_pivot) == 1:
+        pivot_key_dataframe = pivot_key_dataframe.iloc[:, 0]
+    pivoted_values_counts = pivot_key_dataframe.value_counts(sort=False).sort_values(ascending=False, kind="stable")
+    pivoted_values_counts = pivoted_values_counts[pivoted_values_counts > 0]
+    return pivoted_values_counts
+
+
+def sketch_pivoted_values_frequencies(dataframe_chunks, columns_to_pivot, number_of_tracked_values):
+    """
+    Approximates the number of distinct values of the columns to pivot and the frequency of the most frequent ones,
+        in a single pass over a stream of DataFrame chunks (see :function:`datasets.dataset_profiling.profile_dataframe_chunks_key`).
+
+    :param dataframe_chunks: iterable: Iterable of pandas DataFrames, containing the columns to pivot.
+    :param columns_to_pivot: list: List of the columns from which values should be pivoted.
+    :param number_of_tracked_values: int: Number of most frequent values to track.
+
+    :returns: pivoted_values_counts: pandas.core.series.Series: Approximate number of rows of the most frequent values,
+        the most frequent values first. Counts are over-estimated by at most the count of the least frequent tracked value.
+    :returns: distinct_count: int: Approximate number of distinct values.
+    :returns: number_of_pivotable_rows: int: Number of rows without any null value in the columns to pivot.
+    """
+    key_profile = profile_dataframe_chunks_key(dataframe_chunks, columns_to_pivot,
+                                               space_saving_capacity=max(DEFAULT_SPACE_SAVING_CAPACITY, number_of_tracked_values))
+    heavy_hitters = key_profile.heavy_hitters_sketch.get_heavy_hitters(number_of_tracked_values)
+    pivoted_values_counts = pd.Series([count for __, count, __ in heavy_hitters],
+                                      index=[value for value, __, __ in heavy_hitters], dtype="int64")
+    distinct_count = max(key_profile.distinct_count_sketch.estimate(), len(pivoted_values_counts))
+    number_of_pivotable_rows = key_profile.n_rows - key_profile.n_null_key_rows
+    return pivoted_values_counts, distinct_count, number_of_pivotable_rows
+
+
+def compute_pivot_values_selection_settings(pivoted_values_counts,
+                                            distinct_count,
+                                            number_of_pivotable_rows,
+                                            number_of_row_identifiers,
+                                            number_of_columns_per_pivoted_value,
+                                            max_number_of_output_columns=DEFAULT_PIVOT_MAX_NUMBER_OF_OUTPUT_COLUMNS):
+    """
+    Chooses the pivoted values selection strategy and limits keeping a pivot recipe output under a number of columns:
+        - 'NO_LIMIT' when all the values fit in 'PIVOT_NO_LIMIT_OUTPUT_COLUMNS_RATIO' of the output columns, leaving room
+          for the values appearing in future data.
+        - 'TOP_N' otherwise, with as many values as the output columns allow.
+        The minimum number of occurrences keeping the same number of values under 'AT_LEAST_N_OCC' is also computed, but
+        this strategy is never chosen as its number of values grows with the data.
+
+    :param pivoted_values_counts: pandas.core.series.Series: Number of rows of the most frequent values, the most frequent
+        values first (see :function:`compute_pivoted_values_frequencies`).
+    :param distinct_count: int: Number of distinct values of the columns to pivot.
+    :param number_of_pivotable_rows: int: Number of rows without any null value in the columns to pivot.
+    :param number_of_row_identifiers: int: Number of row identifiers of the pivot recipe.
+    :param number_of_columns_per_pivoted_value: int: Number of output columns created for each pivoted value.
+    :param max_number_of_output_columns: int: Maximum number of columns of the pivot recipe output.
+
+    :returns: pivot_values_selection: dict: The pivoted values selection, with keys 'pivoted_values_selection_strategy',
+        'max_number_of_pivoted_column_values' and 'minimum_number_of_occurences' (to use in
+        :function:`define_pivot_recipe_aggregations`), 'distinct_count', 'number_of_pivoted_values',
+        'projected_number_of_output_columns' and 'pivoted_rows_ratio' (share of the rows having a pivoted value).
+    """
+    max_number_of_pivoted_values = (max_number_of_output_columns - number_of_row_identifiers) // number_of_columns_per_pivoted_value
+    if max_number_of_pivoted_values < 1:
+        log_message = "A pivot recipe with {} row identifiers and {} output columns per pivoted value can't stay under {} "\
+            "output columns!".format(number_of_row_identifiers, number_of_columns_per_pivoted_value, max_number_of_output_columns)
+        raise Exception(log_message)
+    if distinct_count <= PIVOT_NO_LIMIT_OUTPUT_COLUMNS_RATIO * max_number_of_pivoted_values:
+        pivoted_values_selection_strategy = "NO_LIMIT"
+        number_of_pivoted_values = distinct_count
+    else:
+        pivoted_values_selection_strategy = "TOP_N"
+        number_of_pivoted_values = min(distinct_count, max_number_of_pivoted_values)
+    if len(pivoted_values_counts) > max_number_of_pivoted_values:
+        minimum_number_of_occurences = int(pivoted_values_counts.iloc[max_number_of_pivoted_values]) + 1
+    else:
+        minimum_number_of_occurences = 1
+    if number_of_pivotable_rows > 0:
+        pivoted_rows_ratio = min(1.0, float(pivoted_values_counts.iloc[:number_of_pivoted_values].sum()) / number_of_pivotable_rows)
+    else:
+        pivoted_rows_ratio = None
+    pivot_values_selection = {"pivoted_values_selection_strategy": pivoted_values_selection_strategy,
+                              "max_number_of_pivoted_column_values": max_number_of_pivoted_values,
+                              "minimum_number_of_occurences": minimum_number_of_occurences,
+                              "distinct_count": distinct_count,
+                              "number_of_pivoted_values": number_of_pivoted_values,
+                              "projected_number_of_output_columns": number_of_row_identifiers
+                              + number_of_pivoted_values * number_of_columns_per_pivoted_value,
+                              "pivoted_rows_ratio": pivoted_rows_ratio}
+    return pivot_values_selection
+
+
+def estimate_pivot_values_selection(project,
+                                    dataset_name,
+                                    row_identifiers,
+                                    columns_to_pivot,
+                                    column_aggregations_mapping,
+                                    bool_compute_global_count=False,
+                                    max_number_of_output_columns=DEFAULT_PIVOT_MAX_NUMBER_OF_OUTPUT_COLUMNS,
+                                    bool_use_full_data=False,
+                                    sample_limit=DEFAULT_PIVOT_CARDINALITY_SAMPLE_LIMIT,
+                                    chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Estimates the cardinality of the columns to pivot of a dataset, and chooses the pivoted values selection keeping
+        the pivot recipe output under a number of columns (see :function:`compute_pivot_values_selection_settings`).
+        Frequencies are computed exactly on a head sample of the dataset, or sketched in a single pass over the full data.
+        Note that the distinct count of a sample underestimates the distinct count of the full data.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param dataset_name: str: Name of the pivot recipe input dataset.
+    :param row_identifiers: list: List of the colunms that should be used as row identifiers.
+    :param columns_to_pivot: list: List of the columns from which values should be pivoted.
+    :param column_aggregations_mapping: dict: Mapping between the columns and the list of aggregations to apply to each one.
+    :param bool_compute_global_count: bool: Precises whether the count of records should be computed for each pivoted value.
+    :param max_number_of_output_columns: int: Maximum number of columns of the pivot recipe output.
+    :param bool_use_full_data: bool: Precise if you want to sketch the frequencies on the full dataset rather than
+        computing them exactly on a sample.
+    :param sample_limit: int: Maximum number of rows of the sample.
+    :param chunksize: int: Number of rows of each chunk streamed when the full dataset is used.
+
+    :returns: pivot_values_selection: dict: The pivoted values selection, as documented in
+        :function:`compute_pivot_values_selection_settings`.
+    """
+    number_of_columns_per_pivoted_value = len([aggregation for column_aggregations in column_aggregations_mapping.values()
+                                               for aggregation in set(column_aggregations)]) + int(bool_compute_global_count)
+    number_of_columns_per_pivoted_value = max(number_of_columns_per_pivoted_value, 1)
+    max_number_of_pivoted_values = max(1, (max_number_of_output_columns - len(row_identifiers)) // number_of_columns_per_pivoted_value)
+    if bool_use_full_data:
+        dataframe_chunks = iter_dataset_chunks(project, dataset_name, columns=columns_to_pivot, chunksize=chunksize)
+        pivoted_values_counts, distinct_count, number_of_pivotable_rows = \
+            sketch_pivoted_values_frequencies(dataframe_chunks, columns_to_pivot, max_number_of_pivoted_values + 1)
+    else:
+        dataset = dataiku.Dataset(dataset_name, project_key=project.project_key)
+        sample_dataframe = dataset.get_dataframe(columns=columns_to_pivot, limit=sample_limit)
+        pivoted_values_counts = compute_pivoted_values_frequencies(sample_dataframe, columns_to_pivot)
+        distinct_count = len(pivoted_values_counts)
+        number_of_pivotable_rows = int(pivoted_values_counts.sum())
+    pivot_values_selection = compute_pivot_values_selection_settings(pivoted_values_counts,
+                                                                     distinct_count,
+                                                                     number_of_pivotable_rows,
+                                                                     len(row_identifiers),
+                                                                     number_of_columns_per_pivoted_value,
+                                                                     max_number_of_output_columns)
+    print("Columns '{}' of dataset '{}' have {}{} distinct values: '{}' selection, projected output width of {} columns."
+          .format(columns_to_pivot, dataset_name, "~" if bool_use_full_data else "", distinct_count,
+                  pivot_values_selection["pivoted_values_selection_strategy"],
+                  pivot_values_selection["projected_number_of_output_columns"]))
+    return pivot_values_selection
+
+
+def define_pivot_recipe_aggregations(project,
+                                     recipe_name,
+                                     row_identifiers,
+                                     columns_to_pivot,
+                                     column_aggregations_mapping,
+                                     pivoted_values_selection_strategy="TOP_N",
+                                     max_number_of_pivoted_column_values=20,
+                                     minimum_number_of_occurences=2,
+                                     bool_compute_global_count=False,
+                                     bool_recompute_schema_at_each_run=True,
+                                     max_number_of_output_columns=DEFAULT_PIVOT_MAX_NUMBER_OF_OUTPUT_COLUMNS):
+    """
+    Set aggregations done by a pivot recipe.
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param recipe_name: str: Name of the recipe.
+    :param row_identifiers: list: List of the colunms that should be used as row identifiers.
+    :param columns_to_pivot: list: List of the columns from which values should be pivoted.
+    :param column_aggregations_mapping: dict: Mapping between the columns and the list of aggregations to apply to each one.
+        Example: {'column_1': ['min', 'concat'], 'column_2': ['avg', 'sum']} 
+    :param: pivoted_values_selection_strategy: str: Parameter setting the way pivoted values should be selected.
+        It corresponds to the 'Pivoted values' section in the visual recipe.
+        It must have a value in  '["TOP_N", "NO_LIMIT", "AT_LEAST_N_OCC"]'
+        - 'TOP_N' corresponds to the choice 'most frequent' in the visual recipe.
+        - 'NO_LIMIT' corresponds to the choice 'all' in the visual recipe.
+        - 'AT_LEAST_N_OCC' corresponds to the choice 'occuring more than' in the visual recipe.
+        It can also be 'AUTO': the strategy and limits are then chosen from the cardinality of the columns to pivot,
+        estimated on a sample of the recipe input (see :function:`estimate_pivot_values_selection`).
+    :param max_number_of_pivoted_column_values: int: Sets the maximum number of values to pivot, in cases
+       when (pivoted_values_selection_strategy == 'TOP_N')
+    :param minimum_number_of_occurences: int: Sets the minimum number of values a column category must have
+        to be pivoted, in cases when (pivoted_values_selection_strategy == 'AT_LEAST_N_OCC')
+    :param bool_compute_global_count: bool: Precises whether the count of recors should be computed or not
+         for each pivoted value.
+    :param bool_recompute_schema_at_each_run: bool: Precises whether the recipe's schema should be recomputed at the runtime
+        or not.        
+    :param max_number_of_output_columns: int: Maximum number of output columns, used when
+        (pivoted_values_selection_strategy == 'AUTO').
+    """
+    print("Updating recipe '{}' aggregations ...".format(recipe_name))
+    recipe_settings, __ = get_recipe_settings_and_dictionary(project, recipe_name, False)
+    recipe_json_payload = recipe_settings.get_json_payload()
+    recipe_input_dataset = get_recipe_input_datasets(project, recipe_name)[0]
+    if pivoted_values_selection_strategy == "AUTO":
+        pivot_values_selection = estimate_pivot_values_selection(project, recipe_input_dataset, row_identifiers, columns_to_pivot,
+                                                                 column_aggregations_mapping, bool_compute_global_count,
+                                                                 max_number_of_output_columns)
+        pivoted_values_selection_strategy, max_number_of_pivoted_column_values, minimum_number_of_occurences = \
+            [pivot_values_selection[settings_key] for settings_key in PIVOT_SELECTION_SETTINGS_KEYS]
+    recipe_input_dataset_column_datatypes = get_dataset_column_datatypes_mapping(project, recipe_input_dataset)
+    recipe_json_payload = update_pivot_recipe_payload(recipe_json_payload,
+                                                      recipe_input_dataset_column_datatypes,
+                                                      row_identifiers,
+                                                      columns_to_pivot,
+                                                      column_aggregations_mapping,
+                                                      pivoted_values_selection_strategy,
+                                                      max_number_of_pivoted_column_values,
+                                                      minimum_number_of_occurences,
+                                                      bool_compute_global_count,
+                                                      bool_recompute_schema_at_each_run)
     recipe_settings.set_json_payload(recipe_json_payload)
     recipe_settings.save()
     print("Recipe '{}' aggregations successfully updated !".format(recipe_name))
     pass
-    
+
+
+class PivotRecipeBuilder(VisualRecipeBuilder):
+    """
+    Accumulates the row identifiers, pivoted columns, aggregations and output column name overrides of a pivot recipe,
+        then validates and saves them in a single settings update.
+    """
+
+    ALLOWED_RECIPE_TYPES = ["pivot"]
+
+    def set_pivot(self,
+                  row_identifiers,
+                  columns_to_pivot,
+                  column_aggregations_mapping,
+                  pivoted_values_selection_strategy="TOP_N",
+                  max_number_of_pivoted_column_values=20,
+                  minimum_number_of_occurences=2,
+                  bool_compute_global_count=False,
+                  bool_recompute_schema_at_each_run=True,
+                  max_number_of_output_columns=DEFAULT_PIVOT_MAX_NUMBER_OF_OUTPUT_COLUMNS):
+        """
+        Sets the aggregations done by the pivot recipe. Parameters are documented in
+            :function:`define_pivot_recipe_aggregations`.
+
+        :returns: self
+        """
+        self.check_columns_are_in_recipe_input(row_identifiers, "row identifier")
+        self.check_columns_are_in_recipe_input(columns_to_pivot, "column to pivot")
+        self.check_columns_are_in_recipe_input(list(column_aggregations_mapping.keys()), "aggregated column")
+        if (len(self.validation_errors) == 0) and (pivoted_values_selection_strategy == "AUTO"):
+            pivot_values_selection = estimate_pivot_values_selection(self.project, self.recipe_input_dataset_names[0],
+                                                                     row_identifiers, columns_to_pivot,
+                                                                     column_aggregations_mapping, bool_compute_global_count,
+                                                                     max_number_of_output_columns)
+            pivoted_values_selection_strategy, max_number_of_pivoted_column_values, minimum_number_of_occurences = \
+                [pivot_values_selection[settings_key] for settings_key in PIVOT_SELECTION_SETTINGS_KEYS]
+        if len(self.validation_errors) == 0:
+            self.recipe_payload = update_pivot_recipe_payload(self.recipe_payload,
+                                                              self.get_recipe_input_column_datatypes(),
+                                                              row_identifiers,
+                                                              columns_to_pivot,
+                                                              column_aggregations_mapping,
+                                                              pivoted_values_selection_strategy,
+                                                              max_number_of_pivoted_column_values,
+                                                              minimum_number_of_occurences,
+                                                              bool_compute_global_count,
+                                                              bool_recompute_schema_at_each_run)
+        return self
+
@@ -1,4 +1,10 @@
-from .recipe_commons import get_recipe_settings_and_dictionary
+import pandas as pd
+from .recipe_commons import get_recipe_settings_and_dictionary, get_recipe_input_datasets, VisualRecipeBuilder
+from .local_execution.grel_expressions import (extract_grel_expression_columns, parse_grel_expression,
+                                               format_grel_expression_tree)
+from .local_execution.prepare_execution import validate_prepare_steps_locally
+from ..datasets.dataset_commons import (get_dataset_schema, extract_dataset_schema_information,
+                                        get_dataset_column_datatypes_mapping)
 
 
 def compute_prepare_rename_step(column_to_rename, new_column_name):
@@ -180,3 +186,631 @@ def compute_prepare_recipe_columns_percent_of_total_steps(columns_of_interest,
                                                                                    group_step_comment="",
                                                                                    show_group_step_comment=True)
     return recipe_columns_percent_of_total_group_step
+
+
+PREPARE_STEPS_OPTIMIZATIONS = ["FLATTEN_GROUP", "MERGE_RENAMES", "REMOVE_UNREAD_FORMULA", "HOIST_DELETION", "MERGE_DELETIONS"]
+
+
+def check_if_prepare_step_is_deletion(step):
+    """
+    Checks if a prepare recipe step is an enabled deletion of a list of columns.
+
+    :param step: dict: Definition of the prepare recipe step in JSON format.
+
+    :returns: bool_step_is_deletion: bool: Boolean precising if the step is a column deletion.
+    """
+    bool_step_is_deletion = (step.get("metaType") != "GROUP") and (not step.get("disabled", False))\
+        and (step.get("type") == "ColumnsSelector") and (not step.get("params", {}).get("keep", False))\
+        and (step.get("params", {}).get("appliesTo", "COLUMNS") in ["COLUMNS", "SINGLE_COLUMN"])
+    return bool_step_is_deletion
+
+
+def compute_prepare_step_touched_columns(step):
+    """
+    Computes the columns a prepare recipe step reads or writes. Disabled steps are analyzed as if they were enabled,
+        so that optimizations never prevent them from being enabled again.
+
+    :param step: dict: Definition of the prepare recipe step in JSON format.
+
+    :returns: touched_columns: set: Set of the columns read or written by the step. None if they are unknown
+        (processors other than 'ColumnRenamer', 'CreateColumnWithGREL', 'ColumnsSelector' deletions and
+        'FilterOnCustomFormula'), in which case the step may depend on any column.
+    """
+    if step.get("metaType") == "GROUP":
+        touched_columns = set()
+        for sub_step in step.get("steps", []):
+            sub_step_touched_columns = compute_prepare_step_touched_columns(sub_step)
+            if sub_step_touched_columns is None:
+                return None
+            touched_columns |= sub_step_touched_columns
+        return touched_columns
+    step_type = step.get("type")
+    step_params = step.get("params", {})
+    try:
+        if step_type == "ColumnRenamer":
+            return set([renaming["from"] for renaming in step_params.get("renamings", [])]
+                       + [renaming["to"] for renaming in step_params.get("renamings", [])])
+        if step_type == "CreateColumnWithGREL":
+            return extract_grel_expression_columns(step_params["expression"]) | set([step_params["column"]])
+        if step_type == "FilterOnCustomFormula":
+            return extract_grel_expression_columns(step_params["expression"])
+    except Exception:
+        return None
+    if (step_type == "ColumnsSelector") and (not step_params.get("keep", False))\
+            and (step_params.get("appliesTo", "COLUMNS") in ["COLUMNS", "SINGLE_COLUMN"]):
+        return set(step_params.get("columns", []))
+    return None
+
+
+def compute_prepare_steps_available_columns(steps, available_columns):
+    """
+    Computes the columns available before each prepare recipe step, when they can be known.
+
+    :param steps: list: List of the prepare recipe steps, each being in JSON format.
+    :param available_columns: set: Set of the columns available before the first step. None if unknown.
+
+    :returns: steps_available_columns: list: Set of the columns available before each step (None when unknown).
+    :returns: available_columns: set: Set of the columns available after the last step (None when unknown).
+    """
+    steps_available_columns = []
+    for step in steps:
+        steps_available_columns.append(None if available_columns is None else set(available_columns))
+        if (available_columns is None) or step.get("disabled", False):
+            continue
+        if step.get("metaType") == "GROUP":
+            __, available_columns = compute_prepare_steps_available_columns(step.get("steps", []), available_columns)
+            continue
+        step_type = step.get("type")
+        step_params = step.get("params", {})
+        if step_type == "ColumnRenamer":
+            for renaming in step_params.get("renamings", []):
+                available_columns.discard(renaming["from"])
+                available_columns.add(renaming["to"])
+        elif step_type == "CreateColumnWithGREL":
+            available_columns.add(step_params["column"])
+        elif (step_type == "ColumnsSelector") and (step_params.get("appliesTo", "COLUMNS") in ["COLUMNS", "SINGLE_COLUMN"]):
+            if step_params.get("keep", False):
+                available_columns.intersection_update(step_params.get("columns", []))
+            else:
+                available_columns.difference_update(step_params.get("columns", []))
+        elif step_type != "FilterOnCustomFormula":
+            available_columns = None
+    return steps_available_columns, available_columns
+
+
+def flatten_prepare_recipe_group_steps(steps, optimization_report, group_path=""):
+    """
+    Flattens the redundant GROUP steps of a prepare recipe: empty groups are removed, and enabled groups holding
+        a single step or directly nested in another group are replaced by their sub-steps.
+
+    :param steps: list: List of the prepare recipe steps, each being in JSON format.
+    :param optimization_report: list: List of the applied optimizations. Updated in place.
+    :param group_path: str: Path of the GROUP step containing the steps ('' at the recipe top level).
+
+    :returns: flattened_steps: list: The flattened steps.
+    """
+    flattened_steps = []
+    for step_index, step in enumerate(steps):
+        if step.get("metaType") != "GROUP":
+            flattened_steps.append(step)
+            continue
+        step_path = "{}{}".format(group_path, step_index)
+        sub_steps = flatten_prepare_recipe_group_steps(step.get("steps", []), optimization_report, "{}.".format(step_path))
+        if len(sub_steps) == 0:
+            optimization_report.append({"optimization": "FLATTEN_GROUP", "group_path": group_path,
+                                        "details": "Empty group '{}' removed".format(step.get("name"))})
+        elif (not step.get("disabled", False)) and ((len(sub_steps) == 1) or (group_path != "")):
+            optimization_report.append({"optimization": "FLATTEN_GROUP", "group_path": group_path,
+                                        "details": "Group '{}' replaced by its {} sub-steps".format(step.get("name"), len(sub_steps))})
+            flattened_steps += sub_steps
+        else:
+            step = dict(step)
+            step["steps"] = sub_steps
+            flattened_steps.append(step)
+    return flattened_steps
+
+
+def merge_prepare_recipe_rename_steps(steps, optimization_report, group_path=""):
+    """
+    Merges the consecutive enabled 'ColumnRenamer' steps of a prepare recipe into a single step, chaining the
+        renamings (ex: 'a' -> 'b' then 'b' -> 'c' becomes 'a' -> 'c') and removing the renamings cancelling each other.
+
+    :param steps: list: List of the prepare recipe steps, each being in JSON format.
+    :param optimization_report: list: List of the applied optimizations. Updated in place.
+    :param group_path: str: Path of the GROUP step containing the steps ('' at the recipe top level).
+
+    :returns: merged_steps: list: The steps with merged renamings.
+    """
+    merged_steps = []
+    for step in steps:
+        bool_step_is_rename = (step.get("type") == "ColumnRenamer") and (not step.get("disabled", False))
+        if bool_step_is_rename and (len(merged_steps) > 0) and (merged_steps[-1].get("type") == "ColumnRenamer")\
+                and (not merged_steps[-1].get("disabled", False)):
+            previous_step = merged_steps[-1]
+            renamings = [dict(renaming) for renaming in previous_step["params"]["renamings"]]
+            for renaming in step["params"].get("renamings", []):
+                chained_renamings = [previous_renaming for previous_renaming in renamings
+                                     if previous_renaming["to"] == renaming["from"]]
+                if len(chained_renamings) > 0:
+                    chained_renamings[0]["to"] = renaming["to"]
+                else:
+                    renamings.append(dict(renaming))
+            renamings = [renaming for renaming in renamings if renaming["from"] != renaming["to"]]
+            merged_steps[-1] = dict(previous_step, params=dict(previous_step["params"], renamings=renamings))
+            optimization_report.append({"optimization": "MERGE_RENAMES", "group_path": group_path,
+                                        "details": "Renamings {} merged into the previous rename step"
+                                        .format([(renaming["from"], renaming["to"]) for renaming in step["params"].get("renamings", [])])})
+            if len(renamings) == 0:
+                merged_steps.pop()
+            continue
+        if step.get("metaType") == "GROUP":
+            step = dict(step, steps=merge_prepare_recipe_rename_steps(step.get("steps", []), optimization_report,
+                                                                       "{}{}.".format(group_path, len(merged_steps))))
+        merged_steps.append(step)
+    return merged_steps
+
+
+def remove_prepare_recipe_unread_formula_steps(steps, optimization_report, available_columns=None, group_path=""):
+    """
+    Removes the enabled formula steps whose column is deleted by a later step of the same level without being read
+        in between. The column is also removed from the deletion step when it is known not to exist before the formula.
+
+    :param steps: list: List of the prepare recipe steps, each being in JSON format.
+    :param optimization_report: list: List of the applied optimizations. Updated in place.
+    :param available_columns: set: Set of the columns available before the first step. None if unknown.
+    :param group_path: str: Path of the GROUP step containing the steps ('' at the recipe top level).
+
+    :returns: remaining_steps: list: The steps without the unread formulas.
+    """
+    steps = [dict(step) for step in steps]
+    steps_available_columns, __ = compute_prepare_steps_available_columns(steps, None if available_columns is None else set(available_columns))
+    removed_step_indexes = []
+    for step_index, step in enumerate(steps):
+        if step.get("metaType") == "GROUP":
+            step["steps"] = remove_prepare_recipe_unread_formula_steps(step.get("steps", []), optimization_report,
+                                                                       steps_available_columns[step_index],
+                                                                       "{}{}.".format(group_path, step_index))
+            continue
+        if (step.get("type") != "CreateColumnWithGREL") or step.get("disabled", False):
+            continue
+        column_name = step["params"]["column"]
+        for next_step_index in range(step_index + 1, len(steps)):
+            if next_step_index in removed_step_indexes:
+                continue
+            next_step = steps[next_step_index]
+            if check_if_prepare_step_is_deletion(next_step) and (column_name in next_step["params"].get("columns", [])):
+                removed_step_indexes.append(step_index)
+                step_available_columns = steps_available_columns[step_index]
+                bool_column_is_new = (step_available_columns is not None) and (column_name not in step_available_columns)
+                if bool_column_is_new:
+                    next_step["params"] = dict(next_step["params"], columns=[deleted_column for deleted_column
+                                                                             in next_step["params"]["columns"]
+                                                                             if deleted_column != column_name])
+                optimization_report.append({"optimization": "REMOVE_UNREAD_FORMULA", "group_path": group_path,
+                                            "details": "Formula computing column '{}' removed, as the column is deleted "
+                                            "without being read".format(column_name)})
+                break
+            next_step_touched_columns = compute_prepare_step_touched_columns(next_step)
+            if (next_step_touched_columns is None) or (column_name in next_step_touched_columns):
+                break
+    remaining_steps = [step for step_index, step in enumerate(steps) if step_index not in removed_step_indexes
+                       and not (check_if_prepare_step_is_deletion(step) and (len(step["params"].get("columns", [])) == 0))]
+    return remaining_steps
+
+
+def hoist_prepare_recipe_deletion_steps(steps, optimization_report, group_path=""):
+    """
+    Moves each column deletion of a prepare recipe right after the last previous step of the same level reading or
+        writing the column (or depending on unknown columns), so that the next steps process narrower rows.
+        Consecutive deletion steps are then merged.
+
+    :param steps: list: List of the prepare recipe steps, each being in JSON format.
+    :param optimization_report: list: List of the applied optimizations. Updated in place.
+    :param group_path: str: Path of the GROUP step containing the steps ('' at the recipe top level).
+
+    :returns: hoisted_steps: list: The steps with hoisted deletions.
+    """
+    steps = list(steps)
+    step_index = 0
+    while step_index < len(steps):
+        step = steps[step_index]
+        if step.get("metaType") == "GROUP":
+            steps[step_index] = dict(step, steps=hoist_prepare_recipe_deletion_steps(step.get("steps", []), optimization_report,
+                                                                                     "{}{}.".format(group_path, step_index)))
+        if (not check_if_prepare_step_is_deletion(step)) or (step_index == 0):
+            step_index += 1
+            continue
+        columns_target_indexes = {}
+        for column_name in step["params"].get("columns", []):
+            target_index = 0
+            for previous_step_index in range(step_index - 1, -1, -1):
+                previous_step_touched_columns = compute_prepare_step_touched_columns(steps[previous_step_index])
+                if (previous_step_touched_columns is None) or (column_name in previous_step_touched_columns):
+                    target_index = previous_step_index + 1
+                    break
+            columns_target_indexes[column_name] = target_index
+        hoisted_columns = [column_name for column_name, target_index in columns_target_indexes.items() if target_index < step_index]
+        if len(hoisted_columns) == 0:
+            step_index += 1
+            continue
+        kept_columns = [column_name for column_name in step["params"]["columns"] if column_name not in hoisted_columns]
+        if len(kept_columns) > 0:
+            steps[step_index] = dict(step, params=dict(step["params"], columns=kept_columns))
+        else:
+            steps.pop(step_index)
+        for target_index in sorted(set([columns_target_indexes[column_name] for column_name in hoisted_columns]), reverse=True):
+            target_columns = [column_name for column_name in hoisted_columns if columns_target_indexes[column_name] == target_index]
+            steps.insert(target_index, compute_prepare_keep_or_delete_step(target_columns, False))
+            optimization_report.append({"optimization": "HOIST_DELETION", "group_path": group_path,
+                                        "details": "Deletion of columns {} moved from step {} to step {}"
+                                        .format(target_columns, step_index, target_index)})
+        step_index += 1 + len(set([columns_target_indexes[column_name] for column_name in hoisted_columns]))\
+            - (1 if len(kept_columns) == 0 else 0)
+
+    hoisted_steps = []
+    for step in steps:
+        if check_if_prepare_step_is_deletion(step) and (len(hoisted_steps) > 0)\
+                and check_if_prepare_step_is_deletion(hoisted_steps[-1]):
+            previous_step = hoisted_steps[-1]
+            deleted_columns = previous_step["params"]["columns"] + [column_name for column_name in step["params"]["columns"]
+                                                                    if column_name not in previous_step["params"]["columns"]]
+            hoisted_steps[-1] = dict(previous_step, params=dict(previous_step["params"], columns=deleted_columns))
+            optimization_report.append({"optimization": "MERGE_DELETIONS", "group_path": group_path,
+                                        "details": "Deletion of columns {} merged into the previous deletion step"
+                                        .format(step["params"]["columns"])})
+            continue
+        hoisted_steps.append(step)
+    return hoisted_steps
+
+
+def optimize_prepare_recipe_steps(steps, input_columns=None):
+    """
+    Optimizes a prepare recipe steps list, without changing its output: redundant GROUP steps are flattened,
+        consecutive renamings are merged, formulas computing columns deleted without being read are removed and
+        column deletions are moved as early as their dependencies allow. Steps of unknown processors are never moved
+        nor crossed.
+
+    :param steps: list: List of the prepare recipe steps, each being in JSON format.
+    :param input_columns: list: Optional list of the recipe input columns, allowing to clean the deletion steps
+        of the columns that are never created.
+
+    :returns: optimized_steps: list: The optimized steps.
+    :returns: optimization_report_df: pandas.core.frame.DataFrame: The applied optimizations, with columns
+        ['optimization', 'group_path', 'details'], optimizations being in 'PREPARE_STEPS_OPTIMIZATIONS'.
+    """
+    optimization_report = []
+    optimized_steps = flatten_prepare_recipe_group_steps(steps, optimization_report)
+    optimized_steps = merge_prepare_recipe_rename_steps(optimized_steps, optimization_report)
+    optimized_steps = remove_prepare_recipe_unread_formula_steps(optimized_steps, optimization_report,
+                                                                 None if input_columns is None else set(input_columns))
+    optimized_steps = hoist_prepare_recipe_deletion_steps(optimized_steps, optimization_report)
+    optimization_report_df = pd.DataFrame(optimization_report, columns=["optimization", "group_path", "details"])
+    return optimized_steps, optimization_report_df
+
+
+def optimize_prepare_recipe(project, recipe_name, bool_save_optimized_steps=False):
+    """
+    Optimizes the steps of a prepare recipe (see :function:`optimize_prepare_recipe_steps`).
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param recipe_name: str: Name of the prepare recipe.
+    :param bool_save_optimized_steps: bool: Precise if the optimized steps should be saved in the recipe.
+        If 'False', only the optimization report is computed.
+
+    :returns: optimization_report_df: pandas.core.frame.DataFrame: The applied optimizations.
+    """
+    recipe_settings, __ = get_recipe_settings_and_dictionary(project, recipe_name, False)
+    recipe_json_payload = recipe_settings.get_json_payload()
+    recipe_input_dataset_name = get_recipe_input_datasets(project, recipe_name)[0]
+    recipe_input_columns, __ = extract_dataset_schema_information(get_dataset_schema(project, recipe_input_dataset_name))
+    optimized_steps, optimization_report_df = optimize_prepare_recipe_steps(recipe_json_payload.get("steps", []),
+                                                                            recipe_input_columns)
+    print("Prepare recipe '{}': {} optimizations found.".format(recipe_name, len(optimization_report_df)))
+    if bool_save_optimized_steps and (len(optimization_report_df) > 0):
+        recipe_json_payload["steps"] = optimized_steps
+        recipe_settings.set_json_payload(recipe_json_payload)
+        recipe_settings.save()
+        print("Prepare recipe '{}' optimized steps saved !".format(recipe_name))
+    return optimization_report_df
+
+
+PREPARE_SQL_TRANSLATABLE_PROCESSORS = ["ColumnRenamer", "ColumnsSelector", "ColumnReorder", "ColumnCopier", "CreateColumnWithGREL",
+                                       "FilterOnCustomFormula", "FilterOnValue", "FilterOnNumericalRange", "FillEmptyWithValue",
+                                       "RemoveRowsOnEmpty", "ColumnsConcat", "RoundProcessor"]
+GREL_SQL_TRANSLATABLE_FUNCTIONS = ["if", "coalesce", "and", "or", "not", "isNull", "isNotNull", "val", "strval", "numval",
+                                   "toString", "toNumber", "length", "toLowercase", "toUppercase", "trim", "strip", "substring",
+                                   "startsWith", "endsWith", "contains", "replace", "concat", "abs", "round", "floor", "ceil",
+                                   "sqrt", "min", "max"]
+SQL_NEVER_BLANK_STRING_DATATYPES = ["tinyint", "smallint", "int", "bigint", "float", "double", "boolean", "date"]
+
+
+def rewrite_grel_expression_tree_for_sql(expression_tree, column_datatypes):
+    """
+    Rewrites a formula expression tree into an equivalent tree that can be translated to SQL. Blank checks on columns
+        that can't hold empty strings become null checks ('isNonBlank(x)' -> 'isNotNull(x)'), then null-defaulting
+        conditions become coalescences ('if(isNotNull(x), x, 0)' -> 'coalesce(x, 0)').
+
+    :param expression_tree: tuple: The formula expression tree, as computed with :function:`parse_grel_expression`.
+    :param column_datatypes: dict: Mapping between the known columns and their datatypes.
+
+    :returns: rewritten_expression_tree: tuple: The rewritten formula expression tree.
+    """
+    node_type = expression_tree[0]
+    if node_type in ["literal", "column"]:
+        return expression_tree
+    if node_type in ["unary", "binary"]:
+        return expression_tree[:2] + tuple([rewrite_grel_expression_tree_for_sql(operand_tree, column_datatypes)
+                                            for operand_tree in expression_tree[2:]])
+    function_name = expression_tree[1]
+    arguments = [rewrite_grel_expression_tree_for_sql(argument, column_datatypes) for argument in expression_tree[2]]
+    if (function_name in ["isBlank", "isNonBlank"]) and (len(arguments) == 1) and (arguments[0][0] == "column")\
+            and (column_datatypes.get(arguments[0][1]) in SQL_NEVER_BLANK_STRING_DATATYPES):
+        return ("call", "isNull" if function_name == "isBlank" else "isNotNull", arguments)
+    if (function_name == "if") and (len(arguments) == 3) and (arguments[0][0] == "call")\
+            and (arguments[0][1] in ["isNull", "isNotNull"]) and (len(arguments[0][2]) == 1):
+        checked_tree = arguments[0][2][0]
+        if (arguments[0][1] == "isNotNull") and (arguments[1] == checked_tree):
+            return ("call", "coalesce", [checked_tree, arguments[2]])
+        if (arguments[0][1] == "isNull") and (arguments[2] == checked_tree):
+            return ("call", "coalesce", [checked_tree, arguments[1]])
+    return ("call", function_name, arguments)
+
+
+def compute_grel_expression_tree_sql_blocking_functions(expression_tree):
+    """
+    Lists the functions of a formula expression tree that can't be translated to SQL.
+
+    :param expression_tree: tuple: The formula expression tree, as computed with :function:`parse_grel_expression`.
+
+    :returns: blocking_functions: set: Set of the function names not in 'GREL_SQL_TRANSLATABLE_FUNCTIONS'.
+    """
+    if expression_tree[0] in ["literal", "column"]:
+        return set()
+    if expression_tree[0] in ["unary", "binary"]:
+        child_trees = expression_tree[2:]
+        blocking_functions = set()
+    else:
+        child_trees = expression_tree[2]
+        blocking_functions = set() if expression_tree[1] in GREL_SQL_TRANSLATABLE_FUNCTIONS else set([expression_tree[1]])
+    for child_tree in child_trees:
+        blocking_functions |= compute_grel_expression_tree_sql_blocking_functions(child_tree)
+    return blocking_functions
+
+
+def rewrite_prepare_steps_for_sql(steps, column_datatypes, compatibility_rows, step_path_prefix=""):
+    """
+    Classifies each enabled prepare recipe step as translatable to SQL or not, rewriting its formula when an equivalent
+        translatable formula exists (see :function:`rewrite_grel_expression_tree_for_sql`).
+
+    :param steps: list: List of the prepare recipe steps, each being in JSON format.
+    :param column_datatypes: dict: Mapping between the known columns and their datatypes. Updated in place.
+    :param compatibility_rows: list: List of the steps compatibility information. Updated in place.
+    :param step_path_prefix: str: Path of the GROUP step containing the steps, if any.
+
+    :returns: rewritten_steps: list: The steps with rewritten formulas.
+    """
+    rewritten_steps = []
+    for step_index, step in enumerate(steps):
+        step_path = "{}{}".format(step_path_prefix, step_index)
+        if step.get("disabled", False):
+            rewritten_steps.append(step)
+            continue
+        if step.get("metaType") == "GROUP":
+            rewritten_steps.append(dict(step, steps=rewrite_prepare_steps_for_sql(step.get("steps", []), column_datatypes,
+                                                                                  compatibility_rows, "{}.".format(step_path))))
+            continue
+        step_type = step.get("type")
+        step_params = step.get("params", {})
+        compatibility_row = {"step_path": step_path, "step_type": step_type, "bool_sql_translatable": True,
+                             "bool_rewritten": False, "expression": step_params.get("expression"),
+                             "rewritten_expression": None, "blocking_reason": None}
+        if step_type not in PREPARE_SQL_TRANSLATABLE_PROCESSORS:
+            compatibility_row["bool_sql_translatable"] = False
+            compatibility_row["blocking_reason"] = "Processor '{}' can't be translated to SQL".format(step_type)
+        elif step_type in ["CreateColumnWithGREL", "FilterOnCustomFormula"]:
+            try:
+                expression_tree = parse_grel_expression(step_params["expression"])
+            except Exception as parsing_error:
+                expression_tree = None
+                compatibility_row["bool_sql_translatable"] = False
+                compatibility_row["blocking_reason"] = "Formula can't be parsed: {}".format(parsing_error)
+            if expression_tree is not None:
+                rewritten_expression_tree = rewrite_grel_expression_tree_for_sql(expression_tree, column_datatypes)
+                blocking_functions = compute_grel_expression_tree_sql_blocking_functions(rewritten_expression_tree)
+                if len(blocking_functions) > 0:
+                    compatibility_row["bool_sql_translatable"] = False
+                    compatibility_row["blocking_reason"] = "Formula functions {} can't be translated to SQL"\
+                        .format(sorted(blocking_functions))
+                elif rewritten_expression_tree != expression_tree:
+                    rewritten_expression = format_grel_expression_tree(rewritten_expression_tree)
+                    compatibility_row["bool_rewritten"] = True
+                    compatibility_row["rewritten_expression"] = rewritten_expression
+                    step = dict(step, params=dict(step_params, expression=rewritten_expression))
+        compatibility_rows.append(compatibility_row)
+        rewritten_steps.append(step)
+
+        if step_type == "ColumnRenamer":
+            for renaming in step_params.get("renamings", []):
+                if renaming["from"] in column_datatypes:
+                    column_datatypes[renaming["to"]] = column_datatypes.pop(renaming["from"])
+                else:
+                    column_datatypes.pop(renaming["to"], None)
+        elif step_type in ["CreateColumnWithGREL", "ColumnCopier"]:
+            column_datatypes.pop(step_params.get("column"), None)
+        elif step_type not in PREPARE_SQL_TRANSLATABLE_PROCESSORS:
+            column_datatypes.clear()
+    return rewritten_steps
+
+
+def check_prepare_recipe_steps_sql_compatibility(steps, input_column_datatypes=None):
+    """
+    Checks which prepare recipe steps prevent the recipe from running on an in-database (SQL) engine, after rewriting
+        the formulas having a translatable equivalent. Blank checks are only rewritten on columns whose datatype is
+        known not to be a string, hence the 'input_column_datatypes'.
+
+    :param steps: list: List of the prepare recipe steps, each being in JSON format.
+    :param input_column_datatypes: dict: Optional mapping between the recipe input columns and their datatypes.
+
+    :returns: rewritten_steps: list: The steps with rewritten formulas.
+    :returns: compatibility_df: pandas.core.frame.DataFrame: The SQL compatibility of each enabled step, with columns
+        ['step_path', 'step_type', 'bool_sql_translatable', 'bool_rewritten', 'expression', 'rewritten_expression',
+         'blocking_reason'].
+    """
+    compatibility_rows = []
+    column_datatypes = dict(input_column_datatypes) if input_column_datatypes is not None else {}
+    rewritten_steps = rewrite_prepare_steps_for_sql(steps, column_datatypes, compatibility_rows)
+    compatibility_df = pd.DataFrame(compatibility_rows, columns=["step_path", "step_type", "bool_sql_translatable",
+                                                                 "bool_rewritten", "expression", "rewritten_expression",
+                                                                 "blocking_reason"])
+    return rewritten_steps, compatibility_df
+
+
+def make_prepare_recipe_sql_compatible(project, recipe_name, bool_save_rewritten_steps=False):
+    """
+    Rewrites the formulas of a prepare recipe into SQL-translatable equivalents and reports the steps still preventing
+        the recipe from running on an in-database engine (see :function:`check_prepare_recipe_steps_sql_compatibility`).
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param recipe_name: str: Name of the prepare recipe.
+    :param bool_save_rewritten_steps: bool: Precise if the rewritten steps should be saved in the recipe.
+
+    :returns: compatibility_df: pandas.core.frame.DataFrame: The SQL compatibility of each enabled step.
+    """
+    recipe_settings, __ = get_recipe_settings_and_dictionary(project, recipe_name, False)
+    recipe_json_payload = recipe_settings.get_json_payload()
+    recipe_input_dataset_name = get_recipe_input_datasets(project, recipe_name)[0]
+    recipe_input_column_datatypes = get_dataset_column_datatypes_mapping(project, recipe_input_dataset_name)
+    rewritten_steps, compatibility_df = check_prepare_recipe_steps_sql_compatibility(recipe_json_payload.get("steps", []),
+                                                                                     recipe_input_column_datatypes)
+    for compatibility_row in compatibility_df[compatibility_df["bool_sql_translatable"] == False].to_dict("records"):
+        print("WARNING: prepare recipe '{}' step '{}' ({}) prevents in-database execution: {}"
+              .format(recipe_name, compatibility_row["step_path"], compatibility_row["step_type"],
+                      compatibility_row["blocking_reason"]))
+    print("Prepare recipe '{}': {} formulas rewritten, {} blocking steps.".format(
+        recipe_name, int(compatibility_df["bool_rewritten"].sum()), int((compatibility_df["bool_sql_translatable"] == False).sum())))
+    if bool_save_rewritten_steps and compatibility_df["bool_rewritten"].any():
+        recipe_json_payload["steps"] = rewritten_steps
+        recipe_settings.set_json_payload(recipe_json_payload)
+        recipe_settings.save()
+        print("Prepare recipe '{}' rewritten steps saved !".format(recipe_name))
+    return compatibility_df
+
+
+class PrepareRecipeBuilder(VisualRecipeBuilder):
+    """
+    Accumulates the steps of a prepare recipe, then validates and saves them in a single settings update.
+    """
+
+    ALLOWED_RECIPE_TYPES = ["shaker"]
+
+    def reset_steps(self):
+        """
+        Removes all the steps of the prepare recipe.
+
+        :returns: self
+        """
+        self.recipe_payload["steps"] = []
+        return self
+
+    def add_step(self, step, step_comment="", show_step_comment=True):
+        """
+        Adds a step at the end of the prepare recipe.
+
+        :param :step: dict: Definition of the prepare recipe step in JSON format.
+        :param :step_comment: str: Comment to link to the recipe step.
+        :param :show_step_comment: bool: Parameter precising whether the step comment should be displayed or not
+            in the recipe.
+
+        :returns: self
+        """
+        step["alwaysShowComment"] = show_step_comment
+        if step_comment != "":
+            step["comment"] = step_comment
+        self.recipe_payload.setdefault("steps", []).append(step)
+        return self
+
+    def add_steps(self, steps):
+        """
+        Adds several steps at the end of the prepare recipe, keeping their comment settings.
+
+        :param :steps: list: List of the prepare recipe steps, each being in JSON format.
+
+        :returns: self
+        """
+        self.recipe_payload.setdefault("steps", []).extend(steps)
+        return self
+
+    def check_steps_columns(self, steps, available_columns):
+        """
+        Records a validation error for each renamed or selected column that does not exist when its step runs.
+            Columns are tracked through 'ColumnRenamer', 'CreateColumnWithGREL' and 'ColumnsSelector' steps:
+            tracking stops at the first step of another processor type, as its output columns are unknown.
+
+        :param :steps: list: List of the prepare recipe steps, each being in JSON format.
+        :param :available_columns: set: Set of the columns available before the first step. It is updated in place.
+
+        :returns: bool_columns_are_known: bool: Boolean precising if the columns are still known after the steps.
+        """
+        for step in steps:
+            if step.get("disabled", False):
+                continue
+            if step.get("metaType") == "GROUP":
+                if not self.check_steps_columns(step.get("steps", []), available_columns):
+                    return False
+                continue
+            step_type = step.get("type")
+            step_params = step.get("params", {})
+            if step_type == "ColumnRenamer":
+                for renaming in step_params.get("renamings", []):
+                    if renaming["from"] not in available_columns:
+                        self.validation_errors.append("Column '{}' renamed in a prepare step does not exist".format(renaming["from"]))
+                    available_columns.discard(renaming["from"])
+                    available_columns.add(renaming["to"])
+            elif step_type == "CreateColumnWithGREL":
+                available_columns.add(step_params["column"])
+            elif (step_type == "ColumnsSelector") and (step_params.get("appliesTo") == "COLUMNS"):
+                for column_name in step_params.get("columns", []):
+                    if column_name not in available_columns:
+                        self.validation_errors.append("Column '{}' kept or deleted in a prepare step does not exist".format(column_name))
+                if step_params.get("keep", False):
+                    available_columns.intersection_update(step_params.get("columns", []))
+                else:
+                    available_columns.difference_update(step_params.get("columns", []))
+            else:
+                return False
+        return True
+
+    def optimize_steps(self):
+        """
+        Optimizes the accumulated prepare recipe steps (see :function:`optimize_prepare_recipe_steps`).
+
+        :returns: self
+        """
+        recipe_input_columns = list(self.get_recipe_input_column_datatypes().keys())
+        optimized_steps, optimization_report_df = optimize_prepare_recipe_steps(self.recipe_payload.get("steps", []),
+                                                                                recipe_input_columns)
+        self.recipe_payload["steps"] = optimized_steps
+        print("Prepare recipe '{}': {} optimizations applied.".format(self.recipe_name, len(optimization_report_df)))
+        return self
+
+    def check_steps_on_dataframe(self, dataframe):
+        """
+        Records a validation error for each prepare recipe step that can't be compiled or fails when executed locally
+            on a sample of the recipe input (see :function:`validate_prepare_steps_locally`).
+
+        :param :dataframe: pandas.core.frame.DataFrame: A sample of the recipe input.
+
+        :returns: self
+        """
+        self.validation_errors += validate_prepare_steps_locally(self.recipe_payload.get("steps", []), dataframe)
+        return self
+
+    def validate(self):
+        """
+        Checks that the columns renamed or selected by the prepare recipe steps exist.
+        """
+        recipe_input_columns = set(self.get_recipe_input_column_datatypes().keys())
+        self.check_steps_columns(self.recipe_payload.get("steps", []), recipe_input_columns)
+        VisualRecipeBuilder.validate(self)
+        pass
+
@@ -1,4 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
 from ..flow.engines import get_flow_engines_priority
+from ..flow.flow_graph import get_flow_graph_nodes, get_flow_dataset_consumer_recipe_names
+from ..datasets.dataset_commons import get_dataset_schema, extract_dataset_schema_information
 
 
 def get_recipe_settings_and_dictionary(project, recipe_name, bool_get_settings_dictionary):
@@ -177,3 +181,211 @@ def switch_visual_recipe_input(project, recipe_name, current_input_dataset_name,
     recipe_settings.save()
     print("Recipe '{}' input dataset successfully changed!".format(recipe_name))
     pass
+
+
+
+def rewire_recipe_inputs(project, recipe_name, recipe_input_mapping):
+    """
+    Replaces several inputs of a VISUAL recipe in a single settings update.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param recipe_name: str: Name of the recipe.
+    :param recipe_input_mapping: dict: Mapping between the current recipe input dataset names and
+        the dataset names that should replace them.
+
+    :returns: rewiring_report: dict: Information about the rewiring, with keys 'recipe_name', 'replaced_inputs'
+        (list of (current_input, new_input) tuples), 'status' ('REWIRED', 'UNCHANGED' or 'FAILED') and 'error_message'.
+    """
+    rewiring_report = {"recipe_name": recipe_name, "replaced_inputs": [], "status": None, "error_message": None}
+    try:
+        recipe_settings, __ = get_recipe_settings_and_dictionary(project, recipe_name, False)
+        recipe_input_dataset_names = [item["ref"] for item in recipe_settings.get_recipe_inputs()["main"]["items"]]
+        for current_input_dataset_name, new_input_dataset_name in recipe_input_mapping.items():
+            if current_input_dataset_name in recipe_input_dataset_names:
+                recipe_settings.replace_input(current_input_dataset_name, new_input_dataset_name)
+                rewiring_report["replaced_inputs"].append((current_input_dataset_name, new_input_dataset_name))
+        if len(rewiring_report["replaced_inputs"]) > 0:
+            recipe_settings.save()
+            rewiring_report["status"] = "REWIRED"
+        else:
+            rewiring_report["status"] = "UNCHANGED"
+    except Exception as exception:
+        rewiring_report["status"] = "FAILED"
+        rewiring_report["error_message"] = str(exception)
+    return rewiring_report
+
+
+def rewire_recipes_inputs(project, recipes_input_mappings, max_workers=8):
+    """
+    Replaces the inputs of several VISUAL recipes concurrently, with a single settings update per recipe.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param recipes_input_mappings: dict: Mapping between the recipe names and their input mapping, with format:
+        {'recipe_1': {'current_input_1': 'new_input_1'}, 'recipe_2': {...}}
+    :param max_workers: int: Maximum number of recipes rewired at the same time.
+
+    :returns: rewiring_report_df: pandas.core.frame.DataFrame: DataFrame containing, for each recipe, the replaced inputs,
+        the rewiring status ('REWIRED', 'UNCHANGED' or 'FAILED') and the error message in case of failure.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        rewiring_reports = list(executor.map(
+            lambda recipe_name: rewire_recipe_inputs(project, recipe_name, recipes_input_mappings[recipe_name]),
+            recipes_input_mappings.keys()))
+    rewiring_report_df = pd.DataFrame(rewiring_reports, columns=["recipe_name", "replaced_inputs", "status", "error_message"])
+    failed_recipe_names = list(rewiring_report_df[rewiring_report_df["status"] == "FAILED"]["recipe_name"])
+    if len(failed_recipe_names) > 0:
+        print("WARNING: recipes '{}' could not be rewired! Please look at the 'error_message' "
+              "column of the returned report.".format(failed_recipe_names))
+    return rewiring_report_df
+
+
+def rewire_inputs(project, input_mapping, scope=None, max_workers=8):
+    """
+    Replaces datasets by other ones in the inputs of all the recipes consuming them. Consumer recipes are found
+        from the flow graph, and each recipe is updated once, whatever the number of its inputs to replace.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param input_mapping: dict: Mapping between the dataset names to replace and the dataset names
+        that should replace them. Example: {'dimension_table': 'dimension_table_v2'}
+    :param scope: list: Optional list of the recipe names that can be rewired. If 'None', all consumer recipes are rewired.
+    :param max_workers: int: Maximum number of recipes rewired at the same time.
+
+    :returns: rewiring_report_df: pandas.core.frame.DataFrame: DataFrame containing, for each rewired recipe,
+        the replaced inputs, the rewiring status and the error message in case of failure.
+    """
+    print("Rewiring recipe inputs with mapping '{}' ...".format(input_mapping))
+    flow_graph_nodes = get_flow_graph_nodes(project)
+    recipes_input_mappings = {}
+    for current_input_dataset_name, new_input_dataset_name in input_mapping.items():
+        for recipe_name in get_flow_dataset_consumer_recipe_names(flow_graph_nodes, current_input_dataset_name):
+            if (scope is None) or (recipe_name in scope):
+                recipes_input_mappings.setdefault(recipe_name, {})[current_input_dataset_name] = new_input_dataset_name
+    rewiring_report_df = rewire_recipes_inputs(project, recipes_input_mappings, max_workers)
+    print("{} recipes successfully rewired!".format(len(rewiring_report_df[rewiring_report_df["status"] == "REWIRED"])))
+    return rewiring_report_df
+
+class VisualRecipeBuilder:
+    """
+    Base class of the visual recipe builders: loads a recipe settings once, accumulates changes on its JSON payload,
+        validates them against the cached recipe input schema and saves the recipe once.
+        Builder methods return the builder itself so that they can be chained, ex:
+        GroupRecipeBuilder(project, 'recipe_1').set_group_key(['column_1']).set_aggregations({'column_2': ['sum']}).save()
+    """
+
+    ALLOWED_RECIPE_TYPES = []
+
+    def __init__(self, project, recipe_name, dataset_schemas_cache=None):
+        """
+        :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+        :param recipe_name: str: Name of the recipe.
+        :param dataset_schemas_cache: dict: Optional mapping between dataset names and their schemas, shared between
+            builders so that each input schema is only fetched once. Missing schemas are fetched and added to it.
+        """
+        self.project = project
+        self.recipe_name = recipe_name
+        self.recipe_settings, self.recipe_settings_dict = get_recipe_settings_and_dictionary(project, recipe_name, True)
+        self.recipe_type = self.recipe_settings_dict["type"]
+        if (len(self.ALLOWED_RECIPE_TYPES) > 0) and (self.recipe_type not in self.ALLOWED_RECIPE_TYPES):
+            log_message = "Recipe '{}' is of type '{}', which is not allowed in '{}'. "\
+                "Allowed recipe types are: '{}'".format(recipe_name, self.recipe_type,
+                                                        self.__class__.__name__, self.ALLOWED_RECIPE_TYPES)
+            raise Exception(log_message)
+        self.recipe_input_dataset_names = [item["ref"] for item in self.recipe_settings.get_recipe_inputs()["main"]["items"]]
+        self.recipe_payload = self.recipe_settings.get_json_payload()
+        if dataset_schemas_cache is None:
+            dataset_schemas_cache = {}
+        self.dataset_schemas_cache = dataset_schemas_cache
+        self.validation_errors = []
+        pass
+
+    def get_recipe_input_schema(self, input_index=0):
+        """
+        Retrieves the schema of a recipe input dataset, from the schemas cache when available.
+
+        :param input_index: int: Index of the input dataset in the recipe inputs.
+
+        :returns: recipe_input_schema: list: Schema of the input dataset, with format:
+            [{'name': 'column_1', 'type': 'column_1_datatype'},
+            {'name': 'column_2', 'type': 'column_2_datatype'}|
+        """
+        recipe_input_dataset_name = self.recipe_input_dataset_names[input_index]
+        if recipe_input_dataset_name not in self.dataset_schemas_cache:
+            self.dataset_schemas_cache[recipe_input_dataset_name] = get_dataset_schema(self.project, recipe_input_dataset_name)
+        recipe_input_schema = self.dataset_schemas_cache[recipe_input_dataset_name]
+        return recipe_input_schema
+
+    def get_recipe_input_column_datatypes(self, input_index=0):
+        """
+        Retrieves the mapping between a recipe input dataset columns and their datatypes.
+
+        :param input_index: int: Index of the input dataset in the recipe inputs.
+
+        :returns: recipe_input_column_datatypes: dict: Mapping between the input columns and their datatypes.
+        """
+        recipe_input_columns, recipe_input_datatypes = extract_dataset_schema_information(self.get_recipe_input_schema(input_index))
+        recipe_input_column_datatypes = dict(zip(recipe_input_columns, recipe_input_datatypes))
+        return recipe_input_column_datatypes
+
+    def check_columns_are_in_recipe_input(self, column_names, columns_usage, input_index=0):
+        """
+        Records a validation error for each column missing from a recipe input dataset.
+
+        :param column_names: list: List of the column names to check.
+        :param columns_usage: str: Description of the way the columns are used, for error messages.
+        :param input_index: int: Index of the input dataset in the recipe inputs.
+        """
+        recipe_input_column_datatypes = self.get_recipe_input_column_datatypes(input_index)
+        for column_name in column_names:
+            if column_name not in recipe_input_column_datatypes:
+                self.validation_errors.append("Column '{}' used as {} is not in recipe input dataset '{}'"
+                                              .format(column_name, columns_usage, self.recipe_input_dataset_names[input_index]))
+        pass
+
+    def set_output_column_name_overrides(self, output_column_name_overrides):
+        """
+        Overrides the output column names of the recipe.
+
+        :param output_column_name_overrides: dict: Mapping between the output columns coming from the recipe and
+            the names they should have, ex: {'column_1_min': 'minimum_value_from_column_1'}
+
+        :returns: self
+        """
+        self.recipe_payload["outputColumnNameOverrides"] = output_column_name_overrides
+        return self
+
+    def set_engine(self, new_engine):
+        """
+        Sets the engine of the recipe.
+
+        :param new_engine: str: Name of the recipe engine.
+
+        :returns: self
+        """
+        if self.recipe_type in ["prepare", "shaker", "sampling"]:
+            self.recipe_settings.get_recipe_params()["engineType"] = new_engine
+        else:
+            self.recipe_payload["engineType"] = new_engine
+        return self
+
+    def validate(self):
+        """
+        Validates the accumulated changes. Subclasses record their own checks in 'self.validation_errors'
+            before calling this method, which raises if any error was recorded.
+        """
+        if len(self.validation_errors) > 0:
+            log_message = "Recipe '{}' settings are not valid:\n- {}".format(self.recipe_name,
+                                                                           "\n- ".join(self.validation_errors))
+            self.validation_errors = []
+            raise Exception(log_message)
+        pass
+
+    def save(self):
+        """
+        Validates and saves all the accumulated changes in a single settings update.
+        """
+        self.validate()
+        print("Updating recipe '{}' ...".format(self.recipe_name))
+        self.recipe_settings.set_json_payload(self.recipe_payload)
+        self.recipe_settings.save()
+        print("Recipe '{}' successfully updated!".format(self.recipe_name))
+        pass
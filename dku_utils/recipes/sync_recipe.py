@@ -1,4 +1,5 @@
 import dataikuapi
+from ..datasets.dataset_partitioning import get_dataset_partitioning_dimensions, set_dataset_partitioning
 
 
 def sync_dataset_to_connection(project, recipe_input_dataset_name, connection_name):
@@ -27,14 +28,16 @@ def sync_dataset_to_connection(project, recipe_input_dataset_name, connection_na
     pass
 
 
-def update_and_run_sync_recipe(project, recipe_name):
+def update_sync_recipe_output_schema(project, recipe_name):
     """
-    Updates a sync recipe so that its output schema matches its input schema. Then runs this recipe
+    Updates a sync recipe so that its output schema matches its input schema.
 
     :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
     :param recipe_name: str: Name of the sync recipe.
+
+    :returns: recipe_input_dataset_name: str: Name of the sync recipe input dataset.
+    :returns: recipe_output_dataset_name: str: Name of the sync recipe output dataset.
     """
-    sync_recipe = project.get_recipe(recipe_name)
     recipe = project.get_recipe(recipe_name)
     recipe_settings = recipe.get_settings()
 
@@ -45,9 +48,53 @@ def update_and_run_sync_recipe(project, recipe_name):
     recipe_input_dataset_settings = recipe_input_dataset.get_settings()
     recipe_input_dataset_schema_columns = recipe_input_dataset_settings.settings["schema"]["columns"]
 
-    recipe_output_dataset_name = project.get_dataset(recipe_output_dataset_name)
-    recipe_output_dataset_name_settings = recipe_output_dataset_name.get_settings()
-    recipe_output_dataset_name_settings.settings["schema"]["columns"] = recipe_input_dataset_schema_columns
-    recipe_output_dataset_name_settings.save()
+    recipe_output_dataset = project.get_dataset(recipe_output_dataset_name)
+    recipe_output_dataset_settings = recipe_output_dataset.get_settings()
+    recipe_output_dataset_settings.settings["schema"]["columns"] = recipe_input_dataset_schema_columns
+    recipe_output_dataset_settings.save()
+    return recipe_input_dataset_name, recipe_output_dataset_name
+
+
+def update_and_run_sync_recipe(project, recipe_name):
+    """
+    Updates a sync recipe so that its output schema matches its input schema. Then runs this recipe
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param recipe_name: str: Name of the sync recipe.
+    """
+    sync_recipe = project.get_recipe(recipe_name)
+    update_sync_recipe_output_schema(project, recipe_name)
     sync_recipe.run()
-    pass
\ No newline at end of file
+    pass
+
+
+def update_and_run_sync_recipe_on_partitions(project, recipe_name, partition_spec, bool_wait=True):
+    """
+    Updates a sync recipe between partitioned datasets so that its output schema and partitioning match its input ones.
+        Then runs this recipe on some partitions only: the other output partitions are left untouched.
+
+    :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+    :param recipe_name: str: Name of the sync recipe.
+    :param partition_spec: str: The partition spec to synchronize, as computed with
+        :function:`datasets.dataset_partitioning.compute_partition_spec` or
+        :function:`datasets.dataset_partitioning.compute_time_partition_range_spec`.
+    :param bool_wait: bool: Precise if the function should wait for the job to end.
+
+    :returns: job: dataikuapi.dss.job.DSSJob: A handle to interact with the sync job.
+    """
+    sync_recipe = project.get_recipe(recipe_name)
+    recipe_input_dataset_name, recipe_output_dataset_name = update_sync_recipe_output_schema(project, recipe_name)
+    recipe_input_partitioning_dimensions = get_dataset_partitioning_dimensions(project, recipe_input_dataset_name)
+    if len(recipe_input_partitioning_dimensions) == 0:
+        log_message = "Sync recipe '{}' input dataset '{}' is not partitioned!".format(recipe_name, recipe_input_dataset_name)
+        raise Exception(log_message)
+    if get_dataset_partitioning_dimensions(project, recipe_output_dataset_name) != recipe_input_partitioning_dimensions:
+        time_dimension_names = [dimension["name"] for dimension in recipe_input_partitioning_dimensions if dimension["type"] == "time"]
+        time_dimension_periods = [dimension["params"]["period"] for dimension in recipe_input_partitioning_dimensions if dimension["type"] == "time"]
+        set_dataset_partitioning(project, recipe_output_dataset_name,
+                                 time_dimension_names[0] if len(time_dimension_names) > 0 else None,
+                                 time_dimension_periods[0] if len(time_dimension_periods) > 0 else "DAY",
+                                 [dimension["name"] for dimension in recipe_input_partitioning_dimensions if dimension["type"] != "time"])
+    print("Running sync recipe '{}' on partitions '{}' ...".format(recipe_name, partition_spec))
+    job = sync_recipe.run(partitions=partition_spec, wait=bool_wait)
+    return job
@@ -1,8 +1,78 @@
 from .recipe_commons import (get_recipe_input_datasets,
-                             get_recipe_settings_and_dictionary)
+                             get_recipe_settings_and_dictionary,
+                             VisualRecipeBuilder)
 from ..datasets.dataset_commons import (get_dataset_schema,
                                         extract_dataset_schema_information)
 
+
+WINDOW_POSSIBLE_AGGREGATIONS = ["last", "lagDiff", "max", "column", "count", "$idx", "sum",
+                                "concat", "type",  "lead", "concatDistinct",  "min", "avg",
+                                "lag", "$selected", "stddev", "value", "leadDiff", "first"]
+WINDOW_DEFAULT_AGGREGATIONS = ["column", "$idx", "type"]
+WINDOW_AGGREGATIONS_TO_CHANGE = [aggregation for aggregation in WINDOW_POSSIBLE_AGGREGATIONS
+                                 if aggregation not in WINDOW_DEFAULT_AGGREGATIONS]
+
+
+def compute_window_recipe_input_columns_index(recipe_input_columns, recipe_input_column_datatypes):
+    """
+    Indexes the recipe input dataset columns, so that the columns of a window recipe payload can be looked up
+        without scanning the whole schema.
+
+    :param recipe_input_columns: list: List of the recipe input dataset columns.
+    :param recipe_input_column_datatypes: list: List of the recipe input dataset column datatypes.
+
+    :returns: recipe_input_columns_index: dict: Mapping between the input columns and their (column_index, column_datatype).
+    """
+    recipe_input_columns_index = {column_name: (column_index, column_datatype) for column_index, (column_name, column_datatype)
+                                  in enumerate(zip(recipe_input_columns, recipe_input_column_datatypes))}
+    return recipe_input_columns_index
+
+
+def compute_window_recipe_aggregations(recipe_input_columns, recipe_input_column_datatypes, column_aggregations_mapping,
+                                       recipe_input_columns_index=None):
+    """
+    Computes the 'values' section of a window recipe payload. Only the columns of 'column_aggregations_mapping' are
+        written, with their enabled aggregations only: columns and aggregations missing from the payload are disabled.
+        The cost of the computation thus depends on the number of requested aggregations, not on the number of
+        input columns.
+
+    :param recipe_input_columns: list: List of the recipe input dataset columns.
+    :param recipe_input_column_datatypes: list: List of the recipe input dataset column datatypes.
+    :param column_aggregations_mapping: dict: Mapping between the columns and the list of aggregations to apply to each one.
+        See :function:`define_window_recipe_aggregations` for details.
+    :param recipe_input_columns_index: dict: Optional index of the recipe input columns, as we can get it with
+        :function:`compute_window_recipe_input_columns_index`. It is computed from the input columns if not provided.
+
+    :returns: window_new_aggregations: list: New 'values' section of the window recipe payload.
+    """
+    if recipe_input_columns_index is None:
+        recipe_input_columns_index = compute_window_recipe_input_columns_index(recipe_input_columns,
+                                                                               recipe_input_column_datatypes)
+    missing_columns = [column_name for column_name in column_aggregations_mapping.keys()
+                       if column_name not in recipe_input_columns_index]
+    if len(missing_columns) > 0:
+        log_message = "Columns '{}' are not in the window recipe input dataset.".format(missing_columns)
+        raise Exception(log_message)
+    window_new_aggregations = []
+    sorted_column_names = sorted(column_aggregations_mapping.keys(),
+                                 key=lambda column_name: recipe_input_columns_index[column_name][0])
+    for column_name in sorted_column_names:
+        column_index, column_datatype = recipe_input_columns_index[column_name]
+        column_aggregation_settings = {
+            "column": column_name,
+            "$idx": column_index,
+            "type": column_datatype
+        }
+        for aggregation in column_aggregations_mapping[column_name]:
+            if aggregation not in WINDOW_AGGREGATIONS_TO_CHANGE:
+                log_message = "Aggregation '{}' of column '{}' is not a window recipe aggregation. "\
+                    "Allowed aggregations are '{}'".format(aggregation, column_name, WINDOW_AGGREGATIONS_TO_CHANGE)
+                raise Exception(log_message)
+            column_aggregation_settings[aggregation] = True
+        window_new_aggregations.append(column_aggregation_settings)
+    return window_new_aggregations
+
+
 def define_window_recipe_aggregations(project, recipe_name, column_aggregations_mapping):
     """
     Updates the aggregations set in a window recipe.
@@ -14,43 +84,17 @@ def define_window_recipe_aggregations(project, recipe_name, column_aggregations_
         - NOTE: use the aggregation 'value', from WINDOW_POSSIBLE_AGGREGATIONS if you want the column value to be retrieved.
             <-> Equivalent of the 'Retrieve' in the visual recipe.
         - NOTE: All columns not present in column_aggregations_mapping.keys() will:
-            - Have their aggregations disabled. 
+            - Have their aggregations disabled, as they are not written in the recipe payload.
             - Not have their values retrieved --> set at least the aggregation 'column_xyz': ['value']
                 if you want to keep the column 'column_xyz' values.
     """
-    WINDOW_POSSIBLE_AGGREGATIONS = ["last", "lagDiff", "max", "column", "count", "$idx", "sum",
-                              "concat", "type",  "lead", "concatDistinct",  "min", "avg",
-                              "lag", "$selected", "stddev", "value", "leadDiff", "first"]
-    WINDOW_DEFAULT_AGGREGATIONS = ["column", "$idx", "type"]
-    WINDOW_AGGREGATIONS_TO_CHANGE = [aggregation for aggregation in WINDOW_POSSIBLE_AGGREGATIONS
-                                     if aggregation not in WINDOW_DEFAULT_AGGREGATIONS]
-    
     recipe_settings, __ = get_recipe_settings_and_dictionary(project, recipe_name, False)
     recipe_payload = recipe_settings.get_json_payload()
     recipe_input_dataset_name = get_recipe_input_datasets(project, recipe_name)[0]
     recipe_input_dataset_schema = get_dataset_schema(project, recipe_input_dataset_name)
     recipe_input_columns, recipe_input_column_datatypes = extract_dataset_schema_information(recipe_input_dataset_schema)
-    column_indexes = range(len(recipe_input_columns))
-    column_with_aggregations = column_aggregations_mapping.keys()
-    window_new_aggregations = []
-    for column_index, column_name, column_datatype in zip(column_indexes, recipe_input_columns, recipe_input_column_datatypes):
-        column_aggregation_settings = {
-            "column": column_name,
-            "$idx": column_index,
-            "type": column_datatype
-        }
-        if column_name in column_with_aggregations:
-            column_aggregations_to_enable = column_aggregations_mapping[column_name]
-            for aggregation in WINDOW_AGGREGATIONS_TO_CHANGE:
-                if aggregation in column_aggregations_to_enable:
-                    column_aggregation_settings[aggregation] = True
-                else:
-                    column_aggregation_settings[aggregation] = False
-        else:
-            for aggregation in WINDOW_AGGREGATIONS_TO_CHANGE:
-                column_aggregation_settings[aggregation] = False            
-        window_new_aggregations.append(column_aggregation_settings)
-    
+    window_new_aggregations = compute_window_recipe_aggregations(recipe_input_columns, recipe_input_column_datatypes,
+                                                                 column_aggregations_mapping)
     recipe_payload["values"] = window_new_aggregations
     recipe_settings.set_json_payload(recipe_payload)
     recipe_settings.save()
@@ -58,6 +102,39 @@ def define_window_recipe_aggregations(project, recipe_name, column_aggregations_
     pass
 
 
+def compute_window_recipe_output_columns(recipe_json_payload):
+    """
+    Computes the output columns of a window recipe from its JSON payload: retrieved columns keep their name and
+        aggregations follow DSS default naming ('column_1_min', 'column_2_sum'...), then output column name overrides
+        are applied. Ranking columns computed from the windows themselves are not listed.
+
+    :param recipe_json_payload: dict: JSON payload of the window recipe.
+
+    :returns: window_recipe_output_columns: list: List of the output columns, with format:
+        [{'output_column': 'column_1', 'input_column': 'column_1', 'aggregation': None},
+         {'output_column': 'column_2_sum', 'input_column': 'column_2', 'aggregation': 'sum'}, ...]
+        Retrieved columns have no aggregation.
+    """
+    WINDOW_OUTPUT_AGGREGATIONS = ["min", "max", "avg", "sum", "count", "stddev", "first", "last",
+                                  "concat", "concatDistinct", "lag", "lead", "lagDiff", "leadDiff"]
+    output_column_name_overrides = recipe_json_payload.get("outputColumnNameOverrides", {})
+    window_recipe_output_columns = []
+    for column_aggregation in recipe_json_payload.get("values", []):
+        column_name = column_aggregation["column"]
+        if column_aggregation.get("value", False) == True:
+            window_recipe_output_columns.append({"output_column": column_name, "input_column": column_name,
+                                                 "aggregation": None})
+        for aggregation in WINDOW_OUTPUT_AGGREGATIONS:
+            if column_aggregation.get(aggregation, False) == True:
+                window_recipe_output_columns.append({"output_column": "{}_{}".format(column_name, aggregation),
+                                                     "input_column": column_name,
+                                                     "aggregation": aggregation})
+    for output_column_information in window_recipe_output_columns:
+        output_column = output_column_information["output_column"]
+        output_column_information["output_column"] = output_column_name_overrides.get(output_column, output_column)
+    return window_recipe_output_columns
+
+
 def generate_window_recipe_orders(column_names, columns_bool_descending_mapping):
     """
     Computes the order payload part of a single window recipe's window.
@@ -95,3 +172,103 @@ def set_window_orders(project, recipe_name, column_names, columns_bool_descendin
     recipe_settings.set_json_payload(recipe_payload)
     recipe_settings.save()
     pass
+
+
+class WindowRecipeBuilder(VisualRecipeBuilder):
+    """
+    Accumulates the aggregations, partitioning, orders and output column name overrides of a window recipe,
+        then validates and saves them in a single settings update.
+    """
+
+    ALLOWED_RECIPE_TYPES = ["window"]
+
+    def __init__(self, project, recipe_name, dataset_schemas_cache=None):
+        """
+        :param project: dataikuapi.dss.project.DSSProject: A handle to interact with a project on the DSS instance.
+        :param recipe_name: str: Name of the recipe.
+        :param dataset_schemas_cache: dict: Optional mapping between dataset names and their schemas, shared between builders.
+        """
+        super().__init__(project, recipe_name, dataset_schemas_cache)
+        self.recipe_input_columns_index = None
+        pass
+
+    def get_window_settings(self, window_id):
+        """
+        Retrieves the settings of one of the recipe windows.
+
+        :param window_id: int: Index of the window in the recipe.
+
+        :returns: window_settings: dict: Settings of the window.
+        """
+        recipe_windows = self.recipe_payload.get("windows", [])
+        if window_id >= len(recipe_windows):
+            log_message = "Recipe '{}' has {} window(s): window '{}' does not exist!".format(self.recipe_name,
+                                                                                           len(recipe_windows), window_id)
+            raise Exception(log_message)
+        window_settings = recipe_windows[window_id]
+        return window_settings
+
+    def get_recipe_input_columns_index(self):
+        """
+        Retrieves the index of the recipe input columns (see :function:`compute_window_recipe_input_columns_index`),
+            computing it once from the cached recipe input schema.
+
+        :returns: recipe_input_columns_index: dict: Mapping between the input columns and their (column_index, column_datatype).
+        """
+        if self.recipe_input_columns_index is None:
+            recipe_input_columns, recipe_input_column_datatypes = extract_dataset_schema_information(self.get_recipe_input_schema())
+            self.recipe_input_columns_index = compute_window_recipe_input_columns_index(recipe_input_columns,
+                                                                                        recipe_input_column_datatypes)
+        return self.recipe_input_columns_index
+
+    def set_aggregations(self, column_aggregations_mapping):
+        """
+        Sets the aggregations done by the window recipe. Columns missing from the recipe input are reported
+            as validation errors and left out of the payload.
+
+        :param column_aggregations_mapping: dict: Mapping between the columns and the list of aggregations to apply
+            to each one. See :function:`define_window_recipe_aggregations` for details.
+
+        :returns: self
+        """
+        self.check_columns_are_in_recipe_input(list(column_aggregations_mapping.keys()), "aggregated column")
+        recipe_input_columns_index = self.get_recipe_input_columns_index()
+        input_column_aggregations_mapping = {column_name: column_aggregations
+                                             for column_name, column_aggregations in column_aggregations_mapping.items()
+                                             if column_name in recipe_input_columns_index}
+        self.recipe_payload["values"] = compute_window_recipe_aggregations(None, None, input_column_aggregations_mapping,
+                                                                           recipe_input_columns_index)
+        return self
+
+    def set_partitioning(self, column_names, window_id=0):
+        """
+        Sets the partitioning columns of one of the recipe windows. An empty list disables the partitioning.
+
+        :param column_names: list: List of the partitioning columns.
+        :param window_id: int: Index of the window in the recipe.
+
+        :returns: self
+        """
+        self.check_columns_are_in_recipe_input(column_names, "window partitioning column")
+        window_settings = self.get_window_settings(window_id)
+        window_settings["enablePartitioning"] = (len(column_names) > 0)
+        window_settings["partitioningColumns"] = column_names
+        return self
+
+    def set_orders(self, column_names, columns_bool_descending_mapping, window_id=0):
+        """
+        Sets the orders of one of the recipe windows. An empty list disables the ordering.
+
+        :param column_names: list: List of columns. Example: ['column_1', 'column_2', 'column_3']
+        :param columns_bool_descending_mapping: list: List of boolean indicating if each column
+            present in 'column_names' should be ordered descending  or not. Example: [True, False, True]
+        :param window_id: int: Index of the window in the recipe.
+
+        :returns: self
+        """
+        self.check_columns_are_in_recipe_input(column_names, "window ordering column")
+        window_settings = self.get_window_settings(window_id)
+        window_settings["enableOrdering"] = (len(column_names) > 0)
+        window_settings["orders"] = generate_window_recipe_orders(column_names, columns_bool_descending_mapping)
+        return self
+
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+pytest.importorskip("dataikuapi")
+
+from dku_utils.connections.sql.sql_aggregations import generate_sql_group_query
+from dku_utils.recipes.group_recipe import compute_group_recipe_aggregations
+from dku_utils.recipes.local_execution.group_execution import execute_group_recipe_payload
+
+
+TABLE_REFERENCE = '"source table"'
+GROUP_KEY = ["key 1", "key_2"]
+CONCATENATION_SEPARATOR = "|'"
+
+
+@pytest.fixture
+def source_dataframe():
+    random_generator = np.random.default_rng(0)
+    n_rows = 5000
+    source_dataframe = pd.DataFrame({"key 1": random_generator.choice(["a", "b", None], n_rows),
+                                     "key_2": random_generator.integers(0, 5, n_rows),
+                                     "x": random_generator.integers(0, 100, n_rows).astype(float),
+                                     "s": random_generator.choice(["p", "q'r", "z"], n_rows),
+                                     "ts": random_generator.permutation(n_rows)})
+    source_dataframe.loc[random_generator.choice(n_rows, 500, replace=False), "x"] = np.nan
+    return source_dataframe
+
+
+def execute_postgresql_query_in_duckdb(source_dataframe, sql_query):
+    connection = duckdb.connect()
+    connection.register("source_dataframe", source_dataframe)
+    connection.execute("CREATE TABLE {} AS SELECT * FROM source_dataframe".format(TABLE_REFERENCE))
+    return connection.execute(sql_query).df()
+
+
+def execute_group_locally(source_dataframe, group_key, column_aggregations_mapping, columns_settings,
+                          output_column_name_overrides):
+    recipe_json_payload = {"keys": [{"column": column_name} for column_name in group_key],
+                           "values": compute_group_recipe_aggregations([dict(column_settings, column=column_name)
+                                                                        for column_name, column_settings
+                                                                        in columns_settings.items()],
+                                                                       column_aggregations_mapping),
+                           "globalCount": True,
+                           "outputColumnNameOverrides": output_column_name_overrides}
+    return execute_group_recipe_payload(recipe_json_payload, [source_dataframe])
+
+
+def assert_group_outputs_are_equal(sql_dataframe, local_dataframe, group_key, unordered_concatenation_columns=()):
+    assert list(sql_dataframe.columns) == list(local_dataframe.columns)
+    if len(group_key) > 0:
+        sql_dataframe = sql_dataframe.sort_values(group_key).reset_index(drop=True)
+        local_dataframe = local_dataframe.sort_values(group_key).reset_index(drop=True)
+    for column_name in sql_dataframe.columns:
+        sql_values = sql_dataframe[column_name]
+        local_values = local_dataframe[column_name]
+        if column_name in unordered_concatenation_columns:
+            sql_values = sql_values.map(lambda value: sorted(value.split(CONCATENATION_SEPARATOR)))
+            local_values = local_values.map(lambda value: sorted(value.split(CONCATENATION_SEPARATOR)))
+            assert list(sql_values) == list(local_values), column_name
+        elif pd.api.types.is_numeric_dtype(sql_values) and pd.api.types.is_numeric_dtype(local_values):
+            assert np.allclose(sql_values.astype(float), local_values.astype(float), equal_nan=True), column_name
+        else:
+            assert list(sql_values.astype(str)) == list(local_values.astype(str)), column_name
+
+
+def test_postgresql_group_query_matches_local_execution(source_dataframe):
+    column_aggregations_mapping = {"x": ["min", "max", "avg", "sum", "stddev", "count", "countDistinct", "first", "last"],
+                                   "s": ["first", "last", "concat", "concatDistinct"]}
+    columns_settings = {"x": {"orderColumn": "ts", "firstLastNotNull": True},
+                        "s": {"orderColumn": "ts", "concatSeparator": CONCATENATION_SEPARATOR}}
+    output_column_name_overrides = {"x_sum": "total"}
+    sql_query = generate_sql_group_query("PostgreSQL", TABLE_REFERENCE, GROUP_KEY, column_aggregations_mapping, True,
+                                         columns_settings, output_column_name_overrides)
+    sql_dataframe = execute_postgresql_query_in_duckdb(source_dataframe, sql_query)
+    local_dataframe = execute_group_locally(source_dataframe, GROUP_KEY, column_aggregations_mapping, columns_settings,
+                                            output_column_name_overrides)
+    assert_group_outputs_are_equal(sql_dataframe, local_dataframe, GROUP_KEY,
+                                   unordered_concatenation_columns=["s_concat_distinct"])
+
+
+def test_postgresql_global_aggregation_matches_local_execution(source_dataframe):
+    column_aggregations_mapping = {"x": ["min", "sum", "count"], "s": ["concat"]}
+    columns_settings = {"s": {"orderColumn": "ts", "concatSeparator": CONCATENATION_SEPARATOR}}
+    sql_query = generate_sql_group_query("PostgreSQL", TABLE_REFERENCE, [], column_aggregations_mapping, True,
+                                         columns_settings)
+    sql_dataframe = execute_postgresql_query_in_duckdb(source_dataframe, sql_query)
+    local_dataframe = execute_group_locally(source_dataframe, [], column_aggregations_mapping, columns_settings, {})
+    assert_group_outputs_are_equal(sql_dataframe, local_dataframe, [])
+
+
+def test_postgresql_first_last_without_order_column_are_min_max(source_dataframe):
+    sql_query = generate_sql_group_query("PostgreSQL", TABLE_REFERENCE, GROUP_KEY, {"s": ["first", "last"]})
+    sql_dataframe = execute_postgresql_query_in_duckdb(source_dataframe, sql_query)
+    sql_dataframe = sql_dataframe.sort_values(GROUP_KEY).reset_index(drop=True)
+    expected_dataframe = source_dataframe.groupby(GROUP_KEY, dropna=False)["s"].agg(["min", "max"]).reset_index()
+    expected_dataframe = expected_dataframe.sort_values(GROUP_KEY).reset_index(drop=True)
+    assert list(sql_dataframe["s_first"]) == list(expected_dataframe["min"])
+    assert list(sql_dataframe["s_last"]) == list(expected_dataframe["max"])